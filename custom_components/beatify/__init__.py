@@ -23,10 +23,8 @@ from .const import (
     DEFAULT_ENABLE_COMPANION_AUTH_BYPASS,
     DOMAIN,
 )
-from .game.playlist import (
-    async_discover_playlists,
-    async_ensure_playlist_directory,
-)
+from .game.playlist import async_ensure_playlist_directory
+from .game.playlist_index import async_discover_playlists
 from .game.service import GameService
 from .game.state import GameState
 from .server import async_register_static_paths
@@ -346,10 +344,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         # Clean up domain data
         if DOMAIN in hass.data:
             domain_data = hass.data.pop(DOMAIN)
-            # Flush any pending debounced analytics error save before teardown (#1388)
-            analytics = domain_data.get("analytics")
-            if analytics is not None:
-                await analytics.async_shutdown()
+            # Flush queued stats/analytics journal events before teardown (#1388)
+            for key in ("stats", "analytics"):
+                store = domain_data.get(key)
+                if store is not None:
+                    await store.async_shutdown()
 
         _LOGGER.info("Beatify integration unloaded")
     else:
@@ -12,9 +12,11 @@ import json
 import logging
 import os
 import time
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, TypedDict, cast
+from typing import TYPE_CHECKING, Any, NotRequired, TypedDict, cast
+
+from custom_components.beatify.services.event_log import EventLog
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -32,11 +34,6 @@ PRUNE_INTERVAL = 10  # Prune every N game records
 # game-driven prune passes. Keep only the most recent events. (#1388)
 MAX_ERROR_RECORDS = 500
 
-# Debounce window (seconds) for coalescing error-driven saves. A burst of
-# errors would otherwise trigger one full-file rewrite per event; instead we
-# delay-coalesce them into a single write. (#1388)
-ERROR_SAVE_DEBOUNCE_SECONDS = 5.0
-
 # Period-to-days mapping used by stats functions
 PERIOD_DAYS_MAP: dict[str, int] = {"7d": 7, "30d": 30, "90d": 90, "all": 365 * 10}
 
@@ -91,6 +88,98 @@ class AnalyticsData(TypedDict):
     games: list[GameRecord]
     errors: list[ErrorEvent]
     monthly_summaries: list[MonthlySummary]
+    log_seq: NotRequired[int]  # last journal event included (services/event_log)
+
+
+def _day_key(timestamp: float) -> str:
+    """UTC calendar day ("YYYY-MM-DD") of a Unix timestamp."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+class _Rollup:
+    """Additive dashboard counters over a set of game records.
+
+    One per UTC day is kept up to date as games are recorded; a period query
+    merges whole days and only scans the records of its two edge days.
+    """
+
+    __slots__ = (
+        "bets",
+        "bets_won",
+        "days",
+        "event_rounds",
+        "games",
+        "peak_players",
+        "players",
+        "playlists",
+        "rounds",
+        "score",
+        "streak_10",
+        "streak_3",
+        "streak_5",
+    )
+
+    def __init__(self) -> None:
+        """Initialize empty counters."""
+        self.games = 0
+        self.players = 0
+        self.rounds = 0
+        # Rounds with the "10 per game" estimate for records without a count,
+        # as used by the error rate (Story 19.6).
+        self.event_rounds = 0
+        self.score = 0.0  # sum of average_score * player_count
+        self.peak_players = 0
+        self.streak_3 = 0
+        self.streak_5 = 0
+        self.streak_10 = 0
+        self.bets = 0
+        self.bets_won = 0
+        self.playlists: dict[str, int] = {}  # playlist name -> games
+        self.days: dict[str, int] = {}  # day key -> games
+
+    @classmethod
+    def of(cls, games: list[GameRecord]) -> _Rollup:
+        """Counters over an explicit list of game records."""
+        rollup = cls()
+        for game in games:
+            rollup.add(game, _day_key(game.get("ended_at", 0)))
+        return rollup
+
+    def add(self, game: GameRecord, day: str) -> None:
+        """Count one game record that ended on ``day``."""
+        players = game.get("player_count", 0)
+        self.games += 1
+        self.players += players
+        self.rounds += game.get("rounds_played", 0)
+        self.event_rounds += game.get("rounds_played", 10)
+        self.score += game.get("average_score", 0) * players
+        self.peak_players = max(self.peak_players, players)
+        self.streak_3 += game.get("streak_3_count", 0)
+        self.streak_5 += game.get("streak_5_count", 0)
+        self.streak_10 += game.get("streak_10_count", 0)
+        self.bets += game.get("total_bets", 0)
+        self.bets_won += game.get("bets_won", 0)
+        for name in game.get("playlist_names", []):
+            self.playlists[name] = self.playlists.get(name, 0) + 1
+        self.days[day] = self.days.get(day, 0) + 1
+
+    def merge(self, other: _Rollup) -> None:
+        """Add another rollup's counters into this one."""
+        self.games += other.games
+        self.players += other.players
+        self.rounds += other.rounds
+        self.event_rounds += other.event_rounds
+        self.score += other.score
+        self.peak_players = max(self.peak_players, other.peak_players)
+        self.streak_3 += other.streak_3
+        self.streak_5 += other.streak_5
+        self.streak_10 += other.streak_10
+        self.bets += other.bets
+        self.bets_won += other.bets_won
+        for name, count in other.playlists.items():
+            self.playlists[name] = self.playlists.get(name, 0) + count
+        for day, count in other.days.items():
+            self.days[day] = self.days.get(day, 0) + count
 
 
 class AnalyticsStorage:
@@ -99,6 +188,9 @@ class AnalyticsStorage:
 
     Stores analytics data in {HA_CONFIG}/beatify/analytics.json with
     crash-safe atomic writes and non-blocking persistence (AC: #3, #4).
+    Recorded games and errors are appended to ``analytics.log`` (see
+    ``services/event_log``); the JSON snapshot is only rewritten when the
+    journal is compacted.
     """
 
     def __init__(self, hass: HomeAssistant) -> None:
@@ -111,16 +203,23 @@ class AnalyticsStorage:
         """
         self._hass = hass
         self._path = Path(hass.config.path("beatify", "analytics.json"))
+        self._log = EventLog(hass, self._path.with_suffix(".log"))
         self._data: AnalyticsData = self._empty_data()
         self._games_since_prune = 0
         self._session_error_count = 0
         self._save_lock = asyncio.Lock()
-        # Pending debounced error-save timer handle (#1388)
-        self._error_save_handle: asyncio.TimerHandle | None = None
+        # False after load() found analytics.json unreadable; compaction then
+        # stays off for the rest of the run (see load()).
+        self._snapshot_readable = True
         self._playlist_display_names: dict[str, str] | None = None
         self._metrics_cache: dict[
             str, tuple[float, dict]
         ] = {}  # period -> (timestamp, result)
+        # Per-day rollups of self._data["games"] (see _sync_rollups).
+        self._day_rollups: dict[str, _Rollup] = {}
+        self._day_games: dict[str, list[GameRecord]] = {}
+        self._rollup_source: list[GameRecord] | None = None
+        self._rollup_count = 0
 
     def _empty_data(self) -> AnalyticsData:
         """Return empty analytics data structure."""
@@ -132,7 +231,42 @@ class AnalyticsStorage:
         }
 
     async def load(self) -> None:
-        """Load analytics data from file (AC: #3).
+        """Load analytics data: snapshot, then the journal events after it (AC: #3).
+
+        Folds a non-empty journal (and anything pruned) back into a fresh
+        snapshot right away, unless analytics.json exists but could not be
+        read: compacting then would write over that possibly recoverable file
+        and truncate the events the next load replays on top of it (#1402).
+        """
+        try:
+            self._snapshot_readable = await self._load_snapshot()
+            events = await self._log.async_replay(self._data.get("log_seq", 0))
+            for event in events:
+                self._apply_event(event)
+            pruned = await self._prune_old_records()
+            if self._snapshot_readable and (self._log.length or pruned):
+                await self._log.async_compact(self._save)
+        finally:
+            # Pre-load playlist display names so later sync callers don't block
+            # the event loop with file I/O. Must run on EVERY load path (fresh
+            # install, corruption recovery, normal load) — otherwise the first
+            # sync compute_playlist_stats() globs+reads playlist JSON in the
+            # event loop. See #1387.
+            await self._hass.async_add_executor_job(self._get_playlist_display_names)
+
+    def _apply_event(self, event: dict[str, Any]) -> None:
+        """Re-apply one journal event to the in-memory store."""
+        kind = event.get("t")
+        value = event.get("v")
+        if not isinstance(value, dict):
+            return
+        if kind == "game":
+            self._data["games"].append(cast("GameRecord", value))
+        elif kind == "error":
+            self._append_error(cast("ErrorEvent", value))
+
+    async def _load_snapshot(self) -> bool:
+        """Load the analytics JSON snapshot.
 
         Only an unparseable file (bad JSON or wrong top-level type) is treated
         as corrupt. A single malformed *record* must never wipe the whole
@@ -140,58 +274,54 @@ class AnalyticsStorage:
         skip/tolerate individual bad records instead of raising (#1385). When
         the file truly is corrupt, the original is quarantined to
         ``analytics.json.corrupt`` rather than being destroyed.
+
+        Returns:
+            False if the file exists but could not be read
+
         """
-        try:
-            if not self._path.exists():
-                _LOGGER.debug("No analytics file found, starting fresh")
-                self._data = self._empty_data()
-                return
+        if not self._path.exists():
+            _LOGGER.debug("No analytics file found, starting fresh")
+            self._data = self._empty_data()
+            return True
 
-            try:
-                content = await self._hass.async_add_executor_job(self._path.read_text)
-            except OSError as err:
-                # The file exists but is unreadable (permissions, transient I/O
-                # error). Start fresh in memory so startup isn't blocked, but do
-                # NOT quarantine or save over it — that would destroy a
-                # possibly-recoverable file. A later successful save can still
-                # replace it once the read error clears (#1402).
-                _LOGGER.error(
-                    "Analytics file unreadable, starting fresh in memory: %s", err
-                )
-                self._data = self._empty_data()
-                return
+        try:
+            content = await self._hass.async_add_executor_job(self._path.read_text)
+        except OSError as err:
+            # The file exists but is unreadable (permissions, transient I/O
+            # error). Start fresh in memory so startup isn't blocked, but do
+            # NOT quarantine or save over it — that would destroy a
+            # possibly-recoverable file. New events stay in the journal until
+            # a later load can read the file again (#1402).
+            _LOGGER.error(
+                "Analytics file unreadable, starting fresh in memory: %s", err
+            )
+            self._data = self._empty_data()
+            return False
 
-            try:
-                parsed = json.loads(content)
-            except json.JSONDecodeError as err:
-                await self._quarantine_corrupt_file(err)
-                return
-
-            if not isinstance(parsed, dict):
-                await self._quarantine_corrupt_file(
-                    TypeError(
-                        f"analytics root is {type(parsed).__name__}, expected dict"
-                    )
+        try:
+            parsed = json.loads(content)
+        except json.JSONDecodeError as err:
+            await self._quarantine_corrupt_file(err)
+            return True
+
+        if not isinstance(parsed, dict):
+            await self._quarantine_corrupt_file(
+                TypeError(
+                    f"analytics root is {type(parsed).__name__}, expected dict"
                 )
-                return
-
-            self._data = cast("AnalyticsData", parsed)
-            _LOGGER.debug(
-                "Loaded analytics: %d games, %d errors",
-                len(self._data.get("games", [])),
-                len(self._data.get("errors", [])),
             )
-            # Prune old records on startup. This runs OUTSIDE the parse guard:
-            # a single malformed record must not silently reset the whole store,
-            # so prune tolerates bad records via .get() defaults (#1385).
-            await self._prune_old_records()
-        finally:
-            # Pre-load playlist display names so later sync callers don't block
-            # the event loop with file I/O. Must run on EVERY load path (fresh
-            # install, corruption recovery, normal load) — otherwise the first
-            # sync compute_playlist_stats() globs+reads playlist JSON in the
-            # event loop. See #1387.
-            await self._hass.async_add_executor_job(self._get_playlist_display_names)
+            return True
+
+        self._data = cast("AnalyticsData", parsed)
+        _LOGGER.debug(
+            "Loaded analytics: %d games, %d errors",
+            len(self._data.get("games", [])),
+            len(self._data.get("errors", [])),
+        )
+        # load() prunes old records next. That runs OUTSIDE the parse guard: a
+        # single malformed record must not silently reset the whole store, so
+        # prune tolerates bad records via .get() defaults (#1385).
+        return True
 
     async def _quarantine_corrupt_file(self, err: Exception) -> None:
         """Move an unparseable analytics file aside and start fresh (#1385).
@@ -215,11 +345,15 @@ class AnalyticsStorage:
         self._data = self._empty_data()
         await self._save()
 
-    async def _save(self) -> None:
+    async def _save(self) -> bool:
         """
         Persist analytics data with atomic write (AC: #3).
 
         Uses temp file + rename for crash safety.
+
+        Returns:
+            True if the snapshot was written
+
         """
         async with self._save_lock:
             try:
@@ -230,6 +364,8 @@ class AnalyticsStorage:
 
                 # Write to temp file first (atomic write pattern)
                 temp_path = self._path.with_suffix(".tmp")
+                # Journal events up to here are part of this snapshot.
+                self._data["log_seq"] = self._log.seq
                 content = json.dumps(self._data, indent=2)
 
                 def _write_atomic() -> None:
@@ -242,14 +378,19 @@ class AnalyticsStorage:
 
             except OSError as err:
                 _LOGGER.error("Failed to save analytics: %s", err)
+                return False
+            return True
 
     def schedule_save(self) -> None:
         """
-        Schedule non-blocking save (AC: #4).
+        Schedule a non-blocking compaction: snapshot rewrite + journal reset (AC: #4).
 
         Uses fire-and-forget pattern to avoid blocking game operations.
+        Nothing is scheduled while the snapshot is unreadable (see load()).
         """
-        task = asyncio.create_task(self._save())
+        if not self._snapshot_readable:
+            return
+        task = asyncio.create_task(self._log.async_compact(self._save))
         task.add_done_callback(self._handle_save_error)
 
     def _handle_save_error(self, task: asyncio.Task) -> None:
@@ -257,39 +398,14 @@ class AnalyticsStorage:
         if (exc := task.exception()) is not None:
             _LOGGER.error("Unhandled error in analytics save task: %s", exc)
 
-    def _schedule_error_save(self) -> None:
-        """
-        Schedule a debounced save for error events (#1388).
-
-        Error events can arrive in bursts (reconnect storms, flapping media
-        players). Writing the whole analytics file per event hammers the disk
-        and runs json.dumps of the growing structure in the event loop. Instead
-        we coalesce: a save is scheduled ERROR_SAVE_DEBOUNCE_SECONDS in the
-        future, and any error arriving before it fires resets the timer, so a
-        burst results in a single write.
-        """
-        if self._error_save_handle is not None:
-            self._error_save_handle.cancel()
-
-        def _fire() -> None:
-            self._error_save_handle = None
-            self.schedule_save()
-
-        self._error_save_handle = self._hass.loop.call_later(
-            ERROR_SAVE_DEBOUNCE_SECONDS, _fire
-        )
-
     async def async_shutdown(self) -> None:
         """
-        Cancel any pending debounced error save and flush to disk (#1388).
+        Write queued journal events to disk.
 
-        Called on unload so the last coalesced batch of error events isn't lost
-        when its debounce timer never fires.
+        Called on unload so events recorded in the last moments (typically a
+        burst of errors) aren't lost.
         """
-        if self._error_save_handle is not None:
-            self._error_save_handle.cancel()
-            self._error_save_handle = None
-            await self._save()
+        await self._log.async_flush()
 
     async def add_game(self, record: GameRecord) -> None:
         """
@@ -300,15 +416,20 @@ class AnalyticsStorage:
 
         """
         self._data["games"].append(record)
+        self._log.append({"t": "game", "v": record})
         self._metrics_cache.clear()
+        self._sync_rollups()
         self._games_since_prune += 1
 
         # Prune periodically
+        pruned = False
         if self._games_since_prune >= PRUNE_INTERVAL:
-            await self._prune_old_records()
+            pruned = await self._prune_old_records()
             self._games_since_prune = 0
 
-        self.schedule_save()
+        # A prune rewrites the record lists, which the journal cannot express.
+        if pruned or self._log.needs_compaction:
+            self.schedule_save()
 
         _LOGGER.info(
             "Recorded analytics for game %s: %d players, %d rounds",
@@ -331,18 +452,24 @@ class AnalyticsStorage:
             "type": error_type,
             "message": message[:500],  # Limit message length
         }
+        self._append_error(event)
+        self._session_error_count += 1
+        # One journal line per event instead of a full-file rewrite (#1388).
+        self._log.append({"t": "error", "v": event})
+        if self._log.needs_compaction:
+            self.schedule_save()
+
+        _LOGGER.debug("Recorded error event: %s - %s", error_type, message)
+
+    def _append_error(self, event: ErrorEvent) -> None:
+        """Append an error event, keeping only the newest MAX_ERROR_RECORDS."""
         errors = self._data["errors"]
         errors.append(event)
         # Cap independently of the game-driven prune, which most installs never
-        # trigger. Keep only the most recent MAX_ERROR_RECORDS events so a burst
-        # cannot grow the list (and the per-save json.dumps) without bound.
+        # trigger, so a burst cannot grow the list (and the snapshot) without
+        # bound.
         if len(errors) > MAX_ERROR_RECORDS:
             del errors[:-MAX_ERROR_RECORDS]
-        self._session_error_count += 1
-        # Debounce/coalesce the save instead of a full-file rewrite per event.
-        self._schedule_error_save()
-
-        _LOGGER.debug("Recorded error event: %s - %s", error_type, message)
 
     @property
     def session_error_count(self) -> int:
@@ -353,11 +480,15 @@ class AnalyticsStorage:
         """Reset session error counter (called at game start)."""
         self._session_error_count = 0
 
-    async def _prune_old_records(self) -> None:
+    async def _prune_old_records(self) -> bool:
         """
         Prune old records and create monthly summaries (AC: #5).
 
         Keeps last 90 days detailed, summarizes older records.
+
+        Returns:
+            True if any game was folded into a monthly summary
+
         """
         now = time.time()
         cutoff = now - (RETENTION_DAYS * 24 * 60 * 60)
@@ -365,7 +496,7 @@ class AnalyticsStorage:
         games = self._data["games"]
 
         if len(games) <= MAX_DETAILED_RECORDS:
-            return
+            return False
 
         # Separate old and recent games
         old_games: list[GameRecord] = []
@@ -382,7 +513,7 @@ class AnalyticsStorage:
                 recent_games.append(game)
 
         if not old_games:
-            return
+            return False
 
         # Group old games by month and create summaries
         monthly_groups: dict[str, list[GameRecord]] = {}
@@ -462,6 +593,59 @@ class AnalyticsStorage:
             len(old_games),
             len(monthly_groups),
         )
+        return True
+
+    def _sync_rollups(self) -> None:
+        """
+        Bring the per-day rollups up to date with the games list.
+
+        Recorded games are appended, so only the new tail is folded in. When
+        the list was replaced (load, prune, corruption reset) or shrank, the
+        rollups are rebuilt from scratch.
+        """
+        games = self._data["games"]
+        if games is not self._rollup_source or len(games) < self._rollup_count:
+            self._day_rollups = {}
+            self._day_games = {}
+            self._rollup_source = games
+            self._rollup_count = 0
+        for game in games[self._rollup_count :]:
+            day = _day_key(game.get("ended_at", 0))
+            rollup = self._day_rollups.get(day)
+            if rollup is None:
+                rollup = self._day_rollups[day] = _Rollup()
+                self._day_games[day] = []
+            rollup.add(game, day)
+            self._day_games[day].append(game)
+        self._rollup_count = len(games)
+
+    def _rollup_range(self, start_date: int, end_date: int) -> _Rollup:
+        """
+        Counters over games that ended within ``[start_date, end_date]``.
+
+        Same selection as ``get_games(start_date, end_date)``, read from the
+        day rollups: whole days inside the range are merged, only the two edge
+        days are scanned record by record.
+
+        Args:
+            start_date: Unix timestamp for start (inclusive)
+            end_date: Unix timestamp for end (inclusive)
+
+        Returns:
+            Aggregated counters for the range
+
+        """
+        self._sync_rollups()
+        total = _Rollup()
+        first, last = _day_key(start_date), _day_key(end_date)
+        for day, rollup in self._day_rollups.items():
+            if first < day < last:
+                total.merge(rollup)
+            elif day in (first, last):
+                for game in self._day_games[day]:
+                    if start_date <= game.get("ended_at", 0) <= end_date:
+                        total.add(game, day)
+        return total
 
     def get_games(
         self, start_date: int | None = None, end_date: int | None = None
@@ -632,14 +816,10 @@ class AnalyticsStorage:
             Top 5 playlists with name, play_count, percentage
 
         """
-        playlist_counts: dict[str, int] = {}
-
-        for game in games:
-            for playlist_name in game.get("playlist_names", []):
-                playlist_counts[playlist_name] = (
-                    playlist_counts.get(playlist_name, 0) + 1
-                )
+        return self._playlist_stats(_Rollup.of(games).playlists)
 
+    def _playlist_stats(self, playlist_counts: dict[str, int]) -> list[dict[str, Any]]:
+        """Top 5 playlists from per-playlist game counts (Story 19.4)."""
         # Sort by count descending
         sorted_playlists = sorted(
             playlist_counts.items(),
@@ -678,8 +858,12 @@ class AnalyticsStorage:
             Chart data with labels, values, and granularity
 
         """
-        from datetime import timedelta  # noqa: PLC0415
+        return self._games_over_time(_Rollup.of(games).days, period)
 
+    def _games_over_time(
+        self, day_counts: dict[str, int], period: str
+    ) -> dict[str, Any]:
+        """Chart data from per-day game counts (day key -> games, Story 19.5)."""
         now = datetime.now(timezone.utc)
 
         if period == "7d":
@@ -690,11 +874,9 @@ class AnalyticsStorage:
                 (now - timedelta(days=i)).strftime("%Y-%m-%d"): 0 for i in range(days)
             }
 
-            for game in games:
-                dt = datetime.fromtimestamp(game["ended_at"], tz=timezone.utc)
-                key = dt.strftime("%Y-%m-%d")
+            for key, count in day_counts.items():
                 if key in buckets:
-                    buckets[key] += 1
+                    buckets[key] += count
 
             labels = [
                 (now - timedelta(days=i)).strftime("%a")
@@ -721,16 +903,15 @@ class AnalyticsStorage:
             # vanished and the chart sum no longer matched total_games.
             oldest_key = min(week_buckets)
 
-            for game in games:
-                dt = datetime.fromtimestamp(game["ended_at"], tz=timezone.utc)
-                week_start = dt - timedelta(days=dt.weekday())
-                key = week_start.strftime("%Y-%m-%d")
+            for day, count in day_counts.items():
+                d = date.fromisoformat(day)
+                key = (d - timedelta(days=d.weekday())).isoformat()
                 if key in week_buckets:
-                    week_buckets[key] += 1
+                    week_buckets[key] += count
                 elif key < oldest_key:
                     # Older than the chart window's first bucket: fold into the
                     # oldest bucket so the totals stay consistent.
-                    week_buckets[oldest_key] += 1
+                    week_buckets[oldest_key] += count
 
             sorted_keys = sorted(week_buckets.keys())
             labels = [f"W{i + 1}" for i in range(len(sorted_keys))]
@@ -741,10 +922,9 @@ class AnalyticsStorage:
             granularity = "month"
             month_buckets: dict[str, int] = {}
 
-            for game in games:
-                dt = datetime.fromtimestamp(game["ended_at"], tz=timezone.utc)
-                key = dt.strftime("%Y-%m")
-                month_buckets[key] = month_buckets.get(key, 0) + 1
+            for day, count in day_counts.items():
+                key = day[:7]
+                month_buckets[key] = month_buckets.get(key, 0) + count
 
             sorted_keys = sorted(month_buckets.keys())[-12:]  # Last 12 months
             labels = (
@@ -771,6 +951,14 @@ class AnalyticsStorage:
             Error stats with rate, count, status, and recent errors
 
         """
+        # Calculate total events (games * avg rounds as rough estimate)
+        total_events = sum(g.get("rounds_played", 10) for g in games)
+        return self._error_stats(total_events, errors, period)
+
+    def _error_stats(
+        self, total_events: int, errors: list[ErrorEvent], period: str
+    ) -> dict[str, Any]:
+        """Error statistics given the period's estimated round count (Story 19.6)."""
         now = int(time.time())
 
         # Calculate period boundaries
@@ -780,9 +968,6 @@ class AnalyticsStorage:
         # Filter errors by period
         period_errors = [e for e in errors if e["timestamp"] >= start_ts]
 
-        # Calculate total events (games * avg rounds as rough estimate)
-        total_events = sum(g.get("rounds_played", 10) for g in games)
-
         error_count = len(period_errors)
         error_rate = error_count / total_events if total_events > 0 else 0
 
@@ -833,20 +1018,18 @@ class AnalyticsStorage:
         current_start = now - (days * 86400)
         previous_start = current_start - (days * 86400)
 
-        # Get games for current and previous periods
-        current_games = self.get_games(start_date=current_start, end_date=now)
-        previous_games = self.get_games(
-            start_date=previous_start, end_date=current_start - 1
-        )
+        # Current and previous period totals, read from the day rollups
+        current = self._rollup_range(current_start, now)
+        previous = self._rollup_range(previous_start, current_start - 1)
 
         # Get errors for current period
         current_errors = self.get_errors(start_date=current_start, end_date=now)
 
         # Compute current period metrics
-        total_games = len(current_games)
-        total_players = sum(g["player_count"] for g in current_games)
-        total_rounds = sum(g["rounds_played"] for g in current_games)
-        total_score = sum(g["average_score"] * g["player_count"] for g in current_games)
+        total_games = current.games
+        total_players = current.players
+        total_rounds = current.rounds
+        total_score = current.score
         total_errors = len(current_errors)
 
         avg_players = total_players / total_games if total_games > 0 else 0
@@ -858,12 +1041,10 @@ class AnalyticsStorage:
         avg_rounds = total_rounds / total_games if total_games > 0 else 0
 
         # Compute previous period metrics for trends
-        prev_total_games = len(previous_games)
-        prev_total_players = sum(g["player_count"] for g in previous_games)
-        prev_total_rounds = sum(g["rounds_played"] for g in previous_games)
-        prev_total_score = sum(
-            g["average_score"] * g["player_count"] for g in previous_games
-        )
+        prev_total_games = previous.games
+        prev_total_players = previous.players
+        prev_total_rounds = previous.rounds
+        prev_total_score = previous.score
         prev_errors = self.get_errors(
             start_date=previous_start, end_date=current_start - 1
         )
@@ -891,14 +1072,14 @@ class AnalyticsStorage:
             return (current - previous) / previous
 
         # Compute additional data for dashboard sections
-        playlists = self.compute_playlist_stats(current_games)
-        chart_data = self.compute_games_over_time(current_games, period)
-        error_stats = self.compute_error_stats(
-            current_games, self._data["errors"], period
+        playlists = self._playlist_stats(current.playlists)
+        chart_data = self._games_over_time(current.days, period)
+        error_stats = self._error_stats(
+            current.event_rounds, self._data["errors"], period
         )
 
         # Story 19.8: Calculate peak concurrent players
-        peak_players = max((g["player_count"] for g in current_games), default=0)
+        peak_players = current.peak_players
 
         result = {
             "period": period,
@@ -909,9 +1090,9 @@ class AnalyticsStorage:
             "peak_players": peak_players,
             "avg_rounds": round(avg_rounds, 1),  # Story 19.9
             # Story 19.11: Include streak stats
-            "streak_stats": self.compute_streak_stats(period, games=current_games),
+            "streak_stats": self._streak_stats(current),
             # Story 19.12: Include bet stats
-            "bet_stats": self.compute_bet_stats(period, games=current_games),
+            "bet_stats": self._bet_stats(current),
             "trends": {
                 "games": round(calc_trend(total_games, prev_total_games), 2),
                 "players": round(calc_trend(avg_players, prev_avg_players), 2),
@@ -944,20 +1125,26 @@ class AnalyticsStorage:
             Dict with streak counts and distribution
 
         """
-        if games is None:
-            now = int(time.time())
+        return self._streak_stats(self._period_rollup(period, games))
 
-            # Calculate period boundaries
-            days = PERIOD_DAYS_MAP.get(period, 30)
-            start_ts = now - (days * 86400)
+    def _period_rollup(self, period: str, games: list | None) -> _Rollup:
+        """Counters over ``games``, or over the period's games when None."""
+        if games is not None:
+            return _Rollup.of(games)
+        now = int(time.time())
 
-            # Get games for current period
-            games = self.get_games(start_date=start_ts, end_date=now)
+        # Calculate period boundaries
+        days = PERIOD_DAYS_MAP.get(period, 30)
+        start_ts = now - (days * 86400)
 
-        # Sum streak achievements across all games
-        streak_3_total = sum(g.get("streak_3_count", 0) for g in games)
-        streak_5_total = sum(g.get("streak_5_count", 0) for g in games)
-        streak_10_total = sum(g.get("streak_10_count", 0) for g in games)
+        return self._rollup_range(start_ts, now)
+
+    @staticmethod
+    def _streak_stats(rollup: _Rollup) -> dict[str, Any]:
+        """Streak achievement totals (Story 19.11)."""
+        streak_3_total = rollup.streak_3
+        streak_5_total = rollup.streak_5
+        streak_10_total = rollup.streak_10
 
         total_streaks = streak_3_total + streak_5_total + streak_10_total
 
@@ -983,19 +1170,13 @@ class AnalyticsStorage:
             Dict with bet counts and win rate
 
         """
-        if games is None:
-            now = int(time.time())
-
-            # Calculate period boundaries
-            days = PERIOD_DAYS_MAP.get(period, 30)
-            start_ts = now - (days * 86400)
-
-            # Get games for current period
-            games = self.get_games(start_date=start_ts, end_date=now)
+        return self._bet_stats(self._period_rollup(period, games))
 
-        # Sum bet outcomes across all games
-        total_bets = sum(g.get("total_bets", 0) for g in games)
-        bets_won = sum(g.get("bets_won", 0) for g in games)
+    @staticmethod
+    def _bet_stats(rollup: _Rollup) -> dict[str, Any]:
+        """Bet totals and win rate (Story 19.12)."""
+        total_bets = rollup.bets
+        bets_won = rollup.bets_won
 
         # Calculate win rate (avoid division by zero)
         win_rate = (bets_won / total_bets * 100) if total_bets > 0 else 0.0
@@ -18,7 +18,7 @@ from custom_components.beatify.game.text_match import (
     STATUS_EXACT,
     STATUS_FUZZY,
     STATUS_NEAR_MISS,
-    classify_field,
+    FieldMatcher,
 )
 
 # Status stored on a near-miss field once a community vote / host override
@@ -136,6 +136,8 @@ class TitleArtistChallenge:
     classification (exact/fuzzy/near_miss/skipped, and later
     near_miss_accepted once resolved). ``votes`` and ``overrides`` are the
     per-near-miss aggregation state (wired to WS handlers in Phase 4).
+    The truths are normalized once into ``FieldMatcher``s that every guess of
+    the round is classified with.
     """
 
     correct_title: str
@@ -148,6 +150,13 @@ class TitleArtistChallenge:
     # nearmiss_id ("player:field") -> host accept_bool
     overrides: dict[str, bool] = field(default_factory=dict)
     resolved: bool = False
+    title_matcher: FieldMatcher = field(init=False, repr=False, compare=False)
+    artist_matcher: FieldMatcher = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Prepare the per-round truth matchers."""
+        self.title_matcher = FieldMatcher(self.correct_title)
+        self.artist_matcher = FieldMatcher(self.correct_artist)
 
 
 # ------------------------------------------------------------------
@@ -610,10 +619,8 @@ class ChallengeManager:
         if not self.title_artist_challenge:
             raise ValueError("No title/artist challenge active")
 
-        title_status = classify_field(title, self.title_artist_challenge.correct_title)
-        artist_status = classify_field(
-            artist, self.title_artist_challenge.correct_artist
-        )
+        title_status = self.title_artist_challenge.title_matcher.classify(title)
+        artist_status = self.title_artist_challenge.artist_matcher.classify(artist)
 
         self.title_artist_challenge.guesses[player_name] = {
             "title": title,
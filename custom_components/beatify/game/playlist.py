@@ -1,4 +1,4 @@
-"""Playlist discovery and validation for Beatify."""
+"""Playlist loading and song selection for Beatify."""
 
 from __future__ import annotations
 
@@ -6,7 +6,7 @@ import asyncio
 import json
 import logging
 import random
-import re
+from array import array
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -19,31 +19,14 @@ from custom_components.beatify.const import (
     PROVIDER_SPOTIFY,
     PROVIDER_TIDAL,
     PROVIDER_YOUTUBE_MUSIC,
-    URI_PATTERN_APPLE_MUSIC,
-    URI_PATTERN_DEEZER,
-    URI_PATTERN_SPOTIFY,
-    URI_PATTERN_TIDAL,
-    URI_PATTERN_YOUTUBE_MUSIC,
 )
+from custom_components.beatify.game.playlist_validation import validate_playlist
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
 
 _LOGGER = logging.getLogger(__name__)
 
-_URI_FIELDS = [
-    ("uri", URI_PATTERN_SPOTIFY, "spotify:track:{22-char-id}"),
-    ("uri_spotify", URI_PATTERN_SPOTIFY, "spotify:track:{22-char-id}"),
-    ("uri_apple_music", URI_PATTERN_APPLE_MUSIC, "applemusic://track/id"),
-    (
-        "uri_youtube_music",
-        URI_PATTERN_YOUTUBE_MUSIC,
-        "https://music.youtube.com/watch?v=...",
-    ),
-    ("uri_tidal", URI_PATTERN_TIDAL, "tidal://track/{id}"),
-    ("uri_deezer", URI_PATTERN_DEEZER, "deezer://track/{id}"),
-]
-
 
 class PlaylistManager:
     """Manages song selection and played tracking.
@@ -52,6 +35,11 @@ class PlaylistManager:
     picks a random playlist first (equal weight), then a random unplayed
     song from that playlist. This ensures equal representation regardless
     of playlist size. Cross-playlist duplicates are deduplicated by URI.
+
+    Songs are kept as a table of rows (the loaded song dicts, not copies)
+    with their resolved URIs computed once. Each playlist owns a pool of
+    unplayed row ids that ``mark_played`` shrinks by swap-remove, so picking
+    and marking are O(1) instead of re-filtering every song on each round.
     """
 
     def __init__(
@@ -103,9 +91,21 @@ class PlaylistManager:
             source = song.get("_playlist_source", "__default__")
             buckets.setdefault(source, []).append(song)
 
-        self._buckets = buckets
-        self._songs = [s for bucket in buckets.values() for s in bucket]
+        # Song table: row -> song dict / resolved URI, rows grouped by playlist.
+        self._rows: list[dict[str, Any]] = []
+        self._uris: list[str] = []
+        self._bucket_rows: list[range] = []
+        self._bucket_of = array("l")
+        for index, bucket in enumerate(buckets.values()):
+            start = len(self._rows)
+            for song in bucket:
+                self._rows.append(song)
+                self._uris.append(get_song_uri(song, provider, storefront))
+                self._bucket_of.append(index)
+            self._bucket_rows.append(range(start, len(self._rows)))
+        self._row_of_uri = {uri: row for row, uri in enumerate(self._uris)}
         self._multi_playlist = len(buckets) > 1
+        self._reset_pools()
 
         deduped = sum(len(v) for v in buckets.values())
         _LOGGER.info(
@@ -125,6 +125,17 @@ class PlaylistManager:
                 storefront,
             )
 
+    def _reset_pools(self) -> None:
+        """Put every row back into its playlist's unplayed pool."""
+        # _pools[b]: unplayed rows of playlist b; _pos[row]: index in its pool.
+        self._pools: list[array] = [array("l", rows) for rows in self._bucket_rows]
+        self._pos = array("l", [0]) * len(self._rows)
+        for pool in self._pools:
+            for index, row in enumerate(pool):
+                self._pos[row] = index
+        # Playlists with unplayed songs left (balanced mode picks among these).
+        self._active = [b for b, pool in enumerate(self._pools) if pool]
+
     def get_next_song(self) -> dict[str, Any] | None:
         """Get random unplayed song with balanced playlist selection.
 
@@ -132,47 +143,13 @@ class PlaylistManager:
             Song dict with _resolved_uri added, or None if all songs played
 
         """
-        if not self._multi_playlist:
-            return self._pick_from_pool(self._songs)
-
-        # Balanced: pick a random non-exhausted playlist, then a song
-        active_buckets = {
-            k: [
-                s
-                for s in v
-                if get_song_uri(s, self._provider, self._storefront)
-                not in self._played_uris
-            ]
-            for k, v in self._buckets.items()
-        }
-        active_buckets = {k: v for k, v in active_buckets.items() if v}
-
-        if not active_buckets:
-            return None
-
-        chosen_key = random.choice(list(active_buckets.keys()))  # noqa: S311
-        song = random.choice(active_buckets[chosen_key])  # noqa: S311
-        song_copy = song.copy()
-        song_copy["_resolved_uri"] = get_song_uri(
-            song, self._provider, self._storefront
-        )
-        return song_copy
-
-    def _pick_from_pool(self, pool: list[dict[str, Any]]) -> dict[str, Any] | None:
-        """Pick a random unplayed song from a flat pool."""
-        available = [
-            s
-            for s in pool
-            if get_song_uri(s, self._provider, self._storefront)
-            not in self._played_uris
-        ]
-        if not available:
+        if not self._active:
             return None
-        song = random.choice(available)  # noqa: S311
-        song_copy = song.copy()
-        song_copy["_resolved_uri"] = get_song_uri(
-            song, self._provider, self._storefront
-        )
+        # Balanced: pick a random non-exhausted playlist, then a song
+        pool = self._pools[random.choice(self._active)]  # noqa: S311
+        row = pool[random.randrange(len(pool))]  # noqa: S311
+        song_copy = self._rows[row].copy()
+        song_copy["_resolved_uri"] = self._uris[row]
         return song_copy
 
     def mark_played(self, uri: str) -> None:
@@ -182,11 +159,26 @@ class PlaylistManager:
             uri: Song URI to mark as played
 
         """
+        if uri in self._played_uris:
+            return
         self._played_uris.add(uri)
+        row = self._row_of_uri.get(uri)
+        if row is None:
+            return
+        bucket = self._bucket_of[row]
+        pool = self._pools[bucket]
+        index = self._pos[row]
+        last = pool.pop()
+        if last != row:
+            pool[index] = last
+            self._pos[last] = index
+        if not pool:
+            self._active.remove(bucket)
 
     def reset(self) -> None:
         """Reset played tracking for new game."""
         self._played_uris.clear()
+        self._reset_pools()
 
     def get_remaining_count(self) -> int:
         """Get count of unplayed songs.
@@ -197,11 +189,11 @@ class PlaylistManager:
         """
         # #707: mark_played() accepts any URI (incl. unknown ones), so naive
         # subtraction can go negative. Clamp at 0.
-        return max(0, len(self._songs) - len(self._played_uris))
+        return max(0, len(self._rows) - len(self._played_uris))
 
     def has_playable_songs(self) -> bool:
         """True if this manager has any songs for its provider (#709)."""
-        return len(self._songs) > 0
+        return len(self._rows) > 0
 
     def get_total_count(self) -> int:
         """Get total song count.
@@ -210,21 +202,7 @@ class PlaylistManager:
             Total number of songs in playlist
 
         """
-        return len(self._songs)
-
-
-# Validation constants
-MIN_YEAR = 1900
-
-
-def _max_year() -> int:
-    """Dynamic upper bound — current year + 1 (#706).
-
-    The previous hardcoded 2030 would silently reject newer songs.
-    """
-    from datetime import datetime, timezone
-
-    return datetime.now(timezone.utc).year + 1
+        return len(self._rows)
 
 
 def get_playlist_directory(hass: HomeAssistant) -> Path:
@@ -353,85 +331,6 @@ async def _copy_bundled_playlists(dest_dir: Path) -> None:
             )
 
 
-def validate_playlist(data: dict[str, Any]) -> tuple[bool, list[str]]:
-    """Validate playlist structure. Returns (is_valid, list_of_errors)."""
-    errors: list[str] = []
-    max_year = _max_year()
-
-    # Check required top-level fields
-    if not isinstance(data.get("name"), str) or not data["name"].strip():
-        errors.append("Missing or empty 'name' field")
-
-    songs = data.get("songs")
-    if not isinstance(songs, list):
-        errors.append("Missing or invalid 'songs' array")
-        return (False, errors)
-
-    if len(songs) == 0:
-        errors.append("Playlist has no songs")
-
-    # Validate each song
-    for i, song in enumerate(songs):
-        if not isinstance(song, dict):
-            errors.append(f"Song {i + 1}: not a valid object")
-            continue
-
-        # #697: title and artist are required for gameplay (challenge + reveal).
-        title = song.get("title")
-        if not isinstance(title, str) or not title.strip():
-            errors.append(f"Song {i + 1}: missing or empty 'title'")
-        artist = song.get("artist")
-        if not isinstance(artist, str) or not artist.strip():
-            errors.append(f"Song {i + 1}: missing or empty 'artist'")
-
-        # Check year
-        year = song.get("year")
-        if not isinstance(year, int):
-            errors.append(f"Song {i + 1}: missing or invalid 'year' (must be integer)")
-        elif not (MIN_YEAR <= year <= max_year):
-            errors.append(f"Song {i + 1}: year {year} out of range")
-
-        # Check URIs - validate patterns and ensure at least one valid URI exists
-        has_valid_uri = False
-        for field, pattern, expected in _URI_FIELDS:
-            value = song.get(field)
-            if isinstance(value, str) and value.strip():
-                if re.match(pattern, value):
-                    has_valid_uri = True
-                else:
-                    errors.append(
-                        f"Song {i + 1}: '{field}' invalid (expected {expected})"
-                    )
-
-        # Error if no valid URI found
-        if not has_valid_uri:
-            errors.append(f"Song {i + 1}: no valid URI")
-
-        # Story 20.2: Validate alt_artists if present (optional field)
-        alt_artists = song.get("alt_artists")
-        if alt_artists is not None:
-            if not isinstance(alt_artists, list):
-                errors.append(f"Song {i + 1}: 'alt_artists' must be an array")
-            else:
-                for j, alt in enumerate(alt_artists):
-                    if not isinstance(alt, str) or not alt.strip():
-                        errors.append(
-                            f"Song {i + 1}: 'alt_artists[{j}]' must be non-empty string"
-                        )
-                # Log warning if fewer than 2 alternatives (weak challenge)
-                valid_alts = [
-                    a for a in alt_artists if isinstance(a, str) and a.strip()
-                ]
-                if len(valid_alts) < 2:
-                    _LOGGER.debug(
-                        "Song %d has only %d alt_artists (2 recommended)",
-                        i + 1,
-                        len(valid_alts),
-                    )
-
-    return (len(errors) == 0, errors)
-
-
 def get_song_uri(
     song: dict[str, Any],
     provider: str,
@@ -545,139 +444,6 @@ def filter_songs_for_provider(
     return (filtered, skipped)
 
 
-async def async_discover_playlists(hass: HomeAssistant) -> list[dict]:
-    """Discover all playlist files in the playlist directory."""
-    playlist_dir = get_playlist_directory(hass)
-    playlists: list[dict] = []
-
-    loop = asyncio.get_running_loop()
-
-    # #1402 B3: `exists()` is a blocking syscall — run it in the executor.
-    if not await loop.run_in_executor(None, playlist_dir.exists):
-        _LOGGER.debug("Playlist directory does not exist: %s", playlist_dir)
-        return playlists
-
-    def _read_file(path: Path) -> str:
-        """Read file contents (runs in executor)."""
-        return path.read_text(encoding="utf-8")
-
-    # Offload blocking glob to executor to avoid scandir in event loop (#516)
-    json_files = await loop.run_in_executor(
-        None, lambda: list(playlist_dir.glob("**/*.json"))
-    )
-    for json_file in json_files:
-        try:
-            rel = json_file.relative_to(playlist_dir)
-            source = (
-                "community"
-                if rel.parts and rel.parts[0] in ("community", "user")
-                else "bundled"
-            )
-            content = await loop.run_in_executor(None, _read_file, json_file)
-            data = json.loads(content)
-            is_valid, errors = validate_playlist(data)
-
-            # Count songs per provider (Story 17.1), validating URI patterns (#708).
-            songs = data.get("songs", [])
-
-            def _count(field: str, pattern: str) -> int:
-                n = 0
-                for s in songs:
-                    v = s.get(field)
-                    if isinstance(v, str) and v and re.match(pattern, v):
-                        n += 1
-                return n
-
-            spotify_count = sum(
-                1
-                for s in songs
-                if (
-                    (
-                        isinstance(s.get("uri_spotify"), str)
-                        and re.match(URI_PATTERN_SPOTIFY, s["uri_spotify"])
-                    )
-                    or (
-                        isinstance(s.get("uri"), str)
-                        and re.match(URI_PATTERN_SPOTIFY, s["uri"])
-                    )
-                )
-            )
-            apple_music_count = _count("uri_apple_music", URI_PATTERN_APPLE_MUSIC)
-            youtube_music_count = _count("uri_youtube_music", URI_PATTERN_YOUTUBE_MUSIC)
-            tidal_count = _count("uri_tidal", URI_PATTERN_TIDAL)
-            deezer_count = _count("uri_deezer", URI_PATTERN_DEEZER)
-            # Amazon Music uses Alexa text search — every song in the playlist is
-            # playable, so the count always equals the total song count.
-            amazon_music_count = len(songs)
-
-            # #716: skip playlists with no songs entirely — they only confuse the UI.
-            if not is_valid and len(songs) == 0:
-                _LOGGER.debug(
-                    "Skipping empty playlist from discovery: %s", json_file.name
-                )
-                continue
-
-            playlists.append(
-                {
-                    "path": str(json_file),
-                    "filename": json_file.name,
-                    "name": data.get("name", json_file.stem),
-                    "source": source,
-                    "author": data.get("author"),
-                    "description": data.get("description"),
-                    "language": data.get("language"),
-                    "added_date": data.get("added_date"),
-                    "version": data.get("version"),
-                    "tags": data.get("tags", []),  # Issue #70: Tag-based filtering
-                    "song_count": len(songs),
-                    "spotify_count": spotify_count,
-                    "apple_music_count": apple_music_count,
-                    "youtube_music_count": youtube_music_count,
-                    "tidal_count": tidal_count,
-                    "deezer_count": deezer_count,
-                    "amazon_music_count": amazon_music_count,
-                    "is_valid": is_valid,
-                    "errors": errors,
-                }
-            )
-        except json.JSONDecodeError as e:
-            try:
-                rel = json_file.relative_to(playlist_dir)
-                source = (
-                    "community"
-                    if rel.parts and rel.parts[0] in ("community", "user")
-                    else "bundled"
-                )
-            except ValueError:
-                source = "bundled"
-            playlists.append(
-                {
-                    "path": str(json_file),
-                    "filename": json_file.name,
-                    "name": json_file.stem,
-                    "source": source,
-                    "author": None,
-                    "description": None,
-                    "language": None,
-                    "added_date": None,
-                    "version": None,
-                    "tags": [],  # Issue #70
-                    "song_count": 0,
-                    "spotify_count": 0,
-                    "apple_music_count": 0,
-                    "youtube_music_count": 0,
-                    "tidal_count": 0,
-                    "deezer_count": 0,
-                    "amazon_music_count": 0,
-                    "is_valid": False,
-                    "errors": [f"Invalid JSON: {e}"],
-                }
-            )
-
-    _LOGGER.debug("Found %d playlists", len(playlists))
-    return playlists
-
-
 async def async_load_and_validate_playlist(
     path: str | Path,
 ) -> tuple[dict | None, list[str]]:
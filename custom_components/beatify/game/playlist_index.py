@@ -0,0 +1,320 @@
+"""Persistent catalog index of the playlist directory.
+
+Discovery runs on every admin page load and status poll (Issue #135), and
+used to read, parse and validate every playlist file each time, the bundled
+set alone being ~9 MB of JSON. The catalog keeps what discovery reports per
+file (validation result, per-provider song counts, decade histogram, display
+metadata) in ``<config>/beatify/playlist_index.json``, keyed by the path
+relative to the playlist directory and checked against the file's mtime and
+size. A refresh then costs one directory walk plus a ``stat`` per file; only
+new or changed files are parsed, and entries of deleted files are dropped.
+
+The stored results are only as current as the rules that produced them, so
+the index also records ``RULES_VERSION`` and the validation year bound
+(``validate_playlist`` accepts years up to next year, #706) and is rebuilt
+when either moves. Entries handed out are copies; callers may modify them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from custom_components.beatify.const import (
+    DOMAIN,
+    URI_PATTERN_APPLE_MUSIC,
+    URI_PATTERN_DEEZER,
+    URI_PATTERN_SPOTIFY,
+    URI_PATTERN_TIDAL,
+    URI_PATTERN_YOUTUBE_MUSIC,
+)
+from custom_components.beatify.game.playlist import get_playlist_directory
+from custom_components.beatify.game.playlist_validation import (
+    RULES_VERSION,
+    max_year,
+    validate_playlist,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+INDEX_FILE = "beatify/playlist_index.json"
+
+# hass.data key outside DOMAIN (like _ROUTES_REGISTERED in __init__), so the
+# in-memory catalog survives a config-entry reload.
+_CATALOG_KEY = f"{DOMAIN}_playlist_catalog"
+
+
+def _source_for(rel: Path) -> str:
+    return "community" if rel.parts and rel.parts[0] in ("community", "user") else "bundled"
+
+
+def _decade_histogram(songs: list[Any]) -> dict[str, int]:
+    """Song count per decade (``"1980": 12``) over songs with an integer year."""
+    decades: dict[str, int] = {}
+    for song in songs:
+        year = song.get("year") if isinstance(song, dict) else None
+        if isinstance(year, int) and not isinstance(year, bool):
+            key = str(year - year % 10)
+            decades[key] = decades.get(key, 0) + 1
+    return dict(sorted(decades.items()))
+
+
+def summarize_playlist(path: Path, rel: Path) -> dict[str, Any] | None:
+    """
+    Parse one playlist file into its discovery entry (runs in executor).
+
+    Args:
+        path: Playlist file
+        rel: Path relative to the playlist directory
+
+    Returns:
+        Discovery entry without ``path``, or None for an invalid playlist
+        without songs (#716: those only confuse the UI)
+
+    """
+    source = _source_for(rel)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        return {
+            "filename": path.name,
+            "name": path.stem,
+            "source": source,
+            "author": None,
+            "description": None,
+            "language": None,
+            "added_date": None,
+            "version": None,
+            "tags": [],  # Issue #70
+            "song_count": 0,
+            "spotify_count": 0,
+            "apple_music_count": 0,
+            "youtube_music_count": 0,
+            "tidal_count": 0,
+            "deezer_count": 0,
+            "amazon_music_count": 0,
+            "decades": {},
+            "is_valid": False,
+            "errors": [f"Invalid JSON: {e}"],
+        }
+
+    is_valid, errors = validate_playlist(data)
+
+    # Count songs per provider (Story 17.1), validating URI patterns (#708).
+    songs = data.get("songs", [])
+
+    def _count(field: str, pattern: str) -> int:
+        n = 0
+        for s in songs:
+            v = s.get(field)
+            if isinstance(v, str) and v and re.match(pattern, v):
+                n += 1
+        return n
+
+    spotify_count = sum(
+        1
+        for s in songs
+        if (
+            (
+                isinstance(s.get("uri_spotify"), str)
+                and re.match(URI_PATTERN_SPOTIFY, s["uri_spotify"])
+            )
+            or (isinstance(s.get("uri"), str) and re.match(URI_PATTERN_SPOTIFY, s["uri"]))
+        )
+    )
+
+    if not is_valid and len(songs) == 0:
+        return None
+
+    return {
+        "filename": path.name,
+        "name": data.get("name", path.stem),
+        "source": source,
+        "author": data.get("author"),
+        "description": data.get("description"),
+        "language": data.get("language"),
+        "added_date": data.get("added_date"),
+        "version": data.get("version"),
+        "tags": data.get("tags", []),  # Issue #70: Tag-based filtering
+        "song_count": len(songs),
+        "spotify_count": spotify_count,
+        "apple_music_count": _count("uri_apple_music", URI_PATTERN_APPLE_MUSIC),
+        "youtube_music_count": _count("uri_youtube_music", URI_PATTERN_YOUTUBE_MUSIC),
+        "tidal_count": _count("uri_tidal", URI_PATTERN_TIDAL),
+        "deezer_count": _count("uri_deezer", URI_PATTERN_DEEZER),
+        # Amazon Music uses Alexa text search — every song in the playlist is
+        # playable, so the count always equals the total song count.
+        "amazon_music_count": len(songs),
+        "decades": _decade_histogram(songs),
+        "is_valid": is_valid,
+        "errors": errors,
+    }
+
+
+def _public_entry(path: Path, entry: dict[str, Any]) -> dict[str, Any]:
+    """Discovery entry for a caller, not sharing the index's lists and dicts."""
+    return {"path": str(path), **copy.deepcopy(entry)}
+
+
+class PlaylistCatalog:
+    """Discovery results of one playlist directory, refreshed by mtime/size."""
+
+    def __init__(self, playlist_dir: Path, index_path: Path) -> None:
+        """
+        Initialize catalog.
+
+        Args:
+            playlist_dir: Directory scanned for ``**/*.json`` playlists
+            index_path: JSON file the index is persisted to
+
+        """
+        self._playlist_dir = playlist_dir
+        self._index_path = index_path
+        # rel posix path -> {"mtime_ns", "size", "entry": dict | None}
+        self._files: dict[str, dict[str, Any]] | None = None
+        self._max_year: int | None = None
+        self._lock = asyncio.Lock()
+
+    async def async_refresh(self, hass: HomeAssistant) -> list[dict]:
+        """
+        Bring the index up to date and return the discovered playlists.
+
+        Args:
+            hass: Home Assistant instance
+
+        Returns:
+            Discovery entries in directory order
+
+        """
+        # One refresh at a time: concurrent status polls reuse its result
+        # instead of parsing the same changed files twice.
+        async with self._lock:
+            return await hass.async_add_executor_job(self._refresh)
+
+    def _refresh(self) -> list[dict]:
+        """Stat the directory, re-parse changed files and persist (executor)."""
+        if self._files is None:
+            self._load()
+        files = self._files if self._files is not None else {}
+        year_bound = max_year()
+        if self._max_year != year_bound:
+            files.clear()
+            self._max_year = year_bound
+
+        if not self._playlist_dir.exists():
+            _LOGGER.debug("Playlist directory does not exist: %s", self._playlist_dir)
+            return []
+
+        changed = False
+        seen: set[str] = set()
+        playlists: list[dict] = []
+        parsed = 0
+        for json_file in self._playlist_dir.glob("**/*.json"):
+            rel = json_file.relative_to(self._playlist_dir)
+            key = rel.as_posix()
+            try:
+                st = json_file.stat()
+            except OSError:
+                continue
+            seen.add(key)
+            cached = files.get(key)
+            if (
+                cached is None
+                or cached.get("mtime_ns") != st.st_mtime_ns
+                or cached.get("size") != st.st_size
+            ):
+                cached = {
+                    "mtime_ns": st.st_mtime_ns,
+                    "size": st.st_size,
+                    "entry": summarize_playlist(json_file, rel),
+                }
+                files[key] = cached
+                changed = True
+                parsed += 1
+            entry = cached.get("entry")
+            if entry is None:
+                _LOGGER.debug("Skipping empty playlist from discovery: %s", json_file.name)
+                continue
+            playlists.append(_public_entry(json_file, entry))
+
+        for key in [k for k in files if k not in seen]:
+            del files[key]
+            changed = True
+
+        self._files = files
+        if changed:
+            self._save()
+        _LOGGER.debug(
+            "Found %d playlists (%d files parsed, %d from index)",
+            len(playlists),
+            parsed,
+            len(seen) - parsed,
+        )
+        return playlists
+
+    def _load(self) -> None:
+        """Read the persisted index; a missing or stale one starts empty."""
+        self._files = {}
+        try:
+            data = json.loads(self._index_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Playlist index unreadable, rebuilding: %s", err)
+            return
+        if (
+            isinstance(data, dict)
+            and data.get("version") == INDEX_VERSION
+            and data.get("rules_version") == RULES_VERSION
+            and data.get("playlist_dir") == str(self._playlist_dir)
+            and isinstance(data.get("files"), dict)
+        ):
+            self._files = data["files"]
+            self._max_year = data.get("max_year")
+
+    def _save(self) -> None:
+        """Persist the index with the temp-file + os.replace pattern (#1386)."""
+        payload = {
+            "version": INDEX_VERSION,
+            "rules_version": RULES_VERSION,
+            "playlist_dir": str(self._playlist_dir),
+            "max_year": self._max_year,
+            "files": self._files,
+        }
+        temp_path = self._index_path.with_suffix(".json.tmp")
+        try:
+            self._index_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(temp_path, self._index_path)
+        except OSError as err:
+            # The in-memory index still serves this run.
+            _LOGGER.warning("Failed to save playlist index: %s", err)
+
+
+def get_playlist_catalog(hass: HomeAssistant) -> PlaylistCatalog:
+    """Return the catalog of the configured playlist directory."""
+    playlist_dir = get_playlist_directory(hass)
+    catalog = hass.data.get(_CATALOG_KEY)
+    if catalog is None or catalog._playlist_dir != playlist_dir:
+        catalog = PlaylistCatalog(playlist_dir, Path(hass.config.path(INDEX_FILE)))
+        hass.data[_CATALOG_KEY] = catalog
+    return catalog
+
+
+async def async_discover_playlists(hass: HomeAssistant) -> list[dict]:
+    """Discover all playlist files in the playlist directory.
+
+    Served from the persistent catalog index: only files added or changed
+    since the last call are read and validated.
+    """
+    return await get_playlist_catalog(hass).async_refresh(hass)
@@ -0,0 +1,126 @@
+"""Playlist validation rules shared by loading and the discovery catalog."""
+
+from __future__ import annotations
+
+import logging
+import re
+from datetime import datetime, timezone
+from typing import Any
+
+from custom_components.beatify.const import (
+    URI_PATTERN_APPLE_MUSIC,
+    URI_PATTERN_DEEZER,
+    URI_PATTERN_SPOTIFY,
+    URI_PATTERN_TIDAL,
+    URI_PATTERN_YOUTUBE_MUSIC,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bump whenever a change here (or to the URI patterns in const) can change the
+# verdict for an unchanged file: the persisted playlist index stores results
+# keyed on this and is rebuilt when it differs.
+RULES_VERSION = 1
+
+MIN_YEAR = 1900
+
+# (song field, accepted pattern, example shown in the error message)
+URI_FIELDS = [
+    ("uri", URI_PATTERN_SPOTIFY, "spotify:track:{22-char-id}"),
+    ("uri_spotify", URI_PATTERN_SPOTIFY, "spotify:track:{22-char-id}"),
+    ("uri_apple_music", URI_PATTERN_APPLE_MUSIC, "applemusic://track/id"),
+    (
+        "uri_youtube_music",
+        URI_PATTERN_YOUTUBE_MUSIC,
+        "https://music.youtube.com/watch?v=...",
+    ),
+    ("uri_tidal", URI_PATTERN_TIDAL, "tidal://track/{id}"),
+    ("uri_deezer", URI_PATTERN_DEEZER, "deezer://track/{id}"),
+]
+
+
+def max_year() -> int:
+    """Dynamic upper bound — current year + 1 (#706).
+
+    The previous hardcoded 2030 would silently reject newer songs.
+    """
+    return datetime.now(timezone.utc).year + 1
+
+
+def validate_playlist(data: dict[str, Any]) -> tuple[bool, list[str]]:
+    """Validate playlist structure. Returns (is_valid, list_of_errors)."""
+    errors: list[str] = []
+    upper = max_year()
+
+    # Check required top-level fields
+    if not isinstance(data.get("name"), str) or not data["name"].strip():
+        errors.append("Missing or empty 'name' field")
+
+    songs = data.get("songs")
+    if not isinstance(songs, list):
+        errors.append("Missing or invalid 'songs' array")
+        return (False, errors)
+
+    if len(songs) == 0:
+        errors.append("Playlist has no songs")
+
+    # Validate each song
+    for i, song in enumerate(songs):
+        if not isinstance(song, dict):
+            errors.append(f"Song {i + 1}: not a valid object")
+            continue
+
+        # #697: title and artist are required for gameplay (challenge + reveal).
+        title = song.get("title")
+        if not isinstance(title, str) or not title.strip():
+            errors.append(f"Song {i + 1}: missing or empty 'title'")
+        artist = song.get("artist")
+        if not isinstance(artist, str) or not artist.strip():
+            errors.append(f"Song {i + 1}: missing or empty 'artist'")
+
+        # Check year
+        year = song.get("year")
+        if not isinstance(year, int):
+            errors.append(f"Song {i + 1}: missing or invalid 'year' (must be integer)")
+        elif not (MIN_YEAR <= year <= upper):
+            errors.append(f"Song {i + 1}: year {year} out of range")
+
+        # Check URIs - validate patterns and ensure at least one valid URI exists
+        has_valid_uri = False
+        for field, pattern, expected in URI_FIELDS:
+            value = song.get(field)
+            if isinstance(value, str) and value.strip():
+                if re.match(pattern, value):
+                    has_valid_uri = True
+                else:
+                    errors.append(
+                        f"Song {i + 1}: '{field}' invalid (expected {expected})"
+                    )
+
+        # Error if no valid URI found
+        if not has_valid_uri:
+            errors.append(f"Song {i + 1}: no valid URI")
+
+        # Story 20.2: Validate alt_artists if present (optional field)
+        alt_artists = song.get("alt_artists")
+        if alt_artists is not None:
+            if not isinstance(alt_artists, list):
+                errors.append(f"Song {i + 1}: 'alt_artists' must be an array")
+            else:
+                for j, alt in enumerate(alt_artists):
+                    if not isinstance(alt, str) or not alt.strip():
+                        errors.append(
+                            f"Song {i + 1}: 'alt_artists[{j}]' must be non-empty string"
+                        )
+                # Log warning if fewer than 2 alternatives (weak challenge)
+                valid_alts = [
+                    a for a in alt_artists if isinstance(a, str) and a.strip()
+                ]
+                if len(valid_alts) < 2:
+                    _LOGGER.debug(
+                        "Song %d has only %d alt_artists (2 recommended)",
+                        i + 1,
+                        len(valid_alts),
+                    )
+
+    return (len(errors) == 0, errors)
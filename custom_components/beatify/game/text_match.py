@@ -4,12 +4,20 @@ This module is intentionally pure and dependency-free: it imports only the
 standard library and the project's tuning constants. It backs per-field
 classification (title and artist are matched independently) used by the game
 challenge, scoring, and serializer layers in later phases.
+
+Edit distances use Myers' bit-parallel algorithm (one pass of integer bit
+operations per guess character, the truth's column packed into a Python int)
+and stop as soon as the distance provably exceeds what classification can
+still use. ``FieldMatcher`` prepares a truth once per round so every player's
+guess reuses its normalization and bit masks.
 """
 
 from __future__ import annotations
 
+import math
 import re
 import unicodedata
+from collections.abc import Iterable
 
 from custom_components.beatify.const import (
     FUZZY_BUDGET_LEN_DIVISOR,
@@ -81,28 +89,67 @@ def normalize(text: str) -> str:
     return result
 
 
-def levenshtein(a: str, b: str) -> int:
-    """Return the Levenshtein edit distance between ``a`` and ``b``.
+def _char_masks(pattern: str) -> dict[str, int]:
+    """Bit mask per character: bit ``i`` set where ``pattern[i]`` is that char."""
+    masks: dict[str, int] = {}
+    for i, ch in enumerate(pattern):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    return masks
+
+
+def _myers_distance(
+    masks: dict[str, int], m: int, text: str, max_dist: int
+) -> int:
+    """Myers/Hyyrö bit-parallel edit distance of a prepared pattern to ``text``.
 
-    Pure two-row dynamic-programming implementation; no dependencies.
+    ``masks`` / ``m`` come from ``_char_masks`` of a non-empty pattern. Returns
+    the distance if it is at most ``max_dist``, otherwise ``max_dist + 1``.
+    """
+    n = len(text)
+    if abs(m - n) > max_dist:
+        return max_dist + 1
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv = full
+    mv = 0
+    score = m
+    for j, ch in enumerate(text, start=1):
+        eq = masks.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        # The remaining n - j characters can lower the distance by at most one
+        # each.
+        if score - (n - j) > max_dist:
+            return max_dist + 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return score if score <= max_dist else max_dist + 1
+
+
+def bounded_levenshtein(a: str, b: str, max_dist: int) -> int:
+    """Levenshtein distance between ``a`` and ``b``, capped at ``max_dist + 1``.
+
+    Exact whenever the distance is at most ``max_dist``; any larger distance is
+    reported as ``max_dist + 1`` without finishing the computation.
     """
     if a == b:
         return 0
-    if not a:
-        return len(b)
-    if not b:
-        return len(a)
-
-    previous = list(range(len(b) + 1))
-    for i, ca in enumerate(a, start=1):
-        current = [i]
-        for j, cb in enumerate(b, start=1):
-            insert_cost = current[j - 1] + 1
-            delete_cost = previous[j] + 1
-            substitute_cost = previous[j - 1] + (0 if ca == cb else 1)
-            current.append(min(insert_cost, delete_cost, substitute_cost))
-        previous = current
-    return previous[-1]
+    if not a or not b:
+        return min(len(a) + len(b), max_dist + 1)
+    return _myers_distance(_char_masks(a), len(a), b, max_dist)
+
+
+def levenshtein(a: str, b: str) -> int:
+    """Return the Levenshtein edit distance between ``a`` and ``b``."""
+    return bounded_levenshtein(a, b, max(len(a), len(b)))
 
 
 def fuzzy_budget(truth_len: int) -> int:
@@ -129,6 +176,62 @@ def _shares_significant_token(a: str, b: str) -> bool:
     return bool(a_tokens & b_tokens)
 
 
+class FieldMatcher:
+    """One normalized truth field, prepared for classifying many guesses.
+
+    Built once per round (see ``TitleArtistChallenge``); every guess then pays
+    only for its own normalization and a bounded bit-parallel distance.
+    """
+
+    def __init__(self, truth: str) -> None:
+        """Normalize ``truth`` and precompute its fuzzy budget and bit masks."""
+        self.truth = truth
+        self.truth_norm = normalize(truth)
+        self._budget = fuzzy_budget(len(self.truth_norm))
+        self._masks = _char_masks(self.truth_norm)
+
+    def distance(self, guess_norm: str, max_dist: int) -> int:
+        """Bounded edit distance from a normalized guess to the truth."""
+        if not self.truth_norm or not guess_norm:
+            return min(len(self.truth_norm) + len(guess_norm), max_dist + 1)
+        return _myers_distance(self._masks, len(self.truth_norm), guess_norm, max_dist)
+
+    def classify(self, guess: str) -> str:
+        """Classify a single guess; see ``classify_field``."""
+        if not guess or not guess.strip():
+            return STATUS_SKIPPED
+
+        # Defensive length cap (#1362): the WS ingest handler already truncates,
+        # but bound here too so any direct caller cannot feed an unbounded
+        # string into the distance computation and freeze the HA event loop.
+        guess = guess[:MAX_GUESS_LEN]
+
+        guess_norm = normalize(guess)
+        truth_norm = self.truth_norm
+
+        if guess_norm == truth_norm:
+            return STATUS_EXACT
+
+        # Only distances up to the larger of the fuzzy budget and the
+        # near-miss ratio matter; anything further is classified the same.
+        longest = max(len(guess_norm), len(truth_norm), 1)
+        cap = max(self._budget, math.floor(NEAR_MISS_MAX_RATIO * longest) + 1)
+        dist = self.distance(guess_norm, cap)
+        if dist <= self._budget:
+            return STATUS_FUZZY
+
+        if dist / longest <= NEAR_MISS_MAX_RATIO or _shares_significant_token(
+            guess_norm, truth_norm
+        ):
+            return STATUS_NEAR_MISS
+
+        return STATUS_WRONG
+
+    def classify_many(self, guesses: Iterable[str]) -> list[str]:
+        """Classify a batch of guesses against this truth, in order."""
+        return [self.classify(guess) for guess in guesses]
+
+
 def classify_field(guess: str, truth: str) -> str:
     """Classify a single field guess against the truth.
 
@@ -142,28 +245,4 @@ def classify_field(guess: str, truth: str) -> str:
     with it. A guess that is neither (e.g. "Beatles" for "Queen") is just
     ``STATUS_WRONG``: no vote, no points.
     """
-    if not guess or not guess.strip():
-        return STATUS_SKIPPED
-
-    # Defensive length cap (#1362): the WS ingest handler already truncates, but
-    # bound here too so any direct caller cannot drive the O(n*m) Levenshtein DP
-    # with an unbounded string and freeze the HA event loop.
-    guess = guess[:MAX_GUESS_LEN]
-
-    guess_norm = normalize(guess)
-    truth_norm = normalize(truth)
-
-    if guess_norm == truth_norm:
-        return STATUS_EXACT
-
-    dist = levenshtein(guess_norm, truth_norm)
-    if dist <= fuzzy_budget(len(truth_norm)):
-        return STATUS_FUZZY
-
-    longest = max(len(guess_norm), len(truth_norm), 1)
-    if dist / longest <= NEAR_MISS_MAX_RATIO or _shares_significant_token(
-        guess_norm, truth_norm
-    ):
-        return STATUS_NEAR_MISS
-
-    return STATUS_WRONG
+    return FieldMatcher(truth).classify(guess)
@@ -0,0 +1,203 @@
+"""Serialize-once WebSocket fan-out with per-socket backpressure.
+
+A broadcast goes to every phone in the room, 20-30 of them in a party game,
+and ``state`` is pushed on every join, submit, timer tick and phase change.
+Sending it with ``ws.send_json`` per connection re-encoded the same dict once
+per player and awaited every socket together, so one phone on bad Wi-Fi held
+up the whole broadcast.
+
+Here a message is encoded once per audience (:func:`encode_frame`) and the
+same bytes are queued on each socket's :class:`SocketOutbox`. Every outbox
+drains on its own task, so a slow reader only backs up its own queue:
+
+* queued frames of the game-state stream (``state``, or the
+  ``state_snapshot`` / ``state_delta`` frames of ``state_sync``) are dropped
+  when a newer full snapshot arrives, since it supersedes them (a backlogged
+  ``state_sync`` socket is sent snapshots rather than deltas for this reason);
+* a single send that stalls for ``SEND_TIMEOUT`` seconds, or a backlog of
+  ``MAX_PENDING`` frames, closes that socket with ``TRY_AGAIN_LATER``; the
+  client's reconnect flow then resyncs it from a fresh ``state``.
+
+Replies to a single socket (acks, errors, its own ``state``) are queued on the
+same outbox (``BeatifyWebSocketHandler.send``), so they can never overtake a
+broadcast that was queued for that socket before them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any
+
+from aiohttp import WSCloseCode, WSMsgType, web
+from homeassistant.helpers.json import json_bytes
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Frame:
+    """One message encoded once for all sockets of an audience."""
+
+    __slots__ = ("data", "stream", "full", "_text")
+
+    def __init__(
+        self, data: bytes, *, stream: str | None = None, full: bool = False
+    ) -> None:
+        """
+        Initialize frame.
+
+        Args:
+            data: UTF-8 JSON text of the message
+            stream: Name of the state stream the frame belongs to, if any
+            full: The frame carries the whole state of its stream, so it
+                replaces frames of that stream still queued
+
+        """
+        self.data = data
+        self.stream = stream
+        self.full = full
+        self._text: str | None = None
+
+    @property
+    def text(self) -> str:
+        """Decoded text, for aiohttp versions without ``send_frame``."""
+        if self._text is None:
+            self._text = self.data.decode("utf-8")
+        return self._text
+
+
+STATE_STREAM = "state"
+
+# Message types of the game-state stream; all but ``state_delta`` carry the
+# complete state.
+_STATE_TYPES = {"state": True, "state_snapshot": True, "state_delta": False}
+
+
+def encode_frame(message: dict[str, Any]) -> Frame:
+    """Encode a broadcast message once."""
+    full = _STATE_TYPES.get(message.get("type"))
+    if full is None:
+        return Frame(json_bytes(message))
+    return Frame(json_bytes(message), stream=STATE_STREAM, full=full)
+
+
+class SocketOutbox:
+    """Ordered queue of frames for one WebSocket, drained by its own task."""
+
+    # Frames queued behind a socket before it is considered stuck.
+    MAX_PENDING = 16
+    # Seconds a single send may wait on the client before the socket is closed.
+    SEND_TIMEOUT = 10.0
+
+    def __init__(self, ws: web.WebSocketResponse) -> None:
+        """
+        Initialize outbox.
+
+        Args:
+            ws: WebSocket connection the frames are written to
+
+        """
+        self.ws = ws
+        self._pending: deque[tuple[Frame, asyncio.Future[None]]] = deque()
+        self._task: asyncio.Task | None = None
+        self._close_task: asyncio.Task | None = None
+        self._abandoned = False
+
+    @property
+    def idle(self) -> bool:
+        """True when nothing is queued or being written."""
+        return self._task is None and not self._pending
+
+    @property
+    def backlogged(self) -> bool:
+        """True when frames are queued behind the one being written."""
+        return bool(self._pending)
+
+    def push(self, frame: Frame) -> asyncio.Future[None]:
+        """
+        Queue a frame.
+
+        Args:
+            frame: Encoded message
+
+        Returns:
+            Future resolved once the frame is written, dropped or failed
+
+        """
+        done: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        if self._abandoned or self.ws.closed:
+            done.set_result(None)
+            return done
+
+        if frame.full and self._pending:
+            kept: deque[tuple[Frame, asyncio.Future[None]]] = deque()
+            for queued, waiter in self._pending:
+                if queued.stream == frame.stream:
+                    if not waiter.done():
+                        waiter.set_result(None)
+                else:
+                    kept.append((queued, waiter))
+            self._pending = kept
+
+        if len(self._pending) >= self.MAX_PENDING:
+            done.set_result(None)
+            self._give_up(f"{len(self._pending)} frames backed up")
+            return done
+
+        self._pending.append((frame, done))
+        if self._task is None:
+            self._task = asyncio.create_task(self._drain())
+        return done
+
+    def abandon(self) -> None:
+        """Drop queued frames and stop draining (socket gone or shutting down)."""
+        self._abandoned = True
+        while self._pending:
+            _frame, waiter = self._pending.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+        task = self._task
+        self._task = None
+        if task is not None and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+
+    async def _drain(self) -> None:
+        try:
+            while self._pending and not self._abandoned:
+                frame, waiter = self._pending.popleft()
+                try:
+                    if not self.ws.closed:
+                        await asyncio.wait_for(self._send(frame), self.SEND_TIMEOUT)
+                except TimeoutError:
+                    # The frame is already in the transport buffer; the client
+                    # is just not reading it.
+                    self._give_up(f"send stalled for {self.SEND_TIMEOUT:.0f}s")
+                except (ConnectionError, RuntimeError) as err:
+                    _LOGGER.warning("Failed to send to WebSocket: %s", err)
+                finally:
+                    if not waiter.done():
+                        waiter.set_result(None)
+        finally:
+            if self._task is asyncio.current_task():
+                self._task = None
+
+    async def _send(self, frame: Frame) -> None:
+        send_frame = getattr(self.ws, "send_frame", None)
+        if send_frame is not None:
+            await send_frame(frame.data, WSMsgType.TEXT)
+        else:
+            await self.ws.send_str(frame.text)
+
+    def _give_up(self, reason: str) -> None:
+        """Close a socket that cannot keep up; its client reconnects and resyncs."""
+        _LOGGER.warning("Closing slow WebSocket (%s)", reason)
+        self.abandon()
+        if not self.ws.closed and self._close_task is None:
+            self._close_task = asyncio.create_task(self._close())
+
+    async def _close(self) -> None:
+        try:
+            await self.ws.close(code=WSCloseCode.TRY_AGAIN_LATER, message=b"slow-consumer")
+        except Exception:  # noqa: BLE001 — best-effort close
+            _LOGGER.debug("Error closing slow WebSocket", exc_info=True)
@@ -15,10 +15,8 @@ from aiohttp import ClientError, web
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from custom_components.beatify.game.playlist import (
-    get_playlist_directory,
-    validate_playlist,
-)
+from custom_components.beatify.game.playlist import get_playlist_directory
+from custom_components.beatify.game.playlist_validation import validate_playlist
 from custom_components.beatify.server.base import (
     RateLimitMixin,
     _json_error,
@@ -0,0 +1,148 @@
+"""Revisioned delta stream of the broadcast ``state`` message.
+
+Every ``broadcast_state`` used to ship the whole game state, every player row
+included, to every phone on each join, guess and reveal, although most
+pushes change a handful of fields. Clients that opt in (``state_sync``
+message) instead get:
+
+* ``{"type": "state_snapshot", "rev": N, "state": {...}}`` - the full
+  ``state`` message, on subscribe, on a phase or game change, and whenever
+  the socket is not at the previous revision;
+* ``{"type": "state_delta", "base": N - 1, "rev": N, "ops": [...]}`` - the
+  changes since the previous broadcast as JSON-Patch operations (RFC 6902
+  ``add`` / ``replace`` / ``remove`` with JSON-Pointer paths).
+
+The revision grows by one per state broadcast. A client whose revision is
+not ``base`` has missed a frame and sends ``state_sync`` again to get a
+snapshot. Players and the spectator admin see different (redacted) variants
+of the state, so each audience is diffed against its own previous snapshot.
+Clients that never send ``state_sync`` keep receiving full ``state``
+messages. ``www/js/state-sync.js`` is the client side.
+
+Lists are diffed element-wise when their length is unchanged and replaced
+whole otherwise (players joining or leaving); that keeps the patch format
+trivial to apply while still reducing a score update to a few ``replace``
+ops on the affected rows.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
+
+AUDIENCE_ADMIN = "admin"
+AUDIENCE_PLAYER = "player"
+
+
+def _pointer(path: str, key: str | int) -> str:
+    token = str(key).replace("~", "~0").replace("/", "~1")
+    return f"{path}/{token}"
+
+
+def diff_state(old: Any, new: Any, path: str = "") -> list[dict[str, Any]]:
+    """JSON-Patch operations turning ``old`` into ``new``.
+
+    Args:
+        old: Previous JSON value
+        new: Current JSON value
+        path: JSON Pointer of the compared values (root is ``""``)
+
+    Returns:
+        List of ``add`` / ``replace`` / ``remove`` operations
+
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: list[dict[str, Any]] = []
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer(path, key), "value": value})
+            elif _changed(old[key], value):
+                ops.extend(diff_state(old[key], value, _pointer(path, key)))
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": _pointer(path, key)})
+        return ops
+    if (
+        isinstance(old, list)
+        and isinstance(new, list)
+        and len(old) == len(new)
+    ):
+        ops = []
+        for index, (before, after) in enumerate(zip(old, new)):
+            if _changed(before, after):
+                ops.extend(diff_state(before, after, _pointer(path, index)))
+        return ops
+    if not _changed(old, new):
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def _changed(old: Any, new: Any) -> bool:
+    # ``True == 1`` in Python, but not on the wire.
+    return type(old) is not type(new) or old != new
+
+
+class StateStream:
+    """Last broadcast state per audience plus the shared revision counter."""
+
+    def __init__(self) -> None:
+        """Initialize an empty stream."""
+        self.rev = 0
+        self._last: dict[str, dict[str, Any]] = {}
+
+    def advance(
+        self, variants: dict[str, dict[str, Any]]
+    ) -> dict[str, list[dict[str, Any]] | None]:
+        """
+        Record a new broadcast and return each audience's delta.
+
+        Args:
+            variants: Audience -> full ``state`` message for this broadcast
+
+        Returns:
+            Audience -> patch ops against the previous revision, or None when
+            a snapshot is needed (first broadcast, new game or phase)
+
+        """
+        self.rev += 1
+        deltas: dict[str, list[dict[str, Any]] | None] = {}
+        copies: dict[int, dict[str, Any]] = {}
+        for audience, live in variants.items():
+            # Stored as its JSON round-trip: a detached copy (the state dict can
+            # share lists with the game objects) in exactly the shape clients
+            # hold, so tuples and lists compare equal. Audiences sharing one
+            # unredacted message share the copy.
+            message = copies.get(id(live))
+            if message is None:
+                message = copies[id(live)] = json_loads(json_bytes(live))
+            previous = self._last.get(audience)
+            if (
+                previous is None
+                or previous.get("game_id") != message.get("game_id")
+                or previous.get("phase") != message.get("phase")
+            ):
+                deltas[audience] = None
+            else:
+                deltas[audience] = diff_state(previous, message)
+            self._last[audience] = message
+        return deltas
+
+    def snapshot(self, audience: str) -> dict[str, Any] | None:
+        """The last broadcast state for an audience, if any."""
+        return self._last.get(audience)
+
+    def reset(self) -> None:
+        """Forget the stored snapshots (game torn down)."""
+        self._last.clear()
+
+
+def snapshot_message(rev: int, state: dict[str, Any]) -> dict[str, Any]:
+    """Build a ``state_snapshot`` frame."""
+    return {"type": "state_snapshot", "rev": rev, "state": state}
+
+
+def delta_message(rev: int, ops: list[dict[str, Any]]) -> dict[str, Any]:
+    """Build a ``state_delta`` frame on top of revision ``rev - 1``."""
+    return {"type": "state_delta", "base": rev - 1, "rev": rev, "ops": ops}
@@ -22,7 +22,7 @@ from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from custom_components.beatify.const import DOMAIN
 from custom_components.beatify.game.state import GamePhase
-from custom_components.beatify.game.playlist import async_discover_playlists
+from custom_components.beatify.game.playlist_index import async_discover_playlists
 from custom_components.beatify.server.base import (
     RateLimitMixin,
     _apply_cache_tokens,
@@ -13,12 +13,20 @@ from custom_components.beatify.const import (
     ERR_GAME_NOT_STARTED,
     LOBBY_DISCONNECT_GRACE_PERIOD,
 )
+from custom_components.beatify.server.fanout import Frame, SocketOutbox, encode_frame
 from custom_components.beatify.server.serializers import (
     REDACTED_PLACEHOLDER,
     build_state_message,
     get_game_state,
     redact_state_for_player,
 )
+from custom_components.beatify.server.state_sync import (
+    AUDIENCE_ADMIN,
+    AUDIENCE_PLAYER,
+    StateStream,
+    delta_message,
+    snapshot_message,
+)
 from custom_components.beatify.server.ws_handlers import (
     handle_admin,
     handle_admin_connect,
@@ -34,6 +42,7 @@ from custom_components.beatify.server.ws_handlers import (
     handle_reconnect,
     handle_report_data,
     handle_round_timeout,
+    handle_state_sync,
     handle_steal,
     handle_submit,
     handle_title_artist_guess,
@@ -57,6 +66,12 @@ class BeatifyWebSocketHandler:
     HEARTBEAT_INTERVAL = 30
     RATE_LIMIT_CONNECTIONS = 10
     RATE_LIMIT_WINDOW = 60  # seconds
+    # How long broadcast() waits for its frame to be written to sockets that
+    # had nothing queued. Healthy sockets finish immediately; sockets already
+    # behind are not waited for at all, their outbox catches up on its own.
+    # Ordering against direct replies does not depend on this: send() queues
+    # on the same outbox.
+    BROADCAST_WAIT = 0.25  # seconds
 
     def __init__(self, hass: HomeAssistant) -> None:
         """
@@ -68,6 +83,11 @@ class BeatifyWebSocketHandler:
         """
         self.hass = hass
         self.connections: set[web.WebSocketResponse] = set()
+        self._outboxes: dict[web.WebSocketResponse, SocketOutbox] = {}
+        # Delta-sync subscribers (``state_sync``): socket -> (audience, last
+        # revision sent, None until it has a snapshot).
+        self._state_stream = StateStream()
+        self._sync_subs: dict[web.WebSocketResponse, tuple[str, int | None]] = {}
         self._admin_disconnect_task: asyncio.Task | None = None
         self._analytics: AnalyticsStorage | None = None
         # Debouncing for concurrent player joins (Issue #41)
@@ -83,6 +103,7 @@ class BeatifyWebSocketHandler:
             "reconnect": handle_reconnect,
             "leave": handle_leave,
             "get_state": handle_get_state,
+            "state_sync": handle_state_sync,
             "get_steal_targets": handle_get_steal_targets,
             "steal": handle_steal,
             "reaction": handle_reaction,
@@ -216,6 +237,12 @@ class BeatifyWebSocketHandler:
 
         finally:
             self.connections.discard(ws)
+            outbox = self._outboxes.pop(ws, None)
+            if outbox is not None:
+                outbox.abandon()
+            if self._sync_subs.pop(ws, None) is not None and not self._sync_subs:
+                # Not advanced without subscribers, so it would go stale.
+                self._state_stream.reset()
             await self._handle_disconnect(ws)
             _LOGGER.info(
                 "[WS-Debug] disconnect path=%s remote=%s total=%d ws_closed=%s close_code=%s",
@@ -251,12 +278,13 @@ class BeatifyWebSocketHandler:
             return
 
         if not game_state or not game_state.game_id:
-            await ws.send_json(
+            await self.send(
+                ws,
                 {
                     "type": "error",
                     "code": ERR_GAME_NOT_STARTED,
                     "message": "No active game",
-                }
+                },
             )
             return
 
@@ -270,13 +298,34 @@ class BeatifyWebSocketHandler:
     # Broadcasting
     # ------------------------------------------------------------------
 
+    async def send(self, ws: web.WebSocketResponse, message: dict) -> None:
+        """
+        Send a message to one connection, behind anything already queued for it.
+
+        Replies, acks and per-socket ``state`` frames share the socket's outbox
+        with broadcasts, so a socket that is behind never sees a reply or a
+        fresh state ahead of an older broadcast still in its queue (state going
+        backwards on the client). Returns once the frame is written, superseded
+        by a newer state, or the socket was given up on.
+
+        Args:
+            ws: WebSocket connection
+            message: Message to send
+
+        """
+        if ws.closed:
+            return
+        await self._outbox(ws).push(encode_frame(message))
+
     async def broadcast(self, message: dict) -> None:
         """
-        Broadcast message to all connected clients in parallel (Issue #41).
+        Broadcast message to all connected clients.
 
-        Uses asyncio.gather() for parallel sends instead of sequential awaits.
-        Issue #550: Also ensures admin spectator WS receives the broadcast
-        even if it somehow dropped out of self.connections.
+        Each audience variant (spectator admin, players) is encoded to JSON
+        exactly once and the same frame is queued on every socket's outbox,
+        which drains on its own task (see ``fanout``), so a slow phone cannot
+        stall the others. Issue #550: Also ensures admin spectator WS receives
+        the broadcast even if it somehow dropped out of self.connections.
 
         Args:
             message: Message to broadcast
@@ -302,16 +351,106 @@ class BeatifyWebSocketHandler:
 
         admin_ws = game_state._admin_ws if game_state else None
 
-        # Build list of send tasks for all open connections
-        tasks = []
-        for ws in list(targets):
-            if not ws.closed:
-                payload = message if ws is admin_ws else player_message
-                tasks.append(self._safe_send(ws, payload))
+        # State broadcasts also advance the revisioned stream that
+        # ``state_sync`` subscribers receive as deltas (see ``state_sync``).
+        # Only while someone subscribed: the copy and diff are wasted on the
+        # full-state clients, and subscribe_state_sync starts from a fresh
+        # broadcast when the stream holds nothing.
+        deltas = None
+        rev = 0
+        if message.get("type") == "state" and self._sync_subs:
+            deltas = self._state_stream.advance(
+                {AUDIENCE_ADMIN: message, AUDIENCE_PLAYER: player_message}
+            )
+            rev = self._state_stream.rev
+
+        variants = {AUDIENCE_ADMIN: message, AUDIENCE_PLAYER: player_message}
+        frames: dict[tuple[str, str], Frame] = {}
+
+        def frame_for(kind: str, audience: str) -> Frame:
+            if kind == "full" and player_message is message:
+                # Nothing was redacted: both audiences share one encoding.
+                audience = AUDIENCE_PLAYER
+            key = (kind, audience)
+            frame = frames.get(key)
+            if frame is not None:
+                return frame
+            if kind == "delta":
+                frame = encode_frame(delta_message(rev, deltas[audience]))
+            elif kind == "snapshot":
+                frame = encode_frame(
+                    snapshot_message(rev, self._state_stream.snapshot(audience))
+                )
+            else:
+                frame = encode_frame(variants[audience])
+            frames[key] = frame
+            return frame
+
+        waiters = []
+        for ws in targets:
+            if ws.closed:
+                continue
+            audience = AUDIENCE_ADMIN if ws is admin_ws else AUDIENCE_PLAYER
+            sub = self._sync_subs.get(ws) if deltas is not None else None
+            outbox = self._outbox(ws)
+            if sub is None:
+                frame = frame_for("full", audience)
+            else:
+                # Deltas cannot replace each other in the queue, so a socket
+                # that is already behind gets a snapshot, which supersedes its
+                # queued state frames instead of piling up to MAX_PENDING.
+                in_step = (
+                    sub == (audience, rev - 1)
+                    and deltas[audience] is not None
+                    and not outbox.backlogged
+                )
+                frame = frame_for("delta" if in_step else "snapshot", audience)
+                self._sync_subs[ws] = (audience, rev)
+            idle = outbox.idle
+            sent = outbox.push(frame)
+            if idle:
+                waiters.append(sent)
+
+        if waiters:
+            await asyncio.wait(waiters, timeout=self.BROADCAST_WAIT)
+
+    async def subscribe_state_sync(self, ws: web.WebSocketResponse) -> None:
+        """
+        Switch a connection to revisioned state deltas and send it a snapshot.
+
+        Also the resync path: a client whose revision no longer matches a
+        delta's base asks again and starts over from the snapshot.
 
-        # Execute all sends in parallel
-        if tasks:
-            await asyncio.gather(*tasks)
+        Args:
+            ws: WebSocket connection
+
+        """
+        game_state = get_game_state(self.hass)
+        admin_ws = game_state._admin_ws if game_state else None
+        audience = AUDIENCE_ADMIN if ws is admin_ws else AUDIENCE_PLAYER
+        snapshot = self._state_stream.snapshot(audience)
+        if (
+            snapshot is None
+            or game_state is None
+            or snapshot.get("game_id") != game_state.game_id
+        ):
+            # Nothing broadcast for this game while the stream was live (it
+            # only advances with subscribers): the next broadcast brings this
+            # socket its snapshot.
+            self._sync_subs[ws] = (audience, None)
+            await self.broadcast_state()
+            return
+        rev = self._state_stream.rev
+        self._sync_subs[ws] = (audience, rev)
+        sent = self._outbox(ws).push(encode_frame(snapshot_message(rev, snapshot)))
+        await asyncio.wait([sent], timeout=self.BROADCAST_WAIT)
+
+    def _outbox(self, ws: web.WebSocketResponse) -> SocketOutbox:
+        """Return the send queue of a connection, creating it on first use."""
+        outbox = self._outboxes.get(ws)
+        if outbox is None:
+            outbox = self._outboxes[ws] = SocketOutbox(ws)
+        return outbox
 
     @staticmethod
     def _redact_for_player(message: dict, game_state) -> dict:  # noqa: ANN001
@@ -341,20 +480,6 @@ class BeatifyWebSocketHandler:
                 return {**message, "song": song}
         return message
 
-    async def _safe_send(self, ws: web.WebSocketResponse, message: dict) -> None:
-        """
-        Send message to a single WebSocket, catching errors.
-
-        Args:
-            ws: WebSocket connection
-            message: Message to send
-
-        """
-        try:
-            await ws.send_json(message)
-        except (ConnectionError, RuntimeError) as err:
-            _LOGGER.warning("Failed to send to WebSocket: %s", err)
-
     async def debounced_broadcast_state(self) -> None:
         """
         Broadcast state with debouncing for concurrent events (Issue #41).
@@ -518,6 +643,12 @@ class BeatifyWebSocketHandler:
             self._broadcast_debounce_task.cancel()
         self._broadcast_debounce_task = None
 
+        for outbox in self._outboxes.values():
+            outbox.abandon()
+        self._outboxes.clear()
+        self._sync_subs.clear()
+        self._state_stream.reset()
+
         # Close every open connection with a going-away code. Snapshot the set
         # first: ws.close() resolves the handle() finally-block which discards
         # from self.connections, mutating it mid-iteration otherwise.
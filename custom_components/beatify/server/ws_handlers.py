@@ -65,7 +65,10 @@ _LOGGER = logging.getLogger(__name__)
 
 
 async def _send_state_to(
-    ws: web.WebSocketResponse, state_msg: dict, game_state: GameState
+    handler: BeatifyWebSocketHandler,
+    ws: web.WebSocketResponse,
+    state_msg: dict,
+    game_state: GameState,
 ) -> None:
     """Send a ``state`` message to a single recipient, redacted for players.
 
@@ -79,7 +82,7 @@ async def _send_state_to(
     payload = state_msg
     if ws is not game_state._admin_ws:
         payload = redact_state_for_player(state_msg)
-    await ws.send_json(payload)
+    await handler.send(ws, payload)
 
 
 # ---------------------------------------------------------------------------
@@ -230,12 +233,13 @@ async def handle_join(
             )
             if not authed:
                 game_state.remove_player(name)
-                await ws.send_json(
+                await handler.send(
+                    ws,
                     {
                         "type": "error",
                         "code": ERR_UNAUTHORIZED,
                         "message": "Home Assistant login required to host",
-                    }
+                    },
                 )
                 return
             # #790: Existing admin reclaiming their own role should always be
@@ -275,12 +279,13 @@ async def handle_join(
                             _LOGGER.info("Game resumed by admin reconnection")
                 else:
                     game_state.remove_player(name)
-                    await ws.send_json(
+                    await handler.send(
+                        ws,
                         {
                             "type": "error",
                             "code": ERR_ADMIN_EXISTS,
                             "message": "Only the original host can reconnect",
-                        }
+                        },
                     )
                     return
             else:
@@ -291,12 +296,13 @@ async def handle_join(
                 )
                 if existing_admin:
                     game_state.remove_player(name)
-                    await ws.send_json(
+                    await handler.send(
+                        ws,
                         {
                             "type": "error",
                             "code": ERR_ADMIN_EXISTS,
                             "message": "Game already has an admin",
-                        }
+                        },
                     )
                     return
                 # Issue #417: Only allow new admin claim during LOBBY
@@ -307,12 +313,13 @@ async def handle_join(
                         game_state.phase.value,
                     )
                     game_state.remove_player(name)
-                    await ws.send_json(
+                    await handler.send(
+                        ws,
                         {
                             "type": "error",
                             "code": ERR_INVALID_ACTION,
                             "message": "Admin claim only allowed during lobby phase",
-                        }
+                        },
                     )
                     return
                 else:
@@ -340,12 +347,13 @@ async def handle_join(
 
         # Send join acknowledgment with session_id (Story 11.1)
         if player:
-            await ws.send_json(
+            await handler.send(
+                ws,
                 {
                     "type": "join_ack",
                     "session_id": player.session_id,
                     "game_id": game_state.game_id,
-                }
+                },
             )
 
         # Send state to newly joined player (redacted — #1366)
@@ -353,7 +361,7 @@ async def handle_join(
         if not state_msg:
             return
         try:
-            await _send_state_to(ws, state_msg, game_state)
+            await _send_state_to(handler, ws, state_msg, game_state)
         except (ConnectionError, RuntimeError) as err:
             _LOGGER.warning("Failed to send state to new player: %s", err)
             return
@@ -365,12 +373,13 @@ async def handle_join(
             ERR_GAME_FULL: "Game is full",
             ERR_GAME_ENDED: "This game has ended",
         }
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": error_code,
                 "message": error_messages.get(error_code, "Join failed"),
-            }
+            },
         )
 
 
@@ -387,22 +396,23 @@ async def handle_admin_connect(
     retired; that token was embedded into the admin page for any visitor.
     """
     if not _is_ha_authenticated(handler, data, ws):
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_UNAUTHORIZED,
                 "message": "Home Assistant login required",
-            }
+            },
         )
         return
 
     game_state._admin_ws = ws
     _LOGGER.info("Admin spectator connected via WebSocket")
 
-    await ws.send_json({"type": "admin_connect_ack", "game_id": game_state.game_id})
+    await handler.send(ws, {"type": "admin_connect_ack", "game_id": game_state.game_id})
     state_msg = build_state_message(game_state)
     if state_msg:
-        await ws.send_json(state_msg)
+        await handler.send(ws, state_msg)
 
 
 async def handle_admin(
@@ -423,12 +433,13 @@ async def handle_admin(
             break
 
     if not (is_admin_ws or (sender and sender.is_admin)):
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_NOT_ADMIN,
                 "message": "Only admin can perform this action",
-            }
+            },
         )
         return
 
@@ -465,7 +476,21 @@ async def handle_get_state(
     """Handle dashboard/observer state request (Story 10.4)."""
     state_msg = build_state_message(game_state)
     if state_msg:
-        await _send_state_to(ws, state_msg, game_state)
+        await _send_state_to(handler, ws, state_msg, game_state)
+
+
+async def handle_state_sync(
+    handler: BeatifyWebSocketHandler,
+    ws: web.WebSocketResponse,
+    data: dict,
+    game_state: GameState,
+) -> None:
+    """Subscribe to revisioned state deltas, or resync after a gap.
+
+    Replies with a ``state_snapshot``; later state broadcasts reach this
+    connection as ``state_delta`` patches (see ``server/state_sync.py``).
+    """
+    await handler.subscribe_state_sync(ws)
 
 
 async def handle_round_timeout(
@@ -509,7 +534,7 @@ async def handle_ping(
     broadcast would otherwise reach the client.
     """
     try:
-        await ws.send_json({"type": "pong"})
+        await handler.send(ws, {"type": "pong"})
     except (ConnectionError, RuntimeError) as err:
         _LOGGER.debug("Failed to send pong: %s", err)
 
@@ -576,12 +601,13 @@ async def admin_start_game(
 ) -> None:
     """Handle admin start_game action."""
     if game_state.phase != GamePhase.LOBBY:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Game already started",
-            }
+            },
         )
         return
 
@@ -619,12 +645,13 @@ async def admin_start_game(
             error_code = ERR_NO_SONGS_REMAINING
             error_message = "No songs available in playlist"
 
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": error_code,
                 "message": error_message,
-            }
+            },
         )
         # #949: start_round failing pauses the game (media_player_error etc.),
         # but without broadcasting that the admin and players never leave the
@@ -684,12 +711,13 @@ async def admin_next_round(
                 await game_state.advance_to_end()
                 await handler.broadcast_state()
     else:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Cannot advance round in current phase",
-            }
+            },
         )
 
 
@@ -701,12 +729,13 @@ async def admin_stop_song(
 ) -> None:
     """Handle admin stop_song action."""
     if game_state.phase != GamePhase.PLAYING:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "No song playing",
-            }
+            },
         )
         return
 
@@ -728,12 +757,13 @@ async def admin_set_volume(
     """Handle admin set_volume action."""
     direction = data.get("direction")
     if direction not in ("up", "down"):
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Invalid volume direction",
-            }
+            },
         )
         return
 
@@ -743,11 +773,12 @@ async def admin_set_volume(
         _LOGGER.warning("Failed to set volume to %.0f%%", new_level * 100)
 
     _LOGGER.info("Volume adjusted %s to %.0f%%", direction, new_level * 100)
-    await ws.send_json(
+    await handler.send(
+        ws,
         {
             "type": "volume_changed",
             "level": new_level,
-        }
+        },
     )
 
 
@@ -778,12 +809,13 @@ async def admin_end_game(
     # the game cleanly. Without PAUSED here, the End button in the control bar
     # silently rejects with ERR_INVALID_ACTION.
     if game_state.phase not in (GamePhase.PLAYING, GamePhase.REVEAL, GamePhase.PAUSED):
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Cannot end game in current phase",
-            }
+            },
         )
         return
 
@@ -818,23 +850,25 @@ async def admin_resume_game(
     prior phase (typically REVEAL, where the admin can try the next round).
     """
     if game_state.phase != GamePhase.PAUSED:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Game is not paused",
-            }
+            },
         )
         return
 
     success = await game_state.resume_game()
     if not success:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Resume failed — no previous phase to restore",
-            }
+            },
         )
         return
 
@@ -850,12 +884,13 @@ async def admin_dismiss_game(
 ) -> None:
     """Handle admin dismiss_game action."""
     if game_state.phase != GamePhase.END:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Can only dismiss from END phase",
-            }
+            },
         )
         return
 
@@ -874,12 +909,13 @@ async def admin_rematch_game(
 ) -> None:
     """Handle admin rematch_game action."""
     if game_state.phase != GamePhase.END:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Can only rematch from END phase",
-            }
+            },
         )
         return
 
@@ -891,12 +927,13 @@ async def admin_rematch_game(
     _LOGGER.info("Rematch started with %d players", player_count)
 
     game_state._admin_ws = ws
-    await ws.send_json(
+    await handler.send(
+        ws,
         {
             "type": "admin_token_update",
             "admin_token": game_state.admin_token,
             "game_id": game_state.game_id,
-        }
+        },
     )
     await handler.broadcast({"type": "rematch_started"})
     await handler.broadcast_state()
@@ -910,12 +947,13 @@ async def admin_set_language(
 ) -> None:
     """Handle admin set_language action."""
     if game_state.phase != GamePhase.LOBBY:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Can only change language in lobby",
-            }
+            },
         )
         return
 
@@ -966,7 +1004,7 @@ async def admin_set_party_lights(
         await game_state.disable_party_lights()
         _LOGGER.info("Party Lights disabled")
 
-    await ws.send_json({"type": "party_lights_updated", "enabled": enabled})
+    await handler.send(ws, {"type": "party_lights_updated", "enabled": enabled})
 
 
 async def admin_toggle_party_lights(
@@ -978,14 +1016,15 @@ async def admin_toggle_party_lights(
     """Handle admin toggle_party_lights action."""
     if game_state._party_lights and game_state._party_lights._active:
         await game_state.disable_party_lights()
-        await ws.send_json({"type": "party_lights_updated", "enabled": False})
+        await handler.send(ws, {"type": "party_lights_updated", "enabled": False})
     else:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Party Lights not configured — set up in game settings first",
-            }
+            },
         )
 
 
@@ -1009,12 +1048,13 @@ async def admin_kick_player(
 ) -> None:
     """Handle admin kick_player action — remove a disconnected player from lobby (#659)."""
     if game_state.phase != GamePhase.LOBBY:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Players can only be removed during lobby phase",
-            }
+            },
         )
         return
 
@@ -1024,32 +1064,35 @@ async def admin_kick_player(
 
     target = game_state.get_player(target_name)
     if not target:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Player not found: " + target_name,
-            }
+            },
         )
         return
 
     if target.is_admin:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Cannot remove admin",
-            }
+            },
         )
         return
 
     if target.connected:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Cannot remove a connected player",
-            }
+            },
         )
         return
 
@@ -1077,53 +1120,58 @@ async def handle_submit(
             break
 
     if not player:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_NOT_IN_GAME,
                 "message": "Not in game",
-            }
+            },
         )
         return
 
     if game_state.phase != GamePhase.PLAYING:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Not in playing phase",
-            }
+            },
         )
         return
 
     if player.submitted:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_ALREADY_SUBMITTED,
                 "message": "Already submitted",
-            }
+            },
         )
         return
 
     if game_state.is_deadline_passed():
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_ROUND_EXPIRED,
                 "message": "Time's up!",
-            }
+            },
         )
         return
 
     year = data.get("year")
     if not isinstance(year, int) or year < YEAR_MIN or year > YEAR_MAX:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Invalid year",
-            }
+            },
         )
         return
 
@@ -1133,11 +1181,12 @@ async def handle_submit(
     submission_time = game_state.current_time()
     player.submit_guess(year, submission_time)
 
-    await ws.send_json(
+    await handler.send(
+        ws,
         {
             "type": "submit_ack",
             "year": year,
-        }
+        },
     )
 
     # Issue #581: Only broadcast here when NOT all guesses are complete.
@@ -1168,45 +1217,49 @@ async def handle_reconnect(
     """Handle session-based reconnection (Story 11.2)."""
     session_id = data.get("session_id")
     if not session_id:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_SESSION_NOT_FOUND,
                 "message": "Session ID required",
-            }
+            },
         )
         return
 
     player = game_state.get_player_by_session_id(session_id)
     if not player:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_SESSION_NOT_FOUND,
                 "message": "Session not found or game was reset",
-            }
+            },
         )
         return
 
     if game_state.phase == GamePhase.END:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_GAME_ENDED,
                 "message": "Game has ended",
-            }
+            },
         )
         return
 
     # Handle dual-tab scenario
     if player.connected and player.ws and not player.ws.closed and player.ws is not ws:
         try:
-            await player.ws.send_json(
+            await handler.send(
+                player.ws,
                 {
                     "type": "error",
                     "code": ERR_SESSION_TAKEOVER,
                     "message": "Session taken over by another tab",
-                }
+                },
             )
             await player.ws.close()
         except (ConnectionError, RuntimeError):
@@ -1226,17 +1279,18 @@ async def handle_reconnect(
             if await game_state.resume_game():
                 _LOGGER.info("Game resumed by admin session reconnection")
 
-    await ws.send_json(
+    await handler.send(
+        ws,
         {
             "type": "reconnect_ack",
             "name": player.name,
             "success": True,
-        }
+        },
     )
 
     state_msg = build_state_message(game_state)
     if state_msg:
-        await _send_state_to(ws, state_msg, game_state)
+        await _send_state_to(handler, ws, state_msg, game_state)
 
     await handler.broadcast_state()
 
@@ -1264,17 +1318,18 @@ async def handle_leave(
         return
 
     if player.is_admin:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_ADMIN_CANNOT_LEAVE,
                 "message": "Host cannot leave. End the game instead.",
-            }
+            },
         )
         return
 
     game_state.remove_player(player_name)
-    await ws.send_json({"type": "left"})
+    await handler.send(ws, {"type": "left"})
     await ws.close()
     await handler.broadcast_state()
     _LOGGER.info("Player left game intentionally: %s", player_name)
@@ -1294,31 +1349,34 @@ async def handle_get_steal_targets(
             break
 
     if not player:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_NOT_IN_GAME,
                 "message": "Not in game",
-            }
+            },
         )
         return
 
     if not player.steal_available:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "No steal available",
-            }
+            },
         )
         return
 
     targets = game_state.get_steal_targets(player.name)
-    await ws.send_json(
+    await handler.send(
+        ws,
         {
             "type": "steal_targets",
             "targets": targets,
-        }
+        },
     )
 
 
@@ -1336,36 +1394,39 @@ async def handle_steal(
             break
 
     if not player:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_NOT_IN_GAME,
                 "message": "Not in game",
-            }
+            },
         )
         return
 
     target_name = data.get("target")
     if not target_name:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Target name required",
-            }
+            },
         )
         return
 
     result = game_state.use_steal(player.name, target_name)
 
     if result["success"]:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "steal_ack",
                 "success": True,
                 "target": result["target"],
                 "year": result["year"],
-            }
+            },
         )
         # Issue #842 Phase 4: announce the steal (use case 23).
         await game_state.announce_steal_used(player.name, result["target"])
@@ -1373,12 +1434,13 @@ async def handle_steal(
             await handler.broadcast_state()
         await game_state.trigger_early_reveal_if_complete()
     else:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": result["error"],
                 "message": _get_steal_error_message(result["error"]),
-            }
+            },
         )
 
 
@@ -1402,44 +1464,48 @@ async def handle_artist_guess(
 ) -> None:
     """Handle artist guess submission (Story 20.3)."""
     if game_state.phase != GamePhase.PLAYING:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Can only guess during PLAYING phase",
-            }
+            },
         )
         return
 
     player = game_state.get_player_by_ws(ws)
     if not player:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_NOT_IN_GAME,
                 "message": "Not in game",
-            }
+            },
         )
         return
 
     if not game_state.artist_challenge:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_NO_ARTIST_CHALLENGE,
                 "message": "No artist challenge this round",
-            }
+            },
         )
         return
 
     artist = data.get("artist", "").strip()
     if not artist:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Artist cannot be empty",
-            }
+            },
         )
         return
 
@@ -1459,7 +1525,7 @@ async def handle_artist_guess(
         else:
             response["winner"] = result["winner"]
 
-    await ws.send_json(response)
+    await handler.send(ws, response)
 
     if result.get("first"):
         await handler.broadcast_state()
@@ -1483,44 +1549,48 @@ async def handle_movie_guess(
 ) -> None:
     """Handle movie quiz guess submission (Issue #28)."""
     if game_state.phase != GamePhase.PLAYING:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Can only guess during PLAYING phase",
-            }
+            },
         )
         return
 
     player = game_state.get_player_by_ws(ws)
     if not player:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_NOT_IN_GAME,
                 "message": "Not in game",
-            }
+            },
         )
         return
 
     if not game_state.movie_challenge:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_NO_MOVIE_CHALLENGE,
                 "message": "No movie quiz this round",
-            }
+            },
         )
         return
 
     movie = data.get("movie", "").strip()
     if not movie:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Movie cannot be empty",
-            }
+            },
         )
         return
 
@@ -1538,7 +1608,7 @@ async def handle_movie_guess(
         response["rank"] = result["rank"]
         response["bonus"] = result["bonus"]
 
-    await ws.send_json(response)
+    await handler.send(ws, response)
     await game_state.trigger_early_reveal_if_complete()
 
     _LOGGER.debug(
@@ -1565,33 +1635,36 @@ async def handle_title_artist_guess(
     "skipped" (0 points for that field), so they are NOT rejected here.
     """
     if game_state.phase != GamePhase.PLAYING:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Can only guess during PLAYING phase",
-            }
+            },
         )
         return
 
     player = game_state.get_player_by_ws(ws)
     if not player:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_NOT_IN_GAME,
                 "message": "Not in game",
-            }
+            },
         )
         return
 
     if not game_state.title_artist_challenge:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_NO_TITLE_ARTIST_CHALLENGE,
                 "message": "No title & artist challenge this round",
-            }
+            },
         )
         return
 
@@ -1622,12 +1695,13 @@ async def handle_title_artist_guess(
     player.submitted = True
     player.submission_time = guess_time
 
-    await ws.send_json(
+    await handler.send(
+        ws,
         {
             "type": "title_artist_guess_ack",
             "title_status": result["title_status"],
             "artist_status": result["artist_status"],
-        }
+        },
     )
 
     # Mirror handle_artist_guess / handle_submit: avoid a redundant broadcast
@@ -1660,44 +1734,48 @@ async def handle_title_artist_vote(
     player is encoded as the prefix of nearmiss_id, "player:field").
     """
     if game_state.phase != GamePhase.REVEAL:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Can only vote during REVEAL phase",
-            }
+            },
         )
         return
 
     player = game_state.get_player_by_ws(ws)
     if not player:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_NOT_IN_GAME,
                 "message": "Not in game",
-            }
+            },
         )
         return
 
     nearmiss_id = data.get("nearmiss_id")
     accept = data.get("accept")
     if not isinstance(nearmiss_id, str) or ":" not in nearmiss_id:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Invalid nearmiss_id",
-            }
+            },
         )
         return
     if not isinstance(accept, bool):
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Invalid vote value",
-            }
+            },
         )
         return
 
@@ -1705,24 +1783,26 @@ async def handle_title_artist_vote(
     # the votes dict would store an entry for ANY string, letting a player flood
     # it with fabricated ids during REVEAL and exhaust server memory.
     if nearmiss_id not in {nm["id"] for nm in game_state.get_near_misses()}:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Unknown nearmiss_id",
-            }
+            },
         )
         return
 
     # Reject self-vote: the near-miss player is the part before the last ":".
     nearmiss_player = nearmiss_id.rsplit(":", 1)[0]
     if nearmiss_player == player.name:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Cannot vote on your own guess",
-            }
+            },
         )
         return
 
@@ -1745,57 +1825,62 @@ async def handle_title_artist_override(
     (window expiry or host-advance) by resolve_title_artist.
     """
     if game_state.phase != GamePhase.REVEAL:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Can only override during REVEAL phase",
-            }
+            },
         )
         return
 
     is_admin_ws = game_state._admin_ws is not None and game_state._admin_ws is ws
     sender = game_state.get_player_by_ws(ws)
     if not (is_admin_ws or (sender and sender.is_admin)):
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_NOT_ADMIN,
                 "message": "Only admin can override",
-            }
+            },
         )
         return
 
     nearmiss_id = data.get("nearmiss_id")
     accept = data.get("accept")
     if not isinstance(nearmiss_id, str) or ":" not in nearmiss_id:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Invalid nearmiss_id",
-            }
+            },
         )
         return
     if not isinstance(accept, bool):
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Invalid override value",
-            }
+            },
         )
         return
 
     # #1180: only accept overrides for a real, vote-eligible near-miss (mirrors
     # the vote handler) so the overrides dict can't be grown with fake ids.
     if nearmiss_id not in {nm["id"] for nm in game_state.get_near_misses()}:
-        await ws.send_json(
+        await handler.send(
+            ws,
             {
                 "type": "error",
                 "code": ERR_INVALID_ACTION,
                 "message": "Unknown nearmiss_id",
-            }
+            },
         )
         return
 
@@ -1886,7 +1971,7 @@ async def handle_report_data(
         name="beatify-report-data",
     )
 
-    await ws.send_json({"type": "report_data_ack"})
+    await handler.send(ws, {"type": "report_data_ack"})
 
 
 _WORKER_URL = "https://beatify-api.mholzi.workers.dev"
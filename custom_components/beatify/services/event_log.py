@@ -0,0 +1,172 @@
+"""
+Append-only event journal next to a JSON snapshot file.
+
+``stats.json`` and ``analytics.json`` used to be serialized and rewritten in
+full after every recorded round, game and error burst. Instead each change is
+appended to a journal (``stats.log`` / ``analytics.log`` next to the
+snapshot) as one NDJSON line, and the snapshot itself is
+only rewritten ("compacted") every ``COMPACT_EVERY`` events, after a prune,
+and when the store is loaded with a non-empty journal.
+
+Every event carries a sequence number and every snapshot records the last
+sequence it contains (``log_seq``), so a crash between writing the snapshot
+and truncating the journal cannot apply an event twice: on load only events
+newer than the snapshot are replayed. A torn last line from a crash mid-append
+is skipped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Journal length (events) that triggers a snapshot rewrite.
+COMPACT_EVERY = 200
+
+
+class EventLog:
+    """Sequenced NDJSON journal; appends are batched into executor writes."""
+
+    def __init__(self, hass: HomeAssistant, path: Path) -> None:
+        """
+        Initialize event log.
+
+        Args:
+            hass: Home Assistant instance
+            path: Journal file (created on first append)
+
+        """
+        self._hass = hass
+        self._path = path
+        self._pending: list[str] = []
+        self._lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+        self.seq = 0  # sequence number of the newest event
+        self.length = 0  # events appended since the last compaction
+
+    @property
+    def needs_compaction(self) -> bool:
+        """True once the journal holds ``COMPACT_EVERY`` events."""
+        return self.length >= COMPACT_EVERY
+
+    async def async_replay(self, after_seq: int) -> list[dict[str, Any]]:
+        """
+        Read the journal and return the events newer than a snapshot.
+
+        Args:
+            after_seq: ``log_seq`` of the loaded snapshot (0 if none)
+
+        Returns:
+            Events with ``seq > after_seq``, in append order
+
+        """
+        events = await self._hass.async_add_executor_job(self._read)
+        self.length = len(events)
+        self.seq = max([after_seq, *(e["seq"] for e in events)])
+        return [e for e in events if e["seq"] > after_seq]
+
+    def _read(self) -> list[dict[str, Any]]:
+        """Parse the journal (executor); unreadable lines are skipped."""
+        try:
+            with open(self._path, encoding="utf-8") as handle:
+                lines = handle.readlines()
+        except FileNotFoundError:
+            return []
+        except OSError as err:
+            _LOGGER.error("Event log %s unreadable: %s", self._path, err)
+            return []
+        events: list[dict[str, Any]] = []
+        for lineno, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                # Typically the last line, cut short by a crash mid-append.
+                _LOGGER.warning("Skipping unreadable line %d of %s", lineno, self._path)
+                continue
+            if isinstance(event, dict) and isinstance(event.get("seq"), int):
+                events.append(event)
+        return events
+
+    def append(self, event: dict[str, Any]) -> None:
+        """
+        Queue an event for the journal (call after applying it in memory).
+
+        The event is serialized immediately, so later in-memory mutations of
+        the objects it references do not leak into it.
+
+        Args:
+            event: JSON-serializable event; ``seq`` is added
+
+        """
+        self.seq += 1
+        self._pending.append(json.dumps({"seq": self.seq, **event}) + "\n")
+        self.length += 1
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self.async_flush())
+            self._flush_task.add_done_callback(self._handle_flush_done)
+
+    def _handle_flush_done(self, task: asyncio.Task) -> None:
+        """Log exceptions from fire-and-forget flush tasks."""
+        if not task.cancelled() and (exc := task.exception()) is not None:
+            _LOGGER.error("Unhandled error in event log flush: %s", exc)
+
+    async def async_flush(self) -> None:
+        """Write all queued events to the journal."""
+        async with self._lock:
+            # Events appended during a write are picked up by the next pass.
+            while self._pending:
+                await self._write_pending()
+
+    async def _write_pending(self) -> None:
+        lines, self._pending = self._pending, []
+        if not lines:
+            return
+
+        def _append() -> None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._path, "a", encoding="utf-8") as handle:
+                handle.writelines(lines)
+
+        try:
+            await self._hass.async_add_executor_job(_append)
+        except OSError as err:
+            # Keep the events in memory; the next compaction persists them.
+            _LOGGER.error("Failed to append to event log %s: %s", self._path, err)
+
+    async def async_compact(self, write_snapshot: Callable[[], Awaitable[bool]]) -> None:
+        """
+        Rewrite the snapshot and truncate the journal.
+
+        ``write_snapshot`` must record ``self.seq`` as ``log_seq`` at the moment
+        it captures the in-memory state. Events appended while it runs stay
+        queued and land in the fresh journal; any of them the snapshot already
+        contains are skipped on replay by their sequence number.
+
+        Args:
+            write_snapshot: Persists the full store, returns True on success
+
+        """
+        async with self._lock:
+            await self._write_pending()
+            if not await write_snapshot():
+                return
+            try:
+                await self._hass.async_add_executor_job(
+                    lambda: self._path.unlink(missing_ok=True)
+                )
+            except OSError as err:
+                _LOGGER.error("Failed to truncate event log %s: %s", self._path, err)
+                return
+            # Appended while the snapshot was written; still queued.
+            self.length = len(self._pending)
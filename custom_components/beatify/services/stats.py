@@ -12,6 +12,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+from custom_components.beatify.services.event_log import EventLog
+
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
 
@@ -28,7 +30,13 @@ MAX_DETAILED_GAMES = 500
 
 
 class StatsService:
-    """Service for tracking game statistics."""
+    """Service for tracking game statistics.
+
+    Recorded games and song results are appended to ``stats.log`` (see
+    ``services/event_log``) as upserts of the entries they changed, so
+    replaying an event twice is harmless; ``stats.json`` is only rewritten
+    when the journal is compacted.
+    """
 
     def __init__(self, hass: HomeAssistant) -> None:
         """
@@ -40,16 +48,22 @@ class StatsService:
         """
         self._hass = hass
         self._stats_file = Path(hass.config.path("beatify/stats.json"))
+        self._log = EventLog(hass, self._stats_file.with_suffix(".log"))
         self._stats: dict[str, Any] = self._empty_stats()
         self._analytics: AnalyticsStorage | None = None
         self._game_start_time: int | None = None
         self._all_time_avg_cache: float | None = None
         self._save_task: asyncio.Task | None = None
         self._save_lock = asyncio.Lock()
-        # Dirty flag: set on every schedule_save(); the save's done-callback
-        # re-schedules if it was set again while a save was in flight, so
-        # mutations made during a save are never silently dropped (#1402).
-        self._save_dirty = False
+        # False after load() found stats.json unreadable; compaction then stays
+        # off for the rest of the run (see load()).
+        self._snapshot_readable = True
+        # compute_song_stats() result, reused until record_song_result bumps
+        # the revision or self._stats is replaced (load / reset).
+        self._songs_rev = 0
+        self._song_stats_cache: tuple[int, dict[str, Any], dict[str, Any]] | None = (
+            None
+        )
 
     def set_analytics(self, analytics: AnalyticsStorage) -> None:
         """
@@ -87,7 +101,52 @@ class StatsService:
         }
 
     async def load(self) -> None:
-        """Load stats from file or create empty structure."""
+        """Load the stats snapshot, then replay the journal events after it.
+
+        If stats.json exists but cannot be read, the journal is replayed onto
+        empty stats for this run but never compacted: that would write over
+        the unreadable (possibly recoverable) snapshot and truncate the events
+        that the next load replays on top of it (#1402).
+        """
+        self._snapshot_readable = await self._load_snapshot()
+        events = await self._log.async_replay(self._stats.get("log_seq", 0))
+        for event in events:
+            self._apply_event(event)
+        if events:
+            self._all_time_avg_cache = None
+            self._songs_rev += 1
+        if self._log.length and self._snapshot_readable:
+            await self._log.async_compact(self.save)
+
+    def _apply_event(self, event: dict[str, Any]) -> None:
+        """Re-apply one journal event (an upsert) to the in-memory stats."""
+        kind = event.get("t")
+        if kind == "game":
+            game = event.get("v")
+            games = self._stats.setdefault("games", [])
+            if isinstance(game, dict) and not any(
+                g.get("id") == game.get("id") for g in games[-MAX_DETAILED_GAMES:]
+            ):
+                games.append(game)
+                if len(games) > MAX_DETAILED_GAMES:
+                    del games[:-MAX_DETAILED_GAMES]
+            if isinstance(event.get("playlist_stats"), dict):
+                self._stats.setdefault("playlists", {})[event.get("playlist")] = event[
+                    "playlist_stats"
+                ]
+            if isinstance(event.get("all_time"), dict):
+                self._stats["all_time"] = event["all_time"]
+        elif kind == "song" and isinstance(event.get("v"), dict):
+            self._stats.setdefault("songs", {})[event.get("k")] = event["v"]
+
+    async def _load_snapshot(self) -> bool:
+        """
+        Load stats from file or create empty structure.
+
+        Returns:
+            False if the file exists but could not be read
+
+        """
         try:
             if self._stats_file.exists():
                 content = await self._hass.async_add_executor_job(
@@ -106,18 +165,20 @@ class StatsService:
             # The file exists but cannot be read (permissions, transient I/O
             # error). Start fresh in memory so startup is not blocked, but do
             # NOT persist an empty file — that would destroy the unreadable
-            # (possibly recoverable) history. A later successful save can still
-            # overwrite it once whatever blocked the read clears (#1402).
+            # (possibly recoverable) history. New events stay in the journal
+            # until a later load can read the file again (#1402).
             _LOGGER.error("Stats file unreadable, starting fresh in memory: %s", err)
             self._stats = self._empty_stats()
             self._all_time_avg_cache = None
+            return False
         except (json.JSONDecodeError, KeyError, TypeError) as err:
             _LOGGER.warning("Stats file corrupted, recreating: %s", err)
             self._stats = self._empty_stats()
             self._all_time_avg_cache = None
             await self.save()
+        return True
 
-    async def save(self) -> None:
+    async def save(self) -> bool:
         """
         Persist stats to file with a crash-safe atomic write.
 
@@ -129,6 +190,10 @@ class StatsService:
         game history (#1386). The lock serializes concurrent saves (e.g. a
         directly-awaited save from load()'s corruption path interleaving with
         a scheduled save task).
+
+        Returns:
+            True if the snapshot was written
+
         """
         async with self._save_lock:
             try:
@@ -146,6 +211,10 @@ class StatsService:
                 stats_path = self._stats_file
                 temp_path = stats_path.with_suffix(".json.tmp")
                 snapshot = self._stats
+                # Journal events up to here are part of this snapshot. Later
+                # ones may leak into it while the executor serializes, which
+                # is fine: their replay re-sets the same entries.
+                snapshot["log_seq"] = self._log.seq
 
                 def _serialize_and_write() -> None:
                     content = json.dumps(snapshot, indent=2)
@@ -157,34 +226,33 @@ class StatsService:
                 _LOGGER.debug("Stats saved to %s", self._stats_file)
             except OSError as err:
                 _LOGGER.error("Failed to save stats: %s", err)
+                return False
+            return True
 
     def schedule_save(self) -> None:
         """
-        Schedule non-blocking save.
-
-        Uses fire-and-forget pattern to avoid blocking game operations.
-        Coalesces rapid calls: if a save is already in flight, the call sets a
-        dirty flag and the in-flight save's done-callback re-schedules a fresh
-        save. Without this, the save task snapshots ``self._stats`` at the
-        moment it runs and any mutation made AFTER that snapshot but before the
-        task finishes would be silently dropped until the next unrelated save
-        (#1402).
+        Schedule a non-blocking compaction: snapshot rewrite + journal reset.
+
+        Uses fire-and-forget pattern to avoid blocking game operations. A call
+        while a compaction is in flight is dropped: mutations made meanwhile
+        are already in the journal, which the next load replays. Nothing is
+        scheduled while the snapshot is unreadable (see load()).
         """
+        if not self._snapshot_readable:
+            return
         if self._save_task is not None and not self._save_task.done():
-            self._save_dirty = True
             return
-        self._save_dirty = False
-        self._save_task = asyncio.create_task(self.save())
+        self._save_task = asyncio.create_task(self._log.async_compact(self.save))
         self._save_task.add_done_callback(self._handle_save_done)
 
     def _handle_save_done(self, task: asyncio.Task) -> None:
-        """Log save-task errors and re-schedule if mutated mid-save (#1402)."""
+        """Log save-task errors."""
         if (exc := task.exception()) is not None:
             _LOGGER.error("Unhandled error in stats save task: %s", exc)
-        # A schedule_save() arrived while this save was in flight — its
-        # mutations may not be on disk yet, so kick off another save.
-        if self._save_dirty:
-            self.schedule_save()
+
+    async def async_shutdown(self) -> None:
+        """Write queued journal events to disk (called on unload)."""
+        await self._log.async_flush()
 
     async def record_game(self, game_summary: dict, difficulty: str = "normal") -> dict:
         """
@@ -323,8 +391,18 @@ class StatsService:
         if len(games_list) > MAX_DETAILED_GAMES:
             del games_list[:-MAX_DETAILED_GAMES]
 
-        # Schedule deferred save (non-blocking)
-        self.schedule_save()
+        # Journal the entries this game changed; compact now and then.
+        self._log.append(
+            {
+                "t": "game",
+                "v": game_entry,
+                "playlist": playlist_key,
+                "playlist_stats": playlist_stats,
+                "all_time": all_time,
+            }
+        )
+        if self._log.needs_compaction:
+            self.schedule_save()
 
         _LOGGER.info(
             "Recorded game %s: %.2f avg pts/round, %d players, %d rounds",
@@ -582,8 +660,11 @@ class StatsService:
                 elif years_off <= CORRECT_GUESS_THRESHOLD:
                     song["correct_guesses"] += 1
 
-        # Schedule deferred save (non-blocking)
-        self.schedule_save()
+        self._songs_rev += 1
+
+        self._log.append({"t": "song", "k": song_key, "v": song})
+        if self._log.needs_compaction:
+            self.schedule_save()
 
         _LOGGER.debug(
             "Recorded song result for %s: %d guesses, %d correct",
@@ -653,6 +734,32 @@ class StatsService:
             Dict with most_played, hardest, easiest, and by_playlist data
 
         """
+        # The per-song counters only change in record_song_result, so the
+        # aggregation runs once per recorded round instead of per request.
+        cached = self._song_stats_cache
+        if (
+            cached is None
+            or cached[0] != self._songs_rev
+            or cached[1] is not self._stats
+        ):
+            cached = (self._songs_rev, self._stats, self._aggregate_song_stats())
+            self._song_stats_cache = cached
+        result = cached[2]
+
+        # Apply playlist filter if specified
+        if playlist_filter:
+            result = {
+                **result,
+                "by_playlist": [
+                    p
+                    for p in result["by_playlist"]
+                    if p["playlist_id"] == playlist_filter
+                ],
+            }
+        return result
+
+    def _aggregate_song_stats(self) -> dict[str, Any]:
+        """Song statistics across all playlists (see compute_song_stats)."""
         songs = self._stats.get("songs", {})
 
         if not songs:
@@ -787,12 +894,6 @@ class StatsService:
         # Sort playlists by total_plays descending
         by_playlist.sort(key=lambda p: p["total_plays"], reverse=True)
 
-        # Apply playlist filter if specified
-        if playlist_filter:
-            by_playlist = [
-                p for p in by_playlist if p["playlist_id"] == playlist_filter
-            ]
-
         def _format_song(s: dict) -> dict | None:
             """Format song for API response."""
             if not s:
@@ -0,0 +1,131 @@
+/**
+ * Unit tests for the delta state sync client (server/state_sync.py).
+ *
+ * The server sends a `state_snapshot` on subscribe and JSON-Patch
+ * `state_delta` frames afterwards. The client must rebuild exactly the
+ * `state` message a full broadcast would carry, and must ask for a new
+ * snapshot instead of applying a delta on top of the wrong revision.
+ */
+import { describe, it, expect, vi } from 'vitest';
+import { applyPatch, createStateSync } from '../state-sync.js';
+
+// ------------------------------------------------------------------
+// applyPatch — the op subset emitted by server/state_sync.diff_state
+// ------------------------------------------------------------------
+describe('applyPatch', () => {
+    it('adds, replaces and removes object keys', () => {
+        const doc = { phase: 'LOBBY', timer: 30, stale: true };
+        const out = applyPatch(doc, [
+            { op: 'replace', path: '/phase', value: 'PLAYING' },
+            { op: 'add', path: '/round', value: 1 },
+            { op: 'remove', path: '/stale' },
+        ]);
+        expect(out).toEqual({ phase: 'PLAYING', timer: 30, round: 1 });
+    });
+
+    it('replaces array elements and nested fields by index', () => {
+        const doc = { players: [{ name: 'Ann', score: 0 }, { name: 'Bob', score: 0 }] };
+        applyPatch(doc, [{ op: 'replace', path: '/players/1/score', value: 10 }]);
+        expect(doc.players[1]).toEqual({ name: 'Bob', score: 10 });
+    });
+
+    it('unescapes ~0 and ~1 in pointer tokens', () => {
+        const doc = { 'a/b': { '~c': 1 } };
+        applyPatch(doc, [{ op: 'replace', path: '/a~1b/~0c', value: 2 }]);
+        expect(doc['a/b']['~c']).toBe(2);
+    });
+
+    it('replaces the whole document for the root path', () => {
+        expect(applyPatch({ a: 1 }, [{ op: 'replace', path: '', value: { b: 2 } }])).toEqual({ b: 2 });
+    });
+
+    it('throws when a path does not resolve', () => {
+        expect(() => applyPatch({}, [{ op: 'replace', path: '/missing/x', value: 1 }])).toThrow();
+    });
+});
+
+// ------------------------------------------------------------------
+// createStateSync — revision tracking and resync on gaps
+// ------------------------------------------------------------------
+describe('createStateSync', () => {
+    function setup() {
+        const send = vi.fn();
+        const onState = vi.fn();
+        const sync = createStateSync({ send, onState });
+        return { send, onState, sync };
+    }
+
+    const snapshot = {
+        type: 'state_snapshot',
+        rev: 4,
+        state: { type: 'state', phase: 'PLAYING', players: [{ name: 'Ann', score: 0 }] },
+    };
+
+    it('subscribes on start', () => {
+        const { send, sync } = setup();
+        sync.start();
+        expect(send).toHaveBeenCalledWith({ type: 'state_sync' });
+    });
+
+    it('emits the snapshot and then each patched state', () => {
+        const { onState, sync } = setup();
+        sync.start();
+        expect(sync.handleMessage(structuredClone(snapshot))).toBe(true);
+        expect(onState).toHaveBeenLastCalledWith(snapshot.state);
+
+        sync.handleMessage({
+            type: 'state_delta',
+            base: 4,
+            rev: 5,
+            ops: [{ op: 'replace', path: '/players/0/score', value: 7 }],
+        });
+        expect(sync.rev).toBe(5);
+        expect(onState).toHaveBeenLastCalledWith({
+            type: 'state',
+            phase: 'PLAYING',
+            players: [{ name: 'Ann', score: 7 }],
+        });
+    });
+
+    it('hands out copies the page may mutate', () => {
+        const { onState, sync } = setup();
+        sync.handleMessage(structuredClone(snapshot));
+        onState.mock.calls[0][0].players.length = 0;
+        expect(sync.state.players).toHaveLength(1);
+    });
+
+    it('requests a snapshot once when a delta skips a revision', () => {
+        const { send, onState, sync } = setup();
+        sync.start();
+        sync.handleMessage(structuredClone(snapshot));
+        send.mockClear();
+        onState.mockClear();
+
+        sync.handleMessage({ type: 'state_delta', base: 5, rev: 6, ops: [] });
+        sync.handleMessage({ type: 'state_delta', base: 6, rev: 7, ops: [] });
+        expect(send).toHaveBeenCalledTimes(1);
+        expect(send).toHaveBeenCalledWith({ type: 'state_sync' });
+        expect(onState).not.toHaveBeenCalled();
+        expect(sync.state).toBeNull();
+    });
+
+    it('resyncs when a patch does not apply', () => {
+        const { send, sync } = setup();
+        sync.handleMessage(structuredClone(snapshot));
+        const warn = vi.spyOn(console, 'warn').mockImplementation(() => {});
+        sync.handleMessage({
+            type: 'state_delta',
+            base: 4,
+            rev: 5,
+            ops: [{ op: 'replace', path: '/nope/0', value: 1 }],
+        });
+        warn.mockRestore();
+        expect(send).toHaveBeenCalledWith({ type: 'state_sync' });
+    });
+
+    it('leaves other messages to the page', () => {
+        const { sync } = setup();
+        expect(sync.handleMessage({ type: 'error', code: 'X' })).toBe(false);
+        expect(sync.handleMessage({ type: 'state', phase: 'LOBBY' })).toBe(false);
+    });
+});
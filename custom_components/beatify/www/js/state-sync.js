@@ -0,0 +1,150 @@
+/**
+ * Delta state sync — client side of server/state_sync.py.
+ *
+ * A socket that sends {type: 'state_sync'} stops receiving full `state`
+ * broadcasts and gets a `state_snapshot` followed by `state_delta` frames
+ * carrying JSON-Patch ops (add / replace / remove) on top of the previous
+ * revision. This module keeps the reconstructed state and hands the page the
+ * same {type: 'state', ...} message a full broadcast would have delivered, so
+ * existing state handlers work unchanged.
+ *
+ * A delta whose `base` is not the held revision means a frame was missed (or
+ * arrived before the snapshot): the state is dropped and a fresh snapshot is
+ * requested with another `state_sync`.
+ *
+ * Loaded as an ES module (exposes window.BeatifyStateSync for the classic
+ * page scripts) and imported directly by the vitest suite.
+ */
+
+function decodeToken(token) {
+    return token.replace(/~1/g, '/').replace(/~0/g, '~');
+}
+
+/**
+ * Apply JSON-Patch ops to a document in place.
+ *
+ * Only the subset the server emits is supported: `add` / `replace` on object
+ * keys and existing array indexes, `remove` on object keys, and `replace` of
+ * the root (path '').
+ *
+ * @param {Object} doc - Document to patch (mutated)
+ * @param {Array<{op: string, path: string, value?: *}>} ops - Patch operations
+ * @returns {Object} The patched document (a new object for a root replace)
+ * @throws {Error} When a path does not resolve
+ */
+export function applyPatch(doc, ops) {
+    let root = doc;
+    for (const { op, path, value } of ops) {
+        if (path === '') {
+            if (op === 'remove') throw new Error('cannot remove the document root');
+            root = value;
+            continue;
+        }
+        const tokens = path.split('/').slice(1).map(decodeToken);
+        const last = tokens.pop();
+        let parent = root;
+        for (const token of tokens) {
+            if (parent === null || typeof parent !== 'object' || !(token in parent)) {
+                throw new Error('patch path not found: ' + path);
+            }
+            parent = parent[token];
+        }
+        if (parent === null || typeof parent !== 'object') {
+            throw new Error('patch path not found: ' + path);
+        }
+        if (op === 'remove') {
+            delete parent[last];
+        } else if (op === 'add' || op === 'replace') {
+            parent[last] = value;
+        } else {
+            throw new Error('unsupported patch op: ' + op);
+        }
+    }
+    return root;
+}
+
+/**
+ * Create a delta state sync session for one WebSocket connection.
+ *
+ * @param {Object} options
+ * @param {function(Object): void} options.send - Sends a message to the server
+ * @param {function(Object): void} options.onState - Receives each
+ *   reconstructed full `state` message
+ * @returns {{start: function(): void, handleMessage: function(Object): boolean,
+ *   reset: function(): void, readonly rev: ?number, readonly state: ?Object}}
+ *   `handleMessage` returns true when it consumed the message.
+ */
+export function createStateSync({ send, onState }) {
+    let rev = null;
+    let state = null;
+    let resyncPending = false;
+
+    function requestSnapshot() {
+        rev = null;
+        state = null;
+        if (resyncPending) return;
+        resyncPending = true;
+        send({ type: 'state_sync' });
+    }
+
+    function emit() {
+        // Hand out a copy: page handlers may keep or mutate what they get.
+        onState(structuredClone(state));
+    }
+
+    function handleMessage(msg) {
+        if (!msg || typeof msg !== 'object') return false;
+        if (msg.type === 'state_snapshot') {
+            resyncPending = false;
+            rev = msg.rev;
+            state = msg.state;
+            emit();
+            return true;
+        }
+        if (msg.type === 'state_delta') {
+            if (state === null || msg.base !== rev) {
+                requestSnapshot();
+                return true;
+            }
+            try {
+                state = applyPatch(state, msg.ops);
+            } catch (err) {
+                console.warn('[StateSync] Patch failed, resyncing:', err);
+                requestSnapshot();
+                return true;
+            }
+            rev = msg.rev;
+            emit();
+            return true;
+        }
+        return false;
+    }
+
+    return {
+        /** Subscribe (call on every socket open, reconnects included). */
+        start() {
+            resyncPending = false;
+            requestSnapshot();
+        },
+        handleMessage,
+        /** Forget the held state (socket closed). */
+        reset() {
+            rev = null;
+            state = null;
+            resyncPending = false;
+        },
+        get rev() {
+            return rev;
+        },
+        get state() {
+            return state;
+        },
+    };
+}
+
+if (typeof window !== 'undefined') {
+    window.BeatifyStateSync = {
+        applyPatch,
+        createStateSync,
+    };
+}
@@ -85,6 +85,9 @@ from .const import (
     CONF_MAX_PAST_CYCLES,
     CONF_MAX_FULL_TRACES_PER_PROFILE,
     CONF_MAX_FULL_TRACES_UNLABELED,
+    CONF_DERIVED_CACHE_MAX_KB,
+    CONF_HOT_PATH_TIMING,
+    CONF_HOT_PATH_SAMPLE_EVERY,
     CONF_WATCHDOG_INTERVAL,
     CONF_AUTO_TUNE_NOISE_EVENTS_THRESHOLD,
     CONF_COMPLETION_MIN_SECONDS,
@@ -95,6 +98,9 @@ from .const import (
     DEFAULT_MAX_PAST_CYCLES,
     DEFAULT_MAX_FULL_TRACES_PER_PROFILE,
     DEFAULT_MAX_FULL_TRACES_UNLABELED,
+    DEFAULT_DERIVED_CACHE_MAX_KB,
+    DEFAULT_HOT_PATH_TIMING,
+    DEFAULT_HOT_PATH_SAMPLE_EVERY,
     DEFAULT_WATCHDOG_INTERVAL,
     DEFAULT_AUTO_TUNE_NOISE_EVENTS_THRESHOLD,
     DEFAULT_COMPLETION_MIN_SECONDS,
@@ -105,6 +111,7 @@ from .const import (
     CONF_START_DURATION_THRESHOLD,
     CONF_RUNNING_DEAD_ZONE,
 )
+from . import backup_stream
 from .log_utils import DeviceLoggerAdapter
 
 _LOGGER = logging.getLogger(__name__)
@@ -223,6 +230,9 @@ async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     options.setdefault(
         CONF_MAX_FULL_TRACES_UNLABELED, DEFAULT_MAX_FULL_TRACES_UNLABELED
     )
+    options.setdefault(CONF_DERIVED_CACHE_MAX_KB, DEFAULT_DERIVED_CACHE_MAX_KB)
+    options.setdefault(CONF_HOT_PATH_TIMING, DEFAULT_HOT_PATH_TIMING)
+    options.setdefault(CONF_HOT_PATH_SAMPLE_EVERY, DEFAULT_HOT_PATH_SAMPLE_EVERY)
     options.setdefault(CONF_WATCHDOG_INTERVAL, DEFAULT_WATCHDOG_INTERVAL)
     options.setdefault(
         CONF_AUTO_TUNE_NOISE_EVENTS_THRESHOLD, DEFAULT_AUTO_TUNE_NOISE_EVENTS_THRESHOLD
@@ -766,14 +776,23 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                     translation_placeholders={"path": str(target)},
                 )
 
+            # A .ndjson/.jsonl(.gz) target streams one record per line instead
+            # of building the whole store as a single JSON string first.
+            streaming = backup_stream.is_ndjson_path(target)
+            if streaming:
+                payload = backup_stream.snapshot_lists(payload)
+
             # Write export (offloaded to executor to avoid blocking the event
             # loop). A caller-supplied path must never silently overwrite an
             # existing file even when is_allowed_path() accepts it; exclusive
             # creation ("x") makes that no-overwrite check atomic (no TOCTOU
             # window). The default generated path may be re-written freely.
             def _dump_and_write():
-                text = json.dumps(payload, indent=2)
                 try:
+                    if streaming:
+                        backup_stream.write_export(payload, target, exclusive=bool(file_path))
+                        return
+                    text = json.dumps(payload, indent=2)
                     if file_path:
                         # Exclusive creation ("x") makes the no-overwrite check
                         # atomic; the default generated path may be re-written.
@@ -846,6 +865,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
             try:
                 def _read_and_parse():
+                    # NDJSON backups are read a record at a time; classic JSON
+                    # exports are parsed whole.
+                    if backup_stream.is_ndjson_backup(source):
+                        return backup_stream.read_payload(source)
                     text = source.read_text(encoding="utf-8")
                     return json.loads(text)
                 payload = await hass.async_add_executor_job(_read_and_parse)
@@ -0,0 +1,246 @@
+# WashData - Home Assistant integration for appliance cycle monitoring via smart plugs.
+# Copyright (C) 2026 Lukas Bandura
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Streaming NDJSON backups (export/import services).
+
+The classic export is one JSON document: the whole store, every cycle trace
+included, is serialized into a single string before anything reaches disk, and
+the importer parses the whole file before it can look at it. On a multi-year
+history that is hundreds of MB of transient memory.
+
+An NDJSON backup holds one record per line, so both directions work a record
+at a time::
+
+    {"t": "header", "format": "ha_washdata_ndjson", "format_version": 1,
+     "version": <STORAGE_VERSION>, "entry_id": ..., "exported_at": ...,
+     "device_fingerprint": {...}, "entry_data": {...}, "entry_options": {...},
+     "counts": {"<list key>": n, ...}}
+    {"t": "data", "k": "<store key>", "v": <value>}     dict / scalar keys
+    {"t": "item", "k": "<store key>", "v": <element>}   one per list element
+    {"t": "end", "records": <data + item records>}
+
+List keys are written element by element, cycle lists last. The trailer makes
+a truncated file detectable. A ``.gz`` path is written (and any gzip file read)
+as one gzip stream of those lines.
+
+Both directions are synchronous and meant for the executor. Reading assembles
+the same ``{"version", "data", "entry_data", ...}`` envelope ``export_data``
+produces (deduplicating list elements on the way via ``ListDeduper``), so the
+result goes through the regular ``unwrap_import_payload`` / import path.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Any
+
+from .profile_store import ListDeduper
+
+_LOGGER = logging.getLogger(__name__)
+
+NDJSON_FORMAT = "ha_washdata_ndjson"
+NDJSON_FORMAT_VERSION = 1
+
+# File suffixes that select the streaming format on export.
+NDJSON_SUFFIXES: tuple[str, ...] = (".ndjson", ".jsonl", ".ndjson.gz", ".jsonl.gz")
+
+# Lists holding cycle traces: written after everything else, and only dict
+# elements are accepted back.
+_CYCLE_LISTS: tuple[str, ...] = ("past_cycles", "reference_cycles")
+
+_HEADER_KEYS: tuple[str, ...] = (
+    "version", "entry_id", "exported_at", "device_fingerprint", "entry_data", "entry_options",
+)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def is_ndjson_path(path: str | Path) -> bool:
+    """Whether an export target path asks for the streaming format."""
+    return str(path).lower().endswith(NDJSON_SUFFIXES)
+
+
+def snapshot_lists(payload: dict[str, Any]) -> dict[str, Any]:
+    """Copy the list containers of an ``export_data`` payload (call on the loop).
+
+    ``export_data`` shallow-copies the store dict but shares its lists. Writing
+    happens in the executor while cycles may be appended on the loop, so the
+    writer gets its own (pointer-only) list copies to iterate.
+    """
+    data = payload.get("data")
+    if isinstance(data, dict):
+        payload = dict(payload)
+        payload["data"] = {k: list(v) if isinstance(v, list) else v for k, v in data.items()}
+    return payload
+
+
+def _open_text(path: Path, mode: str) -> IO[str]:
+    if mode.startswith("r"):
+        with open(path, "rb") as probe:
+            compressed = probe.read(2) == _GZIP_MAGIC
+    else:
+        compressed = path.name.lower().endswith(".gz")
+    if compressed:
+        return gzip.open(path, mode + "t", encoding="utf-8")  # type: ignore[return-value]
+    return open(path, mode, encoding="utf-8")  # pylint: disable=consider-using-with
+
+
+def write_export(payload: dict[str, Any], path: Path, *, exclusive: bool = False) -> int:
+    """Write an ``export_data`` payload to ``path`` as NDJSON; returns the record count.
+
+    ``exclusive`` creates the file atomically and raises ``FileExistsError``
+    when it already exists. OSErrors propagate to the caller.
+    """
+    data = payload.get("data") if isinstance(payload.get("data"), dict) else {}
+    counts = {k: len(v) for k, v in data.items() if isinstance(v, list)}
+    header: dict[str, Any] = {"t": "header", "format": NDJSON_FORMAT,
+                              "format_version": NDJSON_FORMAT_VERSION}
+    for key in _HEADER_KEYS:
+        header[key] = payload.get(key)
+    header["counts"] = counts
+
+    scalars = [k for k, v in data.items() if not isinstance(v, list)]
+    lists = [k for k, v in data.items() if isinstance(v, list) and k not in _CYCLE_LISTS]
+    lists += [k for k in _CYCLE_LISTS if isinstance(data.get(k), list)]
+
+    records = 0
+    with _open_text(path, "x" if exclusive else "w") as handle:
+        handle.write(json.dumps(header) + "\n")
+        for key in scalars:
+            handle.write(json.dumps({"t": "data", "k": key, "v": data[key]}) + "\n")
+            records += 1
+        for key in lists:
+            for item in data[key]:
+                handle.write(json.dumps({"t": "item", "k": key, "v": item}) + "\n")
+                records += 1
+        handle.write(json.dumps({"t": "end", "records": records}) + "\n")
+    return records
+
+
+def is_ndjson_backup(path: Path) -> bool:
+    """Whether ``path`` holds an NDJSON backup (gzip, or a header first line)."""
+    with open(path, "rb") as probe:
+        head = probe.read(2)
+    if head == _GZIP_MAGIC:
+        return True
+    with open(path, encoding="utf-8", errors="replace") as handle:
+        first = handle.readline(64 * 1024)
+    try:
+        record = json.loads(first)
+    except ValueError:
+        return False  # a pretty-printed JSON export opens with a bare "{"
+    return isinstance(record, dict) and record.get("t") == "header"
+
+
+def iter_records(path: Path) -> Iterator[dict[str, Any]]:
+    """Validated records of an NDJSON backup, header first, trailer excluded.
+
+    Raises ``ValueError`` (with the line number) on a malformed line, a
+    missing/foreign header, an unsupported format version, or a missing or
+    inconsistent trailer (truncated file).
+    """
+    records = 0
+    seen_header = False
+    seen_end = False
+    with _open_text(path, "r") as handle:
+        for lineno, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            if seen_end:
+                raise ValueError(f"line {lineno}: data after the end record")
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                raise ValueError(f"line {lineno}: invalid JSON ({exc})") from exc
+            kind = record.get("t") if isinstance(record, dict) else None
+            if not seen_header:
+                if kind != "header" or record.get("format") != NDJSON_FORMAT:
+                    raise ValueError("not a WashData NDJSON backup (missing header)")
+                if int(record.get("format_version") or 0) > NDJSON_FORMAT_VERSION:
+                    raise ValueError(
+                        f"backup format version {record.get('format_version')} is newer "
+                        "than this version of WashData supports"
+                    )
+                seen_header = True
+                yield record
+                continue
+            if kind == "end":
+                if record.get("records") != records:
+                    raise ValueError(
+                        f"backup is incomplete ({records} records, trailer says "
+                        f"{record.get('records')})"
+                    )
+                seen_end = True
+                continue
+            if kind not in ("data", "item") or not isinstance(record.get("k"), str):
+                raise ValueError(f"line {lineno}: unknown record")
+            records += 1
+            yield record
+    if not seen_header:
+        raise ValueError("not a WashData NDJSON backup (empty file)")
+    if not seen_end:
+        raise ValueError("backup is truncated (no end record)")
+
+
+def read_payload(path: Path) -> dict[str, Any]:
+    """Assemble an NDJSON backup into an ``export_data``-shaped payload.
+
+    Memory stays at roughly the size of the imported store: lines are parsed
+    one at a time and list elements are appended (deduplicated) as they
+    arrive. Cycle-list elements that are not objects are dropped.
+    """
+    header: dict[str, Any] = {}
+    data: dict[str, Any] = {}
+    dedupers: dict[str, ListDeduper] = {}
+    duplicates = 0
+    invalid = 0
+    for record in iter_records(path):
+        kind = record["t"]
+        if kind == "header":
+            header = record
+            # Lists are only implied by their items; keep empty ones too.
+            counts = record.get("counts") if isinstance(record.get("counts"), dict) else {}
+            for key in counts:
+                data[str(key)] = []
+            continue
+        key = record["k"]
+        if kind == "data":
+            data[key] = record.get("v")
+            continue
+        value = record.get("v")
+        if key in _CYCLE_LISTS and not isinstance(value, dict):
+            invalid += 1
+            continue
+        dedup = dedupers.get(key)
+        if dedup is None:
+            current = data.get(key)
+            dedup = dedupers[key] = ListDeduper(current if isinstance(current, list) else [])
+            data[key] = dedup.base
+        if not dedup.add(value):
+            duplicates += 1
+    if duplicates or invalid:
+        _LOGGER.warning(
+            "NDJSON import %s: skipped %s duplicate and %s invalid records",
+            path, duplicates, invalid,
+        )
+    payload: dict[str, Any] = {key: header.get(key) for key in _HEADER_KEYS}
+    payload["version"] = payload.get("version") or 2
+    payload["data"] = data
+    return payload
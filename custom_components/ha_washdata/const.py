@@ -76,6 +76,9 @@ CONF_PROFILE_MATCH_MAX_DURATION_RATIO = "profile_match_max_duration_ratio"
 CONF_MAX_PAST_CYCLES = "max_past_cycles"
 CONF_MAX_FULL_TRACES_PER_PROFILE = "max_full_traces_per_profile"
 CONF_MAX_FULL_TRACES_UNLABELED = "max_full_traces_unlabeled"
+CONF_DERIVED_CACHE_MAX_KB = "derived_cache_max_kb"
+CONF_HOT_PATH_TIMING = "hot_path_timing"
+CONF_HOT_PATH_SAMPLE_EVERY = "hot_path_sample_every"
 CONF_WATCHDOG_INTERVAL = "watchdog_interval"  # Derived from sampling_interval
 CONF_MATCH_PERSISTENCE = "match_persistence"
 CONF_COMPLETION_MIN_SECONDS = "completion_min_seconds"
@@ -267,6 +270,13 @@ DEFAULT_PROFILE_MATCH_MAX_DURATION_RATIO = 1.5
 DEFAULT_MAX_PAST_CYCLES = 200
 DEFAULT_MAX_FULL_TRACES_PER_PROFILE = 20
 DEFAULT_MAX_FULL_TRACES_UNLABELED = 20
+# Memory ceiling (KiB) of the per-entry cache of derived store data
+# (derived_cache.py): decompressed traces, parsed phase profiles, cohesion...
+DEFAULT_DERIVED_CACHE_MAX_KB = 8192
+# Per-stage hot-path timing (hot_path.py): off by default; when on, one power
+# event in DEFAULT_HOT_PATH_SAMPLE_EVERY is timed.
+DEFAULT_HOT_PATH_TIMING = False
+DEFAULT_HOT_PATH_SAMPLE_EVERY = 1
 DEFAULT_WATCHDOG_INTERVAL = 30  # Derived: 2 * sampling_interval + 1
 DEFAULT_MATCH_PERSISTENCE = 3
 DEFAULT_END_REPEAT_COUNT = 1  # 1 = current behavior (no repeat required)
@@ -451,6 +461,9 @@ MATCH_DTW_REFINE_TOP_N = 5         # DTW is applied to this many top candidates
 #   "ddtw"   - like "scaled" but warps on the first derivative (slope) of the
 #              curves, so alignment is driven by shape rather than absolute level.
 #   "ensemble" - blend of "scaled" and "ddtw": ENSEMBLE_W*L1 + (1-W)*DDTW.
+# Non-legacy modes refine all top-N candidates in one batched DTW fill. Config
+# key "dtw_prune" (off by default) additionally skips candidates an LB_Keogh
+# bound proves cannot reach the top two; their scores become upper bounds.
 # Defaults tuned via devtools/dtw_ab_eval.py on cycle_data/ (leave-one-out top-1):
 # off 62.4%, legacy 66.4%, scaled 69.9%, ddtw 69.0%, ensemble(w=0.7,dd=30) 70.7%.
 DEFAULT_DTW_MODE = "ensemble"
@@ -826,7 +839,10 @@ GROUP_MIN_COHESION = 0.80
 # v11 is a marker-only bump: per-phase profiles (envelope["phase_profile"]) are
 # derived cache populated by async_rebuild_envelope, so no data migration is
 # needed - they self-populate on the next envelope rebuild.
-STORAGE_VERSION = 11
+# v12 is a marker-only bump: cycle traces moved to a columnar sidecar file
+# (trace_store.py) referenced by ``power_ref``; inline traces still load and are
+# moved out on the next save.
+STORAGE_VERSION = 12
 STORAGE_KEY = "ha_washdata"
 
 # Notification events
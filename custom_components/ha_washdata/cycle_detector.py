@@ -22,7 +22,8 @@ import itertools
 import logging
 import math
 from dataclasses import dataclass
-from datetime import datetime
+from collections.abc import Sequence
+from datetime import datetime, timedelta
 from typing import Any, Callable, cast
 import numpy as np
 
@@ -97,8 +98,23 @@ ML_END_GUARD_MAX_DEFER_SECONDS = 1800.0  # cap the extra wait the guard may add
 ML_PROVIDER_THROTTLE_SECONDS = 30.0
 if not 0 < DISHWASHER_END_SPIKE_MIN_PROGRESS < 1:
     raise ValueError("DISHWASHER_END_SPIKE_MIN_PROGRESS must be a fraction in (0, 1)")
+from .power_trace import PowerTrace, decode_trace, encode_trace
 from .signal_processing import energy_gap_threshold_s, integrate_wh
 
+_ONE_US = timedelta(microseconds=1)
+
+
+def _next_false(mask: np.ndarray) -> np.ndarray:
+    """``out[i]`` = first index ``k >= i`` where ``mask[k]`` is False (else len)."""
+    n = len(mask)
+    idx = np.where(mask, n, np.arange(n))
+    return np.minimum.accumulate(idx[::-1])[::-1]
+
+
+def _accumulate(start: float, terms: np.ndarray) -> float:
+    """``start + t0 + t1 + ...`` added strictly left to right (as a += loop would)."""
+    return float(np.add.accumulate(np.concatenate(([start], terms)))[-1])
+
 _LOGGER = logging.getLogger(__name__)
 
 # After a user/external stop the manual-stop lockout swallows the machine's
@@ -154,11 +170,11 @@ class CycleDetectorConfig:
 
 
 def trim_zero_readings(
-    readings: list[tuple[datetime, float]],
+    readings: Sequence[tuple[datetime, float]],
     threshold: float = 0.5,
     trim_start: bool = True,
     trim_end: bool = True,
-) -> list[tuple[datetime, float]]:
+) -> Sequence[tuple[datetime, float]]:
     """Trim continuous zero/near-zero readings from start and end of cycle.
 
     Args:
@@ -168,14 +184,19 @@ def trim_zero_readings(
         trim_end: Whether to trim zeros from the end
 
     Returns:
-        Trimmed list
+        Trimmed list (a :class:`PowerTrace` slice for a ``PowerTrace``)
     """
     if not readings:
         return readings
+    powers = (
+        readings.watts().tolist()
+        if isinstance(readings, PowerTrace)
+        else [p for _, p in readings]
+    )
 
     start_idx = 0
     if trim_start:
-        for i, (_, power) in enumerate(readings):
+        for i, power in enumerate(powers):
             if power > threshold:
                 start_idx = i
                 break
@@ -187,8 +208,8 @@ def trim_zero_readings(
     if trim_end:
         # Find last non-zero reading
         found_end = False
-        for i in range(len(readings) - 1, -1, -1):
-            if readings[i][1] > threshold:
+        for i in range(len(powers) - 1, -1, -1):
+            if powers[i] > threshold:
                 end_idx = i
                 found_end = True
                 break
@@ -220,7 +241,7 @@ class CycleDetector:
         on_cycle_end: Callable[[dict[str, Any]], None],
         profile_matcher: (
             Callable[
-                [list[tuple[datetime, float]]],
+                [Sequence[tuple[datetime, float]]],
                 tuple[str | None, float, float, str | None],
             ]
             | None
@@ -267,7 +288,8 @@ class CycleDetector:
         self._lockout_high_seconds: float = 0.0
 
         # Data
-        self._power_readings: list[tuple[datetime, float]] = []  # (time, raw_power)
+        # (time, raw_power) of the current cycle, as compact columns (power_trace.py)
+        self._power_readings = PowerTrace()
         self._current_cycle_start: datetime | None = None
         self._last_active_time: datetime | None = None
         self._cycle_max_power: float = 0.0
@@ -422,7 +444,9 @@ class CycleDetector:
 
         # Call the matcher
         try:
-            result = self._profile_matcher(self._power_readings)
+            # Zero-copy, length-frozen view: the matcher may run asynchronously
+            # while readings keep arriving.
+            result = self._profile_matcher(self._power_readings.snapshot())
             # If synchronous result returned, process it.
             # If None returned (async offload), the matcher is responsible for
             # calling update_match later.
@@ -502,7 +526,7 @@ class CycleDetector:
         if (
             self._matched_profile
             and self._power_readings
-            and self._in_anticrease_freeze(self._power_readings[-1][0])
+            and self._in_anticrease_freeze(self._power_readings.last_time())
         ):
             return
         # Unpack 5 elements (or 4 for backward compatibility if needed, but wrapper is updated)
@@ -615,7 +639,7 @@ class CycleDetector:
     def reset(self, target_state: str = STATE_OFF) -> None:
         """Force reset the detector state to target state."""
         self._transition_to(target_state, dt_util.now())
-        self._power_readings = []
+        self._power_readings = PowerTrace()
         self._current_cycle_start = None
         self._last_active_time = None
         self._cycle_max_power = 0.0
@@ -821,12 +845,14 @@ class CycleDetector:
                     # Preserve the anti-wrinkle candidate window instead of dropping ramp-up samples.
                     if candidate_start and candidate_start < timestamp:
                         start_power = candidate_start_power if candidate_start_power > 0 else power
-                        self._power_readings = [(candidate_start, start_power), (timestamp, power)]
+                        self._power_readings = PowerTrace(
+                            [(candidate_start, start_power), (timestamp, power)]
+                        )
                         interval_s = (timestamp - candidate_start).total_seconds()
                         avg_power = (start_power + power) / 2.0
                         self._energy_since_idle_wh = max(0.0, avg_power * (interval_s / 3600.0))
                     else:
-                        self._power_readings = [(timestamp, power)]
+                        self._power_readings = PowerTrace([(timestamp, power)])
                         self._energy_since_idle_wh = power * (dt / 3600.0) if dt > 0 else 0.0
 
                     self._cycle_max_power = max(candidate_peak, power)
@@ -937,7 +963,7 @@ class CycleDetector:
                 self._preserve_delay_band_on_off = self._delay_band_start is not None
                 self._transition_to(STATE_STARTING, timestamp)
                 self._current_cycle_start = timestamp
-                self._power_readings = [(timestamp, power)]
+                self._power_readings = PowerTrace([(timestamp, power)])
                 self._energy_since_idle_wh = power * (dt / 3600.0) if dt > 0 else 0.0
                 self._cycle_max_power = power
             # NOTE: terminal-state expiry (Finished/Interrupted/Force-Stopped -> Off)
@@ -979,7 +1005,7 @@ class CycleDetector:
                         start_timestamp = self._delay_wait_high_start or timestamp
                         start_power = self._delay_wait_high_power or power
                         self._current_cycle_start = start_timestamp
-                        self._power_readings = [(start_timestamp, start_power)]
+                        self._power_readings = PowerTrace([(start_timestamp, start_power)])
                         elapsed_from_anchor = (timestamp - start_timestamp).total_seconds()
                         self._energy_since_idle_wh = (
                             start_power * (elapsed_from_anchor / 3600.0)
@@ -987,7 +1013,7 @@ class CycleDetector:
                             else 0.0
                         )
                         if timestamp != start_timestamp:
-                            self._power_readings.append((timestamp, power))
+                            self._power_readings.add(timestamp, power)
                         self._cycle_max_power = max(start_power, power)
             else:
                 # Power dropped back below start threshold - clear the
@@ -1023,7 +1049,7 @@ class CycleDetector:
                     self._transition_to(STATE_OFF, timestamp)
 
         elif self._state == STATE_STARTING:
-            self._power_readings.append((timestamp, power))
+            self._power_readings.add(timestamp, power)
             self._cycle_max_power = max(self._cycle_max_power, power)
 
             if is_high:
@@ -1088,7 +1114,7 @@ class CycleDetector:
                     self._transition_to(STATE_OFF, timestamp)
 
         elif self._state == STATE_RUNNING:
-            self._power_readings.append((timestamp, power))
+            self._power_readings.add(timestamp, power)
             self._cycle_max_power = max(self._cycle_max_power, power)
 
             # Anti-crease finalize (#296): a matched cycle past its expected
@@ -1122,17 +1148,14 @@ class CycleDetector:
                 # standby. Snap the end back to the last real activity (the last
                 # reading above the plateau ceiling) and drop the trailing plateau.
                 level_ceiling = float(self._cycle_max_power) * STANDBY_BAND_MAX_FRACTION
-                plateau_start_idx = None
-                for i in range(len(self._power_readings) - 1, -1, -1):
-                    if float(self._power_readings[i][1]) > level_ceiling:
-                        plateau_start_idx = i
-                        break
+                above = np.flatnonzero(self._power_readings.watts() > level_ceiling)
+                plateau_start_idx = int(above[-1]) if above.size else None
                 if (
                     plateau_start_idx is not None
                     and plateau_start_idx < len(self._power_readings) - 1
                 ):
-                    self._power_readings = self._power_readings[: plateau_start_idx + 1]
-                    self._last_active_time = self._power_readings[-1][0]
+                    self._power_readings.truncate(plateau_start_idx + 1)
+                    self._last_active_time = self._power_readings.last_time()
                     current_duration = (
                         self._last_active_time - start_time
                     ).total_seconds()
@@ -1166,7 +1189,7 @@ class CycleDetector:
                 )
 
         elif self._state == STATE_PAUSED:
-            self._power_readings.append((timestamp, power))
+            self._power_readings.add(timestamp, power)
 
             # Anti-crease finalize (#296) - see the RUNNING branch.
             if self._maybe_finalize_anticrease_tail(timestamp):
@@ -1184,7 +1207,7 @@ class CycleDetector:
                     self._transition_to(STATE_ENDING, timestamp)
 
         elif self._state == STATE_ENDING:
-            self._power_readings.append((timestamp, power))
+            self._power_readings.add(timestamp, power)
 
             # Hard cap: ENDING must not run longer than RUNNING's 8 h safety limit.
             # Without this a standby baseline can hold the state open indefinitely.
@@ -1620,6 +1643,192 @@ class CycleDetector:
                             self._config.end_energy_threshold,
                         )
 
+    # ------------------------------------------------------------------
+    # Batch replay
+    # ------------------------------------------------------------------
+
+    def process_readings(
+        self,
+        timestamps: Sequence[datetime],
+        powers: Sequence[float] | np.ndarray,
+        before_reading: Callable[[datetime], None] | None = None,
+    ) -> None:
+        """Replay a whole trace; identical to ``process_reading`` per sample.
+
+        Most of a replayed trace is spent in stretches where the state machine
+        only moves its accumulators: an idle device sitting in OFF (or a
+        terminal state) below its threshold, and a RUNNING cycle above the stop
+        threshold between two match checks. Those stretches are found up front
+        from vectorised threshold crossings, timestamp ordering and the few
+        elapsed-time gates that could fire inside them (next profile match,
+        anti-crease / standby-band windows, the 8 h cap), and are applied in one
+        step. Every other reading - each candidate transition point - still goes
+        through :meth:`process_reading`, so callbacks, matcher calls, state and
+        the stored trace are exactly what the per-sample loop produces.
+
+        ``before_reading`` is invoked with the timestamp of each reading that is
+        stepped individually (the only ones that can fire callbacks), so a
+        caller that tags callback output with the current time can keep it in
+        sync without paying for every sample.
+        """
+        ts = list(timestamps)
+        pw = powers.tolist() if isinstance(powers, np.ndarray) else list(powers)
+        n = len(ts)
+        if n == 0:
+            return
+        t0 = ts[0]
+        us = np.fromiter(((t - t0) // _ONE_US for t in ts), dtype=np.int64, count=n)
+        p = np.asarray(pw, dtype=float)
+        # ordered[k]: reading k is not older than reading k-1 (k=0 is checked
+        # against _last_process_time at span start).
+        ordered = np.ones(n, dtype=bool)
+        ordered[1:] = us[1:] >= us[:-1]
+        cfg = self._config
+        low_start = _next_false(p < cfg.start_threshold_w)
+        low_stop = _next_false(p < cfg.stop_threshold_w)
+        high_stop = _next_false(p >= cfg.stop_threshold_w)
+        in_order = _next_false(ordered)
+
+        i = 0
+        while i < n:
+            j = self._batch_span(i, ts, us, t0, low_start, low_stop, high_stop, in_order)
+            if j > i:
+                self._apply_batch_span(i, j, ts, pw, us, p)
+                i = j
+                continue
+            if before_reading is not None:
+                before_reading(ts[i])
+            self.process_reading(pw[i], ts[i])
+            i += 1
+
+    def _batch_span(
+        self,
+        i: int,
+        ts: list[datetime],
+        us: np.ndarray,
+        t0: datetime,
+        low_start: np.ndarray,
+        low_stop: np.ndarray,
+        high_stop: np.ndarray,
+        in_order: np.ndarray,
+    ) -> int:
+        """End (exclusive) of the accumulate-only span starting at ``i``, or ``i``."""
+        if self._ignore_power_until_idle:
+            return i
+        last = self._last_process_time
+        if last is not None and ts[i] < last:
+            return i
+        cfg = self._config
+        state = self._state
+        end = int(in_order[i + 1]) if i + 1 < len(ts) else len(ts)
+        if state in (STATE_OFF, STATE_FINISHED, STATE_INTERRUPTED, STATE_FORCE_STOPPED):
+            if state == STATE_OFF:
+                # Below start_threshold (OFF hysteresis); with delayed-start
+                # detection armed, in-band readings feed the band timer, so
+                # only sub-stop readings are inert.
+                quiet = (
+                    low_stop
+                    if cfg.delay_detect_enabled and cfg.stop_threshold_w < cfg.start_threshold_w
+                    else low_start
+                )
+            else:
+                quiet = low_stop
+            return min(end, int(quiet[i]))
+        if state != STATE_RUNNING:
+            return i
+        end = min(end, int(high_stop[i]))
+        if end <= i:
+            return i
+        ok = np.ones(end - i, dtype=bool)
+        if self._profile_matcher is not None:
+            if self._last_match_time is None:
+                return i
+            lm_us = (self._last_match_time - t0) // _ONE_US
+            ok &= (us[i:end] - lm_us) / 1e6 < cfg.match_interval
+        start = self._current_cycle_start
+        if start:
+            dur = (us[i:end] - (start - t0) // _ONE_US) / 1e6
+            ok &= dur <= 28800
+            matched = bool(self._matched_profile and self._expected_duration > 0)
+            if (
+                matched
+                and cfg.device_type in STANDBY_BAND_FINALIZE_DEVICE_TYPES
+                and not self._verified_pause
+            ):
+                ok &= dur < self._expected_duration * STANDBY_BAND_MIN_RATIO
+            if (
+                matched
+                and cfg.anti_wrinkle_enabled
+                and cfg.device_type in (
+                    DEVICE_TYPE_WASHING_MACHINE, DEVICE_TYPE_DRYER, DEVICE_TYPE_WASHER_DRYER,
+                )
+                and not self._verified_pause
+                and not self._last_match_confidence < 0.4
+                and not (self._match_ambiguous or self._match_prefix_ambiguous)
+            ):
+                ok &= dur < self._expected_duration * ANTI_CREASE_FINALIZE_RATIO
+        return i + (int(np.argmin(ok)) if not ok.all() else len(ok))
+
+    def _apply_batch_span(
+        self,
+        i: int,
+        j: int,
+        ts: list[datetime],
+        pw: list[float],
+        us: np.ndarray,
+        p: np.ndarray,
+    ) -> None:
+        """Fold readings ``[i, j)`` of an accumulate-only span into the state."""
+        last = self._last_process_time
+        dts = np.empty(j - i, dtype=float)
+        dts[0] = (ts[i] - last).total_seconds() if last else 0.0
+        dts[1:] = (us[i + 1:j] - us[i:j - 1]) / 1e6
+
+        # Cadence: only the final 20-sample window (and the p95 taken after the
+        # last qualifying dt) survives the span.
+        cadence = dts[dts > 0.1].tolist()
+        if cadence:
+            self._recent_dts = (self._recent_dts + cadence)[-20:]
+            if len(self._recent_dts) >= 5:
+                self._p95_dt = float(np.percentile(self._recent_dts, 95))
+            else:
+                self._p95_dt = max(cadence[-1], 1.0)
+        self._last_process_time = ts[j - 1]
+
+        keep = max(0, self._config.smoothing_window)
+        buffer = self._ma_buffer + pw[i:j]
+        self._ma_buffer = buffer[-keep:] if keep else []
+
+        self._time_in_state = _accumulate(self._time_in_state, dts)
+        self._last_power = pw[j - 1]
+
+        if self._state == STATE_RUNNING:
+            self._time_above_threshold = _accumulate(self._time_above_threshold, dts)
+            self._time_below_threshold = 0.0
+            self._energy_since_idle_wh = _accumulate(
+                self._energy_since_idle_wh, p[i:j] * (dts / 3600.0)
+            )
+            self._last_active_time = ts[j - 1]
+            self._power_readings.extend(zip(ts[i:j], pw[i:j]))
+            self._cycle_max_power = max(self._cycle_max_power, max(pw[i:j]))
+            return
+
+        self._time_below_threshold = _accumulate(self._time_below_threshold, dts)
+        self._time_above_threshold = 0.0
+        self._anti_wrinkle_candidate_start = None
+        self._anti_wrinkle_candidate_peak = 0.0
+        self._anti_wrinkle_candidate_start_power = 0.0
+        if (
+            self._state == STATE_OFF
+            and self._config.delay_detect_enabled
+            and self._config.stop_threshold_w < self._config.start_threshold_w
+        ):
+            # Sub-stop readings: "machine genuinely idle" band reset.
+            self._delay_band_start = None
+            self._delay_band_seconds = 0.0
+            self._delay_band_peak = 0.0
+            self._preserve_delay_band_on_off = False
+
     def _transition_to(self, new_state: str, timestamp: datetime) -> None:
         """Handle state transitions."""
         if self._state == new_state:
@@ -1704,7 +1913,7 @@ class CycleDetector:
         # Throttle: reuse the last result within the recompute window, but only when
         # it was computed for THIS cycle and the same expected_duration (which can
         # change under overrun) — otherwise recompute.
-        now_ts = self._power_readings[-1][0]
+        now_ts = self._power_readings.last_time()
         exp = float(self._expected_duration)
         cache = self._ml_end_cache
         if (
@@ -1714,10 +1923,7 @@ class CycleDetector:
             and (now_ts - cache[0]).total_seconds() < ML_PROVIDER_THROTTLE_SECONDS
         ):
             return cache[3]
-        points = [
-            ((ts - start).total_seconds(), float(power))
-            for ts, power in self._power_readings
-        ]
+        points = self._power_readings.offset_points(start)
         try:
             result = provider(points, exp)
         except Exception:  # noqa: BLE001 - ML must never break detection
@@ -1749,10 +1955,7 @@ class CycleDetector:
         trace's own cadence (`energy_gap_threshold_s`), so a change-only sensor's
         sparse-but-real stable stretches are not mistaken for a dropout.
         """
-        all_ts = np.array(
-            [r[0].timestamp() for r in self._power_readings], dtype=float
-        )
-        return energy_gap_threshold_s(all_ts)
+        return energy_gap_threshold_s(self._power_readings.epoch_seconds())
 
     def _is_standby_band_stuck(self, timestamp: datetime) -> bool:
         """Whether a RUNNING cycle is stuck on a flat standby plateau (#296).
@@ -1891,7 +2094,7 @@ class CycleDetector:
         """
         if not self._power_readings:
             return False
-        if float(self._power_readings[-1][1]) > float(
+        if float(self._power_readings.last_power()) > float(
             self._config.anti_wrinkle_max_power
         ):
             return False
@@ -1999,7 +2202,7 @@ class CycleDetector:
         if provider is None or start is None or not self._power_readings:
             return False
         # Throttle: reuse within the window, scoped to this cycle + expected_duration.
-        now_ts = self._power_readings[-1][0]
+        now_ts = self._power_readings.last_time()
         exp = float(self._expected_duration)
         cache = self._terminal_drop_cache
         if (
@@ -2009,10 +2212,7 @@ class CycleDetector:
             and (now_ts - cache[0]).total_seconds() < ML_PROVIDER_THROTTLE_SECONDS
         ):
             return cache[3]
-        points = [
-            ((ts - start).total_seconds(), float(power))
-            for ts, power in self._power_readings
-        ]
+        points = self._power_readings.offset_points(start)
         try:
             result = bool(provider(points, exp))
         except Exception:  # noqa: BLE001 - ML must never break detection
@@ -2240,11 +2440,11 @@ class CycleDetector:
 
         # Ensure power_data covers the full duration until end_time
         # (especially important for manual recordings or drying phases with no sensor updates)
-        final_readings = list(trimmed_readings)
+        final_readings = PowerTrace(trimmed_readings)
         if final_readings:
-            last_t, last_p = final_readings[-1]
-            if last_t < end_time:
-                final_readings.append((end_time, last_p))
+            last_t = final_readings.last_time()
+            if last_t is not None and last_t < end_time:
+                final_readings.add(end_time, final_readings.last_power())
 
         start_ts = self._current_cycle_start.timestamp()
         cycle_data: dict[str, Any] = {
@@ -2254,7 +2454,13 @@ class CycleDetector:
             "max_power": self._cycle_max_power,
             "status": status,
             "termination_reason": termination_reason,
-            "power_data": [[round(t.timestamp() - start_ts, 1), p] for t, p in final_readings],
+            "power_data": [
+                [round(t - start_ts, 1), p]
+                for t, p in zip(
+                    final_readings.epoch_seconds().tolist(),
+                    final_readings.watts().tolist(),
+                )
+            ],
         }
 
         self._logger.info("Cycle Finished: %s, %.1f min", status, duration / 60)
@@ -2311,9 +2517,9 @@ class CycleDetector:
             self._last_process_time = now
 
 
-    def get_power_trace(self) -> list[tuple[datetime, float]]:
-        """Return the current power trace."""
-        return list(self._power_readings)
+    def get_power_trace(self) -> PowerTrace:
+        """Return the current power trace (zero-copy snapshot; do not mutate)."""
+        return self._power_readings.snapshot()
 
     def get_state_snapshot(self) -> dict[str, Any]:
         """Get a snapshot of the current state for persistence."""
@@ -2325,7 +2531,9 @@ class CycleDetector:
                 if self._current_cycle_start
                 else None
             ),
-            "power_readings": [(t.isoformat(), p) for t, p in self._power_readings],
+            # Binary columns (power_trace.encode_trace) instead of ISO-string
+            # pairs; restore still reads the legacy "power_readings" list.
+            "power_trace": encode_trace(self._power_readings),
             "accumulated_energy_wh": self._energy_since_idle_wh,
             "time_above": self._time_above_threshold,
             "time_below": self._time_below_threshold,
@@ -2422,7 +2630,14 @@ class CycleDetector:
                     self._logger.warning("Failed to parse start time: %s", start)
 
             readings = snapshot.get("power_readings", [])
-            self._power_readings = []
+            self._power_readings = PowerTrace()
+            packed = snapshot.get("power_trace")
+            if isinstance(packed, str):
+                try:
+                    self._power_readings = decode_trace(packed, dt_util.DEFAULT_TIME_ZONE)
+                except ValueError as exc:
+                    self._logger.warning("Dropping unreadable power trace snapshot: %s", exc)
+                readings = []
 
             # Detect naive readings once
             has_naive_readings = False
@@ -2440,7 +2655,7 @@ class CycleDetector:
                                 has_naive_readings = True
                             value = float(reading[1])
                             if math.isfinite(value):
-                                self._power_readings.append((t, value))
+                                self._power_readings.add(t, value)
                     except (TypeError, ValueError) as exc:
                         self._logger.debug("Skipping malformed power reading %s: %s", r, exc)
 
@@ -0,0 +1,345 @@
+# WashData - Home Assistant integration for appliance cycle monitoring via smart plugs.
+# Copyright (C) 2026 Lukas Bandura
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Secondary indexes and paged queries over ``past_cycles``.
+
+The panel's history tab and a few store helpers used to walk (and copy, and
+reverse) the whole cycle history on every request to filter by profile,
+status or date. :class:`CycleIndex` keeps, per stored position:
+
+* posting lists (sorted position arrays) by profile name, status and review
+  state (``golden`` / ``reviewed`` / ``unreviewed``, from ``ml_review``);
+* start timestamp, duration and energy columns for range filters and sorting.
+
+It is built with one pass over the cycle *metadata* - ``power_data`` is never
+read - and only rebuilt after the store reports a change
+(:meth:`CycleIndex.invalidate`, wired next to the match index's notifications)
+or when the list object or its length no longer match what was indexed.
+
+:meth:`CycleIndex.query` filters, sorts and pages in NumPy. Pages continue
+from an opaque cursor naming the last cycle returned, so a cycle finishing
+while the user scrolls neither repeats nor skips rows the way offset paging
+does. A cursor whose cycle was deleted meanwhile resumes from its sort key.
+
+Lookups happen on the event loop and in executor jobs, so rebuilds and queries
+take a plain thread lock.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import dataclasses
+import json
+import math
+import threading
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+
+SORT_RECORDED = "recorded"  # storage order (the history's natural order)
+SORT_START_TIME = "start_time"
+SORT_DURATION = "duration"
+SORT_ENERGY = "energy_wh"
+SORT_KEYS = (SORT_RECORDED, SORT_START_TIME, SORT_DURATION, SORT_ENERGY)
+
+REVIEW_GOLDEN = "golden"
+REVIEW_REVIEWED = "reviewed"
+REVIEW_UNREVIEWED = "unreviewed"
+REVIEW_STATES = (REVIEW_GOLDEN, REVIEW_REVIEWED, REVIEW_UNREVIEWED)
+
+# Passed for "no profile filter"; ``None`` as a profile selects unlabeled cycles.
+ANY = object()
+
+_EMPTY = np.zeros(0, dtype=np.intp)
+
+
+@dataclasses.dataclass
+class CyclePage:
+    """One page of :meth:`CycleIndex.query`."""
+
+    cycles: list[dict[str, Any]]
+    total: int  # cycles matching the filters
+    next_cursor: str | None  # None on the last page
+
+
+def _float_or_nan(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return math.nan
+    try:
+        out = float(value)
+    except ValueError:
+        return math.nan
+    return out if math.isfinite(out) else math.nan
+
+
+def _review_state(cycle: dict[str, Any]) -> str:
+    review = cycle.get("ml_review")
+    if not isinstance(review, dict) or not review:
+        return REVIEW_UNREVIEWED
+    return REVIEW_GOLDEN if review.get("golden") else REVIEW_REVIEWED
+
+
+def _postings(keys: list[Any]) -> dict[Any, np.ndarray]:
+    grouped: dict[Any, list[int]] = {}
+    for pos, key in enumerate(keys):
+        grouped.setdefault(key, []).append(pos)
+    return {key: np.asarray(pos, dtype=np.intp) for key, pos in grouped.items()}
+
+
+def _encode_cursor(payload: dict[str, Any]) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> dict[str, Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("malformed cursor") from exc
+    if not isinstance(payload, dict):
+        raise ValueError("malformed cursor")
+    return payload
+
+
+class CycleIndex:
+    """Lazily rebuilt secondary indexes over one cycle list; see the module docstring."""
+
+    def __init__(self, parse_start: Callable[[Any], datetime | None]) -> None:
+        self._parse_start = parse_start
+        self._lock = threading.Lock()
+        self._stale = True
+        self._source: list[Any] | None = None
+        self._n = 0
+        self._cycles: list[dict[str, Any]] = []
+        self._pos_by_id: dict[str, int] = {}
+        self._start = np.zeros(0)
+        self._columns: dict[str, np.ndarray] = {}
+        self._by_profile: dict[str | None, np.ndarray] = {}
+        self._by_status: dict[str | None, np.ndarray] = {}
+        self._by_review: dict[str, np.ndarray] = {}
+        self.rebuilds = 0
+
+    # ------------------------------------------------------------------
+    # Change notifications
+    # ------------------------------------------------------------------
+
+    def invalidate(self) -> None:
+        """Rebuild before the next lookup (a cycle changed, bulk edits, full saves)."""
+        self._stale = True
+
+    def clear(self) -> None:
+        """Drop the indexes (store cleared or replaced)."""
+        with self._lock:
+            self._stale = True
+            self._source = None
+            self._cycles = []
+            self._pos_by_id = {}
+
+    # ------------------------------------------------------------------
+    # Build
+    # ------------------------------------------------------------------
+
+    def _ensure_locked(self, cycles: list[Any]) -> None:
+        if not self._stale and cycles is self._source and len(cycles) == self._n:
+            return
+        rows = [c if isinstance(c, dict) else {} for c in cycles]
+        starts: list[float] = []
+        for c in rows:
+            dt = self._parse_start(c.get("start_time"))
+            try:
+                starts.append(dt.timestamp() if dt is not None else math.nan)
+            except (OverflowError, OSError, ValueError):
+                starts.append(math.nan)
+        self._cycles = rows
+        self._pos_by_id = {
+            c["id"]: pos for pos, c in enumerate(rows) if isinstance(c.get("id"), str)
+        }
+        self._start = np.asarray(starts, dtype=float)
+        self._columns = {
+            SORT_RECORDED: np.arange(len(rows), dtype=float),
+            SORT_START_TIME: self._start,
+            SORT_DURATION: np.asarray([_float_or_nan(c.get("duration")) for c in rows]),
+            SORT_ENERGY: np.asarray([_float_or_nan(c.get("energy_wh")) for c in rows]),
+        }
+        self._by_profile = _postings(
+            [(c.get("profile_name") or None) if isinstance(c.get("profile_name"), str) else None for c in rows]
+        )
+        self._by_status = _postings(
+            [c.get("status") if isinstance(c.get("status"), str) else None for c in rows]
+        )
+        review = [_review_state(c) for c in rows]
+        self._by_review = _postings(review)
+        self._by_review[REVIEW_REVIEWED] = np.union1d(
+            self._by_review.get(REVIEW_REVIEWED, _EMPTY),
+            self._by_review.get(REVIEW_GOLDEN, _EMPTY),
+        )
+        self._source = cycles
+        self._n = len(cycles)
+        self._stale = False
+        self.rebuilds += 1
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def cycles_for_profile(self, cycles: list[Any], profile_name: str | None) -> list[dict[str, Any]]:
+        """Cycles labeled ``profile_name`` (``None``: unlabeled), in storage order."""
+        with self._lock:
+            self._ensure_locked(cycles)
+            return [self._cycles[p] for p in self._by_profile.get(profile_name or None, _EMPTY)]
+
+    def counts(self, cycles: list[Any]) -> dict[str, dict[str, int]]:
+        """Cycle counts per profile, status and review state (facets for the panel)."""
+        with self._lock:
+            self._ensure_locked(cycles)
+            return {
+                "profile": {str(k or ""): len(v) for k, v in self._by_profile.items()},
+                "status": {str(k or ""): len(v) for k, v in self._by_status.items()},
+                "review": {k: len(v) for k, v in self._by_review.items()},
+            }
+
+    def query(
+        self,
+        cycles: list[Any],
+        *,
+        profile_name: Any = ANY,
+        status: str | None = None,
+        review: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        sort: str = SORT_RECORDED,
+        descending: bool = True,
+        cursor: str | None = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> CyclePage:
+        """One page of cycles matching every given filter.
+
+        ``since`` / ``until`` bound ``start_time`` (inclusive / exclusive).
+        Cycles missing the sort key come last in either direction; ties keep
+        storage order. ``cursor`` (a previous page's ``next_cursor``) takes
+        precedence over ``offset``. Raises ``ValueError`` for an unknown sort
+        key or review state, or a cursor from a different sort.
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"unknown sort key {sort!r}")
+        if review is not None and review not in REVIEW_STATES:
+            raise ValueError(f"unknown review state {review!r}")
+        anchor = _decode_cursor(cursor) if cursor else None
+        if anchor is not None and (anchor.get("s") != sort or anchor.get("d") != descending):
+            raise ValueError("cursor belongs to a different sort order")
+
+        with self._lock:
+            self._ensure_locked(cycles)
+            pos = self._filter_locked(profile_name, status, review, since, until)
+            order = self._order_locked(pos, sort, descending)
+            start = self._resume_locked(order, sort, descending, anchor) if anchor else max(0, offset)
+            page = order[start:start + max(0, limit)]
+            rows = [self._cycles[p] for p in page]
+            next_cursor = None
+            if start + len(page) < len(order) and len(page):
+                last = int(page[-1])
+                key = self._columns[sort][last]
+                next_cursor = _encode_cursor({
+                    "s": sort,
+                    "d": descending,
+                    "id": self._cycles[last].get("id"),
+                    "k": None if math.isnan(key) else float(key),
+                    "p": last,
+                })
+            return CyclePage(rows, len(order), next_cursor)
+
+    def _filter_locked(
+        self,
+        profile_name: Any,
+        status: str | None,
+        review: str | None,
+        since: datetime | None,
+        until: datetime | None,
+    ) -> np.ndarray:
+        lists: list[np.ndarray] = []
+        if profile_name is not ANY:
+            lists.append(self._by_profile.get(profile_name or None, _EMPTY))
+        if status is not None:
+            lists.append(self._by_status.get(status, _EMPTY))
+        if review is not None:
+            lists.append(self._by_review.get(review, _EMPTY))
+        if lists:
+            lists.sort(key=len)
+            pos = lists[0]
+            for other in lists[1:]:
+                pos = np.intersect1d(pos, other, assume_unique=True)
+        else:
+            pos = np.arange(len(self._cycles), dtype=np.intp)
+        if since is not None or until is not None:
+            start = self._start[pos]
+            keep = ~np.isnan(start)
+            if since is not None:
+                keep &= start >= since.timestamp()
+            if until is not None:
+                keep &= start < until.timestamp()
+            pos = pos[keep]
+        return pos
+
+    def _sort_keys_locked(
+        self, pos: np.ndarray, sort: str, descending: bool
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        key = self._columns[sort][pos]
+        missing = np.isnan(key)
+        sign = -1.0 if descending else 1.0
+        return missing, sign * np.where(missing, 0.0, key), sign * pos.astype(float)
+
+    def _order_locked(self, pos: np.ndarray, sort: str, descending: bool) -> np.ndarray:
+        if not len(pos):
+            return pos
+        missing, key, tie = self._sort_keys_locked(pos, sort, descending)
+        return pos[np.lexsort((tie, key, missing))]
+
+    def _resume_locked(
+        self, order: np.ndarray, sort: str, descending: bool, anchor: dict[str, Any]
+    ) -> int:
+        """Index in ``order`` just after the cursor's cycle."""
+        cid = anchor.get("id")
+        pos = self._pos_by_id.get(cid) if isinstance(cid, str) else None
+        if pos is not None:
+            hit = np.flatnonzero(order == pos)
+            if len(hit):
+                return int(hit[0]) + 1
+        # The anchor cycle is gone (or filtered out now): first row sorting
+        # after its remembered (key, position).
+        if not len(order):
+            return 0
+        sign = -1.0 if descending else 1.0
+        key = anchor.get("k")
+        a_missing = key is None
+        a_key = 0.0 if a_missing else sign * float(key)
+        a_tie = sign * float(anchor.get("p") or 0)
+        missing, keys, tie = self._sort_keys_locked(order, sort, descending)
+        after = (missing > a_missing) | (
+            (missing == a_missing) & ((keys > a_key) | ((keys == a_key) & (tie > a_tie)))
+        )
+        return int(np.argmax(after)) if after.any() else len(order)
+
+
+def project(cycle: dict[str, Any], fields: Iterable[str] | None, exclude: frozenset[str]) -> dict[str, Any]:
+    """Copy of ``cycle`` limited to ``fields`` (all keys when None), never ``exclude``."""
+    if fields is None:
+        return {k: v for k, v in cycle.items() if k not in exclude}
+    return {k: cycle[k] for k in fields if k in cycle and k not in exclude}
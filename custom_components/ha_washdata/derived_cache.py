@@ -0,0 +1,267 @@
+# WashData - Home Assistant integration for appliance cycle monitoring via smart plugs.
+# Copyright (C) 2026 Lukas Bandura
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Bounded, byte-accounted cache for data the store derives from itself.
+
+``ProfileStore`` keeps a handful of values that are pure functions of stored
+cycles, envelopes and groups - decompressed cycle traces, parsed phase
+profiles, resampled profile curves, group cohesion scores, reference curves.
+Held in ad-hoc dicts they grow with the store and are dropped wholesale on
+any change. :class:`DerivedCache` holds them instead:
+
+* every entry carries an estimated size in bytes; the cache as a whole has a
+  ceiling (per config entry, so a multi-appliance install on a small board
+  has a predictable footprint) and evicts least-recently-used entries to stay
+  under it. A single entry larger than a quarter of the ceiling is returned
+  but not kept;
+* entries are stamped with the versions of the *tags* they were derived from
+  (``("cycle", id)``, ``("profile", name)``, ``"groups"``). The store bumps a
+  tag when the thing it names changes; a bump drops the dependent entries at
+  once and any entry built against an older version is never served, even if
+  it was stored by a thread that raced the bump;
+* an entry may also remember the object it was derived from (an envelope
+  dict, a cycle's ``power_data`` list) and is only served while that exact
+  object is still the one in the store, which covers the few store paths that
+  replace data without marking it.
+
+Lookups happen on the event loop and in executor threads, so every operation
+takes a plain thread lock; builders run outside it.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any, TypeVar
+
+import numpy as np
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# An entry may use at most this fraction of the cache ceiling; anything larger
+# would evict most of the cache for a single value.
+_MAX_ENTRY_FRACTION = 0.25
+
+# Size estimation walks containers only this deep and, for long sequences,
+# extrapolates from this many leading items (traces are homogeneous).
+_SIZE_MAX_DEPTH = 6
+_SIZE_SAMPLE_ITEMS = 16
+
+_NO_SOURCE = object()
+
+Stamp = tuple[int, tuple[tuple[Hashable, int], ...]]
+
+
+def estimate_nbytes(obj: Any, _depth: int = 0) -> int:
+    """Approximate memory held by ``obj`` (shallow size of every container level).
+
+    Numpy arrays count their buffer; lists/tuples/dicts/dataclasses are walked,
+    sampling the first items of long sequences. Shared sub-objects are counted
+    every time they are reached, so the estimate errs on the high side.
+    """
+    if isinstance(obj, np.ndarray):
+        # getsizeof already includes the buffer of an array that owns its data.
+        return sys.getsizeof(obj) + (0 if obj.flags.owndata else int(obj.nbytes))
+    size = sys.getsizeof(obj)
+    if _depth >= _SIZE_MAX_DEPTH or isinstance(obj, (str, bytes, int, float, bool)):
+        return size
+    if isinstance(obj, dict):
+        items: Iterable[Any] = (x for kv in obj.items() for x in kv)
+        count = 2 * len(obj)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        items = obj
+        count = len(obj)
+    elif dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        items = [getattr(obj, f.name) for f in dataclasses.fields(obj)]
+        count = len(items)
+    else:
+        return size
+    sampled = 0
+    total = 0
+    for item in items:
+        total += estimate_nbytes(item, _depth + 1)
+        sampled += 1
+        if sampled >= _SIZE_SAMPLE_ITEMS:
+            break
+    if sampled and count > sampled:
+        total = total * count // sampled
+    return size + total
+
+
+@dataclasses.dataclass
+class _Entry:
+    value: Any
+    nbytes: int
+    stamp: Stamp
+    source: Any
+
+
+class DerivedCache:
+    """LRU cache with a byte ceiling and tag-version invalidation."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._versions: dict[Hashable, int] = {}
+        # Advanced by clear(); part of every stamp so nothing built before a
+        # clear is stored after it.
+        self._epoch = 0
+        self._max_bytes = max(0, int(max_bytes))
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.oversize = 0
+
+    @property
+    def max_bytes(self) -> int:
+        """Current memory ceiling in bytes (0 disables caching)."""
+        return self._max_bytes
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        """Change the ceiling, evicting immediately if the cache is now over it."""
+        with self._lock:
+            self._max_bytes = max(0, int(max_bytes))
+            self._evict_locked()
+
+    def stamp(self, tags: Iterable[Hashable]) -> Stamp:
+        """Current versions of ``tags``; pass to :meth:`put` for a value built now."""
+        with self._lock:
+            return self._epoch, tuple((tag, self._versions.get(tag, 0)) for tag in tags)
+
+    def get(self, key: Hashable, source: Any = _NO_SOURCE) -> tuple[bool, Any]:
+        """``(True, value)`` for a current entry, else ``(False, None)``.
+
+        With ``source`` given the entry must have been derived from that exact
+        object; a mismatching or outdated entry is dropped.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                (source is not _NO_SOURCE and entry.source is not source)
+                or not self._current_locked(entry.stamp)
+            ):
+                self._drop_locked(key)
+                self.invalidations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry.value
+
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        stamp: Stamp,
+        source: Any = None,
+        nbytes: int | None = None,
+    ) -> None:
+        """Store ``value`` built against ``stamp`` (skipped if already outdated)."""
+        size = estimate_nbytes(value) if nbytes is None else int(nbytes)
+        with self._lock:
+            if not self._current_locked(stamp):
+                return
+            if size > self._max_bytes * _MAX_ENTRY_FRACTION:
+                self.oversize += 1
+                self._drop_locked(key)
+                return
+            self._drop_locked(key)
+            self._entries[key] = _Entry(value, size, stamp, source)
+            self.bytes += size
+            self._evict_locked()
+
+    def get_or_build(
+        self,
+        key: Hashable,
+        tags: Iterable[Hashable],
+        build: Callable[[], _T],
+        source: Any = _NO_SOURCE,
+    ) -> _T:
+        """Cached value for ``key``, building (outside the lock) and storing on a miss."""
+        hit, value = self.get(key, source)
+        if hit:
+            return value
+        stamp = self.stamp(tags)
+        value = build()
+        self.put(key, value, stamp, None if source is _NO_SOURCE else source)
+        return value
+
+    def bump(self, *tags: Hashable) -> None:
+        """Mark ``tags`` as changed and drop every entry derived from them."""
+        if not tags:
+            return
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+            changed = set(tags)
+            stale = [
+                key for key, entry in self._entries.items()
+                if any(tag in changed for tag, _ in entry.stamp[1])
+            ]
+            for key in stale:
+                self._drop_locked(key)
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        """Drop everything; entries built before the clear are not stored afterwards."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self.bytes = 0
+            self._epoch += 1
+
+    def stats(self) -> dict[str, int | float]:
+        """Counters for diagnostics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self._max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "oversize": self.oversize,
+            }
+
+    def _current_locked(self, stamp: Stamp) -> bool:
+        epoch, versions = stamp
+        return epoch == self._epoch and all(
+            self._versions.get(tag, 0) == version for tag, version in versions
+        )
+
+    def _drop_locked(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.nbytes
+
+    def _evict_locked(self) -> None:
+        while self._entries and self.bytes > self._max_bytes:
+            _, entry = self._entries.popitem(last=False)
+            self.bytes -= entry.nbytes
+            self.evictions += 1
@@ -96,6 +96,11 @@ async def async_get_config_entry_diagnostics(
             ),
             "profile_sample_repair_stats": manager.profile_sample_repair_stats,
             "suggestions": manager.profile_store.get_suggestions(),
+            # Derived-data cache (hits/misses/bytes against the memory ceiling)
+            # and match-index counters.
+            "caches": manager.profile_store.derived_cache_stats(),
+            # Per-stage power-path timings (empty unless hot_path_timing is on).
+            "hot_path": manager.hot_path.stats(),
             "feature_flags": {
                 "auto_maintenance": bool(getattr(manager, "_auto_maintenance", False)),
                 "save_debug_traces": bool(getattr(manager, "_save_debug_traces", False)),
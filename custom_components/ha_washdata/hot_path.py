@@ -0,0 +1,251 @@
+# WashData - Home Assistant integration for appliance cycle monitoring via smart plugs.
+# Copyright (C) 2026 Lukas Bandura
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Per-stage timing of the power-reading hot path.
+
+Each WashDataManager owns one :class:`HotPathTimer`. The manager brackets every
+power-sensor event with :meth:`~HotPathTimer.begin` / :meth:`~HotPathTimer.end`
+and each stage it runs (detector step, progress estimate, ML features, entity
+update, ...) with :meth:`~HotPathTimer.start` / :meth:`~HotPathTimer.stop`,
+mostly through the :func:`timed` method decorator. Durations land in fixed
+log2 histograms (1 us .. ~33 s), so memory is constant and the per-sample cost
+is a couple of integer operations.
+
+Timing is off by default. While off, ``begin`` / ``start`` return 0 after one
+attribute check and ``stop`` / ``end`` return immediately, so the hooks can
+stay in place permanently. When on, one event in ``sample_every`` is timed
+(all of its stages together, so per-event stage costs stay comparable); stages
+that run outside a power event (the periodic re-match task, timer-driven
+updates) are sampled on their own counter.
+
+Everything runs on the event loop; there is no locking.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import time
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from homeassistant.util import dt as dt_util
+
+STAGE_INGEST = "ingest"  # the whole power-sensor event handler
+STAGE_DETECTOR = "detector"  # CycleDetector.process_reading
+STAGE_MATCH = "match"  # periodic re-match, dispatch to result applied (wall time)
+STAGE_PROGRESS = "progress"  # time-remaining / progress estimate
+STAGE_ML = "ml_features"  # ML feature extraction + scoring
+STAGE_STATE_SAVE = "state_save"  # active-cycle snapshot
+STAGE_ENTITY_UPDATE = "entity_update"  # dispatcher fan-out to the entities
+
+STAGES: tuple[str, ...] = (
+    STAGE_INGEST,
+    STAGE_DETECTOR,
+    STAGE_MATCH,
+    STAGE_PROGRESS,
+    STAGE_ML,
+    STAGE_STATE_SAVE,
+    STAGE_ENTITY_UPDATE,
+)
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+# Bucket k holds durations below 2**k microseconds (bucket 0: under 1 us); the
+# last bucket also takes everything longer.
+_BUCKETS = 26
+
+
+class _Histogram:
+    """Count / total / max plus log2 buckets of one stage's durations."""
+
+    __slots__ = ("count", "total_ns", "max_ns", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * _BUCKETS
+
+    def add(self, ns: int) -> None:
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.buckets[min((ns // 1000).bit_length(), _BUCKETS - 1)] += 1
+
+    def quantile_ms(self, q: float) -> float:
+        """Upper edge (ms) of the bucket holding quantile ``q``."""
+        rank = q * self.count
+        seen = 0
+        for k, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min((1 << k) / 1000.0, self.max_ns / 1e6)
+        return self.max_ns / 1e6
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ns / 1e6, 3),
+            "mean_ms": round(self.total_ns / self.count / 1e6, 4) if self.count else 0.0,
+            "max_ms": round(self.max_ns / 1e6, 3),
+            "p50_ms": round(self.quantile_ms(0.50), 4),
+            "p90_ms": round(self.quantile_ms(0.90), 4),
+            "p99_ms": round(self.quantile_ms(0.99), 4),
+            # [upper bound in us, count] for every non-empty bucket.
+            "histogram_us": [[1 << k, n] for k, n in enumerate(self.buckets) if n],
+        }
+
+
+class HotPathTimer:
+    """Sampled per-stage timers for one appliance; see the module docstring."""
+
+    def __init__(self, enabled: bool = False, sample_every: int = 1) -> None:
+        self._enabled = False
+        self._every = 1
+        self._in_event = False
+        self._event_sampled = False
+        self._events = 0
+        self._sampled_events = 0
+        self._calls = 0
+        self._since: str | None = None
+        self._stages: dict[str, _Histogram] = {}
+        self.configure(enabled, sample_every)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether timing is switched on."""
+        return self._enabled
+
+    def configure(self, enabled: bool, sample_every: int | None = None) -> None:
+        """Switch timing on/off and set the sampling rate (keeps collected data)."""
+        if sample_every is not None:
+            self._every = max(1, int(sample_every))
+        if enabled and not self._enabled:
+            self._since = dt_util.now().isoformat()
+        self._enabled = bool(enabled)
+        if not self._enabled:
+            self._in_event = False
+            self._event_sampled = False
+
+    def reset(self) -> None:
+        """Drop collected timings."""
+        self._stages.clear()
+        self._events = 0
+        self._sampled_events = 0
+        self._calls = 0
+        self._since = dt_util.now().isoformat() if self._enabled else None
+
+    def begin(self) -> int:
+        """Start of a power event: start token (0 when this event is not timed)."""
+        if not self._enabled:
+            return 0
+        self._in_event = True
+        self._events += 1
+        self._event_sampled = self._events % self._every == 0
+        if not self._event_sampled:
+            return 0
+        self._sampled_events += 1
+        return time.perf_counter_ns()
+
+    def end(self, token: int) -> None:
+        """End of the power event opened by :meth:`begin`."""
+        self._in_event = False
+        if token:
+            self._add(STAGE_INGEST, time.perf_counter_ns() - token)
+
+    def start(self) -> int:
+        """Start token for one stage (0 when not timed)."""
+        if self._in_event:
+            return time.perf_counter_ns() if self._event_sampled else 0
+        if not self._enabled:
+            return 0
+        self._calls += 1
+        return time.perf_counter_ns() if self._calls % self._every == 0 else 0
+
+    def stop(self, stage: str, token: int) -> None:
+        """Record ``stage`` as having run since ``token`` (no-op for 0)."""
+        if token:
+            self._add(stage, time.perf_counter_ns() - token)
+
+    def _add(self, stage: str, ns: int) -> None:
+        hist = self._stages.get(stage)
+        if hist is None:
+            hist = self._stages[stage] = _Histogram()
+        hist.add(ns)
+
+    def stats(self) -> dict[str, Any]:
+        """Collected timings for the WebSocket API and diagnostics."""
+        order = {name: i for i, name in enumerate(STAGES)}
+        stages = sorted(self._stages.items(), key=lambda kv: order.get(kv[0], len(order)))
+        return {
+            "enabled": self._enabled,
+            "sample_every": self._every,
+            "since": self._since,
+            "events": self._events,
+            "sampled_events": self._sampled_events,
+            "stages": {name: hist.as_dict() for name, hist in stages},
+        }
+
+
+def timed(stage: str) -> Callable[[_F], _F]:
+    """Time a method of an object with a ``hot_path`` timer as ``stage``.
+
+    Works for plain and ``async`` methods (the latter measure wall time up to
+    the awaited result). ``stage`` :data:`STAGE_INGEST` marks the power-event
+    handler itself, which opens and closes the sampled event.
+    """
+
+    def decorate(func: _F) -> _F:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+                timer: HotPathTimer = self.hot_path
+                token = timer.start()
+                try:
+                    return await func(self, *args, **kwargs)
+                finally:
+                    timer.stop(stage, token)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        if stage == STAGE_INGEST:
+
+            @functools.wraps(func)
+            def event_wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+                timer: HotPathTimer = self.hot_path
+                token = timer.begin()
+                try:
+                    return func(self, *args, **kwargs)
+                finally:
+                    timer.end(token)
+
+            return event_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            timer: HotPathTimer = self.hot_path
+            token = timer.start()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                timer.stop(stage, token)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
@@ -27,12 +27,13 @@ import math
 import uuid
 import asyncio
 from asyncio import Task
-from collections.abc import Coroutine
+from collections.abc import Coroutine, Sequence
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any, cast
 import numpy as np
 
 if TYPE_CHECKING:
+    from .ml.feature_cache import MLFeatureCache
     from .store import StoreBridge
 
 from homeassistant.config_entries import ConfigEntry
@@ -83,6 +84,9 @@ from .const import (
     CONF_MAX_PAST_CYCLES,
     CONF_MAX_FULL_TRACES_PER_PROFILE,
     CONF_MAX_FULL_TRACES_UNLABELED,
+    CONF_DERIVED_CACHE_MAX_KB,
+    CONF_HOT_PATH_TIMING,
+    CONF_HOT_PATH_SAMPLE_EVERY,
     CONF_WATCHDOG_INTERVAL,
     CONF_AUTO_TUNE_NOISE_EVENTS_THRESHOLD,
     CONF_COMPLETION_MIN_SECONDS,
@@ -207,6 +211,9 @@ from .const import (
     DEFAULT_NOTIFY_FINISH_CHANNEL,
 
     DEFAULT_MAX_FULL_TRACES_UNLABELED,
+    DEFAULT_DERIVED_CACHE_MAX_KB,
+    DEFAULT_HOT_PATH_TIMING,
+    DEFAULT_HOT_PATH_SAMPLE_EVERY,
     DEFAULT_DTW_BANDWIDTH,
     DEFAULT_WATCHDOG_INTERVAL,
     CONF_MATCH_PERSISTENCE,
@@ -252,6 +259,7 @@ from .profile_store import (
 from .signal_processing import integrate_wh, energy_gap_threshold_s
 from .recorder import CycleRecorder
 from .diag_buffer import DiagBuffer
+from . import hot_path
 from .log_utils import DeviceLoggerAdapter
 from .time_utils import power_data_to_offsets
 from . import progress as progress_mod
@@ -371,6 +379,14 @@ class WashDataManager:
             self._store_bridge = StoreBridge(self.hass, self.profile_store)
         return self._store_bridge
 
+    @property
+    def ml_feature_cache(self) -> "MLFeatureCache":
+        """Lazy persisted trace-feature cache for on-device ML training."""
+        if self._ml_feature_cache is None:
+            from .ml.feature_cache import MLFeatureCache
+            self._ml_feature_cache = MLFeatureCache(self.hass, self.entry_id)
+        return self._ml_feature_cache
+
     def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
         """Initialize the manager."""
         self.hass = hass
@@ -378,6 +394,16 @@ class WashDataManager:
         self.entry_id = config_entry.entry_id
         self._logger = DeviceLoggerAdapter(_LOGGER, config_entry.title)
         self.diag_buffer = DiagBuffer(config_entry.title)
+        # Per-stage timing of the power-reading path (off unless opted in; the
+        # panel can also switch it at runtime via set_hot_path_timing).
+        self.hot_path = hot_path.HotPathTimer(
+            bool(config_entry.options.get(CONF_HOT_PATH_TIMING, DEFAULT_HOT_PATH_TIMING)),
+            int(
+                config_entry.options.get(
+                    CONF_HOT_PATH_SAMPLE_EVERY, DEFAULT_HOT_PATH_SAMPLE_EVERY
+                )
+            ),
+        )
 
         # Prioritize options -> data for power sensor (allows changing it)
         self.power_sensor_entity_id = config_entry.options.get(
@@ -549,6 +575,7 @@ class WashDataManager:
         )
         self.recorder = CycleRecorder(hass, self.entry_id, device_name=config_entry.title)
         self._store_bridge: Any = None  # lazy community-store bridge (online features)
+        self._ml_feature_cache: Any = None  # lazy ML training feature cache
 
         # Priority: Options > Data > Default
         min_power = config_entry.options.get(
@@ -898,7 +925,7 @@ class WashDataManager:
         self._current_match_candidate: str | None = None  # Pending profile name
 
     async def _async_perform_combined_matching(
-        self, readings: list[tuple[datetime, float]]
+        self, readings: Sequence[tuple[datetime, float]]
     ) -> None:
         """PRIMARY matching task: Updates both Manager and Detector using best method."""
         self._logger.debug(
@@ -926,7 +953,8 @@ class WashDataManager:
         except Exception as e:
             self._logger.error("Perform combined matching trigger failed: %s", e)
 
-    async def _async_do_perform_matching(self, readings: list[tuple[datetime, float]]) -> None:
+    @hot_path.timed(hot_path.STAGE_MATCH)
+    async def _async_do_perform_matching(self, readings: Sequence[tuple[datetime, float]]) -> None:
         """Inner task to handle actual matching logic."""
         try:
             end_time = readings[-1][0]
@@ -936,7 +964,8 @@ class WashDataManager:
             # 1. RUN BETTER ASYNC MATCHING
             result = await self.profile_store.async_match_profile(
                  readings,
-                 current_duration
+                 current_duration,
+                 live=True,
             )
 
             # 2. UPDATE MANAGER STATE (Estimates, Program Name, etc.)
@@ -1747,6 +1776,14 @@ class WashDataManager:
                     )
                 ),
             )
+            self.profile_store.set_derived_cache_limit(
+                int(
+                    self.config_entry.options.get(
+                        CONF_DERIVED_CACHE_MAX_KB, DEFAULT_DERIVED_CACHE_MAX_KB
+                    )
+                )
+                * 1024
+            )
         except Exception:
             pass
 
@@ -2325,6 +2362,9 @@ class WashDataManager:
         if self.detector.state in {STATE_RUNNING, STATE_PAUSED, STATE_STARTING, STATE_ENDING}:
             snapshot = self._augment_active_snapshot(self.detector.get_state_snapshot())
             await self.profile_store.async_save_active_cycle(snapshot)
+        # Fold the store's mutation journal into a snapshot so the next load
+        # starts from a single file.
+        await self.profile_store.async_flush()
 
         self._last_reading_time = None
 
@@ -2553,24 +2593,16 @@ class WashDataManager:
         No-op unless the ``ENABLE_ML_TRAINING`` build flag and the per-device
         opt-in are both set.
         """
-        from .const import (
-            ENABLE_ML_TRAINING,
-            CONF_ML_TRAINING_ENABLED,
-            CONF_ML_TRAINING_HOUR,
-            DEFAULT_ML_TRAINING_ENABLED,
-            DEFAULT_ML_TRAINING_HOUR,
-        )
+        from .const import CONF_ML_TRAINING_HOUR, DEFAULT_ML_TRAINING_HOUR
 
         if self._remove_ml_training_scheduler:
             self._remove_ml_training_scheduler()
             self._remove_ml_training_scheduler = None
 
-        if not ENABLE_ML_TRAINING:
-            return
-        opts = {**self.config_entry.data, **self.config_entry.options}
-        if not opts.get(CONF_ML_TRAINING_ENABLED, DEFAULT_ML_TRAINING_ENABLED):
+        if not self._ml_training_enabled():
             self._logger.debug("On-device ML training disabled")
             return
+        opts = {**self.config_entry.data, **self.config_entry.options}
 
         try:
             hour = int(opts.get(CONF_ML_TRAINING_HOUR, DEFAULT_ML_TRAINING_HOUR))
@@ -2586,6 +2618,19 @@ class WashDataManager:
         )
         self._logger.info("Scheduled on-device ML training daily at %02d:00", hour)
 
+    def _ml_training_enabled(self) -> bool:
+        """Build flag and per-device opt-in for on-device ML training."""
+        from .const import (
+            ENABLE_ML_TRAINING,
+            CONF_ML_TRAINING_ENABLED,
+            DEFAULT_ML_TRAINING_ENABLED,
+        )
+
+        if not ENABLE_ML_TRAINING:
+            return False
+        opts = {**self.config_entry.data, **self.config_entry.options}
+        return bool(opts.get(CONF_ML_TRAINING_ENABLED, DEFAULT_ML_TRAINING_ENABLED))
+
     async def async_run_ml_training(self, force: bool = False) -> dict[str, Any]:
         """Retrain the ML models from this device's own cycles (gated + guarded).
 
@@ -2711,13 +2756,22 @@ class WashDataManager:
 
     async def _tune_matching_config(self, cycles: list[dict[str, Any]]) -> dict[str, Any]:
         """Tune + (if it beats the shipped defaults on a held-out split) persist
-        the matcher's scoring weights for this device. Executor-offloaded and
-        never raises. Returns the tuner status dict for logging / the UI event.
+        the matcher's scoring weights for this device. Executor-offloaded (and
+        fanned out over the worker pool) and never raises. Returns the tuner status dict for logging / the UI event.
         """
         try:
+            import functools  # pylint: disable=import-outside-toplevel
+
             from .ml.matching_tuner import tune_matching_config
+            from .worker_pool import get_worker_pool
 
-            result = await self.hass.async_add_executor_job(tune_matching_config, cycles)
+            # The tuner's leave-one-out evaluations fan out over the shared
+            # worker pool from inside this executor job.
+            result = await self.hass.async_add_executor_job(
+                functools.partial(
+                    tune_matching_config, cycles, map_fn=get_worker_pool(self.hass).map
+                )
+            )
         except Exception as err:  # noqa: BLE001 - tuning must never break training
             self._logger.debug("Matching-config tuning failed: %s", err)
             return {"promoted": False, "reason": "exception", "error": str(err)}
@@ -2805,6 +2859,7 @@ class WashDataManager:
         return latest
 
     @callback
+    @hot_path.timed(hot_path.STAGE_INGEST)
     def _async_power_changed(self, event: Any) -> None:
         """Handle power sensor state change."""
         event_data = cast(dict[str, Any], getattr(event, "data", {}))
@@ -2871,7 +2926,9 @@ class WashDataManager:
         self._last_reading_time = now
         self._last_real_reading_time = now # Track real update
         self._current_power = power
+        token = self.hot_path.start()
         self.detector.process_reading(power, now)
+        self.hot_path.stop(hot_path.STAGE_DETECTOR, token)
 
         if self._cycle_start_time is None and self.detector.current_cycle_start is not None:
             self._cycle_start_time = self.detector.current_cycle_start
@@ -2890,6 +2947,7 @@ class WashDataManager:
 
         self._notify_update()
 
+    @hot_path.timed(hot_path.STAGE_STATE_SAVE)
     def _check_state_save(self, now: datetime) -> None:
         """Periodically save active state."""
         last_save = getattr(self, "_last_state_save", None)
@@ -3739,6 +3797,7 @@ class WashDataManager:
                 self._async_process_cycle_end(cycle_data, cycle_token=end_token)
             )
 
+    @hot_path.timed(hot_path.STAGE_ML)
     def _ml_end_confidence(
         self, points: list[tuple[float, float]], expected_duration: float
     ) -> float | None:
@@ -3890,9 +3949,10 @@ class WashDataManager:
             if self._terminal_drop_refresh_n == n:
                 self._terminal_drop_refresh_n = None
 
+    @hot_path.timed(hot_path.STAGE_ML)
     def _ml_progress_percent(
         self,
-        trace: list[tuple[datetime, float]],
+        trace: Sequence[tuple[datetime, float]],
         profile_name: str,
     ) -> float | None:
         """ML completion-fraction estimate (0-100) for the running cycle, or None.
@@ -3916,7 +3976,7 @@ class WashDataManager:
 
     def _ml_energy_total(
         self,
-        trace: list[tuple[datetime, float]],
+        trace: Sequence[tuple[datetime, float]],
         profile_name: str,
     ) -> float | None:
         """Predicted total cycle energy (Wh) from the on-device ``total_energy``
@@ -4432,9 +4492,13 @@ class WashDataManager:
                 self._restart_gaps.clear()
             profile_name = cycle_data.get("profile_name")
             if profile_name:
-                await self.profile_store.async_rebuild_envelope(profile_name)
+                await self.profile_store.async_add_cycle_to_envelope(profile_name, cycle_data)
         except Exception as e: # pylint: disable=broad-exception-caught
             self._logger.error("Failed to add cycle to store: %s", e)
+        if cycle_persisted and self._ml_training_enabled():
+            # Precompute the cycle's trace features so the next training run
+            # only has to recombine them (see ml/feature_cache.py).
+            self.hass.async_create_task(self.ml_feature_cache.async_add_cycle(cycle_data))
 
         # C2: bump the persisted lifetime cycle counter. Unlike ``cycle_count``
         # (== len(history), which regresses when history is trimmed/merged), this
@@ -5390,6 +5454,7 @@ class WashDataManager:
         self._noise_events = []
         self._noise_max_powers = []
 
+    @hot_path.timed(hot_path.STAGE_PROGRESS)
     def _update_estimates(self) -> None:
         """Update time remaining and profile estimates."""
         if self.detector.state in (
@@ -5820,6 +5885,7 @@ class WashDataManager:
             )
             self._logger.info("Sent pre-completion notification: %s", msg)
 
+    @hot_path.timed(hot_path.STAGE_ML)
     def _update_projected_energy(self) -> None:
         """Project total energy/cost for the running cycle.
 
@@ -6116,6 +6182,7 @@ class WashDataManager:
             self._logger,
         )
 
+    @hot_path.timed(hot_path.STAGE_ENTITY_UPDATE)
     def _notify_update(self) -> None:
         """Notify entities of update."""
         async_dispatcher_send(self.hass, SIGNAL_WASHER_UPDATE.format(self.entry_id))
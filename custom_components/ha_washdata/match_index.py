@@ -0,0 +1,364 @@
+# WashData - Home Assistant integration for appliance cycle monitoring via smart plugs.
+# Copyright (C) 2026 Lukas Bandura
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Per-profile matching index for ``ProfileStore.async_match_profile``.
+
+Live matching runs many times per cycle, but the inputs it derives from the
+store - which cycle is each profile's template, whether a golden cycle is
+pinned, the resampled template arrays - only change when the user (or the
+store) edits cycles, profiles or envelopes. :class:`MatchIndex` keeps those
+derivations between calls:
+
+* the cycle tables (first cycle per id, first completed labeled cycle per
+  profile, profiles with a golden cycle) are rebuilt with one walk over the
+  cycle lists, and only after :meth:`MatchIndex.note_cycle` /
+  :meth:`MatchIndex.invalidate` reported a change;
+* one :class:`ProfileTemplate` per profile (and per resampling step for
+  sample-cycle templates) holds the template power list, its
+  ``MATCH_DTW_RESAMPLE_N`` grid, mean power/energy and the LB_Keogh envelope.
+  Each template remembers the exact objects it was derived from (envelope
+  curve, cycle trace) and is rebuilt only when one of them is replaced.
+
+A match call is therefore O(profiles) dictionary lookups plus identity checks.
+The selection rules are the ones the snapshot builder always used, so the
+snapshots are identical to building them from scratch.
+
+Everything here runs on the event loop.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+from collections.abc import Iterable
+from itertools import chain
+from typing import Any
+
+import numpy as np
+
+from .analysis import _resample_to, dtw_keogh_envelope
+from .const import MATCH_DTW_RESAMPLE_N
+from .signal_processing import Segment, resample_uniform
+
+_LOGGER = logging.getLogger(__name__)
+
+# Sample-cycle templates depend on the resampling step chosen for the current
+# trace (it coarsens as a cycle grows); keep the few most recent steps.
+_MAX_STEPS_PER_PROFILE = 4
+
+
+@dataclasses.dataclass
+class ProfileTemplate:
+    """Precomputed matching template of one profile."""
+
+    source: Any  # object the template was derived from (identity-checked)
+    sample_power: list[float]
+    grid: np.ndarray
+    mean_power: float
+    span_s: float
+    keogh: dict[str, Any]
+
+    def energy_wh(self, duration_s: float) -> float:
+        """Expected energy for a cycle of ``duration_s`` at the template's mean power."""
+        return self.mean_power * duration_s / 3600.0
+
+
+def _build_template(source: Any, power: list[float], span_s: float, band: float) -> ProfileTemplate:
+    grid = _resample_to(np.asarray(power, dtype=float), MATCH_DTW_RESAMPLE_N)
+    upper, lower = dtw_keogh_envelope(grid, band)
+    d_upper, d_lower = dtw_keogh_envelope(np.gradient(grid), band)
+    return ProfileTemplate(
+        source=source,
+        sample_power=power,
+        grid=grid,
+        mean_power=float(np.mean(power)) if power else 0.0,
+        span_s=span_s,
+        keogh={"band": band, "l1": (upper, lower), "ddtw": (d_upper, d_lower)},
+    )
+
+
+class MatchIndex:
+    """Incrementally maintained matching inputs for one ``ProfileStore``."""
+
+    def __init__(self, logger: logging.Logger | logging.LoggerAdapter[Any] | None = None) -> None:
+        self._logger = logger or _LOGGER
+        self._stale = True
+        self._cycles_by_id: dict[str, dict[str, Any]] = {}
+        self._labeled_by_profile: dict[str, dict[str, Any]] = {}
+        self._golden_profiles: set[str] = set()
+        # profile -> envelope template, profile -> {dt_key: sample template}
+        self._envelope_templates: dict[str, ProfileTemplate] = {}
+        self._sample_templates: dict[str, dict[float, ProfileTemplate]] = {}
+        self.resyncs = 0
+        self.template_builds = 0
+
+    # ------------------------------------------------------------------
+    # Change notifications
+    # ------------------------------------------------------------------
+
+    def invalidate(self) -> None:
+        """Resync the cycle tables before the next match (bulk edits, imports)."""
+        self._stale = True
+
+    def clear(self) -> None:
+        """Drop every cached template as well (store cleared or replaced)."""
+        self._stale = True
+        self._envelope_templates.clear()
+        self._sample_templates.clear()
+
+    def note_cycle(self, cycle_id: str | None) -> None:
+        """A cycle was added, relabeled, reviewed, trimmed or removed."""
+        self._stale = True
+        if not cycle_id:
+            return
+        # A trace edited in place keeps its list identity, so drop templates
+        # derived from this cycle explicitly.
+        for steps in self._sample_templates.values():
+            for dt_key in [k for k, t in steps.items() if t.source[0] == cycle_id]:
+                del steps[dt_key]
+
+    def note_profile(self, name: str) -> None:
+        """A profile's envelope was rebuilt, or the profile renamed/removed."""
+        self._envelope_templates.pop(name, None)
+        self._sample_templates.pop(name, None)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def _resync(self, past: Iterable[Any], reference: Iterable[Any]) -> None:
+        """Rebuild the cycle tables (same selection rules as the snapshot builder).
+
+        ``cycles_by_id`` keeps the FIRST occurrence, ``labeled_by_profile`` the
+        first completed/force-stopped cycle with a trace, in past-then-reference
+        order, and a profile is golden if any of its cycles with a trace is.
+        """
+        cycles_by_id: dict[str, dict[str, Any]] = {}
+        labeled_by_profile: dict[str, dict[str, Any]] = {}
+        golden_profiles: set[str] = set()
+        for c in chain(past, reference):
+            cid = c.get("id")
+            if cid is not None and cid not in cycles_by_id:
+                cycles_by_id[cid] = c
+            pname = c.get("profile_name")
+            if not pname or not c.get("power_data"):
+                continue
+            if (
+                pname not in labeled_by_profile
+                and c.get("status") in ("completed", "force_stopped")
+            ):
+                labeled_by_profile[pname] = c
+            rev = c.get("ml_review")
+            if isinstance(rev, dict) and rev.get("golden"):
+                golden_profiles.add(pname)
+        self._cycles_by_id = cycles_by_id
+        self._labeled_by_profile = labeled_by_profile
+        self._golden_profiles = golden_profiles
+        self._stale = False
+        self.resyncs += 1
+
+    def envelope_template(self, name: str, avg: list[Any], band: float) -> ProfileTemplate:
+        """Template from a profile's envelope average curve."""
+        cached = self._envelope_templates.get(name)
+        if cached is not None and cached.source is avg and len(cached.sample_power) == len(avg):
+            if cached.keogh["band"] == band:
+                return cached
+        power = [float(p[1]) for p in avg]
+        span = float(avg[-1][0]) - float(avg[0][0]) if len(avg) > 1 else 0.0
+        template = _build_template(avg, power, span, band)
+        self._envelope_templates[name] = template
+        self.template_builds += 1
+        return template
+
+    def sample_template(
+        self, name: str, cycle: dict[str, Any], dt: float, band: float
+    ) -> ProfileTemplate | None:
+        """Template from a sample cycle's trace resampled at step ``dt``."""
+        cycle_id = cycle.get("id")
+        sample_data = cycle.get("power_data")
+        if not cycle_id or not sample_data:
+            return None
+        # Round dt to avoid float cache misses
+        dt_key = float(round(dt, 2))
+        steps = self._sample_templates.setdefault(name, {})
+        cached = steps.get(dt_key)
+        if (
+            cached is not None
+            and cached.source[0] == cycle_id
+            and cached.source[1] is sample_data
+            and cached.source[2] == len(sample_data)
+            and cached.keogh["band"] == band
+        ):
+            return cached
+
+        seg = self._resample_sample(cycle_id, sample_data, dt)
+        if seg is None:
+            return None
+        span = (
+            float(seg.timestamps[-1]) - float(seg.timestamps[0])
+            if len(seg.timestamps) > 1 else 0.0
+        )
+        template = _build_template(
+            (cycle_id, sample_data, len(sample_data)), seg.power.tolist(), span, band
+        )
+        steps.pop(dt_key, None)
+        steps[dt_key] = template
+        while len(steps) > _MAX_STEPS_PER_PROFILE:
+            del steps[next(iter(steps))]
+        self.template_builds += 1
+        return template
+
+    def _resample_sample(self, cycle_id: str, sample_data: list[Any], dt: float) -> Segment | None:
+        try:
+            if len(sample_data) > 0 and isinstance(sample_data[0], (list, tuple)):
+                s_ts = np.array([x[0] for x in sample_data])
+                s_p = np.array([x[1] for x in sample_data])
+            else:
+                return None
+
+            s_segments = resample_uniform(s_ts, s_p, dt_s=dt, gap_s=21600.0)
+            if not s_segments:
+                return None
+            return max(s_segments, key=lambda s: len(s.power))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self._logger.warning("Error caching sample segment %s: %s", cycle_id, e)
+            return None
+
+    # ------------------------------------------------------------------
+    # Snapshot building
+    # ------------------------------------------------------------------
+
+    def build_snapshots(
+        self, data: dict[str, Any], used_dt: float, band: float
+    ) -> tuple[list[dict[str, Any]], list[str]]:
+        """Matching snapshots for every profile, plus human-readable skip reasons.
+
+        Imported reference cycles are eligible as matching templates alongside
+        real cycles (so an import-only profile can match).
+        """
+        if self._stale:
+            self._resync(data.get("past_cycles", []), data.get("reference_cycles", []))
+
+        profiles = data.get("profiles", {})
+        envelopes = data.get("envelopes", {})
+        for stale in [n for n in self._envelope_templates if n not in profiles]:
+            del self._envelope_templates[stale]
+        for stale in [n for n in self._sample_templates if n not in profiles]:
+            del self._sample_templates[stale]
+
+        snapshots: list[dict[str, Any]] = []
+        skipped_profiles: list[str] = []
+        for name, profile in profiles.items():
+            # Try sample_cycle_id first, fall back to any labeled cycle
+            sample_id = profile.get("sample_cycle_id")
+            sample_cycle = self._cycles_by_id.get(sample_id) if sample_id else None
+            # Fallback: find ANY completed cycle labeled with this profile
+            if not sample_cycle:
+                sample_cycle = self._labeled_by_profile.get(name)
+            # Boost user-pinned "golden" cycles: when a profile has one, use
+            # its sharp single-cycle trace as the matching template instead
+            # of the envelope average. The envelope average smears the
+            # wash-phase peaks (each cycle's spikes land at slightly
+            # different times), which hurts correlation for sharply-shaped
+            # programs; a trusted golden cycle preserves that shape.
+            has_golden = name in self._golden_profiles
+
+            # Prefer envelope avg curve when ≥2 labeled cycles have been
+            # confirmed - it gives a more representative reference signal
+            # than the original sample alone, so confidence improves over
+            # time as the user keeps confirming correct detections. Skipped
+            # when a golden cycle is pinned (see above).
+            envelope = envelopes.get(name)
+            _env_avg = envelope.get("avg") if envelope else None
+            if (
+                not has_golden
+                and envelope
+                and envelope.get("cycle_count", 0) >= 2
+                and _env_avg
+                and isinstance(_env_avg[0], (list, tuple))
+                and len(_env_avg[0]) >= 2
+            ):
+                template = self.envelope_template(name, _env_avg, band)
+                avg_duration = (
+                    envelope.get("target_duration") or
+                    profile.get("avg_duration") or
+                    template.span_s or
+                    None
+                )
+                if not avg_duration:
+                    skipped_profiles.append(
+                        f"{name}: no valid duration (envelope has no target_duration, avg_duration, or timestamp span)"
+                    )
+                    continue
+                snapshots.append(self._snapshot(name, float(avg_duration), template))
+                continue
+
+            if not sample_cycle:
+                skipped_profiles.append(
+                    f"{name}: no sample cycle (sample_id={sample_id})"
+                )
+                continue
+
+            template = self.sample_template(name, sample_cycle, used_dt, band)
+            if template is None:
+                skipped_profiles.append(
+                    f"{name}: failed to resample cycle {sample_cycle.get('id')}"
+                )
+                continue
+            # avg_duration preference order:
+            #   1. profile["avg_duration"] (rolling average, most accurate)
+            #   2. sample_cycle["duration"] (raw cycle field)
+            #   3. timestamp span of the resampled sample segment
+            # Profiles created before avg_duration tracking was added may have
+            # 0 or a missing value; falling back to the segment estimate prevents
+            # update_match() from always seeing expected_duration=0, which
+            # silences time-remaining estimates and logs a misleading warning.
+            avg_dur = (
+                profile.get("avg_duration") or
+                sample_cycle.get("duration") or
+                template.span_s
+            )
+            if not avg_dur:
+                skipped_profiles.append(
+                    f"{name}: no valid duration (avg_duration, cycle duration, and timestamp span all zero/missing)"
+                )
+                continue
+            snapshot = self._snapshot(name, float(avg_dur), template)
+            snapshot["sample_dt"] = used_dt
+            snapshots.append(snapshot)
+
+        return snapshots, skipped_profiles
+
+    @staticmethod
+    def _snapshot(name: str, avg_duration: float, template: ProfileTemplate) -> dict[str, Any]:
+        # sample_power is shared with the template: the matcher only reads it.
+        return {
+            "name": name,
+            "avg_duration": avg_duration,
+            "sample_power": template.sample_power,
+            "sample_grid": template.grid,
+            "sample_mean": template.mean_power,
+            "sample_keogh": template.keogh,
+        }
+
+    def stats(self) -> dict[str, int]:
+        """Counters for diagnostics."""
+        return {
+            "profiles_with_envelope_template": len(self._envelope_templates),
+            "sample_templates": sum(len(v) for v in self._sample_templates.values()),
+            "resyncs": self.resyncs,
+            "template_builds": self.template_builds,
+        }
@@ -22,16 +22,22 @@ blobs. They are inert unless the user enables them. See engine.py and README.md.
 
 from .engine import (
     CONF_ENABLE_ML_MODELS,
+    MatrixScorer,
     available_models,
     ml_models_enabled,
+    resolve_matrix_regressor,
+    resolve_matrix_scorer,
     resolve_regressor,
     resolve_scorer,
 )
 
 __all__ = [
     "CONF_ENABLE_ML_MODELS",
+    "MatrixScorer",
     "available_models",
     "ml_models_enabled",
+    "resolve_matrix_regressor",
+    "resolve_matrix_scorer",
     "resolve_regressor",
     "resolve_scorer",
 ]
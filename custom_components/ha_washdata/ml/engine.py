@@ -21,12 +21,17 @@ This package holds compact, NumPy-only models trained offline in the
 ``promoted_manifest.json`` for provenance). The integration runtime stays
 NumPy-only; no sklearn/torch/scipy are imported.
 
-The single runtime entry point is :func:`resolve_scorer`, which returns a scoring
-callable for a capability, preferring an on-device trained spec over the shipped
-embedded baseline. All live ML consumers go through it (the panel's ``ml_health``
-shadow comparison in ``ws_api`` and :class:`MLSuggestionEngine`), and any new
-runtime consumer should too — feature extraction lives in ``feature_extraction``
-and gating in :func:`ml_models_enabled`, so there is no separate engine object.
+The runtime entry points are :func:`resolve_matrix_scorer` /
+:func:`resolve_matrix_regressor`, which return a :class:`MatrixScorer` for a
+capability, preferring an on-device trained spec over the shipped embedded
+baseline, and their per-mapping wrappers :func:`resolve_scorer` /
+:func:`resolve_regressor`. All ML consumers go through them - live gating in the
+manager, the panel's ``ml_health`` shadow comparison in ``ws_api``,
+:class:`MLSuggestionEngine` and the training gate - and any new one should too.
+Batch consumers (history, backfills) build one feature matrix and score it in a
+single pass; live paths score one mapping through the same cached scorer.
+Feature extraction lives in ``feature_extraction`` and gating in
+:func:`ml_models_enabled`.
 
 Each model consumes a feature mapping whose keys are the model's
 ``FEATURE_COLUMNS``; the integration computes those from live data per the
@@ -38,8 +43,11 @@ from __future__ import annotations
 import importlib
 import json
 import logging
+from collections.abc import Iterable, Mapping, Sequence
 from pathlib import Path
-from typing import Mapping
+from typing import Any
+
+import numpy as np
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -60,171 +68,336 @@ def ml_models_enabled(options: Mapping[str, object] | None) -> bool:
     return bool(options.get(CONF_ENABLE_ML_MODELS, False))
 
 
-def resolve_scorer(capability: str, store: object | None):
-    """Return ``(score_fn, source)`` for a capability, preferring an on-device
-    trained spec over the shipped embedded baseline.
+class MatrixScorer:
+    """One capability's resolved model, scoring whole feature matrices at once.
 
-    ``score_fn`` maps a feature mapping -> float in [0,1]; ``source`` is
-    ``"on_device"`` or ``"baseline"``. Returns ``(None, None)`` when neither is
-    available. This is the single bridge that lets trained models (Stage 4)
-    actually reach inference (ML Lab shadow comparison + MLSuggestionEngine)
-    while transparently falling back to the baseline.
+    ``columns`` is the model's feature order. :meth:`score_matrix` takes a
+    ``(rows, features)`` matrix plus the column names it was built with and
+    checks them against ``columns`` - a reordered or wider column list is
+    re-indexed, a missing column or a width mismatch raises ``ValueError`` (a
+    caller bug, not a model failure) - before a single standardise-and-dot
+    pass. :meth:`matrix` builds a matrix in model order from feature mappings,
+    filling missing keys the way the per-mapping scorers always have: the
+    training center for on-device specs, raw 0.0 for the embedded baseline.
+
+    Model failures never raise into inference (unless ``strict``): an on-device
+    classifier falls back to the embedded baseline and then to a neutral 0.0, a
+    regressor returns NaN (which the isfinite-guarded consumers treat as inert).
     """
-    def _baseline():
-        """Resolve the shipped embedded baseline scorer for this capability.
 
-        Kept as a lazily-invoked helper so the baseline module is only imported
-        when the on-device spec is absent *or* fails at call time - preserving the
-        original "baseline only loaded when needed" semantics.
+    def __init__(
+        self,
+        capability: str,
+        source: str,
+        spec: Mapping[str, Any],
+        *,
+        regression: bool = False,
+        fill_center: bool = True,
+    ) -> None:
+        self.capability = capability
+        self.source = source
+        self.regression = regression
+        self.columns: tuple[str, ...] = tuple(str(c) for c in spec["feature_columns"])
+        self._index = {c: i for i, c in enumerate(self.columns)}
+        # Arrays converted once here instead of on every call.
+        self._spec: dict[str, Any] = {
+            "center": np.asarray(spec["center"], dtype=float),
+            "scale": np.asarray(spec["scale"], dtype=float),
+            "coef": np.asarray(spec["coef"], dtype=float),
+            "bias": float(spec.get("bias") or 0.0),
+            "output_center": float(spec.get("output_center") or 0.0),
+            "output_scale": float(
+                spec["output_scale"] if spec.get("output_scale") is not None else 1.0
+            ),
+        }
+        self._fill = (
+            [float(v) for v in self._spec["center"]]
+            if fill_center
+            else [0.0] * len(self.columns)
+        )
+
+    def matrix(self, rows: Iterable[Mapping[str, Any]]) -> np.ndarray:
+        """Feature mappings -> ``(rows, len(columns))`` matrix in model order."""
+        columns = self.columns
+        fill = self._fill
+        data = []
+        for features in rows:
+            row = []
+            for i, col in enumerate(columns):
+                val = features.get(col)
+                row.append(fill[i] if val is None else float(val))
+            data.append(row)
+        return np.array(data, dtype=float).reshape(len(data), len(columns))
+
+    def score_matrix(
+        self,
+        matrix: np.ndarray,
+        columns: Sequence[str] | None = None,
+        *,
+        strict: bool = False,
+    ) -> np.ndarray:
+        """Scores (probabilities, or target units for a regressor) per row.
+
+        ``columns`` names the matrix columns; omit it only for matrices built
+        by :meth:`matrix`. ``strict`` re-raises model errors instead of
+        falling back (training uses it to tell a broken baseline from a bad
+        one).
         """
-        module_name = _MODEL_MODULES.get(capability)
-        if module_name is None:
-            return (None, None)
+        values = np.asarray(matrix, dtype=float)
+        if values.ndim == 1:
+            values = values.reshape(1, -1)
+        if values.ndim != 2:
+            raise ValueError(f"expected a 2-D feature matrix, got {values.ndim}-D")
+        if columns is not None:
+            names = tuple(columns)
+            if len(names) != values.shape[1]:
+                raise ValueError(
+                    f"{len(names)} column names for a {values.shape[1]}-column matrix"
+                )
+            if names != self.columns:
+                position = {c: i for i, c in enumerate(names)}
+                missing = [c for c in self.columns if c not in position]
+                if missing:
+                    raise ValueError(
+                        f"{self.capability} model needs missing feature columns: {missing}"
+                    )
+                values = values[:, [position[c] for c in self.columns]]
+        elif values.shape[1] != len(self.columns):
+            raise ValueError(
+                f"{self.capability} model expects {len(self.columns)} columns, "
+                f"got {values.shape[1]}"
+            )
+        if values.shape[0] == 0:
+            return np.empty(0, dtype=float)
         try:
-            module = importlib.import_module(f"{__package__}.{module_name}")
-        except Exception as exc:  # noqa: BLE001
+            return self._compute(values)
+        except Exception as exc:  # noqa: BLE001 - never raise into live inference
+            if strict:
+                raise
+            return self._fallback(values, exc)
+
+    def score_rows(self, rows: Iterable[Mapping[str, Any]]) -> np.ndarray:
+        """Scores for a batch of feature mappings (one matrix, one pass)."""
+        return self.score_matrix(self.matrix(rows))
+
+    def score(self, features: Mapping[str, Any]) -> float:
+        """Score of one feature mapping (the ``resolve_scorer`` callable)."""
+        return float(self.score_matrix(self.matrix((features,)))[0])
+
+    def _compute(self, values: np.ndarray) -> np.ndarray:
+        from .trainer import predict_matrix_spec, score_matrix_spec
+
+        if self.regression:
+            return predict_matrix_spec(self._spec, values)
+        return score_matrix_spec(self._spec, values)
+
+    def _fallback(self, values: np.ndarray, exc: Exception) -> np.ndarray:
+        rows = values.shape[0]
+        if self.regression:
             _LOGGER.warning(
-                "Failed to load embedded baseline for capability %r: %s",
-                capability, exc,
+                "Trained regressor for capability %r failed at call time, "
+                "returning inert value: %s", self.capability, exc,
             )
-            return (None, None)
-
-        def _baseline_score(feats, _m=module):
-            # The embedded baseline must never raise into live inference either
-            # (mirrors _on_device_score's call-time guard): on any scoring error
-            # log and return a neutral 0.0 so a gate treats the signal as absent
-            # rather than letting the exception reach live detection/matching.
-            try:
-                return float(_m.score(feats))
-            except Exception as exc:  # noqa: BLE001 - never raise into live inference
-                _LOGGER.warning(
-                    "Embedded baseline scorer for capability %r failed at call "
-                    "time, returning neutral 0.0: %s", capability, exc,
-                )
-                return 0.0
-
-        return (_baseline_score, "baseline")
-
-    # 1) On-device trained spec from the store.
-    if store is not None:
-        try:
-            versions = store.get_ml_model_versions() or {}  # type: ignore[attr-defined]
-            record = versions.get(capability)
-            spec = record.get("spec") if isinstance(record, dict) else None
-            # Only treat a spec as a classifier here. A regression spec
-            # (standardized_linear) must never be sigmoid-squashed by score_spec;
-            # classifier and regression capability keys are disjoint today, but this
-            # guard keeps it safe if a key were ever reused.
-            if isinstance(spec, dict) and spec.get("kind") != "standardized_linear":
-                # Feature-column schema guard: a spec promoted under an older
-                # FEATURE_COLUMNS must be dropped rather than silently scoring on a
-                # stale/neutral-filled schema. The call-time guard already catches
-                # shape mismatches, but this catches them at load time and logs
-                # clearly, so users see a single warm-up warning instead of a
-                # per-inference warning storm.
-                module_name = _MODEL_MODULES.get(capability)
-                if module_name is not None:
-                    try:
-                        _bm = importlib.import_module(f"{__package__}.{module_name}")
-                        _expected = list(getattr(_bm, "FEATURE_COLUMNS", []))
-                        _stored = list(spec.get("feature_columns") or [])
-                        if _expected and _stored and _stored != _expected:
-                            _LOGGER.warning(
-                                "Promoted spec for %r has stale feature schema "
-                                "(%d cols vs current %d); reverting to baseline.",
-                                capability, len(_stored), len(_expected),
-                            )
-                            return _baseline()
-                    except Exception:  # noqa: BLE001 - schema check must not break inference
-                        pass
-
-                from .trainer import score_spec
-
-                def _on_device_score(feats, _s=spec):
-                    # A malformed / dimensionally-incompatible promoted spec must
-                    # never raise into live detection/matching: on any call-time
-                    # error fall back to the embedded baseline (or a neutral 0.0).
-                    try:
-                        return float(score_spec(_s, feats))
-                    except Exception as exc:  # noqa: BLE001 - never raise into live inference
-                        _LOGGER.warning(
-                            "Trained scorer for capability %r failed at call time, "
-                            "falling back to baseline: %s", capability, exc,
-                        )
-                        fn, _src = _baseline()
-                        if fn is not None:
-                            try:
-                                return fn(feats)
-                            except Exception:  # noqa: BLE001 - baseline must not raise either
-                                pass
-                        return 0.0
-
-                return (_on_device_score, "on_device")
-        except Exception as exc:  # noqa: BLE001 - never let a bad store break inference
+            return np.full(rows, np.nan)
+        if self.source == "on_device":
             _LOGGER.warning(
-                "Failed to load trained spec for capability %r, falling back to baseline: %s",
-                capability, exc,
+                "Trained scorer for capability %r failed at call time, "
+                "falling back to baseline: %s", self.capability, exc,
             )
-    # 2) Shipped embedded baseline module.
-    return _baseline()
+            baseline = _baseline_scorer(self.capability)
+            if baseline is not None:
+                try:
+                    return baseline.score_matrix(values, self.columns, strict=True)
+                except Exception:  # noqa: BLE001 - baseline must not raise either
+                    pass
+            return np.zeros(rows)
+        # The embedded baseline must never raise into live inference either: a
+        # neutral 0.0 makes a gate treat the signal as absent.
+        _LOGGER.warning(
+            "Embedded baseline scorer for capability %r failed at call "
+            "time, returning neutral 0.0: %s", self.capability, exc,
+        )
+        return np.zeros(rows)
+
+
+# Resolved scorers. Baselines never change at runtime; on-device entries are
+# keyed by store and remembered together with the spec object they were built
+# from, so a promotion / reset (which stores a new record) is picked up on the
+# next resolve while the live paths - which resolve on every reading - reuse
+# the prepared arrays instead of rebuilding them per call.
+_BASELINE_SCORERS: dict[str, MatrixScorer] = {}
+_STORE_SCORERS: dict[tuple[str, int], tuple[object, MatrixScorer | None]] = {}
+
+
+def _baseline_scorer(capability: str) -> MatrixScorer | None:
+    """The shipped embedded baseline for a capability (imported on first use)."""
+    scorer = _BASELINE_SCORERS.get(capability)
+    if scorer is not None:
+        return scorer
+    module_name = _MODEL_MODULES.get(capability)
+    if module_name is None:
+        return None
+    try:
+        module = importlib.import_module(f"{__package__}.{module_name}")
+        scorer = MatrixScorer(capability, "baseline", module._load(), fill_center=False)  # pylint: disable=protected-access
+    except Exception as exc:  # noqa: BLE001
+        _LOGGER.warning(
+            "Failed to load embedded baseline for capability %r: %s",
+            capability, exc,
+        )
+        return None
+    _BASELINE_SCORERS[capability] = scorer
+    return scorer
 
 
-def resolve_regressor(capability: str, store: object | None):
-    """Return ``(predict_fn, source)`` for a regression capability.
+def _promoted_spec(capability: str, store: object | None) -> dict[str, Any] | None:
+    if store is None:
+        return None
+    versions = store.get_ml_model_versions() or {}  # type: ignore[attr-defined]
+    record = versions.get(capability)
+    spec = record.get("spec") if isinstance(record, dict) else None
+    return spec if isinstance(spec, dict) else None
 
-    Regression models (``"remaining_time"`` and ``"total_energy"``) have **no**
-    shipped embedded baseline - they are trained purely on-device (Stage 4) and
-    stored as ``standardized_linear`` specs. This returns ``(None, None)`` until
-    on-device training promotes one, so live behaviour is unchanged until then.
 
-    ``predict_fn`` maps a feature mapping -> float in the model's target units
-    (a completion fraction in ~[0, 1] for both regression capabilities).
+def _cached(capability: str, store: object, spec: object) -> tuple[bool, MatrixScorer | None]:
+    hit = _STORE_SCORERS.get((capability, id(store)))
+    if hit is not None and hit[0] is spec:
+        return True, hit[1]
+    return False, None
+
+
+def resolve_matrix_scorer(capability: str, store: object | None) -> MatrixScorer | None:
+    """Return the :class:`MatrixScorer` for a classifier capability, preferring
+    an on-device trained spec over the shipped embedded baseline.
+
+    ``source`` on the result is ``"on_device"`` or ``"baseline"``; None when
+    neither is available. This is the single bridge that lets trained models
+    (Stage 4) actually reach inference while transparently falling back to the
+    baseline.
     """
-    if store is None:
-        return (None, None)
+    # 1) On-device trained spec from the store.
     try:
-        versions = store.get_ml_model_versions() or {}  # type: ignore[attr-defined]
-        record = versions.get(capability)
-        spec = record.get("spec") if isinstance(record, dict) else None
-        if isinstance(spec, dict) and spec.get("kind") == "standardized_linear":
-            # Feature-column schema guard for regression specs.
-            try:
-                from .feature_extraction import PROGRESS_FEATURE_COLUMNS
-                _expected_r = list(PROGRESS_FEATURE_COLUMNS)
-                _stored_r = list(spec.get("feature_columns") or [])
-                if _expected_r and _stored_r and _stored_r != _expected_r:
-                    _LOGGER.warning(
-                        "Promoted regression spec for %r has stale feature schema "
-                        "(%d cols vs current %d); reverting to inert.",
-                        capability, len(_stored_r), len(_expected_r),
-                    )
-                    return (None, None)
-            except Exception:  # noqa: BLE001 - schema check must not break inference
-                pass
+        spec = _promoted_spec(capability, store)
+        # Only treat a spec as a classifier here. A regression spec
+        # (standardized_linear) must never be sigmoid-squashed; classifier and
+        # regression capability keys are disjoint today, but this guard keeps
+        # it safe if a key were ever reused.
+        if spec is not None and spec.get("kind") != "standardized_linear":
+            found, scorer = _cached(capability, store, spec)
+            if not found:
+                scorer = _on_device_scorer(capability, spec)
+                _STORE_SCORERS[(capability, id(store))] = (spec, scorer)
+            if scorer is not None:
+                return scorer
+    except Exception as exc:  # noqa: BLE001 - never let a bad store break inference
+        _LOGGER.warning(
+            "Failed to load trained spec for capability %r, falling back to baseline: %s",
+            capability, exc,
+        )
+    # 2) Shipped embedded baseline module.
+    return _baseline_scorer(capability)
+
+
+def _on_device_scorer(capability: str, spec: dict[str, Any]) -> MatrixScorer | None:
+    """Scorer for a promoted classifier spec, or None when its schema is stale."""
+    # Feature-column schema guard: a spec promoted under an older FEATURE_COLUMNS
+    # must be dropped rather than silently scoring on a stale/neutral-filled
+    # schema. The call-time guard already catches shape mismatches, but this
+    # catches them at load time and logs clearly - once per promoted spec, as
+    # the verdict is cached with the scorer.
+    module_name = _MODEL_MODULES.get(capability)
+    if module_name is not None:
+        try:
+            _bm = importlib.import_module(f"{__package__}.{module_name}")
+            _expected = list(getattr(_bm, "FEATURE_COLUMNS", []))
+            _stored = list(spec.get("feature_columns") or [])
+            if _expected and _stored and _stored != _expected:
+                _LOGGER.warning(
+                    "Promoted spec for %r has stale feature schema "
+                    "(%d cols vs current %d); reverting to baseline.",
+                    capability, len(_stored), len(_expected),
+                )
+                return None
+        except Exception:  # noqa: BLE001 - schema check must not break inference
+            pass
+    try:
+        return MatrixScorer(capability, "on_device", spec)
+    except Exception as exc:  # noqa: BLE001 - malformed spec: use the baseline
+        _LOGGER.warning(
+            "Trained spec for capability %r is malformed, falling back to baseline: %s",
+            capability, exc,
+        )
+        return None
 
-            from .trainer import predict_value_spec
 
-            def _on_device_predict(feats, _s=spec):
-                # A malformed / incompatible promoted regression spec must never
-                # raise into the live remaining-time / energy estimates: on any
-                # call-time error return NaN so the (isfinite-guarded) consumers
-                # treat this capability as inert.
-                try:
-                    return float(predict_value_spec(_s, feats))
-                except Exception as exc:  # noqa: BLE001 - never raise into live inference
-                    _LOGGER.warning(
-                        "Trained regressor for capability %r failed at call time, "
-                        "returning inert value: %s", capability, exc,
-                    )
-                    return float("nan")
+def resolve_matrix_regressor(capability: str, store: object | None) -> MatrixScorer | None:
+    """Return the :class:`MatrixScorer` for a regression capability, or None.
 
-            return (_on_device_predict, "on_device")
+    Regression models (``"remaining_time"`` and ``"total_energy"``) have **no**
+    shipped embedded baseline - they are trained purely on-device (Stage 4) and
+    stored as ``standardized_linear`` specs. This returns None until on-device
+    training promotes one, so live behaviour is unchanged until then. Scores
+    are in the model's target units (a completion fraction in ~[0, 1] for both
+    regression capabilities).
+    """
+    try:
+        spec = _promoted_spec(capability, store)
+        if spec is None or spec.get("kind") != "standardized_linear":
+            return None
+        found, scorer = _cached(capability, store, spec)
+        if found:
+            return scorer
+        scorer = None
+        stale = False
+        # Feature-column schema guard for regression specs.
+        try:
+            from .feature_extraction import PROGRESS_FEATURE_COLUMNS
+            _expected_r = list(PROGRESS_FEATURE_COLUMNS)
+            _stored_r = list(spec.get("feature_columns") or [])
+            if _expected_r and _stored_r and _stored_r != _expected_r:
+                _LOGGER.warning(
+                    "Promoted regression spec for %r has stale feature schema "
+                    "(%d cols vs current %d); reverting to inert.",
+                    capability, len(_stored_r), len(_expected_r),
+                )
+                stale = True
+        except Exception:  # noqa: BLE001 - schema check must not break inference
+            pass
+        if not stale:
+            scorer = MatrixScorer(capability, "on_device", spec, regression=True)
+        _STORE_SCORERS[(capability, id(store))] = (spec, scorer)
+        return scorer
     except Exception as exc:  # noqa: BLE001 - never let a bad store break inference
         _LOGGER.warning(
             "Failed to load trained regression spec for capability %r, capability will be inert: %s",
             capability, exc,
         )
-    return (None, None)
+    return None
+
+
+def resolve_scorer(capability: str, store: object | None):
+    """Return ``(score_fn, source)`` for a capability (see :func:`resolve_matrix_scorer`).
+
+    ``score_fn`` maps a feature mapping -> float in [0,1]; ``source`` is
+    ``"on_device"`` or ``"baseline"``. Returns ``(None, None)`` when neither is
+    available.
+    """
+    scorer = resolve_matrix_scorer(capability, store)
+    if scorer is None:
+        return (None, None)
+    return (scorer.score, scorer.source)
+
+
+def resolve_regressor(capability: str, store: object | None):
+    """Return ``(predict_fn, source)`` for a regression capability
+    (see :func:`resolve_matrix_regressor`); ``(None, None)`` until one is promoted.
+
+    ``predict_fn`` maps a feature mapping -> float in the model's target units.
+    """
+    scorer = resolve_matrix_regressor(capability, store)
+    if scorer is None:
+        return (None, None)
+    return (scorer.score, scorer.source)
 
 
 _MANIFEST_MODELS_CACHE: list[dict[str, object]] | None = None
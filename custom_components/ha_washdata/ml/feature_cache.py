@@ -0,0 +1,166 @@
+# WashData - Home Assistant integration for appliance cycle monitoring via smart plugs.
+# Copyright (C) 2026 Lukas Bandura
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Persisted per-device cache of trace-only training features.
+
+On-device training (training_task.py) needs the quality-model features of
+every stored cycle. Most of their cost is in the trace itself - noise and
+spike scan, shape descriptors, idle padding - and none of that changes once a
+cycle is stored. The profile-relative parts (duration/energy/peak ratios) and
+the match context do change as the history grows, so the cache holds only the
+:data:`~.feature_extraction.QUALITY_TRACE_COLUMNS` row per cycle and training
+recombines it with the current expectations
+(:func:`~.feature_extraction.quality_feature_matrix`).
+
+Entries are keyed by cycle id and carry a fingerprint of the stored trace
+(sample count plus first/last reading), so a trimmed or replaced trace is
+recomputed. The whole file is dropped when ``FEATURE_CACHE_VERSION`` or the
+column list changes. Rows are filled as cycles finish (only while training is
+enabled) and by the training run itself for anything missing; the run also
+prunes entries of cycles that no longer exist.
+
+Stored as ``.storage/ha_washdata.ml_features.<entry_id>``::
+
+    {"version": FEATURE_CACHE_VERSION, "columns": [...],
+     "cycles": {"<cycle id>": {"fp": "...", "n": <raw readings>, "q": [...]}}}
+
+``q`` is absent for cycles whose trace is too short to train on.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from ..const import STORAGE_KEY
+from .feature_extraction import (
+    FEATURE_CACHE_VERSION,
+    QUALITY_TRACE_COLUMNS,
+    quality_trace_stats,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_STORE_VERSION = 1
+_SAVE_DELAY_S = 60
+
+# Training skips cycles with fewer raw readings than this (see
+# training_task._quality_dataset), so no stats are computed for them.
+MIN_QUALITY_POINTS = 6
+
+CacheEntries = dict[str, dict[str, Any]]
+
+
+def trace_fingerprint(cycle: dict[str, Any]) -> str | None:
+    """Cheap identity of a cycle's stored trace, or None without one."""
+    raw = cycle.get("power_data")
+    if not isinstance(raw, list) or not raw:
+        return None
+    return f"{len(raw)}|{raw[0]!r}|{raw[-1]!r}"
+
+
+def compute_entry(cycle: dict[str, Any]) -> dict[str, Any] | None:
+    """Cache entry for one cycle (executor side); None without a usable trace."""
+    from ..profile_store import decompress_power_data  # noqa: PLC0415
+
+    fingerprint = trace_fingerprint(cycle)
+    if fingerprint is None:
+        return None
+    try:
+        points = decompress_power_data(cycle)
+    except Exception:  # pylint: disable=broad-exception-caught
+        return None
+    entry: dict[str, Any] = {"fp": fingerprint, "n": len(points)}
+    if len(points) >= MIN_QUALITY_POINTS:
+        stats = quality_trace_stats(points)
+        entry["q"] = [stats[c] for c in QUALITY_TRACE_COLUMNS]
+    return entry
+
+
+def lookup(entries: CacheEntries, cycle: dict[str, Any]) -> dict[str, Any] | None:
+    """The cached entry for ``cycle`` if it still matches its trace."""
+    cycle_id = cycle.get("id")
+    entry = entries.get(cycle_id) if isinstance(cycle_id, str) else None
+    if not isinstance(entry, dict) or entry.get("fp") != trace_fingerprint(cycle):
+        return None
+    return entry
+
+
+class MLFeatureCache:
+    """Loads, updates and persists one device's feature cache (event loop)."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass, _STORE_VERSION, f"{STORAGE_KEY}.ml_features.{entry_id}"
+        )
+        self._entries: CacheEntries = {}
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load the cache once; a stale or unreadable file starts it empty."""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            data = await self._store.async_load()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            _LOGGER.warning("Failed to load ML feature cache, starting empty: %s", exc)
+            return
+        if (
+            isinstance(data, dict)
+            and data.get("version") == FEATURE_CACHE_VERSION
+            and data.get("columns") == QUALITY_TRACE_COLUMNS
+            and isinstance(data.get("cycles"), dict)
+        ):
+            self._entries = data["cycles"]
+
+    async def async_snapshot(self) -> CacheEntries:
+        """A copy of the entries for a training run to read and fill."""
+        await self.async_load()
+        return dict(self._entries)
+
+    def replace(self, entries: CacheEntries, live_ids: Iterable[str]) -> None:
+        """Take over a training run's entries, dropping cycles no longer stored."""
+        live = set(live_ids)
+        self._entries = {k: v for k, v in entries.items() if k in live}
+        self._schedule_save()
+
+    async def async_add_cycle(self, cycle: dict[str, Any]) -> None:
+        """Compute and cache the entry of a newly stored cycle."""
+        cycle_id = cycle.get("id")
+        if not isinstance(cycle_id, str):
+            return
+        await self.async_load()
+        job = {k: cycle.get(k) for k in ("power_data", "start_time")}
+        entry = await self.hass.async_add_executor_job(compute_entry, job)
+        if entry is not None:
+            self._entries[cycle_id] = entry
+            self._schedule_save()
+
+    def _schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, _SAVE_DELAY_S)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "version": FEATURE_CACHE_VERSION,
+            "columns": QUALITY_TRACE_COLUMNS,
+            "cycles": self._entries,
+        }
@@ -407,55 +407,53 @@ _SHAPE_COLUMNS = [
     "shape_tail_slope",
 ]
 
+# The trace-only half of the quality features: everything that depends on the
+# power trace alone (no profile expectation, no match context), plus the raw
+# duration/energy/peak the profile ratios are formed from. Training caches one
+# row of these per cycle (see feature_cache.py) and combines them with the
+# current expectations via :func:`quality_feature_matrix`. Bump
+# FEATURE_CACHE_VERSION whenever any of these values would be computed
+# differently, so stale cached rows are dropped.
+_TRACE_QUALITY_COLUMNS = [
+    "max_gap_ratio",
+    "low_power_gap_ratio",
+    "false_end_energy_ratio",
+    "sample_density_log",
+    "peak_density_log",
+    "local_spike_score",
+    "local_spike_rate",
+    "local_noise_score",
+    "leading_idle_ratio",
+    "trailing_idle_ratio",
+    "trimmed_duration_log_ratio",
+]
+QUALITY_TRACE_COLUMNS = [
+    "duration_s",
+    "energy_wh",
+    "max_power_w",
+    *_TRACE_QUALITY_COLUMNS,
+    *_SHAPE_COLUMNS,
+    "has_trace",
+]
 
-def quality_features(
-    points: Sequence[Point],
-    profile_median_duration_s: float,
-    profile_median_energy_wh: float,
-    profile_median_peak_w: float,
-    profile_distance: float,
-    label_margin: float,
-    profile_fit_score: float,
-    flag_count: int,
-    *,
-    trace_length: int = _QUALITY_TRACE_LENGTH,
-) -> dict[str, float]:
-    """Features for the hybrid curve-quality model (problem/bad-cycle detector).
+FEATURE_CACHE_VERSION = 1
 
-    Args:
-        points: Complete cycle power trace (offset_s, watts).
-        profile_median_duration_s: Median duration of the matched profile (s).
-        profile_median_energy_wh: Median energy of the matched profile (Wh).
-        profile_median_peak_w: Median peak power of the matched profile (W).
-        profile_distance: Shape distance from the MatchResult to the assigned
-            profile envelope (higher = worse fit).
-        label_margin: Score margin between the top-1 and top-2 profile candidates
-            (positive = confident match; 0.0 when only one candidate exists).
-        profile_fit_score: Profile fit score in [0, 1] from the matcher.
-        flag_count: Number of detection/anomaly flags raised for this cycle by
-            the existing detector (early_power_dip, false_end_pause_seen, etc.).
 
-    Returns a dict with exactly ``QUALITY_FEATURE_COLUMNS`` keys.
+def quality_trace_stats(
+    points: Sequence[Point], *, trace_length: int = _QUALITY_TRACE_LENGTH
+) -> dict[str, float]:
+    """The :data:`QUALITY_TRACE_COLUMNS` of a complete cycle trace.
+
+    All zeros with ``has_trace`` 0.0 when fewer than four usable readings remain.
     """
     pts = _clean_points(points)
     if len(pts) < 4:
-        return _no_trace_quality_features(
-            profile_distance=profile_distance,
-            label_margin=label_margin,
-            profile_fit_score=profile_fit_score,
-            flag_count=flag_count,
-        )
+        return {c: 0.0 for c in QUALITY_TRACE_COLUMNS}
 
     offsets = np.asarray([float(o) for o, _ in pts], dtype=float)
     powers = np.asarray([float(p) for _, p in pts], dtype=float)
     duration_s = max(float(offsets[-1] - offsets[0]), 1.0)
     total_energy_wh = float(cumulative_energy_wh(pts)[-1])
-    max_power_w = float(np.max(powers))
-
-    # -- profile context ratios --
-    prof_dur = max(float(profile_median_duration_s), 1.0)
-    prof_energy = max(float(profile_median_energy_wh), 1e-6)
-    prof_peak = max(float(profile_median_peak_w), 1.0)
 
     # -- sampling gap features --
     intervals = np.diff(offsets)
@@ -484,11 +482,9 @@ def quality_features(
     trimmed_log = math.log(max(1e-6, trimmed_ratio))  # always <= 0
 
     return {
-        "duration_log_ratio": _log_ratio(duration_s / prof_dur),
-        "energy_log_ratio": _log_ratio(total_energy_wh / prof_energy),
-        "peak_log_ratio": _log_ratio(max_power_w / prof_peak),
-        "profile_distance": float(profile_distance),
-        "label_margin_positive": float(max(0.0, float(label_margin))),
+        "duration_s": duration_s,
+        "energy_wh": total_energy_wh,
+        "max_power_w": float(np.max(powers)),
         "max_gap_ratio": _safe_div(max_gap_s, duration_s),
         "low_power_gap_ratio": _safe_div(low_gap_s, duration_s),
         "false_end_energy_ratio": _safe_div(fe_energy_wh, max(total_energy_wh, 1e-6)),
@@ -500,9 +496,64 @@ def quality_features(
         "leading_idle_ratio": float(padding["leading_idle_ratio"]),
         "trailing_idle_ratio": float(padding["trailing_idle_ratio"]),
         "trimmed_duration_log_ratio": float(trimmed_log),
+        **shape,
+        "has_trace": 1.0,
+    }
+
+
+def quality_features(
+    points: Sequence[Point],
+    profile_median_duration_s: float,
+    profile_median_energy_wh: float,
+    profile_median_peak_w: float,
+    profile_distance: float,
+    label_margin: float,
+    profile_fit_score: float,
+    flag_count: int,
+    *,
+    trace_length: int = _QUALITY_TRACE_LENGTH,
+) -> dict[str, float]:
+    """Features for the hybrid curve-quality model (problem/bad-cycle detector).
+
+    Args:
+        points: Complete cycle power trace (offset_s, watts).
+        profile_median_duration_s: Median duration of the matched profile (s).
+        profile_median_energy_wh: Median energy of the matched profile (Wh).
+        profile_median_peak_w: Median peak power of the matched profile (W).
+        profile_distance: Shape distance from the MatchResult to the assigned
+            profile envelope (higher = worse fit).
+        label_margin: Score margin between the top-1 and top-2 profile candidates
+            (positive = confident match; 0.0 when only one candidate exists).
+        profile_fit_score: Profile fit score in [0, 1] from the matcher.
+        flag_count: Number of detection/anomaly flags raised for this cycle by
+            the existing detector (early_power_dip, false_end_pause_seen, etc.).
+
+    Returns a dict with exactly ``QUALITY_FEATURE_COLUMNS`` keys.
+    """
+    stats = quality_trace_stats(points, trace_length=trace_length)
+    if not stats["has_trace"]:
+        return _no_trace_quality_features(
+            profile_distance=profile_distance,
+            label_margin=label_margin,
+            profile_fit_score=profile_fit_score,
+            flag_count=flag_count,
+        )
+
+    # -- profile context ratios --
+    prof_dur = max(float(profile_median_duration_s), 1.0)
+    prof_energy = max(float(profile_median_energy_wh), 1e-6)
+    prof_peak = max(float(profile_median_peak_w), 1.0)
+
+    return {
+        "duration_log_ratio": _log_ratio(stats["duration_s"] / prof_dur),
+        "energy_log_ratio": _log_ratio(stats["energy_wh"] / prof_energy),
+        "peak_log_ratio": _log_ratio(stats["max_power_w"] / prof_peak),
+        "profile_distance": float(profile_distance),
+        "label_margin_positive": float(max(0.0, float(label_margin))),
+        **{c: stats[c] for c in _TRACE_QUALITY_COLUMNS},
         "flag_pressure": float(max(0, int(flag_count))),
         "shape_fit_penalty": float(max(0.0, 1.0 - float(profile_fit_score))),
-        **shape,
+        **{c: stats[c] for c in _SHAPE_COLUMNS},
         "has_trace": 1.0,
     }
 
@@ -539,6 +590,234 @@ def _no_trace_quality_features(
     }
 
 
+# ---------------------------------------------------------------------------
+# Batch variants (training)
+# ---------------------------------------------------------------------------
+#
+# Training evaluates the extractors above for thousands of traces / prefixes.
+# These variants take right-padded 2-D arrays (one row per trace, valid
+# readings in ``row[:length]``) built by :func:`pad_rows`, and replace the
+# per-reading Python loops with whole-array operations. Each is checked against
+# its single-trace counterpart; results agree to floating-point rounding.
+
+
+def pad_rows(rows: Sequence[np.ndarray], fill: float = 0.0) -> tuple[np.ndarray, np.ndarray]:
+    """Stack 1-D arrays of different lengths into ``(padded, lengths)``."""
+    lengths = np.fromiter((len(r) for r in rows), dtype=np.int64, count=len(rows))
+    width = int(lengths.max()) if lengths.size else 0
+    out = np.full((len(rows), width), fill, dtype=float)
+    for i, row in enumerate(rows):
+        out[i, : lengths[i]] = row
+    return out, lengths
+
+
+def clean_arrays(points: Sequence[Point] | np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Array form of :func:`_clean_points`: ``(offsets, powers)`` with non-finite
+    readings dropped, negative power clamped to 0, sorted by offset and
+    de-duplicated (the last reading at an offset wins)."""
+    arr = np.asarray(points, dtype=float).reshape(-1, 2)
+    arr = arr[np.isfinite(arr[:, 0]) & np.isfinite(arr[:, 1])]
+    arr = arr[np.argsort(arr[:, 0], kind="stable")]
+    offsets = arr[:, 0]
+    keep = np.ones(offsets.size, dtype=bool)
+    keep[:-1] = offsets[:-1] != offsets[1:]
+    return offsets[keep], np.maximum(arr[keep, 1], 0.0)
+
+
+def _row_median_sorted(sorted_rows: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Median of the first ``counts[i]`` values of each ascending-sorted row
+    (``np.median`` semantics; 0.0 for an empty row)."""
+    rows = np.arange(sorted_rows.shape[0])
+    hi = np.clip(counts // 2, 0, max(sorted_rows.shape[1] - 1, 0))
+    lo = np.clip((counts - 1) // 2, 0, max(sorted_rows.shape[1] - 1, 0))
+    if sorted_rows.shape[1] == 0:
+        return np.zeros(sorted_rows.shape[0])
+    med = (sorted_rows[rows, lo] + sorted_rows[rows, hi]) / 2.0
+    odd = counts % 2 == 1
+    med[odd] = sorted_rows[rows[odd], hi[odd]]
+    med[counts == 0] = 0.0
+    return med
+
+
+def energy_wh_batch(offsets: np.ndarray, powers: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Total energy (Wh) of each row: ``cumulative_energy_wh(row)[-1]``.
+
+    Each row gets its own outage-gap threshold (ten times its median positive
+    sample interval, as :func:`~..signal_processing.energy_gap_threshold_s`).
+    """
+    n_rows, width = offsets.shape
+    if width < 2:
+        return np.zeros(n_rows)
+    cols = np.arange(width - 1)
+    in_row = cols[None, :] < (lengths[:, None] - 1)
+    deltas = np.diff(offsets, axis=1)
+
+    ordered = np.sort(np.where(np.arange(width)[None, :] < lengths[:, None], offsets, np.inf), axis=1)
+    with np.errstate(invalid="ignore"):  # inf - inf past the end of a row
+        sorted_deltas = np.diff(ordered, axis=1)
+    positive = in_row & (sorted_deltas > 0)
+    gaps = np.sort(np.where(positive, sorted_deltas, np.inf), axis=1)
+    median = _row_median_sorted(gaps, positive.sum(axis=1))
+    max_gap = np.clip(10.0 * median, 60.0, 3600.0)
+    max_gap[lengths < 2] = 3600.0
+
+    clamped = np.where(powers > 0.0, powers, 0.0)
+    segment = (clamped[:, :-1] + clamped[:, 1:]) / 2.0 * deltas / 3600.0
+    segment[~in_row | (deltas > max_gap[:, None])] = 0.0
+    total = np.cumsum(segment, axis=1)[np.arange(n_rows), np.clip(lengths - 2, 0, width - 2)]
+    total[lengths < 2] = 0.0
+    return total
+
+
+def trace_noise_features_batch(powers: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """``(local_spike_score, local_spike_rate, local_noise_score)`` per row.
+
+    Batch form of :func:`_trace_noise_features` over cleaned power rows: the
+    per-reading neighbourhood medians (two readings either side) are taken for
+    every reading of every row at once.
+    """
+    n_rows, width = powers.shape
+    out = np.zeros((n_rows, 3))
+    valid = np.arange(width)[None, :] < lengths[:, None]
+    scale = np.zeros(n_rows)
+    for i in np.flatnonzero(lengths >= 5):
+        row = powers[i, : lengths[i]]
+        active = row[row > 0.5]
+        scale[i] = float(np.percentile(active, 95)) if active.size else float(np.max(row))
+    usable = (lengths >= 5) & np.isfinite(scale) & (scale > 1e-6)
+    if not usable.any():
+        return out
+    idx = np.flatnonzero(usable)
+    norm = np.full((idx.size, width + 4), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        norm[:, 2:-2] = np.where(valid[idx], np.clip(powers[idx] / scale[idx, None], 0.0, 8.0), np.nan)
+    value = norm[:, 2:-2]
+    neighbours = np.stack(
+        (norm[:, :-4], norm[:, 1:-3], norm[:, 3:-1], norm[:, 4:]), axis=2
+    )
+    neighbours.sort(axis=2)  # NaN (outside the row) sorts last
+    counts = np.sum(~np.isnan(neighbours), axis=2)
+    median = (neighbours[..., 1] + neighbours[..., 2]) / 2.0
+    median = np.where(counts == 3, neighbours[..., 1], median)
+    median = np.where(counts == 2, (neighbours[..., 0] + neighbours[..., 1]) / 2.0, median)
+
+    residual = np.abs(value - median)
+    left = np.where(np.isnan(norm[:, 1:-3]), median, norm[:, 1:-3])
+    right = np.where(np.isnan(norm[:, 3:-1]), median, norm[:, 3:-1])
+    jump = value - np.maximum(left, right)
+    rise = value - median
+    with np.errstate(invalid="ignore"):
+        spike = valid[idx] & (value > 0.15) & (rise > 0.28) & (jump > 0.18)
+    score = np.where(spike, np.minimum(3.0, np.maximum(rise, jump)), 0.0)
+
+    for k, i in enumerate(idx):
+        n = int(lengths[i])
+        out[i, 0] = round(float(score[k, :n].max(initial=0.0)), 6)
+        out[i, 1] = round(float(np.count_nonzero(spike[k, :n]) / max(1, n)), 6)
+        out[i, 2] = round(float(np.percentile(residual[k, :n], 95)), 6)
+    return out
+
+
+def progress_features_batch(
+    offsets: np.ndarray,
+    powers: np.ndarray,
+    lengths: np.ndarray,
+    expectations: np.ndarray,
+) -> np.ndarray:
+    """:data:`PROGRESS_FEATURE_COLUMNS` for each row (one running-cycle prefix).
+
+    Rows must already be cleaned (:func:`clean_arrays`); ``expectations`` holds
+    each row's ``(duration, energy, peak)``. Rows with fewer than four readings
+    (where :func:`progress_features` returns None) come back as NaN.
+    """
+    n_rows, width = offsets.shape
+    out = np.full((n_rows, len(PROGRESS_FEATURE_COLUMNS)), np.nan)
+    ok = lengths >= 4
+    if not ok.any():
+        return out
+    rows = np.flatnonzero(ok)
+    off, pw, lens = offsets[rows], powers[rows], lengths[rows]
+    exp = np.asarray(expectations, dtype=float)[rows]
+    r = np.arange(rows.size)
+    cols = np.arange(width)[None, :]
+    in_row = cols < lens[:, None]
+
+    elapsed = np.maximum(off[r, lens - 1] - off[:, 0], 1.0)
+    exp_dur = np.maximum(exp[:, 0], 1.0)
+    exp_energy = np.maximum(exp[:, 1], 1e-6)
+    exp_peak = np.maximum(exp[:, 2], 1.0)
+    energy = energy_wh_batch(off, pw, lens)
+
+    active = in_row & (pw > np.maximum(1.0, 0.05 * exp_peak)[:, None])
+    n_active = active.sum(axis=1)
+    mean_power = np.where(
+        n_active > 0, np.sum(np.where(active, pw, 0.0), axis=1) / np.maximum(n_active, 1), 0.0
+    )
+    tail_n = np.maximum(1, lens // 20)
+    recent = np.sum(np.where(in_row & (cols >= (lens - tail_n)[:, None]), pw, 0.0), axis=1) / tail_n
+
+    # Least-squares slope over the trailing quarter (readings as the x axis).
+    quarter = np.maximum(2, lens // 4)
+    start = (lens - quarter)[:, None]
+    in_tail = in_row & (cols >= start)
+    tail_mean = np.sum(np.where(in_tail, pw, 0.0), axis=1) / quarter
+    xm = np.where(in_tail, cols - start - (quarter[:, None] - 1) / 2.0, 0.0)
+    num = np.sum(xm * np.where(in_tail, pw - tail_mean[:, None], 0.0), axis=1)
+    denom = np.sum(xm * xm, axis=1)
+    slope = np.where(denom > 1e-9, num / np.where(denom > 1e-9, denom, 1.0), 0.0)
+
+    out[rows] = np.column_stack((
+        np.minimum(elapsed / exp_dur, 3.0),
+        np.minimum(energy / exp_energy, 3.0),
+        np.minimum(mean_power / exp_peak, 2.0),
+        np.minimum(recent / exp_peak, 2.0),
+        np.clip(slope / exp_peak, -2.0, 2.0),
+        n_active / lens,
+        np.log1p(elapsed),
+    ))
+    return out
+
+
+def quality_feature_matrix(
+    trace_stats: np.ndarray,
+    expectations: np.ndarray,
+    context: np.ndarray,
+) -> np.ndarray:
+    """:data:`QUALITY_FEATURE_COLUMNS` matrix from per-cycle trace stats.
+
+    ``trace_stats`` rows are :data:`QUALITY_TRACE_COLUMNS` vectors (from
+    :func:`quality_trace_stats`), ``expectations`` rows the profile's
+    ``(duration, energy, peak)`` and ``context`` rows ``(profile_distance,
+    label_margin, profile_fit_score, flag_count)`` - the same inputs
+    :func:`quality_features` takes, one cycle per row.
+    """
+    stats = np.asarray(trace_stats, dtype=float).reshape(-1, len(QUALITY_TRACE_COLUMNS))
+    exp = np.asarray(expectations, dtype=float).reshape(-1, 3)
+    ctx = np.asarray(context, dtype=float).reshape(-1, 4)
+    col = {name: stats[:, i] for i, name in enumerate(QUALITY_TRACE_COLUMNS)}
+    has_trace = col["has_trace"] > 0
+
+    def log_ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = num / den
+        good = has_trace & np.isfinite(ratio) & (ratio > 0)
+        return np.where(good, np.log(np.maximum(1e-6, np.where(good, ratio, 1.0))), 0.0)
+
+    out = np.zeros((stats.shape[0], len(QUALITY_FEATURE_COLUMNS)))
+    values = {
+        "duration_log_ratio": log_ratio(col["duration_s"], np.maximum(exp[:, 0], 1.0)),
+        "energy_log_ratio": log_ratio(col["energy_wh"], np.maximum(exp[:, 1], 1e-6)),
+        "peak_log_ratio": log_ratio(col["max_power_w"], np.maximum(exp[:, 2], 1.0)),
+        "profile_distance": ctx[:, 0],
+        "label_margin_positive": np.maximum(0.0, ctx[:, 1]),
+        "flag_pressure": np.maximum(0.0, np.trunc(ctx[:, 3])),
+        "shape_fit_penalty": np.maximum(0.0, 1.0 - ctx[:, 2]),
+    }
+    for i, name in enumerate(QUALITY_FEATURE_COLUMNS):
+        out[:, i] = values[name] if name in values else col[name]
+    return out
+
+
 # ---------------------------------------------------------------------------
 # Shared helpers (ported from ml_washdata/wash_ml/features.py and
 # ml_washdata/wash_ml/hybrid_curve_quality.py - NumPy only)
@@ -627,39 +906,14 @@ def _trace_noise_features(points: list[Point]) -> dict[str, float]:
     Ported from ml_washdata/wash_ml/features.py ``trace_noise_features``.
     Distinguishes narrow single-sample spikes from broad appliance phases.
     """
-    if len(points) < 5:
-        return {"local_spike_score": 0.0, "local_spike_rate": 0.0, "local_noise_score": 0.0}
     powers = np.asarray([float(p) for _, p in points], dtype=float)
-    active = powers[powers > 0.5]
-    scale = float(np.percentile(active, 95)) if active.size else float(np.max(powers))
-    if not math.isfinite(scale) or scale <= 1e-6:
-        return {"local_spike_score": 0.0, "local_spike_rate": 0.0, "local_noise_score": 0.0}
-
-    normalized = np.clip(powers / scale, 0.0, 8.0)
-    spike_scores: list[float] = []
-    residuals: list[float] = []
-    n = normalized.size
-    for i, value in enumerate(normalized):
-        left = max(0, i - 2)
-        right = min(n, i + 3)
-        neighbors = np.concatenate([normalized[left:i], normalized[i + 1:right]])
-        if neighbors.size < 2:
-            continue
-        local_median = float(np.median(neighbors))
-        residual = abs(float(value - local_median))
-        residuals.append(residual)
-        left_nbr = float(normalized[i - 1]) if i > 0 else local_median
-        right_nbr = float(normalized[i + 1]) if i + 1 < n else local_median
-        shoulder = max(left_nbr, right_nbr)
-        narrow_jump = float(value - shoulder)
-        if value > 0.15 and (value - local_median) > 0.28 and narrow_jump > 0.18:
-            spike_scores.append(min(3.0, max(float(value - local_median), narrow_jump)))
-
-    spike_count = len(spike_scores)
+    spike, rate, noise = trace_noise_features_batch(
+        powers[None, :], np.array([powers.size])
+    )[0]
     return {
-        "local_spike_score": round(float(max(spike_scores, default=0.0)), 6),
-        "local_spike_rate": round(float(spike_count / max(1, n)), 6),
-        "local_noise_score": round(float(np.percentile(np.asarray(residuals, dtype=float), 95)) if residuals else 0.0, 6),
+        "local_spike_score": float(spike),
+        "local_spike_rate": float(rate),
+        "local_noise_score": float(noise),
     }
 
 
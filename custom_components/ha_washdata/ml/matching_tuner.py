@@ -31,6 +31,8 @@ manually-labelled per-user cycle set.
 """
 from __future__ import annotations
 
+import functools
+from collections.abc import Callable
 from typing import Any
 
 import numpy as np
@@ -121,7 +123,21 @@ def _top1(by_profile: dict[str, list[dict]], targets: list[tuple[str, int]], cfg
     return correct / total if total else 0.0
 
 
-_BASE_CFG = {"min_duration_ratio": 0.10, "max_duration_ratio": 1.5}
+def _top1_job(
+    by_profile: dict[str, list[dict]], job: tuple[list[tuple[str, int]], dict[str, Any]]
+) -> float:
+    """:func:`_top1` for one ``(targets, cfg)`` evaluation (a map item)."""
+    targets, cfg = job
+    return _top1(by_profile, targets, cfg)
+
+
+def _serial_map(fn: Callable[[Any], Any], items: list[Any]) -> list[Any]:
+    return [fn(item) for item in items]
+
+
+# The tuner only reads each leave-one-out run's top candidate, so Stage-3 may
+# skip the DTW fill for candidates LB_Keogh proves cannot reach the top two.
+_BASE_CFG = {"min_duration_ratio": 0.10, "max_duration_ratio": 1.5, "dtw_prune": True}
 
 #: Bounded scoring weights the tuner may promote. All live in [0, 1], so a tuned
 #: config can only shift emphasis (shape vs level vs energy, and how much the DTW
@@ -164,6 +180,7 @@ def tune_matching_config(
     min_targets: int = 12,
     margin: float = 0.03,
     seed: int = 0,
+    map_fn: Callable[[Callable[[Any], Any], list[Any]], list[Any]] | None = None,
 ) -> dict[str, Any]:
     """Leave-one-out per-device tuning of matcher scoring weights.
 
@@ -182,6 +199,11 @@ def tune_matching_config(
          per-device tuning becomes useful early; the majority gate — not a large
          sample — controls the noise.
 
+    The leave-one-out evaluations are independent, so they are handed to
+    ``map_fn(fn, items)`` (an ordered map, e.g. the shared worker pool's) in two
+    batches: every grid config on the search pool, then base vs the chosen
+    candidate on each holdout subsample. The default runs them in-process.
+
     Returns a status dict; ``promoted`` is True only when both holdout gates pass.
     When promoted, ``config`` holds the override to persist (bounded scoring
     weights only — never structural matching behaviour). Never raises for data
@@ -206,34 +228,36 @@ def tune_matching_config(
     if not holdout_pool:
         return {"promoted": False, "reason": "too few targets", "n_targets": len(targets)}
 
+    evaluate = functools.partial(_top1_job, by_profile)
+    run = map_fn or _serial_map
+
     base = {**_BASE_CFG}
     # Candidate: the grid config with the best top-1 on the SEARCH pool only.
-    best_search = _top1(by_profile, search_pool, base)
+    cfgs = [base] + [{**base, **extra} for extra in _grid()]
+    accs = run(evaluate, [(search_pool, cfg) for cfg in cfgs])
+    best_search = accs[0]
     best_cfg = base
-    for extra in _grid():
-        acc = _top1(by_profile, search_pool, {**base, **extra})
+    for cfg, acc in zip(cfgs[1:], accs[1:]):
         if acc > best_search:
-            best_search, best_cfg = acc, {**base, **extra}
+            best_search, best_cfg = acc, cfg
     override = {k: best_cfg[k] for k in OVERRIDE_KEYS if k in best_cfg}
 
     # Gate the FIXED candidate on the held-out pool: require it to beat the defaults
     # by ``margin`` on a MAJORITY of reshuffled subsamples of the holdout (variance
     # check), rejecting a lucky single split while keeping min_targets low.
     n_splits, min_wins = 5, 4
-    base_tests: list[float] = []
-    tuned_tests: list[float] = []
-    wins = 0
+    held_splits = []
     for k in range(n_splits):
         r = np.random.default_rng(seed + 1 + k)
         pool = list(holdout_pool)
         r.shuffle(pool)
-        held = pool[: max(1, len(pool) // 2)]
-        bt = _top1(by_profile, held, base)
-        tt = _top1(by_profile, held, best_cfg)
-        base_tests.append(bt)
-        tuned_tests.append(tt)
-        if tt - bt >= margin:
-            wins += 1
+        held_splits.append(pool[: max(1, len(pool) // 2)])
+    tests = run(
+        evaluate, [(held, cfg) for held in held_splits for cfg in (base, best_cfg)]
+    )
+    base_tests: list[float] = tests[0::2]
+    tuned_tests: list[float] = tests[1::2]
+    wins = sum(1 for bt, tt in zip(base_tests, tuned_tests) if tt - bt >= margin)
     mean_base = float(np.mean(base_tests)) if base_tests else 0.0
     mean_tuned = float(np.mean(tuned_tests)) if tuned_tests else 0.0
     has_override = bool(override)
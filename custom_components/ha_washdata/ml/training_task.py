@@ -85,6 +85,10 @@ _REGRESSION_CAPABILITIES = {
 # Elapsed fractions at which each clean cycle is cut to synthesize a training row.
 _PROGRESS_CUT_FRACTIONS = (0.15, 0.30, 0.45, 0.60, 0.75, 0.90)
 
+# Upper bound on padded cells (rows x readings) per batched prefix evaluation,
+# keeping the temporaries of ``progress_features_batch`` to a few tens of MB.
+_PREFIX_BATCH_CELLS = 400_000
+
 _ACTIVE_FLOOR_RATIO = 0.02
 _MIN_ROWS = 40
 
@@ -177,14 +181,24 @@ def _quality_label(cycle: dict[str, Any]) -> float | None:
 def _quality_dataset(
     cycles: list[dict[str, Any]],
     expectations: dict[str, dict[str, float]],
+    feature_cache: dict[str, dict[str, Any]] | None = None,
 ) -> tuple[np.ndarray, np.ndarray, list[str], np.ndarray]:
     """Uses ALL cycles (not clean-filtered) so mis-detected cycles are the positives.
 
     Emits at most one row per cycle, so ``groups`` is unique-per-row (splitting by
-    group is equivalent to row-level here) — returned for a uniform split API."""
-    from .feature_extraction import QUALITY_FEATURE_COLUMNS, quality_features
-
-    rows: list[dict[str, float]] = []
+    group is equivalent to row-level here) — returned for a uniform split API.
+
+    The trace-only half of each row comes from ``feature_cache`` when it holds a
+    current entry for the cycle (see feature_cache.py); misses are computed and
+    written back into it. The profile ratios and match context are always
+    recomputed, since expectations move as the history grows."""
+    from .feature_cache import compute_entry, lookup
+    from .feature_extraction import QUALITY_FEATURE_COLUMNS, quality_feature_matrix
+
+    cache = feature_cache if feature_cache is not None else {}
+    stats: list[list[float]] = []
+    exps: list[tuple[float, float, float]] = []
+    context: list[tuple[float, float, float, float]] = []
     labels: list[float] = []
     groups: list[int] = []
     for ci, c in enumerate(cycles):
@@ -194,9 +208,18 @@ def _quality_dataset(
         label = _quality_label(c)
         if label is None:
             continue
-        points = _read_points(c)
-        if len(points) < 6:
-            continue
+        entry = lookup(cache, c)
+        if entry is None:
+            try:
+                entry = compute_entry(c)
+            except Exception:  # pylint: disable=broad-exception-caught
+                continue
+            if entry is None:
+                continue
+            if isinstance(c.get("id"), str):
+                cache[c["id"]] = entry
+        if "q" not in entry:
+            continue  # fewer than 6 readings
         raw_conf = c.get("match_confidence")
         if isinstance(raw_conf, (int, float)) and not isinstance(raw_conf, bool) and raw_conf > 0:
             conf = float(raw_conf)
@@ -208,18 +231,17 @@ def _quality_dataset(
         # blind the AUC gate to it). Mirrors inference in manager._compute_cycle_quality_score.
         arts = c.get("artifacts")
         flag_count = len(arts) if isinstance(arts, list) else 0
-        try:
-            feat = quality_features(
-                points, exp["duration"], exp["energy"], exp["peak"],
-                proxy_dist, proxy_margin, proxy_fit, flag_count,
-            )
-        except Exception:  # pylint: disable=broad-exception-caught
-            continue
-        rows.append(feat)
+        stats.append(entry["q"])
+        exps.append((exp["duration"], exp["energy"], exp["peak"]))
+        context.append((proxy_dist, proxy_margin, proxy_fit, float(flag_count)))
         labels.append(label)
         groups.append(ci)
-    return (_matrix(rows, list(QUALITY_FEATURE_COLUMNS)), np.array(labels, dtype=float),
-            list(QUALITY_FEATURE_COLUMNS), np.array(groups, dtype=int))
+    columns = list(QUALITY_FEATURE_COLUMNS)
+    X = (
+        quality_feature_matrix(np.array(stats), np.array(exps), np.array(context))
+        if stats else np.empty((0, len(columns)), dtype=float)
+    )
+    return X, np.array(labels, dtype=float), columns, np.array(groups, dtype=int)
 
 
 def _live_match_dataset(
@@ -275,76 +297,78 @@ def _group_ids(keys: list[Any]) -> np.ndarray:
     return np.array(out, dtype=int)
 
 
-def _progress_dataset(
+def _prefix_datasets(
     clean: list[dict[str, Any]],
     expectations: dict[str, dict[str, float]],
-) -> tuple[np.ndarray, np.ndarray, list[str], np.ndarray]:
-    """Synthesize (features, completion_fraction) rows for the remaining-time model.
-
-    Each clean completed cycle is cut at several elapsed fractions; the target is
-    the true completion fraction of the prefix (``prefix_elapsed / total``). This
-    turns every stored trace into a handful of supervised progress examples, so
-    the regressor learns the device's own progress curve (e.g. a program that
+) -> tuple[
+    tuple[np.ndarray, np.ndarray, list[str], np.ndarray],
+    tuple[np.ndarray, np.ndarray, list[str], np.ndarray],
+]:
+    """Synthesize the remaining-time and total-energy datasets in one pass.
+
+    Each clean completed cycle is cut at several elapsed fractions; every
+    prefix becomes one row of :data:`PROGRESS_FEATURE_COLUMNS`. This turns every
+    stored trace into a handful of supervised progress examples, so the
+    regressors learn the device's own progress curve (e.g. a program that
     reliably runs longer than its labelled duration) rather than the naive
     elapsed/expected assumption.
-    """
-    from .feature_extraction import PROGRESS_FEATURE_COLUMNS, progress_features
 
-    columns = list(PROGRESS_FEATURE_COLUMNS)
-    rows: list[dict[str, float]] = []
-    labels: list[float] = []
-    groups: list[int] = []
-    for ci, c in enumerate(clean):
-        exp = expectations.get(c.get("profile_name"))
-        if not exp:
-            continue
-        points = _read_points(c)
-        if len(points) < 12:
-            continue
-        t0 = points[0][0]
-        total = points[-1][0] - t0
-        if total <= 60.0:
-            continue
-        for frac in _PROGRESS_CUT_FRACTIONS:
-            cut_t = t0 + frac * total
-            prefix = [(o, p) for o, p in points if o <= cut_t]
-            if len(prefix) < 4:
-                continue
-            feat = progress_features(prefix, exp)
-            if feat is None:
-                continue
-            actual_elapsed = prefix[-1][0] - t0
-            label = actual_elapsed / total
-            rows.append(feat)
-            labels.append(float(min(max(label, 0.0), 1.0)))
-            groups.append(ci)
-    return (_matrix(rows, columns), np.array(labels, dtype=float),
-            columns, np.array(groups, dtype=int))
-
-
-def _energy_dataset(
-    clean: list[dict[str, Any]],
-    expectations: dict[str, dict[str, float]],
-) -> tuple[np.ndarray, np.ndarray, list[str], np.ndarray]:
-    """Synthesize (features, energy_completion_fraction) rows for the total-energy
-    model. Same feature vector as the remaining-time model; the label is
-    ``energy_so_far / total_energy`` at each cut, so the regressor learns how
-    energy accumulates *non-linearly* over the cycle (heating front-loads it)
-    rather than assuming it tracks elapsed time. The naive baseline in
-    ``_train_regression_capability`` is ``elapsed_over_expected`` (time progress),
-    which is exactly the current ``energy_so_far / progress`` projection — so a
-    model is only promoted when it beats that.
+    * remaining time: the label is the true completion fraction of the prefix
+      (``prefix_elapsed / total``).
+    * total energy: same rows, labelled ``energy_so_far / total_energy``, so the
+      regressor learns how energy accumulates *non-linearly* over the cycle
+      (heating front-loads it) rather than assuming it tracks elapsed time. The
+      naive baseline in ``_train_regression_capability`` is
+      ``elapsed_over_expected`` (time progress), which is exactly the current
+      ``energy_so_far / progress`` projection - so a model is only promoted when
+      it beats that. Cycles without measurable energy are left out.
+
+    Prefixes are evaluated in padded batches (``progress_features_batch`` /
+    ``energy_wh_batch``) rather than one ``progress_features`` call per row.
     """
     from .feature_extraction import (
         PROGRESS_FEATURE_COLUMNS,
-        progress_features,
-        cumulative_energy_wh,
+        clean_arrays,
+        energy_wh_batch,
+        pad_rows,
+        progress_features_batch,
     )
 
     columns = list(PROGRESS_FEATURE_COLUMNS)
-    rows: list[dict[str, float]] = []
-    labels: list[float] = []
-    groups: list[int] = []
+    feats: list[np.ndarray] = []
+    progress_labels: list[np.ndarray] = []
+    energy_so_far: list[np.ndarray] = []
+    row_totals: list[np.ndarray] = []
+    row_groups: list[np.ndarray] = []
+
+    # Pending prefixes of the current batch.
+    clean_off: list[np.ndarray] = []
+    clean_pow: list[np.ndarray] = []
+    raw_off: list[np.ndarray] = []
+    raw_pow: list[np.ndarray] = []
+    pending: list[tuple[int, float, float, tuple[float, float, float]]] = []
+    widest = 0
+
+    def flush() -> None:
+        nonlocal widest
+        if not pending:
+            return
+        offsets, lengths = pad_rows(clean_off)
+        powers, _ = pad_rows(clean_pow)
+        X = progress_features_batch(offsets, powers, lengths, np.array([p[3] for p in pending]))
+        raw_offsets, raw_lengths = pad_rows(raw_off)
+        raw_powers, _ = pad_rows(raw_pow)
+        so_far = energy_wh_batch(raw_offsets, raw_powers, raw_lengths)
+        ok = ~np.isnan(X[:, 0])
+        feats.append(X[ok])
+        progress_labels.append(np.array([p[1] for p in pending])[ok])
+        energy_so_far.append(so_far[ok])
+        row_totals.append(np.array([p[2] for p in pending])[ok])
+        row_groups.append(np.array([p[0] for p in pending], dtype=int)[ok])
+        for buf in (clean_off, clean_pow, raw_off, raw_pow, pending):
+            buf.clear()
+        widest = 0
+
     for ci, c in enumerate(clean):
         exp = expectations.get(c.get("profile_name"))
         if not exp:
@@ -352,28 +376,48 @@ def _energy_dataset(
         points = _read_points(c)
         if len(points) < 12:
             continue
-        t0 = points[0][0]
-        total_dur = points[-1][0] - t0
-        if total_dur <= 60.0:
-            continue
-        total_energy = float(cumulative_energy_wh(points)[-1])
-        if total_energy <= 1e-6:
+        arr = np.asarray(points, dtype=float)
+        t0 = float(arr[0, 0])
+        total = float(arr[-1, 0]) - t0
+        if total <= 60.0:
             continue
+        whole_off, whole_len = pad_rows([arr[:, 0]])
+        whole_pow, _ = pad_rows([arr[:, 1]])
+        total_energy = float(energy_wh_batch(whole_off, whole_pow, whole_len)[0])
+        offsets_c, powers_c = clean_arrays(arr)
+        expectation = (exp["duration"], exp["energy"], exp["peak"])
         for frac in _PROGRESS_CUT_FRACTIONS:
-            cut_t = t0 + frac * total_dur
-            prefix = [(o, p) for o, p in points if o <= cut_t]
-            if len(prefix) < 4:
-                continue
-            feat = progress_features(prefix, exp)
-            if feat is None:
+            cut_t = t0 + frac * total
+            in_prefix = arr[:, 0] <= cut_t
+            if np.count_nonzero(in_prefix) < 4:
                 continue
-            energy_so_far = float(cumulative_energy_wh(prefix)[-1])
-            label = energy_so_far / total_energy
-            rows.append(feat)
-            labels.append(float(min(max(label, 0.0), 1.0)))
-            groups.append(ci)
-    return (_matrix(rows, columns), np.array(labels, dtype=float),
-            columns, np.array(groups, dtype=int))
+            prefix = arr[in_prefix]
+            keep = offsets_c <= cut_t
+            clean_off.append(offsets_c[keep])
+            clean_pow.append(powers_c[keep])
+            raw_off.append(prefix[:, 0])
+            raw_pow.append(prefix[:, 1])
+            label = (float(prefix[-1, 0]) - t0) / total
+            pending.append((ci, float(min(max(label, 0.0), 1.0)), total_energy, expectation))
+            widest = max(widest, len(prefix))
+        if len(pending) * widest >= _PREFIX_BATCH_CELLS:
+            flush()
+    flush()
+
+    if not feats:
+        empty = (np.empty((0, len(columns)), dtype=float), np.array([], dtype=float),
+                 columns, np.array([], dtype=int))
+        return empty, empty
+    X = np.concatenate(feats)
+    groups = np.concatenate(row_groups)
+    totals = np.concatenate(row_totals)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        energy_labels = np.clip(np.concatenate(energy_so_far) / totals, 0.0, 1.0)
+    has_energy = totals > 1e-6
+    return (
+        (X, np.concatenate(progress_labels), columns, groups),
+        (X[has_energy], energy_labels[has_energy], columns, groups[has_energy]),
+    )
 
 
 def _group_holdout_indices(
@@ -553,13 +597,13 @@ def _embedded_module(capability: str):
 
 def _baseline_scores(capability: str, X_test: np.ndarray, columns: list[str]) -> np.ndarray | None:
     """Embedded-baseline probabilities on X_test, or None if it can't load/score."""
-    module = _embedded_module(capability)
-    if module is None:
+    from .engine import resolve_matrix_scorer  # noqa: PLC0415
+
+    scorer = resolve_matrix_scorer(capability, None)
+    if scorer is None:
         return None
     try:
-        return np.array(
-            [float(module.score(dict(zip(columns, row)))) for row in X_test], dtype=float
-        )
+        return scorer.score_matrix(X_test, columns, strict=True)
     except Exception:  # pylint: disable=broad-exception-caught
         return None
 
@@ -687,6 +731,7 @@ def train_from_cycles(
     stop_threshold_w: float = 2.0,
     trained_at: str = "",
     ranking_history: list[dict[str, Any]] | None = None,
+    feature_cache: dict[str, dict[str, Any]] | None = None,
 ) -> dict[str, Any]:
     """Pure function (executor-safe): build datasets, train, gate all capabilities.
 
@@ -696,6 +741,10 @@ def train_from_cycles(
     ``ranking_history`` is the accumulated match ranking snapshots from the store
     (see :meth:`.ProfileStore.get_match_ranking_history`).  When provided it
     unlocks on-device training for the ``live_match`` capability.
+
+    ``feature_cache`` is the caller's copy of the device's trace-feature cache
+    (:meth:`.MLFeatureCache.async_snapshot`); entries computed during the run
+    are added to it in place.
     """
     from ..suggestion_engine import select_clean_cycles
     from .feature_extraction import profile_expectations
@@ -705,7 +754,7 @@ def train_from_cycles(
 
     datasets: dict[str, tuple[np.ndarray, np.ndarray, list[str], np.ndarray]] = {
         "end": _end_dataset(clean, expectations, stop_threshold_w),
-        "quality": _quality_dataset(cycles, expectations),
+        "quality": _quality_dataset(cycles, expectations, feature_cache),
         "live_match": _live_match_dataset(ranking_history or []),
     }
 
@@ -731,9 +780,10 @@ def train_from_cycles(
             }
 
     # Regression capabilities (no embedded baseline; gated against a naive estimate).
+    progress_ds, energy_ds = _prefix_datasets(clean, expectations)
     reg_datasets: dict[str, tuple[np.ndarray, np.ndarray, list[str], np.ndarray]] = {
-        "remaining_time": _progress_dataset(clean, expectations),
-        "total_energy": _energy_dataset(clean, expectations),
+        "remaining_time": progress_ds,
+        "total_energy": energy_ds,
     }
     for capability, (target, target_units) in _REGRESSION_CAPABILITIES.items():
         X, y, columns, groups = reg_datasets[capability]
@@ -783,6 +833,7 @@ async def async_run_training(hass: Any, manager: Any) -> dict[str, Any]:
     # the event loop could mutate mid-training - matching the get_past_cycles()
     # snapshot above.
     ranking_history = list(store.get_match_ranking_history())
+    feature_cache = await manager.ml_feature_cache.async_snapshot()
 
     _LOGGER.info(
         "On-device ML training starting: %d cycles, %d ranking snapshots, "
@@ -790,7 +841,11 @@ async def async_run_training(hass: Any, manager: Any) -> dict[str, Any]:
         len(cycles), len(ranking_history), manager.device_type, stop_thr,
     )
     summary = await hass.async_add_executor_job(
-        train_from_cycles, cycles, manager.device_type, stop_thr, trained_at, ranking_history
+        train_from_cycles, cycles, manager.device_type, stop_thr, trained_at, ranking_history,
+        feature_cache,
+    )
+    manager.ml_feature_cache.replace(
+        feature_cache, (c["id"] for c in cycles if isinstance(c.get("id"), str))
     )
     for record in summary.get("results", []):
         is_regression = "model_mae" in record
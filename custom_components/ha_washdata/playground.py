@@ -25,7 +25,8 @@ Main entry points:
 - :func:`simulate_cycle_detail` - faithful single-cycle replay with per-step
   progress/remaining-time/phase/energy series and typed event log.
 - :func:`run_playground_history` - per-cycle rows + optional before/after diff.
-- :func:`run_playground_sweep` - objective 1D/2D grid sweep.
+- :func:`run_playground_sweep` - objective 1D/2D sweep (exhaustive grid,
+  coarse-to-fine or successive halving) over a memoised :class:`SweepEngine`.
 - :func:`dtw_debug_payload` - the score breakdown (Stage 2 / DTW / Stage 4),
   the two resampled traces on a shared grid, and the DTW warping path for one
   cycle vs one profile (the DTW visualizer).
@@ -35,8 +36,10 @@ All top-level entry points are defensive: they never raise, returning an
 """
 from __future__ import annotations
 
+import hashlib
 import logging
 import math
+from collections.abc import Sequence
 from dataclasses import replace
 from datetime import datetime, timedelta, timezone
 from typing import Any, Callable
@@ -109,6 +112,7 @@ from .const import (
     TerminationReason,
 )
 from .cycle_detector import CycleDetector, CycleDetectorConfig
+from .power_trace import PowerTrace
 from .profile_store import _ambiguity_from_candidates, decompress_power_data
 
 _LOGGER = logging.getLogger(__name__)
@@ -398,6 +402,100 @@ def _readings_from_cycle(
     return readings, points, base
 
 
+def _memo_key(override: dict[str, Any] | None, keys: Any = None) -> tuple[Any, ...]:
+    """Hashable, order-independent key for (a subset of) a settings override."""
+    if not override:
+        return ()
+    return tuple(sorted(
+        (k, v) for k, v in override.items()
+        if v is not None and (keys is None or k in keys)
+    ))
+
+
+class SweepCache:
+    """Per-sweep memo of the replay work no swept parameter can change.
+
+    A sweep replays the same cycles once per grid cell, and most of each replay
+    is identical from cell to cell: the cycle's decompressed readings, the
+    store's match snapshots and - whenever the detector hands the matcher the
+    same trace - the Stage 1-4 candidates themselves (a detection-only knob
+    such as ``off_delay`` leaves every in-cycle match untouched). Those are
+    computed once here and shared by every :class:`_DetailSim` of the sweep;
+    whole per-cycle rows are memoised too, so a refinement pass that revisits a
+    (cell, cycle) pair costs a dict lookup. Entries are only ever added, and a
+    racing duplicate computes the same value, so the worker pool's threads can
+    share one instance without a lock. Lives for one sweep; never persisted.
+    """
+
+    def __init__(
+        self, store: Any, prebuilt: tuple[Any, Any, Any, Any] | None = None
+    ) -> None:
+        self.prebuilt = prebuilt if prebuilt is not None else _build_match_snapshots(store)
+        self._readings: dict[Any, tuple[list[tuple[datetime, float]], datetime]] = {}
+        self._matches: dict[tuple[Any, ...], list[dict[str, Any]]] = {}
+        self._rows: dict[tuple[Any, ...], dict[str, Any] | None] = {}
+        self.stats = {"match_hits": 0, "match_misses": 0, "row_hits": 0, "row_misses": 0}
+
+    @staticmethod
+    def _cycle_key(cycle: dict[str, Any]) -> Any:
+        return cycle.get("id") or id(cycle)
+
+    def readings(
+        self, cycle: dict[str, Any]
+    ) -> tuple[list[tuple[datetime, float]], datetime]:
+        """``(readings, base)`` for ``cycle``, decompressed once per sweep."""
+        key = self._cycle_key(cycle)
+        hit = self._readings.get(key)
+        if hit is None:
+            readings, _points, base = _readings_from_cycle(cycle)
+            hit = self._readings[key] = (readings, base)
+        return hit
+
+    def matches(
+        self,
+        powers: list[float],
+        duration: float,
+        match_config: dict[str, Any],
+        match_key: tuple[Any, ...],
+        snapshots: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Stage 1-4 candidates for one detector trace, shared across cells.
+
+        Keyed by a digest of the exact trace (plus its duration and the
+        matcher-knob overrides in effect), so a hit returns precisely what
+        ``compute_matches_worker`` would have. The list is copied because the
+        caller may replace its first element with a Stage-5 member.
+        """
+        digest = hashlib.blake2b(
+            np.asarray(powers, dtype=np.float64).tobytes(), digest_size=16
+        ).digest()
+        key = (match_key, float(duration), len(powers), digest)
+        hit = self._matches.get(key)
+        if hit is None:
+            self.stats["match_misses"] += 1
+            hit = self._matches[key] = analysis.compute_matches_worker(
+                powers, duration, snapshots, match_config
+            )
+        else:
+            self.stats["match_hits"] += 1
+        return list(hit)
+
+    def row(
+        self,
+        cycle: dict[str, Any],
+        override: dict[str, Any] | None,
+        compute: Callable[[], dict[str, Any] | None],
+    ) -> dict[str, Any] | None:
+        """Memoised Test-on-history row for ``cycle`` under ``override``."""
+        key = (self._cycle_key(cycle), _memo_key(override))
+        if key in self._rows:
+            self.stats["row_hits"] += 1
+            return self._rows[key]
+        self.stats["row_misses"] += 1
+        row = self._rows[key] = compute()
+        return row
+
+
 # ─── Single-cycle faithful simulation (Simulate mode) ───────────────────────────
 
 
@@ -418,6 +516,7 @@ def simulate_cycle_detail(
     prebuilt: tuple[Any, Any, Any, Any] | None = None,
     stress_tail: bool = False,
     stress_idle_w: float | None = None,
+    cache: SweepCache | None = None,
 ) -> dict[str, Any]:
     """Faithful single-cycle replay for the Playground "Simulate" view.
 
@@ -436,7 +535,7 @@ def simulate_cycle_detail(
     try:
         return _simulate_cycle_detail_inner(
             cycle, base_config, settings_override, store, options, price,
-            compute_series, prebuilt, stress_tail, stress_idle_w,
+            compute_series, prebuilt, stress_tail, stress_idle_w, cache,
         )
     except Exception as exc:  # pylint: disable=broad-exception-caught
         _LOGGER.debug("Playground detail sim failed for %s: %s", cycle.get("id"), exc)
@@ -521,6 +620,7 @@ def _simulate_cycle_detail_inner(
     prebuilt: tuple[Any, Any, Any, Any] | None = None,
     stress_tail: bool = False,
     stress_idle_w: float | None = None,
+    cache: SweepCache | None = None,
 ) -> dict[str, Any]:
     """One-shot faithful replay: build the resumable sim and run it to completion.
 
@@ -533,7 +633,7 @@ def _simulate_cycle_detail_inner(
     sim = _DetailSim(
         cycle, base_config, settings_override, store, options, price,
         compute_series, prebuilt,
-        stress_tail=stress_tail, stress_idle_w=stress_idle_w,
+        stress_tail=stress_tail, stress_idle_w=stress_idle_w, cache=cache,
     )
     if not sim.ready:
         return sim.empty_payload()
@@ -574,6 +674,7 @@ class _DetailSim:
         prebuilt: tuple[Any, Any, Any, Any] | None = None,
         stress_tail: bool = False,
         stress_idle_w: float | None = None,
+        cache: SweepCache | None = None,
     ) -> None:
         self.cycle = cycle
         self.store = store
@@ -583,7 +684,15 @@ class _DetailSim:
         self.config = build_sim_config(base_config, settings_override)
         self.device_type = _device_type_of(self.config)
         self.label = _cycle_label(cycle)
-        self.readings, _points, self.base = _readings_from_cycle(cycle)
+        # A sweep shares one decompressed trace (and its match memo) across all
+        # of its cells; a one-off replay decodes its own.
+        self.cache = cache
+        if cache is not None:
+            self.readings, self.base = cache.readings(cycle)
+            if prebuilt is None:
+                prebuilt = cache.prebuilt
+        else:
+            self.readings, _points, self.base = _readings_from_cycle(cycle)
         self.stored_duration = _safe_float(cycle.get("duration"))
 
         self.outcome: dict[str, Any] = {
@@ -613,6 +722,7 @@ class _DetailSim:
         # applying to a copy keeps the shared prebuilt match_config untouched.
         self.snapshots = snapshots
         self.match_config = apply_match_overrides(match_config, settings_override)
+        self.match_key = _memo_key(settings_override, _MATCH_OVERRIDE_KEYS)
         self.group_members = group_members
         self.member_snaps = member_snaps
 
@@ -731,15 +841,23 @@ class _DetailSim:
         # match-persistence streak, mirroring the live manager (per-cycle reset).
         self.flags["pending_reset"] = True
 
-    def _matcher(self, det_readings: list[tuple[datetime, float]]):
+    def _matcher(self, det_readings: Sequence[tuple[datetime, float]]):
         if len(det_readings) < 5 or not self.snapshots:
             return (None, 0.0, 0.0, None, False, False)
-        powers = [p for _, p in det_readings]
+        if isinstance(det_readings, PowerTrace):
+            powers = det_readings.watts().tolist()
+        else:
+            powers = [p for _, p in det_readings]
         duration = (det_readings[-1][0] - det_readings[0][0]).total_seconds()
         try:
-            candidates = analysis.compute_matches_worker(
-                powers, duration, self.snapshots, self.match_config
-            )
+            if self.cache is not None:
+                candidates = self.cache.matches(
+                    powers, duration, self.match_config, self.match_key, self.snapshots
+                )
+            else:
+                candidates = analysis.compute_matches_worker(
+                    powers, duration, self.snapshots, self.match_config
+                )
         except Exception as exc:  # pylint: disable=broad-exception-caught
             _LOGGER.debug("Playground detail match failed: %s", exc)
             candidates = []
@@ -878,14 +996,51 @@ class _DetailSim:
                     )
         self.series.append(pt)
 
+    def _seek(self, ts: datetime) -> None:
+        self.cursor["t"] = (ts - self.base).total_seconds()
+
+    def _sample_spans(self, i0: int, i1: int) -> list[tuple[int, int]]:
+        """Split readings[i0:i1] so each span ends on a reading _sample() keeps.
+
+        Mirrors the _SIM_SERIES_THROTTLE_S throttle in :meth:`_sample` (which
+        depends only on timestamps), so sampling at span ends yields exactly the
+        series a per-reading loop would.
+        """
+        if not self.compute_series:
+            return [(i0, i1)]
+        spans: list[tuple[int, int]] = []
+        last = self.last_sample_t
+        start = i0
+        for k in range(i0, i1):
+            offset = (self.readings[k][0] - self.base).total_seconds()
+            if offset - last >= _SIM_SERIES_THROTTLE_S:
+                last = offset
+                spans.append((start, k + 1))
+                start = k + 1
+        if start < i1:
+            spans.append((start, i1))
+        return spans
+
     def step(self, i0: int, i1: int) -> None:
-        """Replay readings[i0:i1] through the detector (a chunk of the cycle)."""
+        """Replay readings[i0:i1] through the detector (a chunk of the cycle).
+
+        Uses the detector's batch replay, which steps only the readings that can
+        change state and folds the rest in bulk; the cursor is kept current for
+        every reading that can emit an event.
+        """
         if self._aborted or not self.ready:
             return
         try:
-            for ts, power in self.readings[i0:i1]:
-                self.cursor["t"] = (ts - self.base).total_seconds()
-                self.detector.process_reading(power, ts)
+            chunk = self.readings[i0:i1]
+            timestamps = [ts for ts, _ in chunk]
+            powers = [power for _, power in chunk]
+            for j0, j1 in self._sample_spans(i0, i1):
+                self.detector.process_readings(
+                    timestamps[j0 - i0:j1 - i0], powers[j0 - i0:j1 - i0],
+                    before_reading=self._seek,
+                )
+                ts = timestamps[j1 - i0 - 1]
+                self._seek(ts)
                 self._sample(ts)
         except Exception as exc:  # pylint: disable=broad-exception-caught
             self._aborted = True
@@ -1294,21 +1449,33 @@ def _run_rows(
     options: dict[str, Any],
     price: float | None,
     prebuilt: tuple[Any, Any, Any, Any] | None = None,
+    cache: SweepCache | None = None,
 ) -> list[dict[str, Any]]:
     # Snapshots are store-derived (independent of the cycle and the detector-level
     # settings_override), so build them ONCE and reuse across all cycles/values.
     # Callers that drive many chunks should pass prebuilt= to avoid rebuilding per chunk.
-    if prebuilt is None:
+    # A sweep passes its SweepCache instead, which carries the snapshots too.
+    if cache is not None:
+        prebuilt = cache.prebuilt
+    elif prebuilt is None:
         prebuilt = _build_match_snapshots(store)
-    rows: list[dict[str, Any]] = []
-    for cycle in cycles:
+
+    def _row(cycle: dict[str, Any]) -> dict[str, Any] | None:
         detail = simulate_cycle_detail(
             cycle, base_config, settings_override, store, options, price,
-            compute_series=False, prebuilt=prebuilt,
+            compute_series=False, prebuilt=prebuilt, cache=cache,
         )
-        if "error" in detail:
-            continue
-        rows.append(_detail_to_row(detail))
+        return None if "error" in detail else _detail_to_row(detail)
+
+    rows: list[dict[str, Any]] = []
+    for cycle in cycles:
+        row = (
+            cache.row(cycle, settings_override, lambda c=cycle: _row(c))
+            if cache is not None
+            else _row(cycle)
+        )
+        if row is not None:
+            rows.append(row)
     return rows
 
 
@@ -1527,7 +1694,307 @@ def _coerce_param(base_config: CycleDetectorConfig, param: str, value: float) ->
         return value
 
 
-def run_playground_sweep(
+# Search strategies for a sweep. "grid" replays every cell on every cycle (the
+# exhaustive sweep); "coarse" scores a strided lattice and refines around the
+# leaders at halving strides; "halving" (successive halving) ranks every cell on
+# a few cycles and promotes only the best third to each larger cycle set. "auto"
+# stays exhaustive while that is cheap and switches to halving beyond it.
+SWEEP_SEARCH_MODES = ("auto", "grid", "coarse", "halving")
+# "auto" stays exhaustive up to this many cycle replays (cells x cycles).
+_SWEEP_EXHAUSTIVE_RUNS = 600
+# Successive halving: keep 1/ETA of the cells per rung, never rank on fewer
+# than MIN_CYCLES cycles.
+_HALVING_ETA = 3
+_HALVING_MIN_CYCLES = 2
+# Coarse-to-fine: lattice points per axis to start from, and how many leaders
+# are refined at each finer stride.
+_COARSE_MIN_POINTS = 4
+_COARSE_KEEP = 3
+
+
+def resolve_search(search: str | None, n_cells: int, n_cycles: int) -> str:
+    """Map a requested search mode (incl. "auto"/unknown) to a concrete one."""
+    if search in ("grid", "coarse", "halving"):
+        return search
+    return "grid" if n_cells * max(1, n_cycles) <= _SWEEP_EXHAUSTIVE_RUNS else "halving"
+
+
+def _interleave_by_label(cycles: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Round-robin the cycles across their labels (first-seen order).
+
+    Successive halving ranks the early rungs on a prefix of this order, so every
+    program is represented in even the smallest rung instead of whichever label
+    happened to dominate the most recent cycles.
+    """
+    buckets: dict[str | None, list[dict[str, Any]]] = {}
+    for cycle in cycles:
+        buckets.setdefault(_cycle_label(cycle), []).append(cycle)
+    out: list[dict[str, Any]] = []
+    queues = list(buckets.values())
+    depth = 0
+    while len(out) < len(cycles):
+        for queue in queues:
+            if depth < len(queue):
+                out.append(queue[depth])
+        depth += 1
+    return out
+
+
+def _halving_rungs(n_cells: int, n_cycles: int) -> list[int]:
+    """Cycle-set sizes per rung, smallest first; the last rung is the full set."""
+    sizes = [n_cycles]
+    kept = n_cells
+    while kept > 1:
+        smaller = -(-sizes[-1] // _HALVING_ETA)
+        if smaller < _HALVING_MIN_CYCLES or smaller >= sizes[-1]:
+            break
+        sizes.append(smaller)
+        kept = -(-kept // _HALVING_ETA)
+    return sizes[::-1]
+
+
+def _coarse_stride(n: int) -> int:
+    """Largest power-of-two stride that still leaves _COARSE_MIN_POINTS on an axis."""
+    stride = 1
+    while n / (stride * 2) >= _COARSE_MIN_POINTS:
+        stride *= 2
+    return stride
+
+
+def _lattice(n: int, stride: int) -> list[int]:
+    return sorted(set(range(0, n, stride)) | {n - 1}) if n else []
+
+
+#: One unit of sweep work: (cell index, number of cycles to replay it on).
+SweepJob = tuple[int, int]
+
+
+class SweepEngine:
+    """One parameter sweep, planned as a sequence of independent job batches.
+
+    :meth:`next_batch` hands out ``(cell, n_cycles)`` jobs that can run in any
+    order or in parallel (``ws_api`` fans them over the shared worker pool);
+    :meth:`record` folds their ``(metric, summary)`` results back and plans the
+    next batch from them, which is how the coarse and halving searches steer.
+    :meth:`evaluate` is the job itself and :meth:`run` the plain blocking
+    driver. All cells share one :class:`SweepCache`, so only the work that the
+    swept parameters actually change is repeated per cell.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        cycles: list[dict[str, Any]],
+        base_config: CycleDetectorConfig,
+        param: str,
+        values: list[float],
+        objective: str,
+        options: dict[str, Any],
+        price: float | None,
+        param_y: str | None = None,
+        values_y: list[float] | None = None,
+        search: str | None = "grid",
+        cache: SweepCache | None = None,
+    ) -> None:
+        self.store = store
+        self.base_config = base_config
+        self.options = options
+        self.price = price
+        self.objective = objective
+        self.param = param
+        self.param_y = param_y if param_y and values_y else None
+        self.x_values = list(values)
+        self.y_values = list(values_y) if self.param_y else []
+        self.cache = cache if cache is not None else SweepCache(store)
+        ny = len(self.y_values) or 1
+        self.cells: list[tuple[int, int]] = [
+            (ix, iy) for iy in range(ny) for ix in range(len(self.x_values))
+        ]
+        self.overrides: list[dict[str, Any]] = []
+        for ix, iy in self.cells:
+            override = {param: _coerce_param(base_config, param, self.x_values[ix])}
+            if self.param_y:
+                override[self.param_y] = _coerce_param(
+                    base_config, self.param_y, self.y_values[iy]
+                )
+            self.overrides.append(override)
+        self.search = resolve_search(search, len(self.cells), len(cycles))
+        self.cycles = _interleave_by_label(cycles) if self.search == "halving" else list(cycles)
+        # cell index -> (cycles replayed, raw metric, rows summary)
+        self.results: dict[int, tuple[int, float | None, dict[str, Any]]] = {}
+        self.jobs_done = 0
+
+        n_cycles = len(self.cycles)
+        if self.search == "halving":
+            self._rungs = _halving_rungs(len(self.cells), n_cycles)
+            self._rung = 0
+            self._pending = [(c, self._rungs[0]) for c in range(len(self.cells))]
+        elif self.search == "coarse":
+            self._stride = (
+                _coarse_stride(len(self.x_values)),
+                _coarse_stride(len(self.y_values)) if self.param_y else 1,
+            )
+            xs = _lattice(len(self.x_values), self._stride[0])
+            ys = _lattice(ny, self._stride[1])
+            self._pending = [
+                (c, n_cycles) for c, (ix, iy) in enumerate(self.cells)
+                if ix in xs and iy in ys
+            ]
+        else:
+            self._pending = [(c, n_cycles) for c in range(len(self.cells))]
+
+    # --- planning -----------------------------------------------------------
+
+    def next_batch(self) -> list[SweepJob]:
+        """Jobs for the next round; empty once the search has converged."""
+        return list(self._pending)
+
+    def estimated_jobs(self) -> int:
+        """Best-known total job count (exact for grid/halving, a bound for coarse)."""
+        if self.search == "halving":
+            total, kept = 0, len(self.cells)
+            for _size in self._rungs:
+                total += kept
+                kept = -(-kept // _HALVING_ETA)
+            return total
+        if self.search == "coarse":
+            levels = max(self._stride).bit_length() - 1
+            return self.jobs_done + len(self._pending) + levels * _COARSE_KEEP * 8
+        return len(self.cells)
+
+    def _rank_key(self, cell: int) -> tuple[float, int]:
+        metric = self.results.get(cell, (0, None, {}))[1]
+        if metric is None:
+            return (math.inf, cell)
+        return (metric if self.objective in _SWEEP_LOWER_IS_BETTER else -metric, cell)
+
+    def record(self, done: list[tuple[SweepJob, tuple[float | None, dict[str, Any]]]]) -> None:
+        """Fold a (possibly partial) batch of results back in and plan the next one."""
+        for (cell, n), (metric, summary) in done:
+            if n >= self.results.get(cell, (0, None, {}))[0]:
+                self.results[cell] = (n, metric, summary)
+        self.jobs_done += len(done)
+        self._pending = []
+        if self.search == "halving":
+            self._plan_next_rung()
+        elif self.search == "coarse":
+            self._plan_refinement()
+
+    def _plan_next_rung(self) -> None:
+        if self._rung + 1 >= len(self._rungs):
+            return
+        size = self._rungs[self._rung]
+        ranked = sorted(
+            (c for c, (n, _m, _s) in self.results.items() if n == size),
+            key=self._rank_key,
+        )
+        self._rung += 1
+        keep = ranked[: -(-len(ranked) // _HALVING_ETA)]
+        self._pending = [(c, self._rungs[self._rung]) for c in sorted(keep)]
+
+    def _plan_refinement(self) -> None:
+        sx, sy = self._stride
+        if sx <= 1 and sy <= 1:
+            return
+        sx, sy = max(1, sx // 2), max(1, sy // 2)
+        self._stride = (sx, sy)
+        index = {cell: c for c, cell in enumerate(self.cells)}
+        leaders = sorted(self.results, key=self._rank_key)[:_COARSE_KEEP]
+        wanted: set[int] = set()
+        for c in leaders:
+            ix, iy = self.cells[c]
+            for dy in ((-sy, 0, sy) if self.param_y else (0,)):
+                for dx in (-sx, 0, sx):
+                    near = index.get((ix + dx, iy + dy))
+                    if near is not None and near not in self.results:
+                        wanted.add(near)
+        self._pending = [(c, len(self.cycles)) for c in sorted(wanted)]
+        if not self._pending:
+            # Every neighbour at this stride is already scored; try the next one.
+            self._plan_refinement()
+
+    # --- execution ----------------------------------------------------------
+
+    def evaluate(self, job: SweepJob) -> tuple[float | None, dict[str, Any]]:
+        """Replay one cell on the first ``n`` cycles and reduce it to the objective."""
+        cell, n = job
+        rows = _run_rows(
+            self.store, self.cycles[:n], self.base_config, self.overrides[cell],
+            self.options, self.price, cache=self.cache,
+        )
+        return objective_metric(rows, self.objective), _rows_summary(rows)
+
+    def run(
+        self, map_fn: Callable[[Callable[[Any], Any], list[Any]], list[Any]] | None = None
+    ) -> dict[str, Any]:
+        """Blocking driver: evaluate batches (via ``map_fn``) until converged."""
+        mapper = map_fn or (lambda fn, items: [fn(item) for item in items])
+        while batch := self.next_batch():
+            self.record(list(zip(batch, mapper(self.evaluate, batch))))
+        return self.payload()
+
+    # --- result -------------------------------------------------------------
+
+    def payload(self) -> dict[str, Any]:
+        """The sweep result in the 1D/2D shapes the panel already renders.
+
+        The winner is only ever picked among cells scored on the full cycle set;
+        cells a halving search dropped early still show their (lower-fidelity)
+        metric, with the number of cycles behind it alongside.
+        """
+        full = len(self.cycles)
+        summary = _sim_config_summary(self.base_config)
+        current_x = summary.get(_OVERRIDE_FIELD_MAP.get(self.param, (self.param,))[0])
+
+        def _shown(cell: int, full_only: bool) -> float | None:
+            n, metric, _summary = self.results.get(cell, (0, None, {}))
+            if metric is None or (full_only and n < full):
+                return None
+            return round(metric, 4)
+
+        if self.param_y:
+            nx = len(self.x_values)
+            rows_of = range(len(self.y_values))
+            full_grid = [[_shown(iy * nx + ix, True) for ix in range(nx)] for iy in rows_of]
+            current_y = summary.get(_OVERRIDE_FIELD_MAP.get(self.param_y, (self.param_y,))[0])
+            payload = finalize_sweep_2d(
+                self.param, self.param_y, self.objective, self.x_values, self.y_values,
+                full_grid, {"x": current_x, "y": current_y},
+            )
+            if self.search != "grid":
+                payload["grid"] = [
+                    [_shown(iy * nx + ix, False) for ix in range(nx)] for iy in rows_of
+                ]
+                payload["fidelity"] = [
+                    [self.results[iy * nx + ix][0] if iy * nx + ix in self.results else None
+                     for ix in range(nx)]
+                    for iy in rows_of
+                ]
+        else:
+            points: list[dict[str, Any]] = []
+            full_points: list[dict[str, Any]] = []
+            for c, value in enumerate(self.x_values):
+                if c not in self.results:
+                    continue
+                n, _metric, rows_summary = self.results[c]
+                point = {"value": value, "metric": _shown(c, False), "summary": rows_summary}
+                if self.search != "grid":
+                    point["cycles"] = n
+                points.append(point)
+                if n >= full:
+                    full_points.append(point)
+            payload = finalize_sweep_1d(self.param, self.objective, full_points, current_x)
+            payload["points"] = points
+        if self.search != "grid":
+            payload["search"] = self.search
+            payload["evaluated"] = {
+                "cells": len(self.results), "of": len(self.cells),
+                "replays": self.cache.stats["row_misses"],
+            }
+        return payload
+
+
+def build_sweep_engine(
     store: Any,
     cycle_ids: list[str] | None,
     base_config: CycleDetectorConfig,
@@ -1540,9 +2007,12 @@ def run_playground_sweep(
     param_y: str | None = None,
     values_y: list[float] | None = None,
     prebuilt: tuple[Any, Any, Any, Any] | None = None,
-) -> dict[str, Any]:
-    """Sweep one param (1D curve) or two params (2D heatmap) and score each point
-    by ``objective`` computed from the per-cycle rows. Executor-safe; never raises.
+    search: str | None = "grid",
+) -> SweepEngine | dict[str, Any]:
+    """Select the cycles and set up a :class:`SweepEngine` (snapshots included).
+
+    Executor-safe (it decodes the profile samples); returns an ``{"error": ...}``
+    marker instead of raising.
     """
     options = options or {}
     if objective not in _SWEEP_OBJECTIVES:
@@ -1562,60 +2032,45 @@ def run_playground_sweep(
     else:
         selected = past[-DEFAULT_RECENT_CYCLES:]
     selected = selected[:concurrency]
-
-    def _metric_for(override: dict[str, Any]) -> tuple[float | None, dict[str, Any]]:
-        rows = _run_rows(store, selected, base_config, override, options, price, prebuilt)
-        return objective_metric(rows, objective), _rows_summary(rows)
-
-    current_x = _sim_config_summary(base_config).get(
-        _OVERRIDE_FIELD_MAP.get(param, (param,))[0]
+    return SweepEngine(
+        store, selected, base_config, param, values, objective, options, price,
+        param_y, values_y, search, SweepCache(store, prebuilt),
     )
 
-    if param_y and values_y:
-        grid: list[list[float | None]] = []
-        best: dict[str, Any] | None = None
-        for vy in values_y:
-            row_metrics: list[float | None] = []
-            for vx in values:
-                override = {
-                    param: _coerce_param(base_config, param, vx),
-                    param_y: _coerce_param(base_config, param_y, vy),
-                }
-                metric, _ = _metric_for(override)
-                row_metrics.append(round(metric, 4) if metric is not None else None)
-                if metric is not None and (
-                    best is None or _sweep_is_better(metric, best["metric"], objective)
-                ):
-                    best = {"x": vx, "y": vy, "metric": round(metric, 4)}
-            grid.append(row_metrics)
-        current_y = _sim_config_summary(base_config).get(
-            _OVERRIDE_FIELD_MAP.get(param_y, (param_y,))[0]
-        )
-        return {
-            "param_x": param, "param_y": param_y, "objective": objective,
-            "x_values": values, "y_values": values_y, "grid": grid, "best": best,
-            "current": {"x": current_x, "y": current_y},
-        }
 
-    points: list[dict[str, Any]] = []
-    best_1d: dict[str, Any] | None = None
-    for vx in values:
-        override = {param: _coerce_param(base_config, param, vx)}
-        metric, summary = _metric_for(override)
-        points.append(
-            {"value": vx, "metric": round(metric, 4) if metric is not None else None,
-             "summary": summary}
-        )
-        if metric is not None and (
-            best_1d is None or _sweep_is_better(metric, best_1d["metric"], objective)
-        ):
-            best_1d = {"value": vx, "metric": round(metric, 4)}
-    return {
-        "param": param, "objective": objective, "points": points,
-        "current_value": current_x,
-        "best_value": best_1d["value"] if best_1d else None,
-        "best_metric": best_1d["metric"] if best_1d else None,
-    }
+def run_playground_sweep(
+    store: Any,
+    cycle_ids: list[str] | None,
+    base_config: CycleDetectorConfig,
+    param: str,
+    values: list[float],
+    objective: str,
+    options: dict[str, Any] | None,
+    price: float | None,
+    concurrency: int,
+    param_y: str | None = None,
+    values_y: list[float] | None = None,
+    prebuilt: tuple[Any, Any, Any, Any] | None = None,
+    search: str | None = "grid",
+    map_fn: Callable[[Callable[[Any], Any], list[Any]], list[Any]] | None = None,
+) -> dict[str, Any]:
+    """Sweep one param (1D curve) or two params (2D heatmap) and score each point
+    by ``objective`` computed from the per-cycle rows. ``search`` picks the
+    strategy (see :data:`SWEEP_SEARCH_MODES`; "grid" is exhaustive) and
+    ``map_fn`` may fan each batch of cells out (e.g. ``WorkerPool.map``).
+    Executor-safe; never raises.
+    """
+    engine = build_sweep_engine(
+        store, cycle_ids, base_config, param, values, objective, options, price,
+        concurrency, param_y, values_y, prebuilt, search,
+    )
+    if isinstance(engine, dict):
+        return engine
+    try:
+        return engine.run(map_fn)
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        _LOGGER.debug("Playground sweep failed: %s", exc)
+        return {"error": str(exc)}
 
 
 # ─── DTW debug ────────────────────────────────────────────────────────────────
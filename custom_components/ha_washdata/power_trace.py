@@ -0,0 +1,328 @@
+# WashData - Home Assistant integration for appliance cycle monitoring via smart plugs.
+# Copyright (C) 2026 Lukas Bandura
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Compact storage for the live cycle's ``(timestamp, watts)`` trace.
+
+The detector used to keep the running cycle as a list of ``(datetime, float)``
+tuples - about 100 bytes of objects per sample, so a ten-hour cycle at 1 Hz
+held 36k tuples per appliance, copied again for every trace consumer and
+re-serialised to ISO strings for every active-cycle save. :class:`PowerTrace`
+keeps two growable NumPy columns instead: integer microseconds since the Unix
+epoch and watts (16 bytes per sample).
+
+It still behaves as a read-only sequence of ``(datetime, float)`` tuples
+(indexing, slicing, iteration, ``reversed``), building datetimes on demand, so
+code written against the list keeps working. Datetimes round-trip exactly:
+microsecond integers are what ``datetime`` stores, and
+``timestamp()`` / ``total_seconds()`` of the rebuilt values equal
+``us / 1e6`` / ``(us - us0) / 1e6`` of the columns bit for bit.
+
+:meth:`PowerTrace.snapshot` is zero-copy: writes only ever go past the end of
+the columns (growth, truncation and clearing allocate new ones), so a snapshot
+handed to the matcher or the progress estimator stays valid while the detector
+keeps appending.
+
+:func:`encode_trace` / :func:`decode_trace` are the binary active-cycle
+persistence format (little-endian, base64 in the JSON store)::
+
+    header  b"WDPT" | u16 format version | u8 watts dtype code | u8 reserved
+            | u32 n | i64 first timestamp (us since epoch)
+    body    zlib( timestamp deltas i64[n] | watts[n] )
+
+Deltas of a steady sampling cadence compress to a few bytes per sample; watts
+are written as float32 when that is lossless (as in :mod:`.trace_store`) and
+float64 otherwise.
+"""
+
+from __future__ import annotations
+
+import base64
+import struct
+import zlib
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Any, overload
+
+import numpy as np
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_US = timedelta(microseconds=1)
+_US_PER_S = 1_000_000
+_MIN_CAPACITY = 256
+
+_MAGIC = b"WDPT"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHBBIq")
+_DTYPE_F32 = 1
+_DTYPE_F64 = 2
+_DTYPES: dict[int, np.dtype[Any]] = {
+    _DTYPE_F32: np.dtype("<f4"),
+    _DTYPE_F64: np.dtype("<f8"),
+}
+
+
+def datetime_to_us(ts: datetime) -> int:
+    """Microseconds since the Unix epoch (naive datetimes are local time,
+    as ``datetime.timestamp`` treats them)."""
+    if ts.tzinfo is None:
+        ts = ts.astimezone()
+    return (ts - _EPOCH) // _ONE_US
+
+
+def us_to_datetime(us: int, tz: tzinfo | None) -> datetime:
+    """Inverse of :func:`datetime_to_us` in ``tz`` (naive local time for None)."""
+    sec, micro = divmod(int(us), _US_PER_S)
+    return datetime.fromtimestamp(sec, tz).replace(microsecond=micro)
+
+
+class PowerTrace:
+    """Growable ``(timestamp, watts)`` columns; see the module docstring."""
+
+    __slots__ = ("_us", "_w", "_n", "_tz")
+
+    def __init__(self, readings: Iterable[tuple[datetime, float]] = ()) -> None:
+        self._us = np.empty(0, dtype=np.int64)
+        self._w = np.empty(0, dtype=float)
+        self._n = 0
+        self._tz: tzinfo | None = None
+        self.extend(readings)
+
+    @classmethod
+    def from_arrays(
+        cls, us: np.ndarray, watts: np.ndarray, tz: tzinfo | None
+    ) -> PowerTrace:
+        """Trace over copies of ``us`` (int64 epoch microseconds) and ``watts``."""
+        trace = cls()
+        trace.extend_arrays(us, watts, tz)
+        return trace
+
+    # -- sequence protocol -------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __bool__(self) -> bool:
+        return self._n > 0
+
+    @overload
+    def __getitem__(self, index: int) -> tuple[datetime, float]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> PowerTrace: ...
+
+    def __getitem__(self, index: int | slice) -> tuple[datetime, float] | PowerTrace:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._n)
+            if step != 1:
+                return PowerTrace.from_arrays(
+                    self._us[start:stop:step], self._w[start:stop:step], self._tz
+                )
+            return self._view(self._us[start:max(start, stop)], self._w[start:max(start, stop)])
+        if index < 0:
+            index += self._n
+        if not 0 <= index < self._n:
+            raise IndexError("PowerTrace index out of range")
+        return us_to_datetime(self._us[index], self._tz), float(self._w[index])
+
+    def __iter__(self) -> Iterator[tuple[datetime, float]]:
+        tz = self._tz
+        n = self._n
+        for us, watts in zip(self._us[:n].tolist(), self._w[:n].tolist()):
+            yield us_to_datetime(us, tz), watts
+
+    def __reversed__(self) -> Iterator[tuple[datetime, float]]:
+        tz = self._tz
+        for k in range(self._n - 1, -1, -1):
+            yield us_to_datetime(self._us[k], tz), float(self._w[k])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PowerTrace):
+            return (
+                self._n == other._n
+                and np.array_equal(self.times_us(), other.times_us())
+                and np.array_equal(self.watts(), other.watts())
+            )
+        if isinstance(other, (list, tuple)):
+            return len(other) == self._n and list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"PowerTrace(n={self._n})"
+
+    # -- mutation ----------------------------------------------------------
+
+    def append(self, reading: tuple[datetime, float]) -> None:
+        """Append one ``(timestamp, watts)`` reading."""
+        self.add(reading[0], reading[1])
+
+    def add(self, ts: datetime, watts: float) -> None:
+        """Append one reading without building a tuple."""
+        if self._n == 0:
+            self._tz = ts.tzinfo
+        self._reserve(self._n + 1)
+        self._us[self._n] = datetime_to_us(ts)
+        self._w[self._n] = watts
+        self._n += 1
+
+    def extend(self, readings: Iterable[tuple[datetime, float]]) -> None:
+        """Append ``(timestamp, watts)`` readings."""
+        if isinstance(readings, PowerTrace):
+            self.extend_arrays(readings.times_us(), readings.watts(), readings.tzinfo)
+            return
+        items = readings if isinstance(readings, list) else list(readings)
+        if not items:
+            return
+        k = len(items)
+        self.extend_arrays(
+            np.fromiter((datetime_to_us(ts) for ts, _ in items), dtype=np.int64, count=k),
+            np.fromiter((watts for _, watts in items), dtype=float, count=k),
+            items[0][0].tzinfo,
+        )
+
+    def extend_arrays(self, us: np.ndarray, watts: np.ndarray, tz: tzinfo | None) -> None:
+        """Append epoch-microsecond / watt columns (``tz`` used if still empty)."""
+        k = len(us)
+        if k == 0:
+            return
+        if self._n == 0:
+            self._tz = tz
+        self._reserve(self._n + k)
+        self._us[self._n:self._n + k] = us
+        self._w[self._n:self._n + k] = watts
+        self._n += k
+
+    def truncate(self, n: int) -> None:
+        """Keep only the first ``n`` readings."""
+        n = max(0, min(int(n), self._n))
+        # Fresh columns: appends after this would otherwise overwrite samples
+        # that an outstanding snapshot still covers.
+        self._us = self._us[:n].copy()
+        self._w = self._w[:n].copy()
+        self._n = n
+
+    def clear(self) -> None:
+        """Drop every reading."""
+        self._us = np.empty(0, dtype=np.int64)
+        self._w = np.empty(0, dtype=float)
+        self._n = 0
+        self._tz = None
+
+    def _reserve(self, n: int) -> None:
+        if n <= len(self._us):
+            return
+        cap = max(_MIN_CAPACITY, n, 2 * len(self._us))
+        us = np.empty(cap, dtype=np.int64)
+        w = np.empty(cap, dtype=float)
+        us[:self._n] = self._us[:self._n]
+        w[:self._n] = self._w[:self._n]
+        self._us, self._w = us, w
+
+    # -- array access --------------------------------------------------------
+
+    @property
+    def tzinfo(self) -> tzinfo | None:
+        """Timezone timestamps are rebuilt in (that of the first reading)."""
+        return self._tz
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the columns (including spare capacity)."""
+        return int(self._us.nbytes + self._w.nbytes)
+
+    def snapshot(self) -> PowerTrace:
+        """Zero-copy, length-frozen view of the current readings."""
+        return self._view(self._us[:self._n], self._w[:self._n])
+
+    def _view(self, us: np.ndarray, w: np.ndarray) -> PowerTrace:
+        view = PowerTrace()
+        view._us, view._w, view._n, view._tz = us, w, len(us), self._tz  # pylint: disable=protected-access
+        return view
+
+    def times_us(self) -> np.ndarray:
+        """Epoch microseconds (int64 view - do not modify)."""
+        return self._us[:self._n]
+
+    def watts(self) -> np.ndarray:
+        """Watts (float64 view - do not modify)."""
+        return self._w[:self._n]
+
+    def epoch_seconds(self) -> np.ndarray:
+        """``ts.timestamp()`` of every reading."""
+        return self._us[:self._n] / 1e6
+
+    def offsets(self, start: datetime | None = None) -> np.ndarray:
+        """``(ts - start).total_seconds()`` per reading (``start`` = first reading)."""
+        if self._n == 0:
+            return np.zeros(0)
+        base = self._us[0] if start is None else datetime_to_us(start)
+        return (self._us[:self._n] - base) / 1e6
+
+    def offset_points(self, start: datetime | None = None) -> list[tuple[float, float]]:
+        """``[(offset_s, watts), ...]`` as built from the tuple list."""
+        return list(zip(self.offsets(start).tolist(), self._w[:self._n].tolist()))
+
+    def last_time(self) -> datetime | None:
+        """Timestamp of the newest reading."""
+        return us_to_datetime(self._us[self._n - 1], self._tz) if self._n else None
+
+    def last_power(self) -> float | None:
+        """Watts of the newest reading."""
+        return float(self._w[self._n - 1]) if self._n else None
+
+    def to_list(self) -> list[tuple[datetime, float]]:
+        """The readings as a list of tuples."""
+        return list(self)
+
+
+def encode_trace(trace: PowerTrace) -> str:
+    """Binary (base64) form of ``trace`` for the active-cycle snapshot."""
+    us = trace.times_us()
+    watts = trace.watts()
+    n = len(us)
+    first = int(us[0]) if n else 0
+    deltas = np.diff(us, prepend=np.int64(first)).astype("<i8")
+    as_f32 = watts.astype("<f4")
+    if np.array_equal(as_f32.astype(float), watts, equal_nan=True):
+        code, column = _DTYPE_F32, as_f32
+    else:
+        code, column = _DTYPE_F64, watts.astype("<f8")
+    header = _HEADER.pack(_MAGIC, _FORMAT_VERSION, code, 0, n, first)
+    body = zlib.compress(deltas.tobytes() + column.tobytes(), 6)
+    return base64.b64encode(header + body).decode("ascii")
+
+
+def decode_trace(data: str, tz: tzinfo | None) -> PowerTrace:
+    """Rebuild a trace from :func:`encode_trace` output, timestamps in ``tz``.
+
+    Raises ``ValueError`` on a malformed or unknown-version payload.
+    """
+    try:
+        raw = base64.b64decode(data.encode("ascii"), validate=True)
+        magic, version, code, _reserved, n, first = _HEADER.unpack_from(raw)
+        if magic != _MAGIC or version != _FORMAT_VERSION or code not in _DTYPES:
+            raise ValueError("not a power trace snapshot")
+        body = zlib.decompress(raw[_HEADER.size:])
+    except (struct.error, zlib.error, TypeError, AttributeError) as exc:
+        raise ValueError(f"malformed power trace snapshot: {exc}") from exc
+    dtype = _DTYPES[code]
+    if len(body) != n * (8 + dtype.itemsize):
+        raise ValueError("power trace snapshot length mismatch")
+    deltas = np.frombuffer(body, dtype="<i8", count=n)
+    watts = np.frombuffer(body, dtype=dtype, count=n, offset=8 * n)
+    us = np.int64(first) + np.cumsum(deltas, dtype=np.int64)
+    return PowerTrace.from_arrays(us, watts.astype(float), tz)
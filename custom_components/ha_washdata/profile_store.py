@@ -18,6 +18,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import contextlib
 import dataclasses
 import hashlib
@@ -61,10 +62,11 @@ from .const import (
     DEFAULT_MAX_PAST_CYCLES,
     DEFAULT_MAX_FULL_TRACES_PER_PROFILE,
     DEFAULT_MAX_FULL_TRACES_UNLABELED,
+    DEFAULT_DERIVED_CACHE_MAX_KB,
     DEFAULT_DTW_BANDWIDTH,
 )
 from .features import compute_signature
-from .signal_processing import resample_uniform, resample_adaptive, Segment, integrate_wh, energy_gap_threshold_s
+from .signal_processing import resample_adaptive, integrate_wh, energy_gap_threshold_s
 from . import analysis
 from .time_utils import (
     migrate_power_data_to_offsets,
@@ -85,7 +87,26 @@ from .phase_match import (
     phase_profile_from_dict,
     phase_profile_to_dict,
 )
+from .cycle_index import ANY, CycleIndex, CyclePage
+from .derived_cache import DerivedCache
 from .log_utils import DeviceLoggerAdapter
+from .match_index import MatchIndex
+from .power_trace import PowerTrace
+from .store_journal import (
+    JOURNAL_COMPACT_MIN_BYTES,
+    StoreDocument,
+    StoreJournal,
+    apply_ops,
+    encode_op,
+)
+from .trace_store import (
+    COMPACT_GARBAGE_RATIO,
+    COMPACT_MIN_BYTES,
+    CycleTraceStore,
+    TraceRef,
+    encode_trace,
+)
+from .worker_pool import CancelFn, ProgressFn, get_worker_pool
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -95,9 +116,22 @@ _LOGGER = logging.getLogger(__name__)
 # and reference selection so degenerate cycles never become the matching template.
 _DEGENERATE_POWER_FLOOR = 15.0  # watts
 
+# A profile's envelope absorbs at most this many finished cycles incrementally
+# (warped onto the stored reference, Welford-updated bands) before the next one
+# triggers a full rebuild that re-derives the median reference from every member.
+_ENVELOPE_MAX_INCREMENTAL = 10
+
 JSONDict: TypeAlias = dict[str, Any]
 CycleDict: TypeAlias = dict[str, Any]
 
+# Cycle lists whose power_data is persisted in the columnar trace sidecar
+# (see trace_store.py) instead of inline in the JSON document.
+_TRACE_SECTIONS = ("past_cycles", "reference_cycles")
+# Top-level keys journaled record-by-record (marked via _journal_cycle /
+# _journal_envelope); every other top-level key is journaled whole once marked
+# dirty (see _journal_key).
+_JOURNAL_RECORD_KEYS = frozenset((*_TRACE_SECTIONS, "envelopes"))
+
 
 def _is_recorded_cycle(cycle: dict[str, Any]) -> bool:
     """True when a cycle was produced by the manual recorder.
@@ -614,6 +648,412 @@ def compress_power_data(cycle: CycleDict) -> list[Any] | None:
         return None
 
 
+# Cycle fields reprocess_cycle_worker / build_envelope_worker read; only these
+# cross to the worker.
+_REPROCESS_INPUT_KEYS = (
+    "id", "status", "start_time", "duration", "sampling_interval", "power_data",
+)
+_ENVELOPE_INPUT_KEYS = (
+    "power_data", "start_time", "duration", "manual_duration", "ml_review",
+)
+
+# (level, message, args) records a worker hands back for the caller to log with
+# its device-prefixed logger (a worker process has no configured handlers).
+LogNote: TypeAlias = tuple[int, str, tuple[Any, ...]]
+
+_Logger: TypeAlias = logging.Logger | logging.LoggerAdapter
+
+
+def reprocess_cycle_worker(
+    source: CycleDict,
+) -> tuple[dict[str, Any], int, list[LogNote]]:
+    """Reprocess one stored cycle: trim its trace, self-heal duration drift and
+    recompute its signature (fan-out worker for ``async_reprocess_all_data``).
+
+    Pure: works on a shallow copy and returns ``(changes, processed, notes)``
+    where ``changes`` holds only the fields it reassigned, for the caller to
+    apply to the live record.
+    """
+    cycle = cast(CycleDict, dict(source))
+    processed_count = 0
+    notes: list[LogNote] = []
+
+    # Data Optimization: Trim leading/trailing zeros (0W)
+    # Only apply to compressed data to avoid breaking legacy format
+    p_data = cycle.get("power_data")
+    if (
+        p_data
+        and isinstance(p_data, list)
+        and p_data
+        and isinstance(p_data[0], (list, tuple))
+    ):
+        first_point = cast(list[Any] | tuple[Any, ...], p_data[0])
+        # Only trim offset-format data (numeric offsets). Legacy ISO-format
+        # cycles skip trimming but still reach the signature block below.
+        if len(first_point) == 2 and isinstance(first_point[0], (int, float)):
+            p_data_list = cast(list[list[float]], p_data)
+            # Apply trim helper
+            original_len = len(p_data_list)
+
+            # Logic: For completed cycles, only trim leading zeros.
+            # For others, trim both ends.
+            if cycle.get("status") in ("completed", "force_stopped"):
+                # Only trim leading
+                start_idx = 0
+                for i, point in enumerate(p_data_list):
+                    if point[1] > 1.0: # Match threshold below
+                        start_idx = i
+                        break
+                trimmed: list[list[float]] = p_data_list[start_idx:]
+            else:
+                trimmed = trim_zero_power_data(p_data_list, threshold=1.0) # Conservative 1W threshold
+
+            if trimmed and len(trimmed) < original_len:
+                # Data was trimmed - check for start time shift
+                first_offset = trimmed[0][0]
+
+                if first_offset > 0:
+                    # Leading zeros removed - Must shift start_time forward
+                    try:
+                        start_dt = datetime.fromisoformat(cycle["start_time"])
+                        new_start = start_dt + timedelta(seconds=first_offset)
+                        cycle["start_time"] = new_start.isoformat()
+
+                        # Re-normalize offsets to 0
+                        shifted_data: list[list[float]] = []
+                        for row in trimmed:
+                            # row is [offset, power]
+                            shifted_data.append([round(row[0] - first_offset, 1), row[1]])
+                        cycle["power_data"] = shifted_data
+                        processed_count += 1
+                    except (ValueError, TypeError) as e:
+                        notes.append((logging.WARNING, "Failed to shift start_time for trimmed cycle: %s", (str(e),)))
+                else:
+                    # Only trailing trimmed or no shift needed
+                    cycle["power_data"] = trimmed
+                    processed_count += 1
+
+                # Update duration to match new data length
+                # If we only trimmed the head, the new duration is old_duration - first_offset
+                # This preserves trailing silence.
+                if cycle.get("power_data"):
+                    old_dur = float(cycle.get("duration", 0.0) or 0.0)
+                    # If we shifted (first_offset > 0), new duration is old_dur - first_offset
+                    # Otherwise if we only trimmed tail, we might want to snap,
+                    # but for completed cycles we don't trim tail in this loop.
+                    if first_offset > 0:
+                        cycle["duration"] = max(0.0, old_dur - first_offset)
+                    else:
+                        # Only trailing was trimmed (not expected for completed cycles here)
+                        # or no trim happened.
+                        # If trailing was trimmed, we SHOULD snap.
+                        if len(trimmed) < original_len:
+                            cycle["duration"] = cycle["power_data"][-1][0]
+
+            # Self-heal duration/end_time drift.  A freshly-finalized cycle
+            # always has last_offset == duration (the finalizer appends a
+            # terminal point at end_time, and add_cycle keeps the tail for
+            # completed cycles), so this is a no-op for healthy records.  It
+            # repairs older / manually-edited cycles whose trace was trimmed
+            # without updating duration + end_time - e.g. a legacy record
+            # whose drying tail was dropped while duration kept the pre-trim
+            # value (duration says 8820s but the trace and end_time end at
+            # 6845s).  Snap both to the trace so the three always agree.
+            pd_now = cycle.get("power_data")
+            if (
+                isinstance(pd_now, list)
+                and pd_now
+                and isinstance(pd_now[-1], (list, tuple))
+                and len(pd_now[-1]) == 2
+            ):
+                trace_end = float(pd_now[-1][0])
+                stored_dur = float(cycle.get("duration", 0.0) or 0.0)
+                si = float(cycle.get("sampling_interval", 0.0) or 0.0)
+                # Tolerance above rounding + one sampling gap; the drifts we
+                # repair are large (minutes), so this never churns healthy data.
+                tol = max(5.0, 2.0 * si)
+                if trace_end > 0 and abs(stored_dur - trace_end) > tol:
+                    cycle["duration"] = round(trace_end, 1)
+                    start_ts = _value_to_timestamp(cycle.get("start_time"))
+                    if start_ts is not None:
+                        cycle["end_time"] = dt_util.utc_from_timestamp(
+                            start_ts + trace_end
+                        ).isoformat()
+                    processed_count += 1
+                    notes.append((
+                        logging.INFO,
+                        "Reprocess self-heal: cycle %s duration %.0fs -> %.0fs "
+                        "(snapped to trace; end_time realigned)",
+                        (cycle.get("id"), stored_dur, trace_end),
+                    ))
+
+    if cycle.get("power_data"):
+        try:
+            tuples = decompress_power_data(cycle)
+            if tuples and len(tuples) > 10:
+                ts_arr: list[float] = []
+                p_arr: list[float] = []
+                for offset_sec, p in tuples:
+                    ts_arr.append(float(offset_sec))
+                    p_arr.append(float(p))
+
+                sig = compute_signature(np.array(ts_arr, dtype=float), np.array(p_arr, dtype=float))
+                cycle["signature"] = dataclasses.asdict(sig)
+                processed_count += 1
+        except Exception as e: # pylint: disable=broad-exception-caught
+            notes.append((logging.WARNING, "Failed to reprocess signature: %s", (str(e),)))
+
+    changes = {k: v for k, v in cycle.items() if k not in source or source[k] is not v}
+    return changes, processed_count, notes
+
+
+EnvelopeCurve: TypeAlias = tuple[list[float], list[float], float, bool, float]
+
+
+def _envelope_curve(cycle: CycleDict) -> EnvelopeCurve | None:
+    """``(offsets, values, duration, is_golden, peak)`` of one envelope member,
+    or None when its trace is too short."""
+    pairs = decompress_power_data(cycle)
+    if len(pairs) < 3:
+        return None
+    offsets = [p[0] for p in pairs]
+    values = [p[1] for p in pairs]
+    stored_dur = float(cycle.get("duration", 0.0) or 0.0)
+    authoritative_dur = float(max(offsets[-1], stored_dur))
+    man_dur = cycle.get("manual_duration")
+    final_dur = float(man_dur) if man_dur else authoritative_dur
+    review = cycle.get("ml_review")
+    is_golden = bool(review.get("golden")) if isinstance(review, dict) else False
+    peak = max(values) if values else 0.0
+    return offsets, values, final_dur, is_golden, peak
+
+
+def _build_envelope(
+    labeled_cycles: list[CycleDict], dtw_bandwidth: float, logger: _Logger
+) -> tuple[Any, list[float], dict[str, Any]] | None:
+    """Parse a profile's cycles and build its envelope (worker side).
+
+    Degenerate cycles (a near-flat trace whose peak is a tiny fraction of the
+    profile's typical peak - e.g. a run where the power sensor wasn't
+    reporting) are excluded so they cannot pollute the envelope average that
+    the live matcher scores against, or drag ``avg_duration`` around.
+    User-pinned golden cycles are always kept.
+
+    Returns ``(bands, durations, incremental_state)``; the state is what
+    :func:`update_envelope_worker` needs to fold in one more cycle later.
+    """
+    # First pass: decompress everything and record each cycle's peak so we
+    # can judge degeneracy relative to the profile (works for both a 2000W
+    # dishwasher and a low-power pump).
+    parsed: list[EnvelopeCurve] = []
+    for cycle in labeled_cycles:
+        curve = _envelope_curve(cycle)
+        if curve is not None:
+            parsed.append(curve)
+
+    if not parsed:
+        return None
+
+    # Degeneracy floor: below max(_DEGENERATE_POWER_FLOOR, 10% of the median
+    # peak) a cycle is treated as a mis-capture and dropped (unless golden).
+    peaks = sorted(p[4] for p in parsed)
+    median_peak = peaks[len(peaks) // 2] if peaks else 0.0
+    degen_floor = max(_DEGENERATE_POWER_FLOOR, 0.10 * median_peak)
+
+    raw_cycles_data: list[tuple[list[float], list[float], float]] = []
+    durations: list[float] = []
+    golden_mask: list[bool] = []
+    dropped = 0
+    for offsets, values, final_dur, is_golden, peak in parsed:
+        if peak < degen_floor and not is_golden:
+            dropped += 1
+            continue
+        raw_cycles_data.append((offsets, values, final_dur))
+        durations.append(final_dur)
+        golden_mask.append(is_golden)
+
+    # Never drop everything: if the filter removed all cycles (e.g. a truly
+    # low-power profile misjudged), fall back to using them all.
+    if not raw_cycles_data:
+        for offsets, values, final_dur, is_golden, _peak in parsed:
+            raw_cycles_data.append((offsets, values, final_dur))
+            durations.append(final_dur)
+            golden_mask.append(is_golden)
+    elif dropped:
+        logger.debug(
+            "Envelope rebuild: excluded %d degenerate cycle(s) below %.0fW "
+            "(median peak %.0fW)", dropped, degen_floor, median_peak,
+        )
+
+    if not raw_cycles_data:
+        return None
+
+    # Run Heavy Computation. When the profile has user-verified "golden"
+    # cycles, they define the reference shape (see compute_envelope_worker).
+    stack = analysis.build_envelope_stack(
+        cast(Any, raw_cycles_data),
+        dtw_bandwidth,
+        reference_mask=golden_mask if any(golden_mask) else None,
+    )
+
+    if stack is None:
+        return None
+
+    state = {
+        "reference": [round(float(v), 1) for v in stack.reference],
+        "align_dt": stack.align_dt,
+        "count": int(stack.stacked.shape[0]),
+        "durations": durations,
+        "degenerate_floor": degen_floor,
+        "golden": any(golden_mask),
+        "updates": 0,
+    }
+    return stack.bands(), durations, state
+
+
+def update_envelope_worker(
+    job: tuple[dict[str, Any], CycleDict, float],
+) -> tuple[tuple[Any, list[float], dict[str, Any]] | None, bool]:
+    """Fold one new member cycle into a stored envelope (executor side).
+
+    ``job`` is ``(envelope, cycle, dtw_bandwidth)``. Returns
+    ``(result_pkg, needs_rebuild)`` where ``result_pkg`` has the same shape as
+    :func:`_build_envelope`'s; ``needs_rebuild`` is True when the cycle can't be
+    folded in (unusable trace, golden, degenerate), so the caller rebuilds.
+    """
+    envelope, cycle, dtw_bandwidth = job
+    state = envelope["incremental"]
+    curve = _envelope_curve(cycle)
+    if curve is None:
+        return None, True
+    offsets, values, final_dur, is_golden, peak = curve
+    if is_golden or peak < float(state.get("degenerate_floor", 0.0)):
+        return None, True
+    bands_in = {
+        "time_grid": envelope["time_grid"],
+        "reference": state["reference"],
+        "align_dt": state["align_dt"],
+        "count": state["count"],
+        **{k: [p[1] for p in envelope[k]] for k in ("min", "max", "avg", "std")},
+    }
+    updated = analysis.update_envelope_worker(bands_in, (offsets, values, final_dur), dtw_bandwidth)
+    if updated is None:
+        return None, True
+    min_c, max_c, avg_c, std_c, count = updated
+    durations = [*state["durations"], final_dur]
+    new_state = {
+        **state, "count": count, "durations": durations, "updates": int(state["updates"]) + 1,
+    }
+    bands = (
+        list(envelope["time_grid"]), min_c, max_c, avg_c, std_c,
+        float(envelope.get("target_duration") or 0.0),
+    )
+    return (bands, durations, new_state), False
+
+
+def _build_phase_profile(
+    profile_name: str, cycles: list[CycleDict], device_type: str, logger: _Logger
+) -> dict[str, Any] | None:
+    """Segment each member cycle and aggregate a per-role phase profile.
+
+    Returns a JSON-safe dict for ``envelope["phase_profile"]`` or ``None`` when
+    phase matching is not live-supported for this device type or no cycle could
+    be segmented. Never raises (phase support must never break envelope rebuild).
+    """
+    try:
+        if not phase_matching_live_supported(device_type):
+            return None
+        model = phase_model_for(device_type)
+        if model is None:
+            return None
+        segmented: list = []
+        for cycle in cycles:
+            offsets = power_data_to_offsets(cycle.get("power_data") or [])
+            if len(offsets) < 4:
+                continue
+            t = [float(o) for o, _ in offsets]
+            w = [float(p) for _, p in offsets]
+            segs = segment_cycle(t, w, model)
+            if segs:
+                segmented.append(segs)
+        if not segmented:
+            return None
+        profile = build_phase_profile(profile_name, segmented)
+        return phase_profile_to_dict(profile) if profile is not None else None
+    except Exception:  # noqa: BLE001 - phase caching must never break rebuild
+        logger.debug("phase-profile build failed for %s", profile_name, exc_info=True)
+        return None
+
+
+EnvelopeJob: TypeAlias = tuple[str, list[CycleDict], float, str, _Logger]
+
+
+def build_envelope_worker(
+    job: EnvelopeJob,
+) -> tuple[tuple[Any, list[float], dict[str, Any]] | None, dict[str, Any] | None]:
+    """Envelope + per-phase profile for one profile (executor / pool worker).
+
+    ``job`` is ``(profile_name, shape_cycles, dtw_bandwidth, device_type,
+    logger)``; returns ``(result_pkg, phase_profile)``. The phase profile is
+    only built when the envelope itself is usable, as before.
+    """
+    profile_name, cycles, dtw_bandwidth, device_type, logger = job
+    result_pkg = _build_envelope(cycles, dtw_bandwidth, logger)
+    phase_profile = None
+    if result_pkg and result_pkg[0]:
+        phase_profile = _build_phase_profile(profile_name, cycles, device_type, logger)
+    return result_pkg, phase_profile
+
+
+def _match_trace(
+    ts_arr: np.ndarray, p_arr: np.ndarray
+) -> tuple[list[float], float] | None:
+    """Resample a trace for matching: ``(power, used_dt)`` of its longest
+    segment, or None when there is too little of it to match."""
+    segments, used_dt = resample_adaptive(ts_arr, p_arr, min_dt=5.0, gap_s=21600.0)
+    if not segments:
+        return None
+    current_seg = max(segments, key=lambda s: len(s.power))
+    if len(current_seg.power) < 12:
+        return None
+    return current_seg.power.tolist(), used_dt
+
+
+def match_trace_worker(cycle: CycleDict) -> tuple[list[float], float] | None:
+    """Stored cycle -> resampled matching trace (pass 1 of ``auto_label_cycles``).
+
+    None means the cycle is skipped: too few points, or a trace the matcher
+    could not use (``async_match_profile`` returns an empty result for those).
+    """
+    try:
+        power_data = decompress_power_data(cycle)
+        if not power_data or len(power_data) < 10:
+            return None
+        ts_arr = np.array([float(x[0]) for x in power_data])
+        p_arr = np.array([float(x[1]) for x in power_data])
+        return _match_trace(ts_arr, p_arr)
+    except Exception:  # pylint: disable=broad-exception-caught
+        return None
+
+
+MatchJob: TypeAlias = tuple[list[float], float, list[dict[str, Any]], dict[str, Any]]
+
+
+def match_cycle_worker(job: MatchJob) -> list[dict[str, Any]]:
+    """``compute_matches_worker`` for one stored cycle (pass 2 of
+    ``auto_label_cycles``); ``job`` is ``(power, duration, snapshots, config)``.
+
+    The per-candidate copies of the current/sample traces are dropped: the
+    caller already holds them, and they would dominate the result payload.
+    """
+    current_power, duration, snapshots, config = job
+    candidates = analysis.compute_matches_worker(current_power, duration, snapshots, config)
+    return [
+        {k: v for k, v in c.items() if k not in ("current", "sample")}
+        for c in candidates
+    ]
+
+
 class WashDataStore(Store[JSONDict]):
     """Store implementation with migration support."""
 
@@ -828,6 +1268,14 @@ class WashDataStore(Store[JSONDict]):
             _LOGGER.info("Migrating storage from v%s to v11 (phase-profile cache marker)",
                          old_major_version)
 
+        if old_major_version < 12:
+            # Format marker only. Cycle traces now live in the columnar sidecar
+            # (trace_store.py) and the JSON keeps a ``power_ref`` per cycle. Traces
+            # that are still inline load exactly as before and are moved to the
+            # sidecar by the next save, so nothing is rewritten here.
+            _LOGGER.info("Migrating storage from v%s to v12 (columnar trace sidecar marker)",
+                         old_major_version)
+
         return old_data
 
 def _ambiguity_from_candidates(candidates: list[dict]) -> tuple[float, bool]:
@@ -1161,36 +1609,55 @@ def _usable_reference_pairs(points: Any) -> list[list[float]] | None:
     return pairs
 
 
-def _merge_list_dedup(base: list[Any], incoming: list[Any]) -> None:
-    """Append items from ``incoming`` to ``base`` in place, skipping duplicates.
+class ListDeduper:
+    """Appends items to a list in place, skipping ones it already holds.
 
     Dedupes by ``id`` when items carry one, else by a stable JSON signature so
-    re-importing the same log file is idempotent for id-less list entries.
+    re-importing the same log file is idempotent for id-less list entries. The
+    seen-sets are built once from ``base``, so items can be fed one at a time
+    (the streaming importer adds records as it reads them).
     """
-    seen_ids = {str(x.get("id")) for x in base if isinstance(x, dict) and x.get("id") is not None}
-    seen_sigs: set[str] = set()
-    for x in base:
-        try:
-            seen_sigs.add(json.dumps(x, sort_keys=True, default=str))
-        except (TypeError, ValueError):
-            pass
-    for item in incoming:
+
+    def __init__(self, base: list[Any]) -> None:
+        self.base = base
+        self._seen_ids = {
+            str(x.get("id")) for x in base if isinstance(x, dict) and x.get("id") is not None
+        }
+        self._seen_sigs: set[str] = set()
+        for x in base:
+            if isinstance(x, dict) and x.get("id") is not None:
+                continue  # id-keyed items never need a signature
+            try:
+                self._seen_sigs.add(json.dumps(x, sort_keys=True, default=str))
+            except (TypeError, ValueError):
+                pass
+
+    def add(self, item: Any) -> bool:
+        """Append ``item`` unless it is a duplicate; True when appended."""
         if isinstance(item, dict) and item.get("id") is not None:
             key = str(item.get("id"))
-            if key in seen_ids:
-                continue
-            seen_ids.add(key)
-            base.append(item)
-            continue
+            if key in self._seen_ids:
+                return False
+            self._seen_ids.add(key)
+            self.base.append(item)
+            return True
         try:
             sig = json.dumps(item, sort_keys=True, default=str)
         except (TypeError, ValueError):
             sig = None
         if sig is not None:
-            if sig in seen_sigs:
-                continue
-            seen_sigs.add(sig)
-        base.append(item)
+            if sig in self._seen_sigs:
+                return False
+            self._seen_sigs.add(sig)
+        self.base.append(item)
+        return True
+
+
+def _merge_list_dedup(base: list[Any], incoming: list[Any]) -> None:
+    """Append items from ``incoming`` to ``base`` in place, skipping duplicates."""
+    dedup = ListDeduper(base)
+    for item in incoming:
+        dedup.add(item)
 
 
 class ProfileStore:
@@ -1218,19 +1685,24 @@ class ProfileStore:
         self.dtw_bandwidth: float = DEFAULT_DTW_BANDWIDTH
         self._save_debug_traces = save_debug_traces
 
-        # Cache for resampled sample segments: key=(cycle_id, dt)
-        self._cached_sample_segments: dict[tuple[str, float], Segment] = {}
-        # Cache for group cohesion scores to avoid re-running DTW on the event loop
-        # every 5 minutes.  Keyed by sorted-members tuple; invalidated when profile_groups
-        # content changes (tracked by a simple generation counter).
-        self._cohesion_cache: dict[tuple[str, ...], float] = {}
-        self._cohesion_cache_generation: int = 0
-        self._cohesion_cache_generation_checked: int = -1
+        # Per-profile matching templates, maintained incrementally (match_index.py).
+        self._match_index = MatchIndex(self._logger)
+        # Profile/status/review/date indexes over past_cycles for paged queries
+        # (cycle_index.py), invalidated alongside the match index.
+        self._cycle_index = CycleIndex(_parse_start_dt)
+        # Live-cycle matching state: the Stage-2 alignment sums carried between
+        # periodic re-matches.
+        self._live_stream = analysis.AlignmentStream()
+        # Bounded cache of data derived from the store (decompressed traces, parsed
+        # phase profiles, profile curves, group cohesion, reference curves) - see
+        # derived_cache.py.  Invalidated per cycle/profile/groups via _derived.bump
+        # from the journal markers and group mutations.
+        self._derived = DerivedCache(DEFAULT_DERIVED_CACHE_MAX_KB * 1024)
         # group_cohesion runs in executor threads (live matching + Playground can
-        # touch the same store concurrently); serialize the read-clear-compute-store
-        # sequence so a concurrent call can't clear a half-populated cache or
-        # duplicate the DTW work.  A plain thread lock, never held across an await.
-        self._cohesion_cache_lock = threading.Lock()
+        # touch the same store concurrently); serialize the compute so concurrent
+        # callers don't duplicate the DTW work.  A plain thread lock, never held
+        # across an await.
+        self._cohesion_lock = threading.Lock()
         # Profile duration tolerance (set by manager; reserved for duration-based heuristics)
         self._duration_tolerance: float = 0.25
         # Retention policy: cap total cycles and number of full-resolution traces per profile
@@ -1242,7 +1714,21 @@ class ProfileStore:
         self._store: Store[JSONDict] = WashDataStore(
             hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry_id}"
         )
-        self._data: JSONDict = {
+        # Columnar sidecar for cycle traces. _trace_refs maps (section, cycle_id) to
+        # (power_data list persisted, its record ref, record size in bytes); the list
+        # is compared by identity on save so only new/replaced traces are written.
+        self._traces = CycleTraceStore(self._store.path)
+        self._trace_refs: dict[tuple[str, str], tuple[list[Any], TraceRef, int]] = {}
+        self._persist_lock = asyncio.Lock()
+        # Append-only mutation journal between full snapshots (store_journal.py).
+        self._journal = StoreJournal(self._store.path)
+        self._journal_epoch = 0
+        self._dirty_cycles: set[tuple[str, str]] = set()
+        self._dirty_envelopes: set[str] = set()
+        self._journal_needs_snapshot = False
+        self._snapshot_bytes = 0
+        self._loaded = False
+        self._data = StoreDocument({
             "profiles": {},
             "past_cycles": [],
             "reference_cycles": [],  # Imported store cycles: envelope/matcher only, never usage stats
@@ -1255,7 +1741,7 @@ class ProfileStore:
             "ml_model_versions": {},  # On-device trained model specs (Stage 4)
             "profile_groups": {},  # Named groups of near-duplicate profiles (Stage 5)
             "maintenance_log": [],  # User-logged maintenance events (Group E)
-        }
+        })
 
 
 
@@ -1288,6 +1774,7 @@ class ProfileStore:
         if reason_params is not None:
             entry["reason_params"] = reason_params
         suggestions[key] = entry
+        self._journal_key("suggestions")
 
     def get_suggestions(self) -> dict[str, Any]:
         """Return current suggestion map."""
@@ -1301,6 +1788,7 @@ class ProfileStore:
         """Remove a single suggestion entry by key."""
         suggestions: JSONDict = self._data.setdefault("suggestions", {})
         suggestions.pop(key, None)
+        self._journal_key("suggestions")
 
     async def clear_suggestions(self) -> None:
         """Clear all pending suggestions and persist."""
@@ -1390,6 +1878,7 @@ class ProfileStore:
         """Persist a trained model record for a capability (quality/live_match/end)."""
         versions: JSONDict = self._data.setdefault("ml_model_versions", {})
         versions[capability] = record
+        self._journal_key("ml_model_versions")
         await self.async_save()
 
     async def clear_ml_model_versions(self) -> None:
@@ -1453,6 +1942,7 @@ class ProfileStore:
             del series[:-ML_TRAINING_HISTORY_MAX]
             changed = True
         if changed:
+            self._journal_key("ml_training_history")
             await self.async_save()
 
     # ─── On-device matching-config tuning (Stage 4/5, opt-in) ──────────────────
@@ -1538,6 +2028,7 @@ class ProfileStore:
             review["notes"] = notes
         review["reviewed_at"] = dt_util.now().isoformat()
         cycle["ml_review"] = review
+        self._journal_cycle(cycle)
         # Golden cycles seed the profile's matching reference/envelope. When the
         # golden flag actually flips (either direction), rebuild the affected
         # profile so its envelope + reference cycle + cohesion cache reflect the
@@ -1547,7 +2038,7 @@ class ProfileStore:
         profile_name = cycle.get("profile_name")
         if golden_changed and isinstance(profile_name, str) and profile_name:
             await self.async_rebuild_envelope(profile_name)
-        await self.async_save()
+        await self.async_save_changes()
         # Don't log the full review (notes/tags are user-entered) — only field names.
         _changed = [
             n for n, v in (("quality", quality), ("golden", golden), ("tags", tags), ("notes", notes))
@@ -1594,14 +2085,20 @@ class ProfileStore:
         return flagged
 
     def get_feedback_history(self) -> dict[str, dict[str, Any]]:
-        """Return mutable feedback history mapping (cycle_id -> record)."""
+        """Return mutable feedback history mapping (cycle_id -> record).
+
+        Callers that edit it persist with :meth:`async_save` (a full snapshot).
+        """
         raw = self._data.setdefault("feedback_history", {})
         if isinstance(raw, dict):
             return cast(dict[str, dict[str, Any]], raw)
         return {}
 
     def get_pending_feedback(self) -> dict[str, dict[str, Any]]:
-        """Return mutable pending feedback mapping (cycle_id -> request)."""
+        """Return mutable pending feedback mapping (cycle_id -> request).
+
+        Callers that edit it persist with :meth:`async_save` (a full snapshot).
+        """
         raw = self._data.setdefault("pending_feedback", {})
         if isinstance(raw, dict):
             return cast(dict[str, dict[str, Any]], raw)
@@ -1611,6 +2108,7 @@ class ProfileStore:
         """Add a pending feedback request (sync wrapper, does not save immediately)."""
         feedbacks = self.get_pending_feedback()
         feedbacks[cycle_id] = request_data
+        self._journal_key("pending_feedback")
         # Caller must ensure save is called eventually
 
     def prune_orphaned_feedback(self) -> int:
@@ -1629,6 +2127,8 @@ class ProfileStore:
             orphans = [cid for cid in list(pending) if cid not in live_ids]
             for cid in orphans:
                 pending.pop(cid, None)
+            if orphans:
+                self._journal_key("pending_feedback")
             return len(orphans)
         except Exception:  # noqa: BLE001
             return 0
@@ -1641,7 +2141,11 @@ class ProfileStore:
         return next((p for p in all_profiles if p["name"] == name), None)
 
     def get_profiles(self) -> dict[str, JSONDict]:
-        """Return mutable profiles mapping (profile_name -> profile data)."""
+        """Return mutable profiles mapping (profile_name -> profile data).
+
+        Edits must be marked with ``_journal_key("profiles")`` (or saved with
+        :meth:`async_save`).
+        """
         raw = self._data.setdefault("profiles", {})
         if isinstance(raw, dict):
             return cast(dict[str, JSONDict], raw)
@@ -1654,6 +2158,51 @@ class ProfileStore:
             return cast(list[CycleDict], raw)
         return []
 
+    def cycles_for_profile(self, profile_name: str) -> list[CycleDict]:
+        """Stored cycles labeled ``profile_name``, oldest first (indexed lookup)."""
+        return cast(
+            list[CycleDict],
+            self._cycle_index.cycles_for_profile(self.get_past_cycles(), profile_name),
+        )
+
+    def query_cycles(
+        self,
+        *,
+        profile_name: Any = ANY,
+        status: str | None = None,
+        review: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        sort: str = "recorded",
+        descending: bool = True,
+        cursor: str | None = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> CyclePage:
+        """One filtered, sorted page of ``past_cycles`` (see cycle_index.py).
+
+        Returns the stored cycle dicts themselves (callers project/copy them);
+        ``power_data`` is not read. Raises ``ValueError`` for a bad sort key,
+        review state or cursor.
+        """
+        return self._cycle_index.query(
+            self.get_past_cycles(),
+            profile_name=profile_name,
+            status=status,
+            review=review,
+            since=since,
+            until=until,
+            sort=sort,
+            descending=descending,
+            cursor=cursor,
+            offset=offset,
+            limit=limit,
+        )
+
+    def cycle_counts(self) -> dict[str, dict[str, int]]:
+        """Cycle counts per profile, status and review state."""
+        return self._cycle_index.counts(self.get_past_cycles())
+
     # ── Community-store account (connect handoff) ─────────────────────────────
     def get_store_account(self) -> dict[str, Any]:
         """Full persisted store account incl. the refresh token (credential)."""
@@ -1772,6 +2321,7 @@ class ProfileStore:
         profiles = self._data.setdefault("profiles", {})
         if profile_name not in profiles:
             profiles[profile_name] = {"avg_duration": duration}
+            self._journal_key("profiles")
         self._add_cycle_data(cycle, target=self._data.setdefault("reference_cycles", []), id_pool=id_pool)
         return str(cycle.get("id", ""))
 
@@ -1812,7 +2362,10 @@ class ProfileStore:
         profiles = self.get_profiles()
         for g in raw.values():
             if isinstance(g, dict) and isinstance(g.get("members"), list):
-                g["members"] = [m for m in g["members"] if m in profiles]
+                members = [m for m in g["members"] if m in profiles]
+                if len(members) != len(g["members"]):
+                    g["members"] = members
+                    self._journal_key("profile_groups")
         return cast(dict[str, JSONDict], raw)
 
     def _members_in_other_groups(self, members: list[str], exclude: str | None) -> dict[str, str]:
@@ -1842,7 +2395,8 @@ class ProfileStore:
             )
         groups = self.get_profile_groups()
         groups[name] = {"members": members, "created_at": dt_util.now().isoformat()}
-        self._cohesion_cache_generation += 1
+        self._derived.bump("groups")
+        self._journal_key("profile_groups")
         await self.async_save()
         self._logger.info("Created profile group %r with %d members", name, len(members))
         return True
@@ -1864,7 +2418,8 @@ class ProfileStore:
             groups[name]["members"] = members
         else:
             groups.pop(name, None)
-        self._cohesion_cache_generation += 1
+        self._derived.bump("groups")
+        self._journal_key("profile_groups")
         await self.async_save()
         return True
 
@@ -1877,7 +2432,8 @@ class ProfileStore:
             if new_name in groups:
                 raise ValueError(f"A group named {new_name!r} already exists")
             groups[new_name] = groups.pop(name)
-        self._cohesion_cache_generation += 1
+        self._derived.bump("groups")
+        self._journal_key("profile_groups")
         await self.async_save()
         return True
 
@@ -1885,21 +2441,31 @@ class ProfileStore:
         groups = self.get_profile_groups()
         if groups.pop(name, None) is None:
             return False
-        self._cohesion_cache_generation += 1
+        self._derived.bump("groups")
+        self._journal_key("profile_groups")
         await self.async_save()
         self._logger.info("Deleted profile group %r", name)
         return True
 
     def _profile_curve(self, name: str, n: int = 150) -> np.ndarray | None:
-        """A profile's envelope average resampled to n points, or None."""
+        """A profile's envelope average resampled to n points, or None.
+
+        Cached per envelope object; treat the returned array as read-only.
+        """
         env = self._data.get("envelopes", {}).get(name) if isinstance(self._data.get("envelopes"), dict) else None
-        avg = env.get("avg") if isinstance(env, dict) else None
-        if not avg or not isinstance(avg[0], (list, tuple)):
-            return None
-        ys = np.asarray([float(p[1]) for p in avg], dtype=float)
-        if ys.size < 4:
-            return None
-        return np.interp(np.linspace(0, 1, n), np.linspace(0, 1, ys.size), ys)
+
+        def _build() -> np.ndarray | None:
+            avg = env.get("avg") if isinstance(env, dict) else None
+            if not avg or not isinstance(avg[0], (list, tuple)):
+                return None
+            ys = np.asarray([float(p[1]) for p in avg], dtype=float)
+            if ys.size < 4:
+                return None
+            return np.interp(np.linspace(0, 1, n), np.linspace(0, 1, ys.size), ys)
+
+        return self._derived.get_or_build(
+            ("profile_curve", name, n), (("profile", name),), _build, source=env
+        )
 
     @staticmethod
     def _shape_similarity(a: np.ndarray, b: np.ndarray) -> float:
@@ -1925,17 +2491,17 @@ class ProfileStore:
         unrelated profiles - the matcher refuses to aggregate below
         GROUP_MIN_COHESION and the UI warns the user.
 
-        Results are cached per member-set and invalidated via
-        ``_cohesion_cache_generation`` (incremented by group mutation methods) so
-        the DTW pairwise comparison does not run on the event loop every 5 minutes.
+        Results are cached per member-set in the derived cache and invalidated
+        when a member's envelope is rebuilt or a group is mutated, so the DTW
+        pairwise comparison does not run on the event loop every 5 minutes.
         """
-        key = tuple(sorted(members))
-        with self._cohesion_cache_lock:
-            if self._cohesion_cache_generation != self._cohesion_cache_generation_checked:
-                self._cohesion_cache.clear()
-                self._cohesion_cache_generation_checked = self._cohesion_cache_generation
-            if key in self._cohesion_cache:
-                return self._cohesion_cache[key]
+        key = ("cohesion",) + tuple(sorted(members))
+        tags = ("groups",) + tuple(("profile", m) for m in key[1:])
+        with self._cohesion_lock:
+            hit, cached = self._derived.get(key)
+            if hit:
+                return cached
+            stamp = self._derived.stamp(tags)
             curves = [c for c in (self._profile_curve(m) for m in members) if c is not None]
             if len(members) < 2:
                 # A genuinely single-member group is trivially cohesive (and is never
@@ -1950,7 +2516,7 @@ class ProfileStore:
                 for i in range(len(curves)):
                     for j in range(i + 1, len(curves)):
                         result = min(result, self._shape_similarity(curves[i], curves[j]))
-            self._cohesion_cache[key] = result
+            self._derived.put(key, result, stamp)
             return result
 
     def _grouped_snapshots(
@@ -2122,8 +2688,8 @@ class ProfileStore:
         try:
             durations = [
                 float(c["duration"])
-                for c in self.get_past_cycles()
-                if c.get("profile_name") == profile_name and c.get("duration")
+                for c in self.cycles_for_profile(profile_name)
+                if c.get("duration")
             ]
             return float(np.median(durations)) if len(durations) >= 2 else None
         except Exception:  # noqa: BLE001
@@ -2138,8 +2704,8 @@ class ProfileStore:
         try:
             energies = [
                 float(c["energy_wh"])
-                for c in self.get_past_cycles()
-                if c.get("profile_name") == profile_name and c.get("energy_wh")
+                for c in self.cycles_for_profile(profile_name)
+                if c.get("energy_wh")
             ]
             if len(energies) < 3:
                 return None
@@ -2155,7 +2721,7 @@ class ProfileStore:
     def get_profile_labeled_count(self, profile_name: str) -> int:
         """Number of labeled cycles for this profile. Never raises."""
         try:
-            return sum(1 for c in self.get_past_cycles() if c.get("profile_name") == profile_name)
+            return len(self.cycles_for_profile(profile_name))
         except Exception:  # noqa: BLE001
             return 0
 
@@ -2198,7 +2764,7 @@ class ProfileStore:
             return
         base = self.get_lifetime_energy_wh()
         self._data["lifetime_energy_wh"] = round(base + add, 3)
-        await self.async_save()
+        await self.async_save_changes()
 
     def get_lifetime_cycle_count(self) -> int:
         """Persisted monotonic lifetime completed-cycle count.
@@ -2271,6 +2837,7 @@ class ProfileStore:
             log = []
             self._data["maintenance_log"] = log
         log.append(entry)
+        self._journal_key("maintenance_log")
         await self.async_save()
         return entry
 
@@ -2900,6 +3467,7 @@ class ProfileStore:
         # Trim to the most recent N snapshots.
         if len(history) > MATCH_RANKING_HISTORY_MAX:
             del history[: len(history) - MATCH_RANKING_HISTORY_MAX]
+        self._journal_key("match_ranking_history")
 
     def confirm_match_ranking_snapshots(
         self,
@@ -2933,6 +3501,8 @@ class ProfileStore:
                 if snap.get("start_time_iso") == start_time_iso:
                     snap["confirmed_label"] = str(confirmed_label)
                     updated += 1
+        if updated:
+            self._journal_key("match_ranking_history")
         return updated
 
     def get_match_ranking_history(self) -> list[dict[str, Any]]:
@@ -3032,6 +3602,7 @@ class ProfileStore:
                 "created_at": dt_util.now().isoformat(),
             }
         )
+        self._journal_key("custom_phases")
         await self.async_save()
 
     async def async_update_custom_phase(
@@ -3097,6 +3668,7 @@ class ProfileStore:
                 if str(assigned.get("name", "")).casefold() == old_name.casefold():
                     assigned["name"] = target_name
 
+        self._journal_key("custom_phases", "profiles")
         await self.async_save()
 
     async def async_delete_custom_phase(self, phase_id: str) -> int:
@@ -3133,6 +3705,7 @@ class ProfileStore:
             ]
             removed_assignments += before - len(profile["phases"])
 
+        self._journal_key("profiles")
         await self.async_save()
         return removed_assignments
 
@@ -3219,6 +3792,7 @@ class ProfileStore:
             prev_end = row["end"]
 
         profile["phases"] = normalized
+        self._journal_key("profiles")
         await self.async_save()
 
     def set_duration_tolerance(self, tolerance: float) -> None:
@@ -3243,6 +3817,20 @@ class ProfileStore:
         except (TypeError, ValueError):
             pass
 
+    def set_derived_cache_limit(self, max_bytes: int) -> None:
+        """Set the memory ceiling of the derived-data cache (0 disables it)."""
+        try:
+            self._derived.set_max_bytes(int(max_bytes))
+        except (TypeError, ValueError):
+            pass
+
+    def derived_cache_stats(self) -> dict[str, Any]:
+        """Derived-data cache and match-index counters, for diagnostics."""
+        return {
+            "derived_cache": self._derived.stats(),
+            "match_index": self._match_index.stats(),
+        }
+
     def get_duration_ratio_limits(self) -> tuple[float, float]:
         """Return (min_duration_ratio, max_duration_ratio) used for duration matching."""
         return (float(self._min_duration_ratio), float(self._max_duration_ratio))
@@ -3278,6 +3866,8 @@ class ProfileStore:
                     break
             phase["id"] = matched_id if matched_id else str(uuid.uuid4())
             changed = True
+        if changed:
+            self._journal_key("custom_phases")
         return changed
 
     async def async_load(self) -> None:
@@ -3285,7 +3875,11 @@ class ProfileStore:
         # WashDataStore handles migration internally via _async_migrate_func
         data = await self._store.async_load()
         if data:
-            self._data = data
+            self._data = StoreDocument(data)
+        await self._async_replay_journal()
+        await self._async_load_traces()
+        self._data.dirty.clear()  # the loaded state is what is on disk
+        self._loaded = True
         # Ensure legacy custom phase formats are normalized in-memory.
         self._get_shared_custom_phases()
         # Assign ids to any custom phase missing one.
@@ -3376,10 +3970,12 @@ class ProfileStore:
             profile["sample_cycle_id"] = chosen.get("id")
             if chosen.get("duration"):
                 profile["avg_duration"] = chosen["duration"]
+            self._journal_key("profiles")
 
             # If chosen cycle is unlabeled, label it to this profile to bootstrap matching
             if not chosen.get("profile_name"):
                 chosen["profile_name"] = profile_name
+                self._journal_cycle(chosen)
                 stats["cycles_labeled_as_sample"] += 1
 
             stats["profiles_repaired"] += 1
@@ -3390,15 +3986,362 @@ class ProfileStore:
 
         return stats
 
+    async def _async_replay_journal(self) -> None:
+        """Apply journal records written since the loaded snapshot."""
+        epoch = 0
+        with contextlib.suppress(TypeError, ValueError):
+            epoch = int(self._data.pop("journal_epoch", 0) or 0)
+
+        def _read() -> tuple[list[dict[str, Any]], int]:
+            return (
+                self._journal.read(epoch),
+                int(_safe_file_size_kb(self._store.path) * 1024),
+            )
+
+        ops, self._snapshot_bytes = await self.hass.async_add_executor_job(_read)
+        self._journal_epoch = epoch
+        if ops:
+            applied = apply_ops(self._data, ops)
+            self._logger.debug("Replayed %s journal record(s) onto the snapshot", applied)
+
+    async def _async_load_traces(self) -> None:
+        """Hydrate ``power_data`` of cycles whose trace lives in the sidecar.
+
+        The sidecar is read (mmap + ``np.frombuffer``) in the executor; only the
+        resulting lists are attached to the cycle dicts here. A trace that cannot
+        be read leaves its cycle without ``power_data`` - the same shape as a
+        retention-stripped cycle, which every consumer already handles.
+        """
+        meta = self._data.pop("trace_store", None)
+        generation = 0
+        if isinstance(meta, dict):
+            with contextlib.suppress(TypeError, ValueError):
+                generation = int(meta.get("generation", 0))
+
+        wanted: list[tuple[tuple[str, str], str, TraceRef]] = []
+        by_key: dict[tuple[str, str], tuple[CycleDict, TraceRef]] = {}
+        for section in _TRACE_SECTIONS:
+            seq = self._data.get(section)
+            if not isinstance(seq, list):
+                continue
+            for cycle in seq:
+                if not isinstance(cycle, dict):
+                    continue
+                ref = cycle.pop("power_ref", None)
+                cid = cycle.get("id")
+                if ref is None or not isinstance(cid, str) or cycle.get("power_data"):
+                    continue
+                key = (section, cid)
+                by_key[key] = (cycle, ref)
+                wanted.append((key, cid, ref))
+
+        def _read() -> dict[tuple[str, str], tuple[list[list[float]], int]]:
+            loaded = self._traces.read_traces(generation, wanted)
+            self._traces.remove_stale()
+            return loaded
+
+        loaded = await self.hass.async_add_executor_job(_read)
+        self._trace_refs = {}
+        for key, (pairs, size) in loaded.items():
+            cycle, ref = by_key[key]
+            cycle["power_data"] = pairs
+            self._trace_refs[key] = (pairs, ref, size)
+
+    def _find_cycles(
+        self, keys: set[tuple[str, str]]
+    ) -> tuple[dict[tuple[str, str], CycleDict], bool]:
+        """Resolve ``(section, id)`` keys to live cycle dicts.
+
+        Returns ``(found, ambiguous)``; ``ambiguous`` is True when one of the ids
+        occurs more than once in its section (only a snapshot can persist that).
+        """
+        wanted: dict[str, set[str]] = {}
+        for section, cid in keys:
+            wanted.setdefault(section, set()).add(cid)
+        found: dict[tuple[str, str], CycleDict] = {}
+        ambiguous = False
+        for section, ids in wanted.items():
+            seq = self._data.get(section)
+            if not isinstance(seq, list):
+                continue
+            for cycle in seq:
+                if not isinstance(cycle, dict) or cycle.get("id") not in ids:
+                    continue
+                key = (section, cycle["id"])
+                if key in found:
+                    ambiguous = True
+                    continue
+                found[key] = cycle
+        return found, ambiguous
+
+    async def _async_write_traces(
+        self,
+        live: dict[tuple[str, str], tuple[str, list[Any]]],
+        *,
+        compact: bool = False,
+    ) -> None:
+        """Persist the traces in ``live`` that are not in the sidecar yet.
+
+        Only traces whose ``power_data`` list is not the one already persisted are
+        encoded and appended, so the cost is O(changed traces). With ``compact``
+        every trace in ``live`` is written into a fresh sidecar generation and the
+        refs are replaced wholesale.
+        """
+        if compact:
+            to_write = [(key, cid, pdata) for key, (cid, pdata) in live.items()]
+        else:
+            to_write = []
+            for key, (cid, pdata) in live.items():
+                known = self._trace_refs.get(key)
+                if known is None or known[0] is not pdata:
+                    to_write.append((key, cid, pdata))
+        if not to_write and not compact:
+            return
+
+        def _write() -> dict[tuple[str, str], tuple[list[Any], TraceRef, int]]:
+            blobs: list[tuple[tuple[str, str], bytes]] = []
+            lists: dict[tuple[str, str], list[Any]] = {}
+            for key, cid, pdata in to_write:
+                blob = encode_trace(cid, pdata)
+                if blob is not None:
+                    blobs.append((key, blob))
+                    lists[key] = pdata
+            if compact:
+                positions = self._traces.write_generation(self._traces.generation + 1, blobs)
+            elif blobs:
+                positions = self._traces.append(blobs)
+            else:
+                positions = {}
+            sizes = {key: len(blob) for key, blob in blobs}
+            return {
+                key: (lists[key], [pos, len(lists[key])], sizes[key])
+                for key, pos in positions.items()
+            }
+
+        written = await self.hass.async_add_executor_job(_write)
+        if compact:
+            self._trace_refs = written
+        else:
+            self._trace_refs.update(written)
+
+    def _persisted_cycle(self, section: str, cycle: Any) -> Any:
+        """The form a cycle is written in: ``power_ref`` instead of ``power_data``.
+
+        A cycle whose current trace is not the one in the sidecar (legacy format,
+        or replaced while a write was running) is returned as-is and stays inline
+        until the next save picks it up.
+        """
+        cid = cycle.get("id") if isinstance(cycle, dict) else None
+        persisted = self._trace_refs.get((section, cid)) if isinstance(cid, str) else None
+        if persisted is None or persisted[0] is not cycle.get("power_data"):
+            return cycle
+        stripped = {k: v for k, v in cycle.items() if k != "power_data"}
+        stripped["power_ref"] = persisted[1]
+        return stripped
+
+    def _journal_key(self, *keys: str) -> None:
+        """Mark top-level keys whose value was edited in place.
+
+        The store document marks keys that are assigned or removed by itself
+        (see ``StoreDocument``), but not edits inside a value: changing a
+        profile field, appending to a log or popping a pending-feedback entry
+        must be followed by this call, or :meth:`async_save_changes` leaves the
+        edit to the next full snapshot. Cycles and envelopes are marked with
+        :meth:`_journal_cycle` / :meth:`_journal_envelope` instead.
+        """
+        self._data.dirty.update(keys)
+
+    def _journal_cycle(self, cycle: Any, section: str = "past_cycles") -> None:
+        """Mark a cycle (dict or id) as added, changed or removed.
+
+        Marked cycles are what :meth:`async_save_changes` journals. A cycle
+        without an id cannot be journaled, so it forces the next save to be a
+        full snapshot instead.
+        """
+        cid = cycle.get("id") if isinstance(cycle, dict) else cycle
+        self._match_index.note_cycle(cid if isinstance(cid, str) else None)
+        self._cycle_index.invalidate()
+        if isinstance(cid, str) and cid:
+            self._derived.bump(("cycle", cid))
+            self._dirty_cycles.add((section, cid))
+        else:
+            self._journal_needs_snapshot = True
+
+    def _journal_envelope(self, profile_name: str) -> None:
+        """Mark a profile's envelope as rebuilt or removed."""
+        self._match_index.note_profile(profile_name)
+        self._derived.bump(("profile", profile_name))
+        self._dirty_envelopes.add(profile_name)
+
     async def async_save(self) -> None:
-        """Save data to storage."""
-        await self._store.async_save(self._data)
+        """Save a full snapshot to storage.
+
+        Traces go to the columnar sidecar first, then the metadata-only JSON
+        snapshot that references them is written, and the mutation journal is
+        folded in (emptied). Serialised with :meth:`async_save_changes` so sidecar
+        and journal writes can never interleave.
+
+        Full saves follow bulk and unmarked edits, so the match index resyncs
+        its cycle tables before the next match.
+        """
+        self._match_index.invalidate()
+        self._cycle_index.invalidate()
+        async with self._persist_lock:
+            await self._async_save_snapshot_locked()
+
+    async def _async_save_snapshot_locked(self) -> None:
+        live: dict[tuple[str, str], tuple[str, list[Any]]] = {}
+        for section in _TRACE_SECTIONS:
+            seq = self._data.get(section)
+            if not isinstance(seq, list):
+                continue
+            for cycle in seq:
+                if not isinstance(cycle, dict):
+                    continue
+                cid = cycle.get("id")
+                pdata = cycle.get("power_data")
+                if not isinstance(cid, str) or not cid or not isinstance(pdata, list) or not pdata:
+                    continue
+                key = (section, cid)
+                if key not in live:  # duplicate id: the later copy stays inline
+                    live[key] = (cid, pdata)
+
+        self._trace_refs = {
+            k: v for k, v in self._trace_refs.items() if k in live and v[0] is live[k][1]
+        }
+        live_bytes = sum(size for _, _, size in self._trace_refs.values())
+        file_size = self._traces.file_size
+        compact = (
+            file_size >= COMPACT_MIN_BYTES
+            and file_size - live_bytes > file_size * COMPACT_GARBAGE_RATIO
+        )
+        generation = self._traces.generation
+        await self._async_write_traces(live, compact=compact)
+
+        # Everything below up to the store write runs without yielding, so the
+        # snapshot, the dirty-set reset and the key baseline describe one state.
+        snapshot = dict(self._data)
+        for section in _TRACE_SECTIONS:
+            seq = self._data.get(section)
+            if isinstance(seq, list):
+                snapshot[section] = [self._persisted_cycle(section, c) for c in seq]
+        epoch = self._journal_epoch + 1
+        snapshot["trace_store"] = {"generation": self._traces.generation}
+        snapshot["journal_epoch"] = epoch
+        self._dirty_cycles = set()
+        self._dirty_envelopes = set()
+        self._data.dirty = set()
+        self._journal_needs_snapshot = True  # until the write below succeeds
+
+        await self._store.async_save(snapshot)
+        self._journal_epoch = epoch
+        self._journal_needs_snapshot = False
+
+        def _after_snapshot() -> int:
+            self._journal.truncate()
+            if self._traces.generation != generation:
+                # The snapshot now points at the compacted generation.
+                self._traces.remove_stale()
+            return int(_safe_file_size_kb(self._store.path) * 1024)
+
+        self._snapshot_bytes = await self.hass.async_add_executor_job(_after_snapshot)
+
+    async def async_save_changes(self) -> None:
+        """Persist only what changed since the last save, as journal records.
+
+        Cost is O(change): marked cycles (:meth:`_journal_cycle`) and envelopes
+        (:meth:`_journal_envelope`) are written as whole-record upserts/deletes,
+        plus every other top-level key (profiles, counters, feedback, the active
+        cycle, ...) marked dirty since the last save (:meth:`_journal_key`).
+        Falls back to a full :meth:`async_save` when the journal has outgrown
+        the snapshot, the trace sidecar needs compacting, or a change could not
+        be journaled. Callers must mark everything they touched; anything
+        unmarked is persisted by the next snapshot.
+        """
+        async with self._persist_lock:
+            dirty = set(self._dirty_cycles)
+            found, ambiguous = self._find_cycles(dirty)
+            file_size = self._traces.file_size
+            if (
+                not self._loaded
+                or self._journal_needs_snapshot
+                or ambiguous
+                or self._journal.size > max(JOURNAL_COMPACT_MIN_BYTES, self._snapshot_bytes)
+                or (
+                    file_size >= COMPACT_MIN_BYTES
+                    and self._trace_garbage_bytes() > file_size * COMPACT_GARBAGE_RATIO
+                )
+            ):
+                await self._async_save_snapshot_locked()
+                return
+
+            self._dirty_cycles.difference_update(dirty)
+            envelopes = set(self._dirty_envelopes)
+            self._dirty_envelopes.difference_update(envelopes)
+
+            live: dict[tuple[str, str], tuple[str, list[Any]]] = {}
+            for key in dirty:
+                cycle = found.get(key)
+                pdata = cycle.get("power_data") if cycle is not None else None
+                if isinstance(pdata, list) and pdata:
+                    live[key] = (key[1], pdata)
+                else:
+                    self._trace_refs.pop(key, None)
+            try:
+                await self._async_write_traces(live)
+
+                # Re-resolve after the await: a cycle may have changed meanwhile.
+                found, _ = self._find_cycles(dirty)
+                epoch = self._journal_epoch
+                lines: list[bytes] = []
+                for section, cid in sorted(dirty):
+                    cycle = found.get((section, cid))
+                    lines.append(encode_op({
+                        "e": epoch, "op": "cycle", "s": section, "id": cid,
+                        "v": None if cycle is None else self._persisted_cycle(section, cycle),
+                    }))
+                all_envelopes = self._data.get("envelopes") or {}
+                for name in sorted(envelopes):
+                    lines.append(encode_op(
+                        {"e": epoch, "op": "env", "k": name, "v": all_envelopes.get(name)}
+                    ))
+                keys = self._data.dirty - _JOURNAL_RECORD_KEYS
+                self._data.dirty = set()
+                for key in sorted(keys):
+                    if key in self._data:
+                        lines.append(encode_op(
+                            {"e": epoch, "op": "key", "k": key, "v": self._data[key]}
+                        ))
+                    else:
+                        lines.append(encode_op({"e": epoch, "op": "del_key", "k": key}))
+                if lines:
+                    await self.hass.async_add_executor_job(
+                        self._journal.append, b"".join(lines)
+                    )
+            except Exception:
+                # The on-disk state is unknown now; the next save must be full.
+                self._journal_needs_snapshot = True
+                raise
+
+    def _trace_garbage_bytes(self) -> int:
+        live_bytes = sum(size for _, _, size in self._trace_refs.values())
+        return max(0, self._traces.file_size - live_bytes)
+
+    async def async_flush(self) -> None:
+        """Fold any journaled changes into a snapshot (called on unload)."""
+        if self._loaded and (
+            self._journal.size
+            or self._dirty_cycles
+            or self._dirty_envelopes
+            or self._data.dirty
+        ):
+            await self.async_save()
 
     async def async_save_active_cycle(self, detector_snapshot: JSONDict) -> None:
         """Save the active cycle state to storage (throttled by Manager)."""
         self._data["active_cycle"] = detector_snapshot
         self._data["last_active_save"] = dt_util.now().isoformat()
-        await self._store.async_save(self._data)
+        await self.async_save_changes()
 
     def get_active_cycle(self) -> JSONDict | None:
         """Get the saved active cycle."""
@@ -3421,7 +4364,7 @@ class ProfileStore:
         """Clear the active cycle snapshot from storage."""
         if "active_cycle" in self._data:
             del self._data["active_cycle"]
-            await self._store.async_save(self._data)
+            await self.async_save_changes()
 
     def add_cycle(self, cycle_data: CycleDict) -> None:
         """Add a completed cycle to history (sync wrapper, schedules async tasks)."""
@@ -3452,6 +4395,7 @@ class ProfileStore:
         mutated in place with the newly-minted id.
         """
         dest = self._data["past_cycles"] if target is None else target
+        section = next((name for name in _TRACE_SECTIONS if self._data.get(name) is dest), None)
         # Generate SHA256 ID — dedup suffix avoids collisions when two cycles share
         # an identical raw start_time + duration (e.g. bulk reference-cycle imports).
         existing_ids = id_pool if id_pool is not None else {c.get("id") for c in dest if isinstance(c, dict)}
@@ -3508,6 +4452,8 @@ class ProfileStore:
                 if hasattr(self, "_save_debug_traces") and not self._save_debug_traces:
                     cycle_data.pop("debug_data", None)
                 dest.append(cycle_data)
+                if section:
+                    self._journal_cycle(cycle_data, section)
                 return
 
             # Use unified normalizer: handles offset, ISO-string, and datetime formats
@@ -3574,7 +4520,8 @@ class ProfileStore:
                 del cycle_data["debug_data"]
 
         dest.append(cycle_data)
-        # Apply retention after adding
+        if section:
+            self._journal_cycle(cycle_data, section)
 
 
     async def async_enforce_retention(self) -> None:
@@ -3618,6 +4565,7 @@ class ProfileStore:
                 for name, p in self._data.get("profiles", {}).items()
             }
             for cy in to_drop:
+                self._journal_cycle(cy)
                 # Track affected profile
                 p_name = cy.get("profile_name")
                 if p_name:
@@ -3643,6 +4591,7 @@ class ProfileStore:
                         else:
                             # No replacement available
                             self._data["profiles"][name].pop("sample_cycle_id", None)
+                        self._journal_key("profiles")
             # Actually drop
             del cycles[:drop_count]
 
@@ -3708,6 +4657,7 @@ class ProfileStore:
                     if c.get("power_data"):
                         c.pop("power_data", None)
                         c.pop("sampling_interval", None)
+                        self._journal_cycle(c)
                         if key:
                             affected_profiles.add(key)
 
@@ -3735,6 +4685,7 @@ class ProfileStore:
 
         for name in orphaned:
             del self._data["profiles"][name]
+            self._journal_key("profiles")
             self._logger.info(
                 "Cleaned up orphaned profile '%s' (cycle no longer exists)", name
             )
@@ -3787,149 +4738,12 @@ class ProfileStore:
 
         return stats
 
-    def _reprocess_all_data_sync(self) -> int:
-        """Synchronous implementation of reprocessing logic (run in executor)."""
-        cycles_raw = self._data.get("past_cycles", [])
-        cycles = cast(list[CycleDict], cycles_raw) if isinstance(cycles_raw, list) else []
-        if not cycles:
-            return 0
-
-        processed_count = 0
-
-        # 1. Update Signatures & Optimize Data
-        for cycle in cycles:
-            # Data Optimization: Trim leading/trailing zeros (0W)
-            # Only apply to compressed data to avoid breaking legacy format
-            p_data = cycle.get("power_data")
-            if (
-                p_data
-                and isinstance(p_data, list)
-                and p_data
-                and isinstance(p_data[0], (list, tuple))
-            ):
-                first_point = cast(list[Any] | tuple[Any, ...], p_data[0])
-                # Only trim offset-format data (numeric offsets). Legacy ISO-format
-                # cycles skip trimming but still reach the signature block below.
-                if len(first_point) == 2 and isinstance(first_point[0], (int, float)):
-                    p_data_list = cast(list[list[float]], p_data)
-                    # Apply trim helper
-                    original_len = len(p_data_list)
-
-                    # Logic: For completed cycles, only trim leading zeros.
-                    # For others, trim both ends.
-                    if cycle.get("status") in ("completed", "force_stopped"):
-                        # Only trim leading
-                        start_idx = 0
-                        for i, point in enumerate(p_data_list):
-                            if point[1] > 1.0: # Match threshold below
-                                start_idx = i
-                                break
-                        trimmed: list[list[float]] = p_data_list[start_idx:]
-                    else:
-                        trimmed = trim_zero_power_data(p_data_list, threshold=1.0) # Conservative 1W threshold
-
-                    if trimmed and len(trimmed) < original_len:
-                        # Data was trimmed - check for start time shift
-                        first_offset = trimmed[0][0]
-
-                        if first_offset > 0:
-                            # Leading zeros removed - Must shift start_time forward
-                            try:
-                                start_dt = datetime.fromisoformat(cycle["start_time"])
-                                new_start = start_dt + timedelta(seconds=first_offset)
-                                cycle["start_time"] = new_start.isoformat()
-
-                                # Re-normalize offsets to 0
-                                shifted_data: list[list[float]] = []
-                                for row in trimmed:
-                                    # row is [offset, power]
-                                    shifted_data.append([round(row[0] - first_offset, 1), row[1]])
-                                cycle["power_data"] = shifted_data
-                                processed_count += 1
-                            except (ValueError, TypeError) as e:
-                                self._logger.warning("Failed to shift start_time for trimmed cycle: %s", e)
-                        else:
-                            # Only trailing trimmed or no shift needed
-                            cycle["power_data"] = trimmed
-                            processed_count += 1
-
-                        # Update duration to match new data length
-                        # If we only trimmed the head, the new duration is old_duration - first_offset
-                        # This preserves trailing silence.
-                        if cycle.get("power_data"):
-                            old_dur = float(cycle.get("duration", 0.0) or 0.0)
-                            # If we shifted (first_offset > 0), new duration is old_dur - first_offset
-                            # Otherwise if we only trimmed tail, we might want to snap,
-                            # but for completed cycles we don't trim tail in this loop.
-                            if first_offset > 0:
-                                cycle["duration"] = max(0.0, old_dur - first_offset)
-                            else:
-                                # Only trailing was trimmed (not expected for completed cycles here)
-                                # or no trim happened.
-                                # If trailing was trimmed, we SHOULD snap.
-                                if len(trimmed) < original_len:
-                                    cycle["duration"] = cycle["power_data"][-1][0]
-
-                    # Self-heal duration/end_time drift.  A freshly-finalized cycle
-                    # always has last_offset == duration (the finalizer appends a
-                    # terminal point at end_time, and add_cycle keeps the tail for
-                    # completed cycles), so this is a no-op for healthy records.  It
-                    # repairs older / manually-edited cycles whose trace was trimmed
-                    # without updating duration + end_time - e.g. a legacy record
-                    # whose drying tail was dropped while duration kept the pre-trim
-                    # value (duration says 8820s but the trace and end_time end at
-                    # 6845s).  Snap both to the trace so the three always agree.
-                    pd_now = cycle.get("power_data")
-                    if (
-                        isinstance(pd_now, list)
-                        and pd_now
-                        and isinstance(pd_now[-1], (list, tuple))
-                        and len(pd_now[-1]) == 2
-                    ):
-                        trace_end = float(pd_now[-1][0])
-                        stored_dur = float(cycle.get("duration", 0.0) or 0.0)
-                        si = float(cycle.get("sampling_interval", 0.0) or 0.0)
-                        # Tolerance above rounding + one sampling gap; the drifts we
-                        # repair are large (minutes), so this never churns healthy data.
-                        tol = max(5.0, 2.0 * si)
-                        if trace_end > 0 and abs(stored_dur - trace_end) > tol:
-                            cycle["duration"] = round(trace_end, 1)
-                            start_ts = _value_to_timestamp(cycle.get("start_time"))
-                            if start_ts is not None:
-                                cycle["end_time"] = dt_util.utc_from_timestamp(
-                                    start_ts + trace_end
-                                ).isoformat()
-                            processed_count += 1
-                            self._logger.info(
-                                "Reprocess self-heal: cycle %s duration %.0fs -> %.0fs "
-                                "(snapped to trace; end_time realigned)",
-                                cycle.get("id"),
-                                stored_dur,
-                                trace_end,
-                            )
-
-            if cycle.get("power_data"):
-                try:
-                    tuples = decompress_power_data(cycle)
-                    if tuples and len(tuples) > 10:
-                        ts_arr: list[float] = []
-                        p_arr: list[float] = []
-                        for offset_sec, p in tuples:
-                            ts_arr.append(float(offset_sec))
-                            p_arr.append(float(p))
-
-                        sig = compute_signature(np.array(ts_arr, dtype=float), np.array(p_arr, dtype=float))
-                        cycle["signature"] = dataclasses.asdict(sig)
-                        processed_count += 1
-                except Exception as e: # pylint: disable=broad-exception-caught
-                    self._logger.warning("Failed to reprocess signature: %s", e)
-
-        # 2. Rebuild Envelopes
-
-
-        return processed_count
-
-    async def async_reprocess_all_data(self) -> int:
+    async def async_reprocess_all_data(
+        self,
+        *,
+        progress: ProgressFn | None = None,
+        cancelled: CancelFn | None = None,
+    ) -> int:
         """Reprocess all historical data to update signatures and rebuild envelopes.
 
         This is a non-destructive operation for raw cycle data. It:
@@ -3937,17 +4751,49 @@ class ProfileStore:
         2. Rebuilds all profile envelopes from scratch.
         3. Updates global stats.
 
+        Both passes fan out over the shared worker pool. ``progress(done, total)``
+        counts cycles then profiles; once ``cancelled()`` is true the remaining
+        work is skipped and what already finished is kept and saved.
+
         Returns total number of cycles processed.
         """
         self._logger.info("Starting reprocessing (offloaded)...")
 
-        # Offload heavy synchronous work
-        processed_count = await self.hass.async_add_executor_job(
-            self._reprocess_all_data_sync
-        )
+        cycles_raw = self._data.get("past_cycles", [])
+        cycles = list(cast(list[CycleDict], cycles_raw)) if isinstance(cycles_raw, list) else []
+        n_profiles = len(self._data.get("profiles", {}))
+        total = len(cycles) + n_profiles
+
+        def _cycle_progress(done: int, _total: int) -> None:
+            if progress is not None:
+                progress(done, total)
+
+        def _envelope_progress(done: int, _total: int) -> None:
+            if progress is not None:
+                progress(len(cycles) + done, total)
+
+        processed_count = 0
+        payloads = [
+            {k: c[k] for k in _REPROCESS_INPUT_KEYS if k in c} for c in cycles
+        ]
+        pool = get_worker_pool(self.hass)
+        async for index, (changes, processed, notes) in pool.async_imap(
+            reprocess_cycle_worker,
+            payloads,
+            progress=_cycle_progress,
+            cancelled=cancelled,
+        ):
+            if changes:
+                cycles[index].update(changes)
+            processed_count += processed
+            for level, message, args in notes:
+                self._logger.log(level, message, *args)
 
         # 2. Rebuild Envelopes (Using new async infrastructure)
-        await self.async_rebuild_all_envelopes()
+        if cancelled is None or not cancelled():
+            await self.async_rebuild_all_envelopes(
+                progress=_envelope_progress, cancelled=cancelled
+            )
 
         await self.async_save()
 
@@ -3972,9 +4818,14 @@ class ProfileStore:
             file_size_kb = await self.hass.async_add_executor_job(
                 _safe_file_size_kb, path
             )
+        trace_file_size_kb = await self.hass.async_add_executor_job(
+            _safe_file_size_kb, self._traces.path
+        )
 
         return {
-            "file_size_kb": round(file_size_kb, 1),
+            # Total on-disk footprint: JSON metadata + columnar trace sidecar.
+            "file_size_kb": round(file_size_kb + trace_file_size_kb, 1),
+            "trace_file_size_kb": round(trace_file_size_kb, 1),
             "total_cycles": len(cycles),
             "total_profiles": len(profiles),
             "debug_traces_count": debug_traces_count,
@@ -3997,86 +4848,6 @@ class ProfileStore:
 
 
 
-    def _rebuild_envelope_sync(
-        self, labeled_cycles: list[CycleDict]
-    ) -> tuple[Any, list[float]] | None:
-        """Sync worker to parse data and build envelope (run in executor).
-
-        Degenerate cycles (a near-flat trace whose peak is a tiny fraction of the
-        profile's typical peak - e.g. a run where the power sensor wasn't
-        reporting) are excluded so they cannot pollute the envelope average that
-        the live matcher scores against, or drag ``avg_duration`` around.
-        User-pinned golden cycles are always kept.
-        """
-        # First pass: decompress everything and record each cycle's peak so we
-        # can judge degeneracy relative to the profile (works for both a 2000W
-        # dishwasher and a low-power pump).
-        parsed: list[tuple[list[float], list[float], float, bool, float]] = []
-        for cycle in labeled_cycles:
-            pairs = decompress_power_data(cycle)
-            if len(pairs) < 3:
-                continue
-            offsets = [p[0] for p in pairs]
-            values = [p[1] for p in pairs]
-            stored_dur = float(cycle.get("duration", 0.0) or 0.0)
-            authoritative_dur = float(max(offsets[-1], stored_dur))
-            man_dur = cycle.get("manual_duration")
-            final_dur = float(man_dur) if man_dur else authoritative_dur
-            review = cycle.get("ml_review")
-            is_golden = bool(review.get("golden")) if isinstance(review, dict) else False
-            peak = max(values) if values else 0.0
-            parsed.append((offsets, values, final_dur, is_golden, peak))
-
-        if not parsed:
-            return None
-
-        # Degeneracy floor: below max(_DEGENERATE_POWER_FLOOR, 10% of the median
-        # peak) a cycle is treated as a mis-capture and dropped (unless golden).
-        peaks = sorted(p[4] for p in parsed)
-        median_peak = peaks[len(peaks) // 2] if peaks else 0.0
-        degen_floor = max(_DEGENERATE_POWER_FLOOR, 0.10 * median_peak)
-
-        raw_cycles_data: list[tuple[list[float], list[float], float]] = []
-        durations: list[float] = []
-        golden_mask: list[bool] = []
-        dropped = 0
-        for offsets, values, final_dur, is_golden, peak in parsed:
-            if peak < degen_floor and not is_golden:
-                dropped += 1
-                continue
-            raw_cycles_data.append((offsets, values, final_dur))
-            durations.append(final_dur)
-            golden_mask.append(is_golden)
-
-        # Never drop everything: if the filter removed all cycles (e.g. a truly
-        # low-power profile misjudged), fall back to using them all.
-        if not raw_cycles_data:
-            for offsets, values, final_dur, is_golden, _peak in parsed:
-                raw_cycles_data.append((offsets, values, final_dur))
-                durations.append(final_dur)
-                golden_mask.append(is_golden)
-        elif dropped:
-            self._logger.debug(
-                "Envelope rebuild: excluded %d degenerate cycle(s) below %.0fW "
-                "(median peak %.0fW)", dropped, degen_floor, median_peak,
-            )
-
-        if not raw_cycles_data:
-            return None
-
-        # Run Heavy Computation. When the profile has user-verified "golden"
-        # cycles, they define the reference shape (see compute_envelope_worker).
-        result = analysis.compute_envelope_worker(
-            cast(Any, raw_cycles_data),
-            self.dtw_bandwidth,
-            reference_mask=golden_mask if any(golden_mask) else None,
-        )
-
-        if not result:
-            return None
-
-        return result, durations
-
     def _cycle_peak(self, cycle: CycleDict) -> float:
         """Peak power of a cycle's trace (0.0 if it has none)."""
         pairs = decompress_power_data(cycle)
@@ -4121,11 +4892,45 @@ class ProfileStore:
             best = max(pool, key=lambda c: float(c.get("duration") or 0.0))
         return best.get("id")
 
-    async def async_rebuild_all_envelopes(self) -> int:
-        """Rebuild envelopes for all profiles. Returns count of envelopes rebuilt."""
-        count = 0
+    async def async_rebuild_all_envelopes(
+        self,
+        *,
+        progress: ProgressFn | None = None,
+        cancelled: CancelFn | None = None,
+    ) -> int:
+        """Rebuild envelopes for all profiles. Returns count of envelopes rebuilt.
+
+        Profiles are built in parallel on the shared worker pool and applied in
+        profile order afterwards, so the stored result matches a one-by-one
+        rebuild. On cancel, profiles whose build finished are still applied.
+        """
+        sources: dict[str, tuple[list[CycleDict], list[CycleDict]]] = {}
         for profile_name in list(self._data["profiles"].keys()):
-            if await self.async_rebuild_envelope(profile_name):
+            real_cycles, ref_cycles = self._envelope_sources(profile_name)
+            if real_cycles or ref_cycles:
+                sources[profile_name] = (real_cycles, ref_cycles)
+            elif profile_name in self._data.get("envelopes", {}):
+                del self._data["envelopes"][profile_name]
+
+        names = list(sources)
+        jobs = [self._envelope_job(n, sources[n][0] + sources[n][1]) for n in names]
+        built: dict[str, tuple[Any, Any]] = {}
+        pool = get_worker_pool(self.hass)
+        async for index, result in pool.async_imap(
+            build_envelope_worker, jobs, chunk_size=1,
+            progress=progress, cancelled=cancelled,
+        ):
+            built[names[index]] = result
+
+        count = 0
+        for profile_name in names:
+            if profile_name not in built:
+                continue
+            result_pkg, phase_profile = built[profile_name]
+            real_cycles, ref_cycles = sources[profile_name]
+            if self._apply_envelope(
+                profile_name, real_cycles, ref_cycles, result_pkg, phase_profile
+            ):
                 count += 1
         return count
 
@@ -4198,15 +5003,16 @@ class ProfileStore:
             )
         return repaired
 
-    async def async_rebuild_envelope(self, profile_name: str) -> bool:
-        """
-        Build/rebuild statistical envelope for a profile asynchronously.
-        Offloads heavy DTW/normalization to executor.
-        """
-        # A rebuild changes this profile's curve, which feeds group cohesion, so
-        # invalidate the cohesion cache (not only on group mutations) to avoid stale
-        # cohesion approving/rejecting a collapse against outdated shapes.
-        self._cohesion_cache_generation += 1
+    def _envelope_sources(
+        self, profile_name: str
+    ) -> tuple[list[CycleDict], list[CycleDict]]:
+        """Marks ``profile_name``'s envelope dirty and returns the cycles that
+        feed it as ``(real_cycles, reference_cycles)``."""
+        # A rebuild changes this profile's curve, which feeds group cohesion;
+        # marking the envelope bumps ("profile", name) in the derived cache, which
+        # drops the cohesion of every group it belongs to (not only on group
+        # mutations) so stale cohesion can't approve/reject a collapse.
+        self._journal_envelope(profile_name)
         # 1. Gather Data (Main Thread)
         def _eligible(seq: list[CycleDict]) -> list[CycleDict]:
             return [
@@ -4219,25 +5025,100 @@ class ProfileStore:
 
         # Real cycles drive usage stats (energy/count). Imported reference cycles
         # additionally shape the curves + matching duration, but never usage stats.
-        real_cycles = _eligible(self._data["past_cycles"])
-        ref_cycles = _eligible(self._data.get("reference_cycles", []))
-        shape_cycles = real_cycles + ref_cycles
+        return (
+            _eligible(self._data["past_cycles"]),
+            _eligible(self._data.get("reference_cycles", [])),
+        )
+
+    def _envelope_job(self, profile_name: str, shape_cycles: list[CycleDict]) -> EnvelopeJob:
+        """Worker payload for :func:`build_envelope_worker`.
+
+        Copies just the fields the worker reads, on the event loop, so a pool
+        worker never serialises a record the loop is concurrently editing.
+        """
+        device_type = str(
+            self._data.get("profiles", {}).get(profile_name, {}).get("device_type") or ""
+        )
+        cycles = [
+            {k: c[k] for k in _ENVELOPE_INPUT_KEYS if k in c} for c in shape_cycles
+        ]
+        return profile_name, cycles, self.dtw_bandwidth, device_type, self._logger
 
-        if not shape_cycles:
+    async def async_rebuild_envelope(self, profile_name: str) -> bool:
+        """
+        Build/rebuild statistical envelope for a profile asynchronously.
+        Offloads heavy DTW/normalization to executor.
+        """
+        real_cycles, ref_cycles = self._envelope_sources(profile_name)
+        if not real_cycles and not ref_cycles:
             if profile_name in self._data.get("envelopes", {}):
                 del self._data["envelopes"][profile_name]
             return False
 
-        # Kept for the fallback path + duration-stat code below (behaviour is
-        # byte-identical to before when there are no reference cycles).
-        labeled_cycles = shape_cycles
+        # 2. Run Heavy Computation in Executor (Parsing + DTW + phase segmentation)
+        result_pkg, phase_profile = await self.hass.async_add_executor_job(
+            build_envelope_worker,
+            self._envelope_job(profile_name, real_cycles + ref_cycles),
+        )
+        return self._apply_envelope(
+            profile_name, real_cycles, ref_cycles, result_pkg, phase_profile
+        )
+
+    async def async_add_cycle_to_envelope(self, profile_name: str, cycle: CycleDict) -> bool:
+        """Update a profile's envelope for one newly labeled member cycle.
+
+        Folds ``cycle`` into the stored bands (one DTW alignment against the
+        stored reference) instead of re-aligning every member. Falls back to
+        :meth:`async_rebuild_envelope` when there is no incremental state, the
+        envelope already absorbed :data:`_ENVELOPE_MAX_INCREMENTAL` cycles,
+        golden cycles shape it, or the cycle itself can't be folded in
+        (golden, degenerate, not an eligible member). Phase profiles are
+        carried over until the next full rebuild.
+        """
+        env = self._data.get("envelopes", {}).get(profile_name)
+        state = env.get("incremental") if isinstance(env, dict) else None
+        if (
+            not isinstance(state, dict)
+            or state.get("golden")
+            or int(state.get("updates", 0)) >= _ENVELOPE_MAX_INCREMENTAL
+            or cycle.get("profile_name") != profile_name
+        ):
+            return await self.async_rebuild_envelope(profile_name)
 
-        # 2. Run Heavy Computation in Executor (Parsing + DTW)
-        result_pkg = await self.hass.async_add_executor_job(
-            self._rebuild_envelope_sync,
-            shape_cycles
+        real_cycles, ref_cycles = self._envelope_sources(profile_name)
+        if not any(c is cycle for c in real_cycles):
+            return await self.async_rebuild_envelope(profile_name)
+        job_cycle = {k: cycle[k] for k in _ENVELOPE_INPUT_KEYS if k in cycle}
+        try:
+            result_pkg, needs_rebuild = await self.hass.async_add_executor_job(
+                update_envelope_worker, (env, job_cycle, self.dtw_bandwidth)
+            )
+        except Exception:  # pylint: disable=broad-exception-caught
+            self._logger.debug("Incremental envelope update failed for %s", profile_name, exc_info=True)
+            needs_rebuild = True
+        # A concurrent rebuild may have replaced the envelope meanwhile; its
+        # result already covers this cycle.
+        if self._data.get("envelopes", {}).get(profile_name) is not env:
+            return True
+        if needs_rebuild or not result_pkg:
+            return await self.async_rebuild_envelope(profile_name)
+        return self._apply_envelope(
+            profile_name, real_cycles, ref_cycles, result_pkg, env.get("phase_profile")
         )
 
+    def _apply_envelope(
+        self,
+        profile_name: str,
+        real_cycles: list[CycleDict],
+        ref_cycles: list[CycleDict],
+        result_pkg: tuple[Any, list[float], dict[str, Any]] | None,
+        phase_profile: dict[str, Any] | None,
+    ) -> bool:
+        """Store a built envelope + the profile's duration stats (event loop)."""
+        # Kept for the fallback path + duration-stat code below (behaviour is
+        # byte-identical to before when there are no reference cycles).
+        labeled_cycles = real_cycles + ref_cycles
+
         if not result_pkg:
             # Envelope shape couldn't be built (no power data / too few points).
             # Still update profile min/max/avg from raw cycle durations so that
@@ -4253,11 +5134,12 @@ class ProfileStore:
                     self._data["profiles"][profile_name]["min_duration"] = float(np.min(raw_arr_fallback))
                     self._data["profiles"][profile_name]["max_duration"] = float(np.max(raw_arr_fallback))
                     self._data["profiles"][profile_name]["avg_duration"] = float(np.mean(raw_arr_fallback))
+                    self._journal_key("profiles")
             if profile_name in self._data.get("envelopes", {}):
                 del self._data["envelopes"][profile_name]
             return False
 
-        result, durations = result_pkg
+        result, durations, incremental = result_pkg
 
         # Update profile stats in storage (Fast metadata update)
         if durations and profile_name in self._data.get("profiles", {}):
@@ -4271,6 +5153,7 @@ class ProfileStore:
             self._data["profiles"][profile_name]["min_duration"] = min_duration
             self._data["profiles"][profile_name]["max_duration"] = max_duration
             self._data["profiles"][profile_name]["avg_duration"] = avg_duration
+            self._journal_key("profiles")
 
             # Re-point the matching reference to a golden / non-degenerate cycle
             # near the representative duration, so a mis-captured (flat) or
@@ -4328,20 +5211,14 @@ class ProfileStore:
             "avg_energy": avg_energy,
             "duration_std_dev": duration_std_dev,
             "updated": dt_util.now().isoformat(),
+            # Reference curve + running counts for async_add_cycle_to_envelope.
+            "incremental": incremental,
         }
 
         # Derived cache: per-phase profile (per-role duration/energy priors) used by
-        # phase-segmented matching / phase-resolved ETA. Built only for device types
-        # phase matching is live-supported for; absent otherwise (consumers fall back
-        # to the whole-cycle pipeline). Pure/cheap - segmentation is O(samples).
-        device_type = str(
-            self._data.get("profiles", {}).get(profile_name, {}).get("device_type") or ""
-        )
-        # Offload the per-cycle segmentation to the executor (it can be tens of ms
-        # for very long traces; keep it off the event loop, like the envelope DTW).
-        phase_profile = await self.hass.async_add_executor_job(
-            self._compute_phase_profile, profile_name, shape_cycles, device_type
-        )
+        # phase-segmented matching / phase-resolved ETA. Built (by the worker) only
+        # for device types phase matching is live-supported for; absent otherwise
+        # (consumers fall back to the whole-cycle pipeline).
         if phase_profile is not None:
             envelope_data["phase_profile"] = phase_profile
 
@@ -4351,39 +5228,6 @@ class ProfileStore:
 
         return True
 
-    def _compute_phase_profile(
-        self, profile_name: str, cycles: list[CycleDict], device_type: str
-    ) -> dict[str, Any] | None:
-        """Segment each member cycle and aggregate a per-role phase profile.
-
-        Returns a JSON-safe dict for ``envelope["phase_profile"]`` or ``None`` when
-        phase matching is not live-supported for this device type or no cycle could
-        be segmented. Never raises (phase support must never break envelope rebuild).
-        """
-        try:
-            if not phase_matching_live_supported(device_type):
-                return None
-            model = phase_model_for(device_type)
-            if model is None:
-                return None
-            segmented: list = []
-            for cycle in cycles:
-                offsets = power_data_to_offsets(cycle.get("power_data") or [])
-                if len(offsets) < 4:
-                    continue
-                t = [float(o) for o, _ in offsets]
-                w = [float(p) for _, p in offsets]
-                segs = segment_cycle(t, w, model)
-                if segs:
-                    segmented.append(segs)
-            if not segmented:
-                return None
-            profile = build_phase_profile(profile_name, segmented)
-            return phase_profile_to_dict(profile) if profile is not None else None
-        except Exception:  # noqa: BLE001 - phase caching must never break rebuild
-            self._logger.debug("phase-profile build failed for %s", profile_name, exc_info=True)
-            return None
-
     def _group_scope(self, program: str) -> set[str] | None:
         """Phase-narrowing scope for the matched ``program``:
 
@@ -4416,13 +5260,23 @@ class ProfileStore:
         Restricted to ``scope`` (profile names) when given, and always filtered to
         profiles with >= ``PHASE_PROFILE_MIN_CYCLES`` member cycles so a noisy
         single-cycle prior can't drive the ETA (cold-start floor).
+
+        The parsed profiles live in the derived cache keyed by the stored
+        ``phase_profile`` dict, so the live ETA path does not re-parse every
+        envelope on each progress update.
         """
         out = []
         for name, env in (self._data.get("envelopes") or {}).items():
             if scope is not None and name not in scope:
                 continue
             if isinstance(env, dict):
-                pp = phase_profile_from_dict(env.get("phase_profile"))
+                raw = env.get("phase_profile")
+                pp = self._derived.get_or_build(
+                    ("phase_profile", name),
+                    (("profile", name),),
+                    lambda raw=raw: phase_profile_from_dict(raw),
+                    source=raw,
+                )
                 if pp is not None and pp.n_cycles >= PHASE_PROFILE_MIN_CYCLES:
                     out.append(pp)
         return out
@@ -4525,12 +5379,24 @@ class ProfileStore:
         be surfaced as an attribute without recorder churn.
 
         Pure statistics (no ML); never raises - returns ``None`` when the
-        envelope is missing or too short to be meaningful.
+        envelope is missing or too short to be meaningful. The sensor asks for it
+        on every state write, so the result is cached per envelope object in the
+        derived cache; callers must not mutate it.
         """
+        env = self.get_envelope(profile_name)
+        if not isinstance(env, dict):
+            return None
+        return self._derived.get_or_build(
+            ("reference_curve", profile_name, int(n)),
+            (("profile", profile_name),),
+            lambda: self._build_reference_curve(env, n),
+            source=env,
+        )
+
+    @staticmethod
+    def _build_reference_curve(env: JSONDict, n: int) -> JSONDict | None:
+        """Uncached body of :meth:`reference_curve`."""
         try:
-            env = self.get_envelope(profile_name)
-            if not isinstance(env, dict):
-                return None
             avg = env.get("avg")
             if (
                 not isinstance(avg, list)
@@ -4871,52 +5737,20 @@ class ProfileStore:
 
         return candidates
 
-    def _get_cached_sample_segment(
-        self, sample_cycle: dict[str, Any], dt: float
-    ) -> Segment | None:
-        """Get or compute resampled segment for a sample cycle, using cache."""
-        cycle_id = sample_cycle.get("id")
-        if not cycle_id:
-            return None
-
-        # Round dt to avoid float cache misses
-        dt_key = float(round(dt, 2))
-        key = (cycle_id, dt_key)
-
-        if key in self._cached_sample_segments:
-            return self._cached_sample_segments[key]
-
-        # Miss: Compute
-        sample_data = sample_cycle.get("power_data")
-        if not sample_data:
-            return None
-
-        try:
-            if len(sample_data) > 0 and isinstance(sample_data[0], (list, tuple)):
-                s_ts = np.array([x[0] for x in sample_data])
-                s_p = np.array([x[1] for x in sample_data])
-            else:
-                return None
-
-            s_segments = resample_uniform(s_ts, s_p, dt_s=dt, gap_s=21600.0)
-            if not s_segments:
-                return None
-
-            sample_seg = max(s_segments, key=lambda s: len(s.power))
-
-            # Store
-            self._cached_sample_segments[key] = sample_seg
-            return sample_seg
-        except Exception as e: # pylint: disable=broad-exception-caught
-            self._logger.warning("Error caching sample segment %s: %s", cycle_id, e)
-            return None
-
     async def async_match_profile(
         self,
         current_power_data: list[tuple[str, float]] | list[tuple[datetime, float]] | list[tuple[float, float]] | list[list[float]],
         current_duration: float,
+        *,
+        live: bool = False,
     ) -> MatchResult:
-        """Run profile matching asynchronously in executor."""
+        """Run profile matching asynchronously in executor.
+
+        ``live`` marks the running cycle's periodic re-match: Stage-2
+        alignment state is carried between calls (same results, cost no longer
+        re-paid for the whole prefix every time). The detector passes its
+        trace as a :class:`PowerTrace`, whose columns are used directly.
+        """
         # 1. Prepare data in main thread (Access ProfileStore state safely)
         group_members: dict[str, list[str]] = {}
         member_snaps: dict[str, dict[str, Any]] = {}
@@ -4929,7 +5763,13 @@ class ProfileStore:
         try:
             # Normalize input format
             first_elem = current_power_data[0][0]
-            if isinstance(first_elem, datetime):
+            if isinstance(current_power_data, PowerTrace):
+                # Same values as the datetime branch below, without building
+                # a datetime per reading.
+                epoch_s = current_power_data.epoch_seconds()
+                ts_arr = epoch_s - epoch_s[0]
+                p_arr = current_power_data.watts()
+            elif isinstance(first_elem, datetime):
                 # datetime objects: compute relative timestamps
                 t_start = first_elem.timestamp()
                 ts_arr = np.array([(x[0].timestamp() - t_start) for x in cast(list[tuple[datetime, float]], current_power_data)])
@@ -4946,162 +5786,16 @@ class ProfileStore:
                     ]
                 )
 
-            p_arr = np.array([float(x[1]) for x in current_power_data])
+            if not isinstance(current_power_data, PowerTrace):
+                p_arr = np.array([float(x[1]) for x in current_power_data])
 
             # Resample current
-            segments, used_dt = resample_adaptive(ts_arr, p_arr, min_dt=5.0, gap_s=21600.0)
-            if not segments:
-                return MatchResult(None, 0.0, 0.0, None, [], False, 0.0)
-            current_seg = max(segments, key=lambda s: len(s.power))
-            if len(current_seg.power) < 12:
+            trace = _match_trace(ts_arr, p_arr)
+            if trace is None:
                 return MatchResult(None, 0.0, 0.0, None, [], False, 0.0)
+            current_power_list, used_dt = trace
 
-            current_power_list = current_seg.power.tolist()
-
-            # Prepare Snapshots. Imported reference cycles are eligible as matching
-            # templates alongside real cycles (so an import-only profile can match).
-            all_cycles = list(self._data["past_cycles"]) + list(self._data.get("reference_cycles", []))
-            # Precompute per-profile lookups ONCE so the loop below is O(profiles),
-            # not O(profiles x cycles). Rescanning all_cycles with next()/any() for
-            # every profile made matching quadratic and stalled low-power hosts on
-            # auto-label (many matches x many cycles) - issue #311. Selections are
-            # byte-identical: cycles_by_id keeps the FIRST occurrence (== next()),
-            # labeled_by_profile keeps the first eligible cycle in all_cycles order,
-            # and golden_profiles mirrors the any(...) golden test.
-            cycles_by_id: dict[str, CycleDict] = {}
-            labeled_by_profile: dict[str, CycleDict] = {}
-            golden_profiles: set[str] = set()
-            for c in all_cycles:
-                cid = c.get("id")
-                if cid is not None and cid not in cycles_by_id:
-                    cycles_by_id[cid] = c
-                pname = c.get("profile_name")
-                if not pname or not c.get("power_data"):
-                    continue
-                if (
-                    pname not in labeled_by_profile
-                    and c.get("status") in ("completed", "force_stopped")
-                ):
-                    labeled_by_profile[pname] = c
-                rev = c.get("ml_review")
-                if isinstance(rev, dict) and rev.get("golden"):
-                    golden_profiles.add(pname)
-
-            snapshots: list[dict[str, Any]] = []
-            skipped_profiles: list[str] = []
-            for name, profile in self._data["profiles"].items():
-                # Try sample_cycle_id first, fall back to any labeled cycle
-                sample_id = profile.get("sample_cycle_id")
-                sample_cycle = cycles_by_id.get(sample_id) if sample_id else None
-                # Fallback: find ANY completed cycle labeled with this profile
-                if not sample_cycle:
-                    sample_cycle = labeled_by_profile.get(name)
-                # Boost user-pinned "golden" cycles: when a profile has one, use
-                # its sharp single-cycle trace as the matching template instead
-                # of the envelope average. The envelope average smears the
-                # wash-phase peaks (each cycle's spikes land at slightly
-                # different times), which hurts correlation for sharply-shaped
-                # programs; a trusted golden cycle preserves that shape.
-                has_golden = name in golden_profiles
-
-                # Prefer envelope avg curve when ≥2 labeled cycles have been
-                # confirmed - it gives a more representative reference signal
-                # than the original sample alone, so confidence improves over
-                # time as the user keeps confirming correct detections. Skipped
-                # when a golden cycle is pinned (see above).
-                envelope = self._data.get("envelopes", {}).get(name)
-                _env_avg = envelope.get("avg") if envelope else None
-                if (
-                    not has_golden
-                    and envelope
-                    and envelope.get("cycle_count", 0) >= 2
-                    and _env_avg
-                    and isinstance(_env_avg[0], (list, tuple))
-                    and len(_env_avg[0]) >= 2
-                ):
-                    avg_y = [float(p[1]) for p in _env_avg]
-                    _env_ts_duration = (
-                        float(_env_avg[-1][0]) - float(_env_avg[0][0])
-                        if len(_env_avg) > 1 else 0.0
-                    )
-                    avg_duration = (
-                        envelope.get("target_duration") or
-                        profile.get("avg_duration") or
-                        _env_ts_duration or
-                        None
-                    )
-                    if not avg_duration:
-                        skipped_profiles.append(
-                            f"{name}: no valid duration (envelope has no target_duration, avg_duration, or timestamp span)"
-                        )
-                        continue
-                    snapshots.append({
-                        "name": name,
-                        "avg_duration": float(avg_duration),
-                        "sample_power": avg_y,
-                    })
-                    continue
-
-                if not sample_cycle:
-                    skipped_profiles.append(
-                        f"{name}: no sample cycle (sample_id={sample_id})"
-                    )
-                    continue
-
-                # Prepare sample segment (using cache)
-                sample_seg = self._get_cached_sample_segment(sample_cycle, used_dt)
-                if not sample_seg:
-                    skipped_profiles.append(
-                        f"{name}: failed to resample cycle {sample_cycle.get('id')}"
-                    )
-                    continue
-                # avg_duration preference order:
-                #   1. profile["avg_duration"] (rolling average, most accurate)
-                #   2. sample_cycle["duration"] (raw cycle field)
-                #   3. timestamp span of sample_seg (estimate from the resampled data)
-                # Profiles created before avg_duration tracking was added may have
-                # 0 or a missing value; falling back to the segment estimate prevents
-                # update_match() from always seeing expected_duration=0, which
-                # silences time-remaining estimates and logs a misleading warning.
-                _seg_ts_duration = (
-                    float(sample_seg.timestamps[-1]) - float(sample_seg.timestamps[0])
-                    if len(sample_seg.timestamps) > 1 else 0.0
-                )
-                avg_dur = (
-                    profile.get("avg_duration") or
-                    sample_cycle.get("duration") or
-                    _seg_ts_duration
-                )
-                if not avg_dur:
-                    skipped_profiles.append(
-                        f"{name}: no valid duration (avg_duration, cycle duration, and timestamp span all zero/missing)"
-                    )
-                    continue
-                snapshots.append({
-                    "name": name,
-                    "avg_duration": float(avg_dur),
-                    "sample_power": sample_seg.power.tolist(),
-                    "sample_dt": used_dt
-                })
-
-            if skipped_profiles:
-                self._logger.debug(
-                    "Profile matching skipped %d profiles: %s",
-                    len(skipped_profiles),
-                    "; ".join(skipped_profiles)
-                )
-
-            # Stage 5: collapse cohesive near-duplicate groups into one aggregate
-            # candidate each (loose groups stay individual). No-op without groups.
-            snapshots, group_members, member_snaps = self._grouped_snapshots(snapshots)
-
-            config = {
-                "min_duration_ratio": self._min_duration_ratio,
-                "max_duration_ratio": self._max_duration_ratio,
-                "dtw_bandwidth": self.dtw_bandwidth,
-                # On-device tuned scoring weights (opt-in); empty = shipped defaults.
-                **self._matching_overrides(),
-            }
+            snapshots, group_members, member_snaps, config = self._match_inputs(used_dt)
 
         except Exception as e:  # pylint: disable=broad-exception-caught
             self._logger.error("Preparation for async match failed: %s", e)
@@ -5113,13 +5807,58 @@ class ProfileStore:
             current_power_list,
             current_duration,
             cast(Any, snapshots),
-            config
+            config,
+            self._live_stream if live else None,
         )
 
         # 3. Process Result (Main Thread)
+        return self._finish_match(
+            candidates, current_power_list, current_duration,
+            len(snapshots), group_members, member_snaps,
+        )
+
+    def _match_inputs(
+        self, used_dt: float
+    ) -> tuple[list[dict[str, Any]], dict[str, list[str]], dict[str, dict[str, Any]], dict[str, Any]]:
+        """Snapshots, Stage-5 groups and config for a trace resampled at ``used_dt``."""
+        # Prepare Snapshots from the incrementally maintained match index:
+        # O(profiles) lookups, templates only rebuilt after an edit.
+        snapshots, skipped_profiles = self._match_index.build_snapshots(
+            self._data, used_dt, self.dtw_bandwidth
+        )
+
+        if skipped_profiles:
+            self._logger.debug(
+                "Profile matching skipped %d profiles: %s",
+                len(skipped_profiles),
+                "; ".join(skipped_profiles)
+            )
+
+        # Stage 5: collapse cohesive near-duplicate groups into one aggregate
+        # candidate each (loose groups stay individual). No-op without groups.
+        snapshots, group_members, member_snaps = self._grouped_snapshots(snapshots)
+
+        config = {
+            "min_duration_ratio": self._min_duration_ratio,
+            "max_duration_ratio": self._max_duration_ratio,
+            "dtw_bandwidth": self.dtw_bandwidth,
+            # On-device tuned scoring weights (opt-in); empty = shipped defaults.
+            **self._matching_overrides(),
+        }
+        return snapshots, group_members, member_snaps, config
+
+    def _finish_match(
+        self,
+        candidates: list[dict[str, Any]],
+        current_power_list: list[float],
+        current_duration: float,
+        snapshots_count: int,
+        group_members: dict[str, list[str]],
+        member_snaps: dict[str, dict[str, Any]],
+    ) -> MatchResult:
+        """Turn the worker's ranked candidates into a :class:`MatchResult`."""
         if not candidates:
             profiles_count = len(self._data.get("profiles", {}))
-            snapshots_count = len(snapshots) if 'snapshots' in dir() else 0
             self._logger.debug(
                 "No profile match candidates: profiles=%d, snapshots=%d, "
                 "duration=%.0fs. Possible reasons: duration ratio filter, "
@@ -5322,6 +6061,7 @@ class ProfileStore:
             "avg_duration": cycle["duration"],
             "sample_cycle_id": source_cycle_id,
         }
+        self._journal_key("profiles")
 
         # Save to persist the label
         await self.async_save()
@@ -5467,6 +6207,7 @@ class ProfileStore:
         # Create profile with minimal data (will be updated when cycles are labeled)
         profile_data.setdefault("phases", [])
         self._data.setdefault("profiles", {})[name] = profile_data
+        self._journal_key("profiles")
 
         # Build the envelope from any already-labeled cycles (e.g. reference cycle above)
         await self.async_rebuild_envelope(name)
@@ -5491,12 +6232,15 @@ class ProfileStore:
 
             # Rename in profiles dict
             profiles[new_name] = profiles.pop(old_name)
+            self._journal_key("profiles")
 
             # Rename in envelopes
             if "envelopes" in self._data and old_name in self._data["envelopes"]:
                 self._data["envelopes"][new_name] = self._data["envelopes"].pop(
                     old_name
                 )
+            self._journal_envelope(old_name)
+            self._journal_envelope(new_name)
 
             renamed = True
 
@@ -5505,6 +6249,7 @@ class ProfileStore:
         # Handle Duration Update
         if avg_duration is not None and avg_duration > 0:
             profiles[target_name]["avg_duration"] = float(avg_duration)
+            self._journal_key("profiles")
             # If there's an envelope, we ideally update its target_duration too,
             # but envelope is usually rebuilt from data.
             # However, for manual profiles, envelope might be empty or theoretical.
@@ -5520,13 +6265,12 @@ class ProfileStore:
         if renamed:
             # 1. Update past + imported reference cycles (imports carry profile_name
             #    too; leaving them under the old name orphans them from the matcher).
-            for cycle in (
-                list(self._data.get("past_cycles", []))
-                + list(self._data.get("reference_cycles", []))
-            ):
-                if cycle.get("profile_name") == old_name:
-                    cycle["profile_name"] = new_name
-                    count += 1
+            for section in _TRACE_SECTIONS:
+                for cycle in self._data.get(section, []):
+                    if cycle.get("profile_name") == old_name:
+                        cycle["profile_name"] = new_name
+                        self._journal_cycle(cycle, section)
+                        count += 1
 
             # 2. Update pending feedback
             pending = self.get_pending_feedback()
@@ -5547,6 +6291,7 @@ class ProfileStore:
                 mems = g.get("members") if isinstance(g, dict) else None
                 if isinstance(mems, list) and old_name in mems:
                     g["members"] = [new_name if m == old_name else m for m in mems]
+            self._journal_key("pending_feedback", "feedback_history", "profile_groups")
 
             self._logger.info(
                 "Renamed profile '%s' to '%s', updated %s cycles and associated feedback",
@@ -5555,7 +6300,7 @@ class ProfileStore:
                 count,
             )
 
-        await self.async_save()
+        await self.async_save_changes()
         return count
 
     async def delete_profile(self, name: str, unlabel_cycles: bool = True) -> int:
@@ -5568,6 +6313,7 @@ class ProfileStore:
 
         # Delete profile
         del self._data["profiles"][name]
+        self._journal_key("profiles")
 
         # Handle cycles (past + imported reference; both carry profile_name, so an
         # imported cycle would otherwise keep a dangling label for a deleted profile).
@@ -5612,9 +6358,9 @@ class ProfileStore:
         self._data["lifetime_cycle_count"] = 0
         self._data["settings_changelog"] = []
         self._data["suggestion_apply_cycle_count"] = 0
-        self._cached_sample_segments = {}
-        self._cohesion_cache = {}
-        self._cohesion_cache_generation += 1
+        self._match_index.clear()
+        self._cycle_index.clear()
+        self._derived.clear()
         await self.async_save()
         self._logger.info("Cleared all WashData storage")
 
@@ -5653,6 +6399,7 @@ class ProfileStore:
         # Update cycle
         cycle["profile_name"] = profile_name if profile_name else None
         cycle["label_source"] = "manual" if profile_name else None
+        self._journal_cycle(cycle)
 
         # Update profile metadata if this is the first cycle
         if profile_name:
@@ -5660,16 +6407,21 @@ class ProfileStore:
             if not profile.get("sample_cycle_id"):
                 profile["sample_cycle_id"] = cycle_id
                 profile["avg_duration"] = cycle["duration"]
+                self._journal_key("profiles")
 
         # Rebuild envelopes for affected profiles
         if old_profile and old_profile != profile_name:
             await self.async_rebuild_envelope(old_profile)  # Old profile lost a cycle
+        if profile_name and old_profile != profile_name:
+            # New profile gained a cycle
+            await self.async_add_cycle_to_envelope(profile_name, cycle)
+        elif profile_name:
+            await self.async_rebuild_envelope(profile_name)
         if profile_name:
-            await self.async_rebuild_envelope(profile_name)  # New profile gained a cycle
             # Apply retention after labeling, in case profile now exceeds cap
             await self.async_enforce_retention()
 
-        await self.async_save()
+        await self.async_save_changes()
         self._logger.info("Assigned profile '%s' to cycle %s", profile_name, cycle_id)
         # Trigger smart processing to potentially merge now-labeled cycle
         await self.async_smart_process_history()
@@ -5696,6 +6448,7 @@ class ProfileStore:
             op = self._data.get("profiles", {}).get(old_profile)
             if op is not None and op.get("sample_cycle_id") == ref_id:
                 op["sample_cycle_id"] = None
+                self._journal_key("profiles")
             old_has_cycles = any(
                 c.get("profile_name") == old_profile
                 for c in list(self._data.get("past_cycles", []))
@@ -5706,6 +6459,7 @@ class ProfileStore:
             else:
                 self._data.get("profiles", {}).pop(old_profile, None)
                 self._data.get("envelopes", {}).pop(old_profile, None)
+                self._journal_key("profiles")
         if profile_name:
             await self.async_rebuild_envelope(profile_name)
         await self.async_save()
@@ -5714,6 +6468,46 @@ class ProfileStore:
             ref.get("id"), profile_name,
         )
 
+    async def _async_match_stored_cycles(
+        self, cycles: list[CycleDict]
+    ) -> list[MatchResult | None]:
+        """``async_match_profile`` for many stored cycles, fanned out over the
+        worker pool. None marks a cycle whose trace is too short to match.
+
+        Pass 1 resamples every trace; pass 2 matches each against the snapshots
+        of its ``used_dt``. Chunks are cut per ``used_dt`` so a chunk carries
+        its snapshots once. The match index is not touched in between, so each
+        cycle gets the same result a sequential ``async_match_profile`` would.
+        """
+        pool = get_worker_pool(self.hass)
+        traces = await pool.async_map(
+            match_trace_worker,
+            [{k: c[k] for k in ("power_data", "start_time") if k in c} for c in cycles],
+        )
+
+        results: list[MatchResult | None] = [None] * len(cycles)
+        by_dt: dict[float, list[int]] = {}
+        for index, trace in enumerate(traces):
+            if trace is not None:
+                by_dt.setdefault(trace[1], []).append(index)
+
+        for used_dt, indices in by_dt.items():
+            try:
+                snapshots, group_members, member_snaps, config = self._match_inputs(used_dt)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                self._logger.error("Preparation for async match failed: %s", e)
+                continue
+            jobs = [
+                (traces[i][0], cycles[i]["duration"], snapshots, config) for i in indices
+            ]
+            matched = await pool.async_map(match_cycle_worker, jobs)
+            for index, candidates in zip(indices, matched):
+                results[index] = self._finish_match(
+                    candidates, traces[index][0], cycles[index]["duration"],
+                    len(snapshots), group_members, member_snaps,
+                )
+        return results
+
     async def auto_label_cycles(
         self, confidence_threshold: float = 0.75, overwrite: bool = False
     ) -> dict[str, int]:
@@ -5733,20 +6527,17 @@ class ProfileStore:
         if not overwrite:
             target_cycles = [c for c in cycles if not c.get("profile_name")]
         else:
-            target_cycles = cycles
+            target_cycles = list(cycles)
 
         stats["total"] = len(target_cycles)
 
-        for cycle in target_cycles:
-            # Reconstruct power data for matching
-            power_data = decompress_power_data(cycle)
-            if not power_data or len(power_data) < 10:
+        results = await self._async_match_stored_cycles(target_cycles)
+
+        for cycle, result in zip(target_cycles, results):
+            if result is None:
                 stats["skipped"] += 1
                 continue
 
-            # Try to match
-            result = await self.async_match_profile(power_data, cycle["duration"])
-
             # Honor the ambiguity safeguard: never auto-label a close/ambiguous match.
             if result.best_profile and result.confidence >= confidence_threshold and not result.is_ambiguous:
                 current_label = cycle.get("profile_name")
@@ -6043,8 +6834,10 @@ class ProfileStore:
             raise ValueError(
                 "Import payload contains no profiles or cycles — aborting to prevent data loss"
             )
-        self._data = data_dict
-        self._cached_sample_segments = {}
+        self._data = StoreDocument(data_dict)
+        self._match_index.clear()
+        self._cycle_index.clear()
+        self._derived.clear()
         await self.async_save()
 
         return {
@@ -6209,12 +7002,14 @@ class ProfileStore:
                     local_profiles[name] = dict(src_def)
                     name_remap[name] = name
                     created_profiles += 1
+            self._journal_key("profiles")
 
         def _ensure_profile(name: str, duration: float) -> None:
             nonlocal created_profiles
             if name and name not in local_profiles:
                 local_profiles[name] = {"avg_duration": float(duration or 0)}
                 created_profiles += 1
+                self._journal_key("profiles")
 
         # Replace-mode wipes (hoisted so the id pools + dedup set below reflect the
         # post-wipe lists). Each ticked cycle category clears the list it actually writes to
@@ -6399,7 +7194,9 @@ class ProfileStore:
         for p in sorted(touched):
             await self.async_rebuild_envelope(p)
 
-        self._cached_sample_segments = {}
+        self._match_index.clear()
+        self._cycle_index.clear()
+        self._derived.clear()
         await self.async_save()
 
         settings_out: dict[str, Any] = {}
@@ -6429,22 +7226,25 @@ class ProfileStore:
 
         profile_name = cycle_to_delete.get("profile_name")
         self._data["past_cycles"] = [c for c in cycles if c.get("id") != cycle_id]
+        self._journal_cycle(cycle_id)
 
         if len(self._data["past_cycles"]) < initial_len:
             # Check profile references
             for _p_name, p_data in self.get_profiles().items():
                 if p_data.get("sample_cycle_id") == cycle_id:
                     p_data["sample_cycle_id"] = None
+                    self._journal_key("profiles")
 
             # Drop any pending feedback for this cycle so it can't orphan the
             # "needs review" count (the count would say 1 while the cycle is gone).
-            self._data.get("pending_feedback", {}).pop(cycle_id, None)
+            if self._data.get("pending_feedback", {}).pop(cycle_id, None) is not None:
+                self._journal_key("pending_feedback")
 
             # Rebuild envelope if cycle belonged to a profile
             if profile_name:
                 await self.async_rebuild_envelope(profile_name)
 
-            await self.async_save()
+            await self.async_save_changes()
             return True
         return False
 
@@ -6466,6 +7266,7 @@ class ProfileStore:
         for _p_name, p_data in self.get_profiles().items():
             if p_data.get("sample_cycle_id") == cycle_id:
                 p_data["sample_cycle_id"] = None
+                self._journal_key("profiles")
         if profile_name:
             # If removing this recording leaves the profile with no cycles at all
             # (no real, no imported), drop the now-empty profile. Otherwise a
@@ -6481,6 +7282,7 @@ class ProfileStore:
             else:
                 self._data.get("profiles", {}).pop(profile_name, None)
                 self._data.get("envelopes", {}).pop(profile_name, None)
+                self._journal_key("profiles")
         await self.async_save()
         return True
 
@@ -6501,7 +7303,17 @@ class ProfileStore:
             )
         if cycle is None:
             return []
-        return decompress_power_data(cycle)
+        # Cached per stored power_data list (a trim or split replaces it); the
+        # copy keeps callers from mutating the cached trace.
+        raw = cycle.get("power_data")
+        return list(
+            self._derived.get_or_build(
+                ("cycle_power", cycle_id),
+                (("cycle", cycle_id),),
+                lambda: decompress_power_data(cycle),
+                source=raw,
+            )
+        )
 
     async def trim_cycle_power_data(
         self,
@@ -6608,11 +7420,10 @@ class ProfileStore:
             meta["edited"] = True
             meta["trim"] = [round(new_start_s, 1), round(new_end_s, 1)]
 
-        # Invalidate cached sample segments for this cycle so future lookups
+        # Invalidate cached matching templates for this cycle so future lookups
         # are recomputed from the trimmed data
-        stale_keys = [k for k in self._cached_sample_segments if k[0] == cycle_id]
-        for k in stale_keys:
-            del self._cached_sample_segments[k]
+        self._match_index.note_cycle(cycle_id)
+        self._cycle_index.invalidate()
 
         # Rebuild envelope for the associated profile
         profile_name = cycle.get("profile_name")
@@ -6843,6 +7654,7 @@ class ProfileStore:
             p_data = self._data["profiles"].get(original_profile)
             if p_data and p_data.get("sample_cycle_id") == original_sample_id:
                 p_data["sample_cycle_id"] = best_replacement_id
+                self._journal_key("profiles")
 
         # Rebuild envelopes ONLY for the profiles whose dataset actually changed:
         # the original profile (it lost the parent cycle) plus any profile a labeled
@@ -7034,6 +7846,7 @@ class ProfileStore:
         for p_data in self.get_profiles().values():
             if p_data.get("sample_cycle_id") in all_removed_ids:
                 p_data["sample_cycle_id"] = new_id
+                self._journal_key("profiles")
 
         # Remove consumed cycles
         self._data["past_cycles"] = [
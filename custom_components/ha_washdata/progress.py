@@ -32,6 +32,7 @@ from __future__ import annotations
 
 import logging
 import math
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, cast
@@ -46,6 +47,7 @@ from .const import (
     STATE_PAUSED,
     STATE_RUNNING,
 )
+from .power_trace import PowerTrace
 from .profile_store import decompress_power_data
 from .time_utils import power_data_to_offsets
 
@@ -109,11 +111,19 @@ def profile_end_expectation(
 EndExpFn = Any  # Callable[[str, float], dict[str, float] | None]
 
 
+def _trace_points(trace: Sequence[tuple[datetime, float]]) -> list[tuple[float, float]]:
+    """``[(offset_s, watts), ...]`` from the first reading."""
+    if isinstance(trace, PowerTrace):
+        return trace.offset_points()
+    t0 = trace[0][0]
+    return [(float((t - t0).total_seconds()), float(p)) for t, p in trace]
+
+
 def ml_progress_percent(
     store: Any,
     options: Any,
     matched_duration: float,
-    trace: list[tuple[datetime, float]],
+    trace: Sequence[tuple[datetime, float]],
     profile_name: str,
     end_expectation_fn: EndExpFn,
     logger: logging.Logger | None = None,
@@ -148,8 +158,7 @@ def ml_progress_percent(
         )
         if expectation is None:
             return None
-        t0 = trace[0][0]
-        pts = [(float((t - t0).total_seconds()), float(p)) for t, p in trace]
+        pts = _trace_points(trace)
         from .ml.feature_extraction import progress_features
 
         feat = progress_features(pts, expectation)
@@ -168,7 +177,7 @@ def ml_energy_total(
     store: Any,
     options: Any,
     matched_duration: float,
-    trace: list[tuple[datetime, float]],
+    trace: Sequence[tuple[datetime, float]],
     profile_name: str,
     end_expectation_fn: EndExpFn,
     logger: logging.Logger | None = None,
@@ -199,8 +208,7 @@ def ml_energy_total(
         )
         if expectation is None:
             return None
-        t0 = trace[0][0]
-        pts = [(float((t - t0).total_seconds()), float(p)) for t, p in trace]
+        pts = _trace_points(trace)
         from .ml.feature_extraction import cumulative_energy_wh, progress_features
 
         feat = progress_features(pts, expectation)
@@ -730,7 +738,7 @@ def projected_energy(
     store: Any,
     options: Any,
     matched_duration: float,
-    trace: list[tuple[datetime, float]],
+    trace: Sequence[tuple[datetime, float]],
     current_program: str | None,
     cycle_progress: float,
     energy_so_far: float,
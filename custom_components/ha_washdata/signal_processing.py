@@ -96,7 +96,6 @@ def integrate_wh(
     return float(np.sum(avg_power[mask] * dt_hours[mask]))
 
 
-
 def resample_uniform(
     timestamps: np.ndarray, power: np.ndarray, dt_s: float = 5.0, gap_s: float = 60.0
 ) -> List[Segment]:
@@ -0,0 +1,211 @@
+# WashData - Home Assistant integration for appliance cycle monitoring via smart plugs.
+# Copyright (C) 2026 Lukas Bandura
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Append-only mutation journal for the WashData store.
+
+``ProfileStore.async_save`` writes a full JSON snapshot. Between snapshots,
+``ProfileStore.async_save_changes`` appends only the records that changed to
+``<store path>.journal`` as NDJSON, one op per line:
+
+    {"e": epoch, "op": "cycle", "s": section, "id": cycle_id, "v": {...} | null}
+    {"e": epoch, "op": "env", "k": profile_name, "v": {...} | null}
+    {"e": epoch, "op": "key", "k": top_level_key, "v": value}
+    {"e": epoch, "op": "del_key", "k": top_level_key}
+
+Every op is an idempotent upsert/delete of a whole record, so replay is just
+"apply in order". The snapshot stores the ``journal_epoch`` it was written
+at; each snapshot bumps the epoch and truncates the journal afterwards, so a
+crash between the two leaves only stale-epoch lines that replay ignores. A
+torn final line (crash mid-append) is skipped.
+
+File methods block and must run in the executor.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections.abc import Iterable
+from typing import Any
+
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fold the journal into a fresh snapshot once it outgrows the snapshot itself
+# (or this floor, for small stores), which bounds replay time and keeps the
+# amortised snapshot cost per journaled byte constant.
+JOURNAL_COMPACT_MIN_BYTES = 1024 * 1024
+
+JournalOp = dict[str, Any]
+
+
+class StoreDocument(dict[str, Any]):
+    """The store's top-level dict; records which keys changed since the last save.
+
+    Assigning, replacing or removing a top-level key marks it in :attr:`dirty`
+    on its own. An edit *inside* a value (a profile field, an appended log
+    entry) is invisible here and must be marked by the caller, see
+    ``ProfileStore._journal_key``. ``ProfileStore.async_save_changes`` journals
+    exactly the marked keys, so its cost does not grow with the store.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.dirty: set[str] = set()
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.dirty.add(key)
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self.dirty.add(key)
+
+    def __ior__(self, other: Any) -> StoreDocument:
+        self.update(other)
+        return self
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key in self:
+            self.dirty.add(key)
+        return super().pop(key, *default)
+
+    def popitem(self) -> tuple[str, Any]:
+        key, value = super().popitem()
+        self.dirty.add(key)
+        return key, value
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self) -> None:
+        self.dirty.update(self)
+        super().clear()
+
+
+class StoreJournal:
+    """NDJSON journal file next to the JSON store."""
+
+    def __init__(self, store_path: str) -> None:
+        self.path = f"{store_path}.journal"
+        self.size = 0
+
+    def append(self, payload: bytes) -> int:
+        """Append pre-encoded op lines durably; return the number of bytes written."""
+        if not payload:
+            return 0
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "ab") as fh:
+            fh.write(payload)
+            fh.flush()
+            os.fsync(fh.fileno())
+        self.size += len(payload)
+        return len(payload)
+
+    def read(self, epoch: int) -> list[JournalOp]:
+        """Return the ops written at ``epoch``, in order."""
+        try:
+            with open(self.path, "rb") as fh:
+                raw = fh.read()
+        except FileNotFoundError:
+            self.size = 0
+            return []
+        self.size = len(raw)
+        ops: list[JournalOp] = []
+        for line in raw.splitlines():
+            if not line.strip():
+                continue
+            try:
+                op = json_loads(line)
+            except ValueError:
+                _LOGGER.warning("Skipping unreadable journal record in %s", self.path)
+                continue
+            if isinstance(op, dict) and op.get("e") == epoch:
+                ops.append(op)
+        return ops
+
+    def truncate(self) -> None:
+        """Empty the journal (called once a snapshot covers every op in it)."""
+        try:
+            with open(self.path, "wb") as fh:
+                fh.flush()
+                os.fsync(fh.fileno())
+        except FileNotFoundError:
+            pass
+        self.size = 0
+
+
+def encode_op(op: JournalOp) -> bytes:
+    """Serialise one op as a journal line.
+
+    Encoding happens on the event loop, before the bytes are handed to the
+    executor, so the live store dicts are never walked from another thread.
+    """
+    return json_bytes(op) + b"\n"
+
+
+def apply_ops(data: dict[str, Any], ops: Iterable[JournalOp]) -> int:
+    """Replay journal ops onto a loaded snapshot dict; return ops applied."""
+    applied = 0
+    index: dict[str, dict[str, int]] = {}
+
+    def _position(section: str, cycle_id: str) -> int | None:
+        seq = data.setdefault(section, [])
+        if section not in index:
+            index[section] = {
+                c.get("id"): i for i, c in enumerate(seq) if isinstance(c, dict)
+            }
+        return index[section].get(cycle_id)
+
+    for op in ops:
+        kind = op.get("op")
+        if kind == "cycle":
+            section, cycle_id, value = op.get("s"), op.get("id"), op.get("v")
+            if not isinstance(section, str) or not isinstance(cycle_id, str):
+                continue
+            pos = _position(section, cycle_id)
+            seq = data[section]
+            if value is None:
+                if pos is not None:
+                    del seq[pos]
+                    index.pop(section, None)
+            elif pos is not None:
+                seq[pos] = value
+            else:
+                seq.append(value)
+                index[section][cycle_id] = len(seq) - 1
+        elif kind == "env":
+            envelopes = data.setdefault("envelopes", {})
+            if op.get("v") is None:
+                envelopes.pop(op.get("k"), None)
+            else:
+                envelopes[op.get("k")] = op["v"]
+        elif kind == "key":
+            data[op.get("k")] = op.get("v")
+        elif kind == "del_key":
+            data.pop(op.get("k"), None)
+        else:
+            continue
+        applied += 1
+    return applied
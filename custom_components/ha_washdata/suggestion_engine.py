@@ -1507,25 +1507,27 @@ class MLSuggestionEngine:
         self.device_type = classic.device_type
 
     def _load_models(self) -> tuple[Any, Any, Any, Any] | None:
-        """Resolve (end_score_fn, quality_score_fn, end_feat_fn, quality_feat_fn).
+        """Resolve (end_scorer, quality_scorer, end_feat_fn, quality_feat_fn).
 
-        Score fns prefer an on-device trained spec over the embedded baseline
-        (via :func:`ml.engine.resolve_scorer`), so ML-calibrated suggestions use
-        the user's personalised model once one has been trained.
+        Scorers prefer an on-device trained spec over the embedded baseline
+        (via :func:`ml.engine.resolve_matrix_scorer`), so ML-calibrated
+        suggestions use the user's personalised model once one has been trained.
+        Either may be None; features of the whole history are scored in one
+        batch per model.
         """
         try:
-            from .ml.engine import resolve_scorer
+            from .ml.engine import resolve_matrix_scorer
             from .ml.feature_extraction import (
                 latest_end_event_features,
                 quality_features,
             )
         except Exception:  # pylint: disable=broad-exception-caught
             return None
-        end_fn, _ = resolve_scorer("end", self.profile_store)
-        quality_fn, _ = resolve_scorer("quality", self.profile_store)
-        if end_fn is None and quality_fn is None:
+        end_scorer = resolve_matrix_scorer("end", self.profile_store)
+        quality_scorer = resolve_matrix_scorer("quality", self.profile_store)
+        if end_scorer is None and quality_scorer is None:
             return None
-        return (end_fn, quality_fn, latest_end_event_features, quality_features)
+        return (end_scorer, quality_scorer, latest_end_event_features, quality_features)
 
     def _profile_expectations(
         self, clean: list[dict[str, Any]]
@@ -1535,17 +1537,16 @@ class MLSuggestionEngine:
 
         return profile_expectations(clean)
 
-    def _scored_pauses(
+    def _pause_features(
         self,
         points: list[tuple[float, float]],
         expectation: dict[str, float],
         stop_threshold_w: float,
-        end_score_fn: Any,
         end_feat_fn: Any,
-    ) -> list[tuple[float, float | None]]:
-        """Return (duration_s, P(end)) for each internal pause (>=30s) that
-        resumed. P(end) is the end-detector's score for a prefix ending in that
-        pause; ``None`` if scoring failed."""
+    ) -> list[tuple[float, dict[str, float] | None]]:
+        """Return (duration_s, end features) for each internal pause (>=30s)
+        that resumed. The features are the end-detector's for a prefix ending in
+        that pause; ``None`` if they could not be computed."""
         if not points or len(points) < 6:
             return []
         powers = [p for _, p in points]
@@ -1559,7 +1560,7 @@ class MLSuggestionEngine:
         # pause; its span must not be counted as pause duration (it would inflate
         # dur and, downstream, the p95 that sizes _ml_off_delay / off_delay_pauses).
         max_gap_s = _MAX_PAUSE_GAP_H * 3600
-        out: list[tuple[float, float | None]] = []
+        out: list[tuple[float, dict[str, float] | None]] = []
         # Same pause detector as the classic off_delay heuristic: a low run that
         # resumed into sustained activity (a terminal drying/pump-out blip that does
         # not sustain is not a pause).  ``resume_idx`` is the first active sample of
@@ -1568,22 +1569,60 @@ class MLSuggestionEngine:
             dur = points[resume_idx - 1][0] - low_start_s
             if dur < 30.0:  # ignore motor micro-dips
                 continue
-            score: float | None = None
+            feat: dict[str, float] | None = None
             try:
                 feat = end_feat_fn(points[:resume_idx], expectation)  # tail is the low run
-                if feat is not None:
-                    score = float(end_score_fn(feat))
             except Exception:  # pylint: disable=broad-exception-caught
                 pass
-            out.append((dur, score))
+            out.append((dur, feat))
         return out
 
+    def _scored_pauses(
+        self,
+        clean: list[dict[str, Any]],
+        expectations: dict[str, dict[str, float]],
+        stop_thr: float,
+        end_scorer: Any,
+        end_feat_fn: Any,
+    ) -> list[list[tuple[float, float | None]]]:
+        """(duration_s, P(end)) of every resumed pause, one list per usable cycle.
+
+        A cycle is usable with a profile expectation and at least 6 readings.
+        All pauses of the history are scored in one end-detector batch; P(end)
+        is ``None`` where features or scoring failed.
+        """
+        per_cycle: list[list[tuple[float, dict[str, float] | None]]] = []
+        for c in clean:
+            exp = expectations.get(c.get("profile_name"))
+            if not exp:
+                continue
+            points = _cycle_readings(c)
+            if len(points) < 6:
+                continue
+            per_cycle.append(self._pause_features(points, exp, stop_thr, end_feat_fn))
+
+        rows = [feat for pauses in per_cycle for _dur, feat in pauses if feat is not None]
+        scores: list[float] = []
+        if rows and end_scorer is not None:
+            try:
+                scores = [float(v) for v in end_scorer.score_rows(rows)]
+            except Exception:  # pylint: disable=broad-exception-caught
+                scores = []
+        it = iter(scores)
+        return [
+            [
+                (dur, next(it, None) if feat is not None else None)
+                for dur, feat in pauses
+            ]
+            for pauses in per_cycle
+        ]
+
     def generate_ml_suggestions(self) -> dict[str, Any]:
         """Produce ML-calibrated suggestions from clean cycle history."""
         models = self._load_models()
         if models is None:
             return {}
-        end_score_fn, quality_score_fn, end_feat_fn, quality_feat_fn = models
+        end_scorer, quality_scorer, end_feat_fn, quality_feat_fn = models
 
         raw_cycles = self.profile_store.get_past_cycles()[-200:]
         stop_thr = self._classic._current_stop_threshold(self._classic._entry_options())
@@ -1599,17 +1638,16 @@ class MLSuggestionEngine:
         )
 
         out: dict[str, dict[str, Any]] = {}
-        off_delay = self._ml_off_delay(
-            clean, expectations, stop_thr, end_score_fn, end_feat_fn, device_floor
-        )
+        pauses = self._scored_pauses(clean, expectations, stop_thr, end_scorer, end_feat_fn)
+        off_delay = self._ml_off_delay(pauses, device_floor)
         if off_delay is not None:
             out[CONF_OFF_DELAY] = off_delay
 
-        erc = self._ml_end_repeat_count(clean, expectations, stop_thr, end_score_fn, end_feat_fn)
+        erc = self._ml_end_repeat_count(pauses)
         if erc is not None:
             out[CONF_END_REPEAT_COUNT] = erc
 
-        alc = self._ml_auto_label_confidence(clean, expectations, quality_score_fn, quality_feat_fn)
+        alc = self._ml_auto_label_confidence(clean, expectations, quality_scorer, quality_feat_fn)
         if alc is not None:
             out[CONF_AUTO_LABEL_CONFIDENCE] = alc
 
@@ -1619,27 +1657,17 @@ class MLSuggestionEngine:
 
     def _ml_off_delay(
         self,
-        clean: list[dict[str, Any]],
-        expectations: dict[str, dict[str, float]],
-        stop_thr: float,
-        end_score_fn: Any,
-        end_feat_fn: Any,
+        pauses: list[list[tuple[float, float | None]]],
         device_floor: int,
     ) -> dict[str, Any] | None:
         """Off-delay from end-detector-confirmed pauses (P(end) < 0.4)."""
-        confirmed: list[float] = []
-        n_cycles = 0
-        for c in clean:
-            exp = expectations.get(c.get("profile_name"))
-            if not exp:
-                continue
-            points = _cycle_readings(c)
-            if len(points) < 6:
-                continue
-            n_cycles += 1
-            for dur, score in self._scored_pauses(points, exp, stop_thr, end_score_fn, end_feat_fn):
-                if score is not None and score < 0.4:
-                    confirmed.append(dur)
+        confirmed = [
+            dur
+            for cycle_pauses in pauses
+            for dur, score in cycle_pauses
+            if score is not None and score < 0.4
+        ]
+        n_cycles = len(pauses)
         if n_cycles < 5 or len(confirmed) < 3:
             return None
         p95 = float(np.percentile(confirmed, 95))
@@ -1662,28 +1690,16 @@ class MLSuggestionEngine:
 
     def _ml_end_repeat_count(
         self,
-        clean: list[dict[str, Any]],
-        expectations: dict[str, dict[str, float]],
-        stop_thr: float,
-        end_score_fn: Any,
-        end_feat_fn: Any,
+        pauses: list[list[tuple[float, float | None]]],
     ) -> dict[str, Any] | None:
         """Require extra end confirmations when the end-detector is fooled by
         pauses (scores a resuming pause > 0.5)."""
-        n_total = 0
-        n_false = 0
-        for c in clean:
-            exp = expectations.get(c.get("profile_name"))
-            if not exp:
-                continue
-            points = _cycle_readings(c)
-            if len(points) < 6:
-                continue
-            n_total += 1
-            for _dur, score in self._scored_pauses(points, exp, stop_thr, end_score_fn, end_feat_fn):
-                if score is not None and score > 0.5:
-                    n_false += 1
-                    break
+        n_total = len(pauses)
+        n_false = sum(
+            1
+            for cycle_pauses in pauses
+            if any(score is not None and score > 0.5 for _dur, score in cycle_pauses)
+        )
         if n_total < 15:
             return None
         frac = n_false / n_total
@@ -1707,11 +1723,14 @@ class MLSuggestionEngine:
         self,
         clean: list[dict[str, Any]],
         expectations: dict[str, dict[str, float]],
-        quality_score_fn: Any,
+        quality_scorer: Any,
         quality_feat_fn: Any,
     ) -> dict[str, Any] | None:
         """Lowest match-confidence band the quality model still rates as clean."""
-        clean_confs: list[float] = []
+        if quality_scorer is None:
+            return None
+        confs: list[float] = []
+        rows: list[dict[str, float]] = []
         for c in clean:
             raw_conf = c.get("match_confidence")
             if (
@@ -1738,11 +1757,17 @@ class MLSuggestionEngine:
                     profile_fit_score=conf,
                     flag_count=0,
                 )
-                q = float(quality_score_fn(feat))
             except Exception:  # pylint: disable=broad-exception-caught
                 continue
-            if q < 0.15:
-                clean_confs.append(conf)
+            confs.append(conf)
+            rows.append(feat)
+        if not rows:
+            return None
+        try:
+            scores = quality_scorer.score_rows(rows)
+        except Exception:  # pylint: disable=broad-exception-caught
+            return None
+        clean_confs = [conf for conf, q in zip(confs, scores) if q < 0.15]
         if len(clean_confs) < 10:
             return None
         p10 = float(np.percentile(clean_confs, 10))
@@ -36,6 +36,8 @@ from typing import Any, Literal, cast
 
 import homeassistant.util.dt as dt_util
 
+from .power_trace import PowerTrace
+
 _LOGGER = logging.getLogger(__name__)
 
 # Type aliases
@@ -93,6 +95,23 @@ def power_data_to_offsets(
     if not power_data:
         return []
 
+    if isinstance(power_data, PowerTrace):
+        # The detector's live trace: same offsets as the datetime branch below,
+        # read straight from its columns.
+        secs = power_data.epoch_seconds().tolist()
+        base = secs[0]
+        if start_time_iso:
+            try:
+                parsed = dt_util.parse_datetime(start_time_iso)
+                if parsed is not None:
+                    base = parsed.timestamp()
+            except (ValueError, OSError) as e:
+                _LOGGER.debug("Failed to parse datetime %s: %s", start_time_iso, e)
+        return [
+            [round(ts - base, 1), p]
+            for ts, p in zip(secs, power_data.watts().tolist())
+        ]
+
     fmt = detect_power_data_format(power_data)
 
     if fmt == "unix_timestamp":
@@ -0,0 +1,324 @@
+# WashData - Home Assistant integration for appliance cycle monitoring via smart plugs.
+# Copyright (C) 2026 Lukas Bandura
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Columnar sidecar file for cycle power traces.
+
+The ``.storage`` JSON document only keeps cycle *metadata*; every cycle's
+``power_data`` lives in a binary sidecar next to it, referenced from the
+cycle dict by ``power_ref = [record_pos, sample_count]``.
+
+File layout (little-endian)::
+
+    header   b"WDTR" | u16 format version | u16 reserved
+    record   u16 id_len | u8 dtype code | u8 reserved | u32 n
+             | cycle id (utf-8, zero-padded to a 4-byte boundary)
+             | offsets[n] | watts[n]
+
+Traces are stored column-wise so a reader gets two contiguous arrays straight
+out of an ``mmap`` without parsing. Samples that survive a float32 round trip
+(the canonical 0.1 s / 0.1 W rounding every stored trace gets) are written as
+float32; anything else falls back to float64 so the on-disk copy is always
+lossless.
+
+Records are append-only. A save only appends the traces that are new or were
+replaced since the last save; deleted/replaced records become garbage that
+:meth:`CycleTraceStore.write_generation` compacts away by writing a fresh
+*generation* file. The JSON snapshot names the generation it references, so a
+crash between writing a new generation and saving the JSON never leaves the
+metadata pointing into the wrong file.
+
+All methods block on file I/O and must run in the executor.
+"""
+
+from __future__ import annotations
+
+import glob
+import logging
+import mmap
+import os
+import struct
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import numpy as np
+
+_LOGGER = logging.getLogger(__name__)
+
+_MAGIC = b"WDTR"
+_FORMAT_VERSION = 1
+_FILE_HEADER = struct.Struct("<4sHH")
+_RECORD_HEADER = struct.Struct("<HBBI")
+
+_DTYPE_F32 = 1
+_DTYPE_F64 = 2
+_DTYPES: dict[int, np.dtype[Any]] = {
+    _DTYPE_F32: np.dtype("<f4"),
+    _DTYPE_F64: np.dtype("<f8"),
+}
+
+# Compact a generation once it is at least this large and more than half of it
+# is unreferenced (deleted cycles, stripped traces, replaced trims).
+COMPACT_MIN_BYTES = 4 * 1024 * 1024
+COMPACT_GARBAGE_RATIO = 0.5
+
+TraceRef = list[int]  # [record_pos, sample_count]
+
+
+def _pad4(n: int) -> int:
+    return (n + 3) & ~3
+
+
+def encode_trace(cycle_id: str, power_data: Sequence[Any]) -> bytes | None:
+    """Encode one ``[[offset, watts], ...]`` trace as a sidecar record.
+
+    Returns ``None`` when the trace is not a numeric ``(n, 2)`` sequence (e.g.
+    a legacy ``[iso_str, watts]`` trace); such cycles keep their trace inline
+    in the JSON document.
+    """
+    try:
+        arr = np.asarray(power_data, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+    if arr.ndim != 2 or arr.shape[0] == 0 or arr.shape[1] != 2:
+        return None
+
+    arr32 = arr.astype(np.float32)
+    lossless32 = bool(
+        np.array_equal(np.round(arr32.astype(np.float64), 1), arr, equal_nan=True)
+    )
+    code = _DTYPE_F32 if lossless32 else _DTYPE_F64
+    cols = arr32 if lossless32 else arr
+    dtype = _DTYPES[code]
+
+    id_bytes = cycle_id.encode("utf-8")
+    if len(id_bytes) > 0xFFFF:
+        return None
+    n = int(arr.shape[0])
+    return b"".join(
+        (
+            _RECORD_HEADER.pack(len(id_bytes), code, 0, n),
+            id_bytes.ljust(_pad4(len(id_bytes)), b"\0"),
+            np.ascontiguousarray(cols[:, 0], dtype=dtype).tobytes(),
+            np.ascontiguousarray(cols[:, 1], dtype=dtype).tobytes(),
+        )
+    )
+
+
+class CycleTraceStore:
+    """Generation-numbered sidecar files holding cycle power traces.
+
+    ``base_path`` is the JSON store path; generation ``g`` lives at
+    ``<base_path>.traces.<g>``.
+    """
+
+    def __init__(self, base_path: str) -> None:
+        self._base_path = base_path
+        self.generation = 0
+        self._file_size = 0
+
+    def path_for(self, generation: int) -> str:
+        return f"{self._base_path}.traces.{generation}"
+
+    @property
+    def path(self) -> str:
+        return self.path_for(self.generation)
+
+    @property
+    def file_size(self) -> int:
+        """Size in bytes of the current generation file (as last seen)."""
+        return self._file_size
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def read_traces(
+        self, generation: int, refs: Iterable[tuple[Any, str, TraceRef]]
+    ) -> dict[Any, tuple[list[list[float]], int]]:
+        """Materialize ``power_data`` lists for ``(key, cycle_id, ref)`` triples.
+
+        Returns ``key -> (power_data, record_size)``.
+
+        The generation file is memory-mapped and every record is decoded with
+        ``np.frombuffer`` directly over the mapping. Records that are missing,
+        truncated or belong to a different cycle id are skipped (and logged);
+        the caller treats those cycles like retention-stripped ones.
+        """
+        self.generation = generation
+        path = self.path_for(generation)
+        out: dict[Any, tuple[list[list[float]], int]] = {}
+        try:
+            fh = open(path, "rb")  # noqa: SIM115 - closed in finally
+        except FileNotFoundError:
+            self._file_size = 0
+            refs = list(refs)
+            if refs:
+                _LOGGER.warning(
+                    "Trace sidecar %s is missing; %s cycle trace(s) unavailable",
+                    path, len(refs),
+                )
+            return out
+        try:
+            self._file_size = os.fstat(fh.fileno()).st_size
+            if self._file_size < _FILE_HEADER.size:
+                return out
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, version, _ = _FILE_HEADER.unpack_from(mm, 0)
+                if magic != _MAGIC or version > _FORMAT_VERSION:
+                    _LOGGER.warning("Trace sidecar %s has an unknown format; ignoring", path)
+                    return out
+                skipped = 0
+                for key, cycle_id, ref in refs:
+                    decoded = self._decode(mm, cycle_id, ref)
+                    if decoded is None:
+                        skipped += 1
+                        continue
+                    out[key] = decoded
+                if skipped:
+                    _LOGGER.warning(
+                        "Trace sidecar %s: %s cycle trace(s) could not be read", path, skipped
+                    )
+        finally:
+            fh.close()
+        return out
+
+    def read_arrays(
+        self, cycle_id: str, ref: TraceRef
+    ) -> tuple[np.ndarray, np.ndarray] | None:
+        """Return ``(offsets, watts)`` float64 arrays for one cycle, or ``None``."""
+        try:
+            with open(self.path, "rb") as fh, mmap.mmap(
+                fh.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mm:
+                cols = self._columns(mm, cycle_id, ref)
+                if cols is None:
+                    return None
+                offsets, watts, _, _ = cols
+                # Copy out before the mapping closes.
+                result = offsets.astype(np.float64), watts.astype(np.float64)
+                del offsets, watts, cols
+                return result
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _columns(
+        mm: mmap.mmap, cycle_id: str, ref: TraceRef
+    ) -> tuple[np.ndarray, np.ndarray, bool, int] | None:
+        """Zero-copy ``(offsets, watts, is_float32, record_size)`` over one record."""
+        try:
+            pos, n = int(ref[0]), int(ref[1])
+        except (TypeError, ValueError, IndexError):
+            return None
+        if pos < _FILE_HEADER.size or pos + _RECORD_HEADER.size > len(mm):
+            return None
+        id_len, code, _, rec_n = _RECORD_HEADER.unpack_from(mm, pos)
+        dtype = _DTYPES.get(code)
+        if dtype is None or rec_n != n:
+            return None
+        id_start = pos + _RECORD_HEADER.size
+        data_start = id_start + _pad4(id_len)
+        if data_start + 2 * n * dtype.itemsize > len(mm):
+            return None
+        if mm[id_start:id_start + id_len].decode("utf-8", "replace") != cycle_id:
+            return None
+        offsets = np.frombuffer(mm, dtype=dtype, count=n, offset=data_start)
+        watts = np.frombuffer(
+            mm, dtype=dtype, count=n, offset=data_start + n * dtype.itemsize
+        )
+        size = data_start - pos + 2 * n * dtype.itemsize
+        return offsets, watts, code == _DTYPE_F32, size
+
+    def _decode(
+        self, mm: mmap.mmap, cycle_id: str, ref: TraceRef
+    ) -> tuple[list[list[float]], int] | None:
+        cols = self._columns(mm, cycle_id, ref)
+        if cols is None:
+            return None
+        offsets, watts, is_f32, size = cols
+        stacked = np.column_stack((offsets, watts)).astype(np.float64)
+        # column_stack copied the data; drop the views so the mapping can close.
+        del offsets, watts, cols
+        if is_f32:
+            # float32 records were 0.1-rounded on write; undo the float32 noise.
+            stacked = np.round(stacked, 1)
+        return stacked.tolist(), size
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, records: Sequence[tuple[Any, bytes]]) -> dict[Any, int]:
+        """Append encoded records to the current generation; return key -> pos.
+
+        Creates the generation file (with header) if it does not exist yet.
+        The file is fsync'd before returning so the JSON snapshot that is
+        written next never references bytes that are not durable.
+        """
+        path = self.path
+        positions: dict[Any, int] = {}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "ab") as fh:
+            pos = fh.tell()
+            if pos == 0:
+                fh.write(_FILE_HEADER.pack(_MAGIC, _FORMAT_VERSION, 0))
+                pos = _FILE_HEADER.size
+            for key, blob in records:
+                fh.write(blob)
+                positions[key] = pos
+                pos += len(blob)
+            fh.flush()
+            os.fsync(fh.fileno())
+        self._file_size = pos
+        return positions
+
+    def write_generation(
+        self, generation: int, records: Sequence[tuple[Any, bytes]]
+    ) -> dict[Any, int]:
+        """Write ``records`` into a fresh generation file (compaction).
+
+        The file is written to a temporary name and atomically renamed. The
+        previous generation is left in place until :meth:`remove_stale` runs
+        after the JSON snapshot referencing ``generation`` has been saved.
+        """
+        path = self.path_for(generation)
+        tmp = f"{path}.tmp"
+        positions: dict[Any, int] = {}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "wb") as fh:
+            fh.write(_FILE_HEADER.pack(_MAGIC, _FORMAT_VERSION, 0))
+            pos = _FILE_HEADER.size
+            for key, blob in records:
+                fh.write(blob)
+                positions[key] = pos
+                pos += len(blob)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+        self.generation = generation
+        self._file_size = pos
+        return positions
+
+    def remove_stale(self) -> None:
+        """Delete every generation file other than the current one."""
+        keep = self.path
+        for path in glob.glob(glob.escape(self._base_path) + ".traces.*"):
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError as err:
+                _LOGGER.debug("Could not remove stale trace file %s: %s", path, err)
@@ -0,0 +1,361 @@
+# WashData - Home Assistant integration for appliance cycle monitoring via smart plugs.
+# Copyright (C) 2026 Lukas Bandura
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Shared worker pool for the bulk jobs (reprocess, envelope rebuild,
+retro auto-labelling, Playground sweeps, matcher tuning).
+
+Those jobs are per-cycle / per-profile / per-config NumPy work with no shared
+mutable state, but each used to run as ONE executor job on one core. The pool
+fans a job out as chunks of items:
+
+* **Process lane** (default): chunks go to a ``spawn``-context
+  :class:`~concurrent.futures.ProcessPoolExecutor`. The function must be a
+  module-level callable (or a ``functools.partial`` of one) and the items
+  picklable - plain cycle dicts, lists, NumPy arrays. A chunk is pickled as one
+  payload, so an object its items share (e.g. the match snapshots of one
+  ``used_dt``) crosses the process boundary once per chunk, not once per item.
+* **Thread lane** (``processes=False``): for work that needs a live object
+  which cannot be pickled (the Playground replays against the ``ProfileStore``),
+  chunks run on the HA executor, at most ``max_workers`` at a time.
+
+The process pool is started on first use and shut down once no job has held it
+for ``_IDLE_SHUTDOWN_S``, so an idle install carries no extra processes while
+back-to-back stages of one bulk operation (reprocess -> envelope rebuild ->
+tuning) pay the spawn cost - one import of the integration per worker - once. When processes are
+unavailable (single core, a platform without working ``spawn``, a worker that
+died) the job degrades to the thread lane. Every lane runs the same function on
+the same items, so results are identical whichever lane ran them.
+
+Progress is reported per finished chunk via ``progress(done, total)`` and a
+``cancelled()`` callable is polled between chunks: on cancel the outstanding
+chunks are dropped and only finished results are yielded. :func:`task_hooks`
+builds both from a :class:`~.task_registry.Task`.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+from collections.abc import AsyncIterator, Callable, Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+
+from . import task_registry
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+_POOL_KEY = f"{DOMAIN}_worker_pool"
+
+# Leave one core to the event loop (and the recorder); more than four workers
+# buys little for the library sizes seen in practice and each one holds its own
+# copy of the integration's imports.
+_MAX_WORKERS_CAP = 4
+
+# Chunks per worker for the async lanes: enough for smooth progress and load
+# balancing across uneven items (a 6h cycle vs a 20min one), few enough that the
+# per-chunk pickling round trip stays negligible.
+_CHUNKS_PER_WORKER = 4
+
+# Keep idle workers this long after the last job released them.
+_IDLE_SHUTDOWN_S = 60.0
+
+
+ProgressFn = Callable[[int, int], None]
+CancelFn = Callable[[], bool]
+
+
+def _run_chunk(fn: Callable[[Any], Any], chunk: list[Any]) -> list[Any]:
+    """Apply ``fn`` to each item of one chunk (runs inside a worker)."""
+    return [fn(item) for item in chunk]
+
+
+def _is_lane_error(err: BaseException) -> bool:
+    """True when the process lane could not run a chunk at all (dead worker,
+    unpicklable payload) - as opposed to the job function itself raising."""
+    return isinstance(err, (BrokenProcessPool, pickle.PicklingError))
+
+
+def _picklable(fn: Callable[[Any], Any]) -> bool:
+    try:
+        pickle.dumps(fn)
+    except Exception:  # pylint: disable=broad-exception-caught
+        return False
+    return True
+
+
+def _default_max_workers() -> int:
+    return max(1, min(_MAX_WORKERS_CAP, (os.cpu_count() or 1) - 1))
+
+
+def _chunk_bounds(total: int, chunk_size: int) -> list[tuple[int, int]]:
+    size = max(1, int(chunk_size))
+    return [(start, min(total, start + size)) for start in range(0, total, size)]
+
+
+class WorkerPool:
+    """Fan-out executor shared by every WashData entry of one ``hass``."""
+
+    def __init__(self, hass: HomeAssistant, max_workers: int | None = None) -> None:
+        self.hass = hass
+        self.max_workers = max(1, int(max_workers or _default_max_workers()))
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        self._users = 0
+        self._idle_handle: asyncio.TimerHandle | None = None
+        # Set once process workers failed to start/run here; later jobs go
+        # straight to the thread lane instead of paying the failure again.
+        self._processes_disabled = self.max_workers < 2
+
+    # -- process executor lifecycle -----------------------------------------
+    def _acquire(self) -> Executor | None:
+        """Take a reference on the process executor (None = use threads)."""
+        with self._lock:
+            if self._processes_disabled:
+                return None
+            if self._executor is None:
+                try:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                except (OSError, ValueError, NotImplementedError) as err:
+                    _LOGGER.info("Worker processes unavailable, using threads: %s", err)
+                    self._processes_disabled = True
+                    return None
+            self._users += 1
+            return self._executor
+
+    def _release(self, executor: Executor | None) -> None:
+        if executor is None:
+            return
+        with self._lock:
+            self._users -= 1
+            if self._executor is executor:
+                if self._users <= 0:
+                    self.hass.loop.call_soon_threadsafe(self._schedule_idle_shutdown)
+                return
+        # A pool this job was still holding after it was dropped as broken.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    @callback
+    def _schedule_idle_shutdown(self) -> None:
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+        self._idle_handle = self.hass.loop.call_later(
+            _IDLE_SHUTDOWN_S, self._idle_shutdown
+        )
+
+    @callback
+    def _idle_shutdown(self) -> None:
+        self._idle_handle = None
+        with self._lock:
+            if self._users > 0 or self._executor is None:
+                return
+            executor, self._executor = self._executor, None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _lane_failed(self, executor: Executor | None, err: BaseException) -> None:
+        """Record a process-lane failure seen by one job."""
+        if not isinstance(err, BrokenProcessPool):
+            # Unpicklable payload: specific to this job, the workers are fine.
+            _LOGGER.debug("Job payload not picklable (%s); running it on threads", err)
+            return
+        with self._lock:
+            if self._processes_disabled:
+                return
+            # A worker died (most likely out of memory): stop using processes
+            # on this host rather than re-spawning into the same failure.
+            self._processes_disabled = True
+            if self._executor is executor:
+                self._executor = None
+        _LOGGER.warning("Worker process lane failed (%s); falling back to threads", err)
+
+    def shutdown(self) -> None:
+        """Stop the process workers (HA shutdown)."""
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._users = 0
+            self._processes_disabled = True
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # -- async API (event loop) ------------------------------------------------
+    async def async_imap(
+        self,
+        fn: Callable[[Any], Any],
+        items: Iterable[Any],
+        *,
+        chunk_size: int | None = None,
+        processes: bool = True,
+        progress: ProgressFn | None = None,
+        cancelled: CancelFn | None = None,
+    ) -> AsyncIterator[tuple[int, Any]]:
+        """Yield ``(index, fn(items[index]))`` as chunks finish (any order).
+
+        Stops early, dropping unfinished chunks, once ``cancelled()`` is true.
+        Exceptions raised by ``fn`` propagate to the caller.
+        """
+        work = list(items)
+        total = len(work)
+        if not total:
+            return
+        if chunk_size is None:
+            chunk_size = -(-total // (self.max_workers * _CHUNKS_PER_WORKER))
+        bounds = iter(_chunk_bounds(total, chunk_size))
+        executor = self._acquire() if processes and _picklable(fn) else None
+        lane = executor
+        # future -> (start, stop, ran on the process lane)
+        in_flight: dict[asyncio.Future[list[Any]], tuple[int, int, bool]] = {}
+        done = 0
+
+        def _submit(start: int, stop: int) -> None:
+            chunk = work[start:stop]
+            if lane is not None:
+                fut = asyncio.wrap_future(lane.submit(_run_chunk, fn, chunk))
+            else:
+                fut = self.hass.async_add_executor_job(_run_chunk, fn, chunk)
+            in_flight[fut] = (start, stop, lane is not None)
+
+        def _fill() -> None:
+            limit = self.max_workers * (2 if lane is not None else 1)
+            while len(in_flight) < limit:
+                nxt = next(bounds, None)
+                if nxt is None:
+                    return
+                _submit(*nxt)
+
+        try:
+            _fill()
+            while in_flight:
+                finished, _pending = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
+                )
+                for fut in finished:
+                    start, stop, in_process = in_flight.pop(fut)
+                    try:
+                        results = fut.result()
+                    except Exception as err:  # pylint: disable=broad-exception-caught
+                        if not in_process or not _is_lane_error(err):
+                            raise
+                        # The chunk never ran (or its worker died): redo it, and
+                        # everything not yet submitted, on the thread lane.
+                        if lane is not None:
+                            self._lane_failed(executor, err)
+                            lane = None
+                        _submit(start, stop)
+                        continue
+                    for offset, result in enumerate(results):
+                        yield start + offset, result
+                    done += stop - start
+                    if progress is not None:
+                        progress(done, total)
+                if cancelled is not None and cancelled():
+                    return
+                _fill()
+        finally:
+            for fut in in_flight:
+                fut.cancel()
+            self._release(executor)
+
+    async def async_map(
+        self,
+        fn: Callable[[Any], Any],
+        items: Iterable[Any],
+        *,
+        chunk_size: int | None = None,
+        processes: bool = True,
+        progress: ProgressFn | None = None,
+    ) -> list[Any]:
+        """``[fn(item) for item in items]``, fanned out; order preserved."""
+        work = list(items)
+        out: list[Any] = [None] * len(work)
+        async for index, result in self.async_imap(
+            fn, work, chunk_size=chunk_size, processes=processes, progress=progress
+        ):
+            out[index] = result
+        return out
+
+    # -- blocking API (executor threads) ---------------------------------------
+    def map(self, fn: Callable[[Any], Any], items: Iterable[Any]) -> list[Any]:
+        """Blocking ordered map for code that already runs in the executor.
+
+        One chunk per worker: such callers report no per-chunk progress, and
+        their items tend to share one large argument (pickled once per chunk).
+        """
+        work = list(items)
+        if not work:
+            return []
+        executor = self._acquire() if _picklable(fn) else None
+        if executor is None:
+            return _run_chunk(fn, work)
+        try:
+            size = -(-len(work) // self.max_workers)
+            futures = [
+                executor.submit(_run_chunk, fn, work[start:stop])
+                for start, stop in _chunk_bounds(len(work), size)
+            ]
+            try:
+                return [r for fut in futures for r in fut.result()]
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                if not _is_lane_error(err):
+                    raise
+                self._lane_failed(executor, err)
+                for fut in futures:
+                    fut.cancel()
+                return _run_chunk(fn, work)
+        finally:
+            self._release(executor)
+
+
+def task_hooks(
+    hass: HomeAssistant, task: Any, *, offset: int = 0
+) -> tuple[ProgressFn, CancelFn]:
+    """``(progress, cancelled)`` callbacks that drive a registry task.
+
+    ``offset`` shifts ``done`` for jobs that are one stage of a larger task.
+    """
+    reg = task_registry.get_registry(hass)
+
+    def _progress(done: int, _total: int) -> None:
+        reg.update(task, done=offset + done)
+
+    return _progress, lambda: bool(task.cancel_requested)
+
+
+def get_worker_pool(hass: HomeAssistant) -> WorkerPool:
+    """Get (or lazily create) the per-hass worker pool. Event loop only."""
+    pool = hass.data.get(_POOL_KEY)
+    if not isinstance(pool, WorkerPool):
+        pool = WorkerPool(hass)
+        hass.data[_POOL_KEY] = pool
+
+        @callback
+        def _on_stop(_event: Event) -> None:
+            pool.shutdown()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _on_stop)
+    return pool
@@ -84,8 +84,10 @@ from .const import (
     SHOW_ML_LAB,
     STATE_COLORS,
 )
+from . import cycle_index
 from . import playground
 from . import task_registry
+from . import worker_pool
 from .cycle_detector import CycleDetectorConfig
 from .setup_advisor import compute_setup_phase
 from .ws_schema import WS_OPEN_RESPONSES, WS_RESPONSE_TYPES
@@ -1105,6 +1107,8 @@ def async_register_commands(hass: HomeAssistant) -> None:
         ws_set_program,
         # Live match debug
         ws_get_match_debug,
+        # Hot-path stage timing (read / runtime switch)
+        ws_get_hot_path_stats, ws_set_hot_path_timing,
         # ML Lab shadow-mode comparison
         ws_get_ml_comparison,
         # ML Lab review write-back (Stage 4b)
@@ -1236,6 +1240,17 @@ def ws_get_devices(
         vol.Required("entry_id"): str,
         vol.Optional("limit", default=50): vol.All(int, vol.Range(min=1, max=200)),
         vol.Optional("offset", default=0): vol.All(int, vol.Range(min=0)),
+        vol.Optional("cursor"): vol.Any(str, None),
+        # Server-side filters (all optional; profile_name null = unlabeled).
+        vol.Optional("profile_name"): vol.Any(str, None),
+        vol.Optional("status"): str,
+        vol.Optional("review"): vol.In(cycle_index.REVIEW_STATES),
+        vol.Optional("since"): str,
+        vol.Optional("until"): str,
+        vol.Optional("sort", default=cycle_index.SORT_RECORDED): vol.In(cycle_index.SORT_KEYS),
+        vol.Optional("order", default="desc"): vol.In(["asc", "desc"]),
+        # Projection: only these cycle keys (traces are never included).
+        vol.Optional("fields"): [str],
     }
 )
 @callback
@@ -1244,59 +1259,104 @@ def ws_get_device_cycles(
     connection: websocket_api.ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """Return a page of recent cycles for a device, stripping large binary fields.
-
-    Cycles are returned most-recent-first and sliced ``[offset : offset+limit]``
-    so the panel can page. ``total`` is the device's full cycle count and
-    ``has_more`` is True when cycles remain beyond the returned window.
+    """Return a page of cycles for a device, stripping large binary fields.
+
+    Served from the store's cycle index (profile/status/review/date filters,
+    sorting, paging) without touching traces. By default cycles come
+    most-recent-first and ``[offset : offset+limit]`` is returned, as before.
+    Passing the previous page's ``next_cursor`` as ``cursor`` continues after
+    its last cycle instead, stable against cycles finishing meanwhile.
+    ``total`` is the number of cycles matching the filters (the device's full
+    count without filters) and ``has_more`` is True when more remain.
     """
     entry_id: str = msg["entry_id"]
     limit: int = msg.get("limit", 50)
     offset: int = msg.get("offset", 0)
+    cursor: str | None = msg.get("cursor")
 
     manager = _get_manager(hass, entry_id)
     if manager is None:
         _err_not_found(connection, msg["id"], entry_id)
         return
 
+    since = until = None
+    try:
+        if msg.get("since"):
+            since = _parse_query_time(msg["since"])
+        if msg.get("until"):
+            until = _parse_query_time(msg["until"])
+    except ValueError as exc:
+        connection.send_error(msg["id"], "invalid_format", str(exc))
+        return
+    filters: dict[str, Any] = {
+        "status": msg.get("status"),
+        "review": msg.get("review"),
+        "since": since,
+        "until": until,
+    }
+    filtered = any(v is not None for v in filters.values()) or "profile_name" in msg
+    if "profile_name" in msg:
+        filters["profile_name"] = msg["profile_name"]
+    fields = msg.get("fields")
+
     cycles: list[dict[str, Any]] = []
     reference_cycles: list[dict[str, Any]] = []
     total = 0
+    next_cursor: str | None = None
     try:
         store = getattr(manager, "profile_store", None)
         if store is not None:
-            raw: list[Any] = store.get_past_cycles()
-            total = len(raw)
-            # History order is oldest-first in storage; present most-recent-first
-            # and slice the requested page. offset=0 is identical to the legacy
-            # reversed(raw[-limit:]) behaviour.
-            ordered = list(reversed(raw))
-            window = ordered[offset:offset + limit]
-            for c in window:
-                cycles.append(_strip_cycle(c))
+            page = store.query_cycles(
+                **filters,
+                sort=msg.get("sort", cycle_index.SORT_RECORDED),
+                descending=msg.get("order", "desc") == "desc",
+                cursor=cursor,
+                offset=offset,
+                limit=limit,
+            )
+            total = page.total
+            next_cursor = page.next_cursor
+            for c in page.cycles:
+                cycles.append(cycle_index.project(c, fields, _CYCLE_STRIP_KEYS))
             # Imported store recordings are a small, bounded set kept out of the
             # paginated `cycles`/`total` (they never enter usage stats). Return
-            # them once, on the first page, tagged so the panel can badge them
-            # and route edits/deletes correctly.
-            if offset == 0:
+            # them once, on the first unfiltered page, tagged so the panel can
+            # badge them and route edits/deletes correctly.
+            if offset == 0 and not cursor and not filtered:
                 for c in reversed(store.get_reference_cycles()):
-                    ref = _strip_cycle(c)
+                    ref = cycle_index.project(c, fields, _CYCLE_STRIP_KEYS)
                     ref["is_reference"] = True
                     reference_cycles.append(ref)
+    except ValueError as exc:
+        connection.send_error(msg["id"], "invalid_format", str(exc))
+        return
     except Exception as exc:  # pylint: disable=broad-exception-caught
         _LOGGER.debug("Error fetching cycles for entry %s: %s", entry_id, exc)
 
-    has_more = (offset + len(cycles)) < total
     _send_result(connection, msg["id"], "get_device_cycles", {
             "entry_id": entry_id,
             "cycles": cycles,
             "reference_cycles": reference_cycles,
             "total": total,
-            "has_more": has_more,
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor,
         },
     )
 
 
+def _parse_query_time(value: str) -> Any:
+    """Aware datetime from an ISO date or datetime query bound (naive = local)."""
+    parsed = dt_util.parse_datetime(value)
+    if parsed is None:
+        day = dt_util.parse_date(value)
+        if day is None:
+            raise ValueError(f"Invalid date/time {value!r}")
+        parsed = dt_util.start_of_local_day(day)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return parsed
+
+
 # ─── Settings ─────────────────────────────────────────────────────────────────
 
 @websocket_api.websocket_command(
@@ -2721,6 +2781,11 @@ async def ws_get_diagnostics(
         connection.send_error(msg["id"], "unknown_error", str(exc))
 
 
+# Progress units per "Process history" phase. The first phase (per-cycle
+# reprocess + envelope rebuild on the worker pool) reports within its span.
+_REPROCESS_PHASE_UNITS = 100
+
+
 async def _reprocess_task(hass: HomeAssistant, task: Any, entry_id: str) -> None:
     """Detached runner for the full "Process history" pass, reporting phase-level
     progress to the task registry and storing the summary as the result. Survives
@@ -2744,15 +2809,23 @@ async def _reprocess_task(hass: HomeAssistant, task: Any, entry_id: str) -> None
             reg.finish(task, state=task_registry.STATE_CANCELLED)
             return
 
-        reg.update(task, total=5, done=0, label="Reprocessing: matching cycles",
+        reg.update(task, total=5 * _REPROCESS_PHASE_UNITS, done=0,
+                   label="Reprocessing: matching cycles",
                    label_key="task.reprocess.matching")
-        summary["count"] = await store.async_reprocess_all_data()
+
+        def _first_phase_progress(done: int, total: int) -> None:
+            reg.update(task, done=_REPROCESS_PHASE_UNITS * done // max(1, total))
+
+        summary["count"] = await store.async_reprocess_all_data(
+            progress=_first_phase_progress,
+            cancelled=lambda: task.cancel_requested,
+        )
 
         if task.cancel_requested:
             reg.finish(task, state=task_registry.STATE_CANCELLED, result=summary)
             return
 
-        reg.update(task, done=1, label="Reprocessing: backfilling golden",
+        reg.update(task, done=_REPROCESS_PHASE_UNITS, label="Reprocessing: backfilling golden",
                    label_key="task.reprocess.golden")
         try:
             summary["golden_backfilled"] = await store.async_backfill_recorded_golden()
@@ -2763,7 +2836,7 @@ async def _reprocess_task(hass: HomeAssistant, task: Any, entry_id: str) -> None
             reg.finish(task, state=task_registry.STATE_CANCELLED, result=summary)
             return
 
-        reg.update(task, done=2, label="Reprocessing: suggestions",
+        reg.update(task, done=2 * _REPROCESS_PHASE_UNITS, label="Reprocessing: suggestions",
                    label_key="task.reprocess.suggestions")
         learning = getattr(manager, "learning_manager", None)
         if learning is not None and hasattr(learning, "async_run_full_analysis"):
@@ -2773,7 +2846,7 @@ async def _reprocess_task(hass: HomeAssistant, task: Any, entry_id: str) -> None
             except Exception as exc:  # pylint: disable=broad-exception-caught
                 _LOGGER.debug("suggestion analysis failed for %s: %s", entry_id, exc)
 
-        reg.update(task, done=3, label="Reprocessing: ML training",
+        reg.update(task, done=3 * _REPROCESS_PHASE_UNITS, label="Reprocessing: ML training",
                    label_key="task.reprocess.ml_training")
         if ENABLE_ML_TRAINING and not task.cancel_requested:
             try:
@@ -2790,7 +2863,7 @@ async def _reprocess_task(hass: HomeAssistant, task: Any, entry_id: str) -> None
             reg.finish(task, state=task_registry.STATE_CANCELLED, result=summary)
             return
 
-        reg.update(task, done=4, label="Reprocessing: cycle health",
+        reg.update(task, done=4 * _REPROCESS_PHASE_UNITS, label="Reprocessing: cycle health",
                    label_key="task.reprocess.health")
         # Recompute per-cycle health against the (possibly retrained) model.
         # Skip when training already recomputed it (a promotion refreshes health).
@@ -2800,7 +2873,7 @@ async def _reprocess_task(hass: HomeAssistant, task: Any, entry_id: str) -> None
             except Exception as exc:  # pylint: disable=broad-exception-caught
                 _LOGGER.debug("health recompute failed for %s: %s", entry_id, exc)
 
-        reg.update(task, done=5)
+        reg.update(task, done=5 * _REPROCESS_PHASE_UNITS)
         # Re-validate the manager is still live after a long chain of awaits; if the
         # entry was reloaded, the original manager is detached and must not notify.
         if _get_manager(hass, entry_id) is manager:
@@ -3952,14 +4025,20 @@ async def ws_get_profile_cycles(
     profile_name: str = msg["profile_name"]
     limit: int = msg.get("limit", 150)
 
+    # Pick the newest `limit` cycles from the index on the loop (no scan of the
+    # history); only the trace loading/downsampling goes to the executor.
+    store = manager.profile_store
+    try:
+        page = store.query_cycles(profile_name=profile_name, limit=limit)
+        selected = list(reversed(page.cycles))  # oldest-first, as before
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        _LOGGER.debug("Error selecting profile cycles for %s: %s", profile_name, exc)
+        selected = []
+
     def _collect() -> list[dict[str, Any]]:
         out: list[dict[str, Any]] = []
         try:
-            store = manager.profile_store
-            matched = [
-                c for c in store.get_past_cycles() if c.get("profile_name") == profile_name
-            ]
-            for c in matched[-limit:]:
+            for c in selected:
                 cid = c.get("id")
                 samples = store.get_cycle_power_data(cid) if cid else []
                 out.append(
@@ -4144,6 +4223,65 @@ def ws_get_match_debug(
     _send_result(connection, msg["id"], "get_match_debug", out)
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ha_washdata/get_hot_path_stats",
+        vol.Required("entry_id"): str,
+        vol.Optional("reset", default=False): bool,
+    }
+)
+@callback
+def ws_get_hot_path_stats(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return per-stage timings of the device's power-reading path.
+
+    Count, mean/max and bucketed p50/p90/p99 per stage (ingest, detector,
+    match, progress, ml_features, state_save, entity_update). Empty until
+    timing is switched on (``set_hot_path_timing`` or the hot_path_timing
+    option). ``reset`` clears the collected timings after reading them.
+    """
+    entry_id: str = msg["entry_id"]
+    manager = _get_manager(hass, entry_id)
+    if manager is None:
+        _err_not_found(connection, msg["id"], entry_id)
+        return
+    stats = manager.hot_path.stats()
+    if msg.get("reset"):
+        manager.hot_path.reset()
+    _send_result(connection, msg["id"], "get_hot_path_stats", stats)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ha_washdata/set_hot_path_timing",
+        vol.Required("entry_id"): str,
+        vol.Required("enabled"): bool,
+        vol.Optional("sample_every"): vol.All(int, vol.Range(min=1, max=10_000)),
+    }
+)
+@callback
+def ws_set_hot_path_timing(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Switch hot-path timing on/off at runtime (until the next reload).
+
+    Unlike set_options this does not reload the entry, so timings collected
+    so far are kept; the persistent default is the hot_path_timing option.
+    """
+    entry_id: str = msg["entry_id"]
+    manager = _get_manager(hass, entry_id)
+    if manager is None:
+        _err_not_found(connection, msg["id"], entry_id)
+        return
+    manager.hot_path.configure(msg["enabled"], msg.get("sample_every"))
+    _send_result(connection, msg["id"], "set_hot_path_timing", manager.hot_path.stats())
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "ha_washdata/set_program",
@@ -4287,18 +4425,20 @@ def _ml_median(values: list[float]) -> float | None:
     return s[n // 2] if n % 2 else (s[n // 2 - 1] + s[n // 2]) / 2
 
 
-def _compute_cycle_events(
+def _find_cycle_events(
     points: list[tuple[float, float]],
     expectation: dict[str, float],
     end_feat_fn: Any,
-    end_score_fn: Any,
     max_events: int = 20,
-) -> list[dict[str, Any]]:
-    """Find all low-power events in a trace and score each with the ML end detector.
+) -> tuple[list[dict[str, Any]], list[dict[str, float] | None]]:
+    """Find all low-power events in a trace with the ML end features of each.
 
     Each event represents a contiguous below-threshold power segment.  Events that
     were followed by power resumption are classified as pauses (``is_end=False``);
-    the last event is marked as the end trigger (``is_end=True``).
+    the last event is marked as the end trigger (``is_end=True``).  Returns the
+    events (``ml_end_confidence`` still None) and, aligned with them, the end
+    detector features at each event (None where they could not be computed), so
+    the caller can score them all in one batch.
 
     Motor-cycling appliances (washing machines) produce tens of micro-dips per cycle
     from drum motor switching.  A 30 s minimum filters these while still capturing
@@ -4306,15 +4446,22 @@ def _compute_cycle_events(
     """
     _MIN_EVENT_S = 30.0
     if not points or len(points) < 4:
-        return []
+        return [], []
     powers = [p for _, p in points]
     peak = max(powers) if powers else 0.0
     low_thresh = max(1.0, 0.05 * peak)
 
     events: list[dict[str, Any]] = []
+    feats: list[dict[str, float] | None] = []
     in_low = False
     seg_start_s = 0.0
 
+    def _features(prefix: list[tuple[float, float]]) -> dict[str, float] | None:
+        try:
+            return end_feat_fn(prefix, expectation)
+        except Exception:  # pylint: disable=broad-exception-caught
+            return None
+
     for i, (offset_s, pwr) in enumerate(points):
         if not in_low and pwr < low_thresh:
             in_low = True
@@ -4323,14 +4470,8 @@ def _compute_cycle_events(
             seg_end_s = points[i - 1][0] if i > 0 else offset_s
             low_run_s = seg_end_s - seg_start_s
             if low_run_s >= _MIN_EVENT_S:
-                ml_conf: float | None = None
-                try:
-                    feat = end_feat_fn(points[:i], expectation)
-                    if feat is not None:
-                        ml_conf = round(float(end_score_fn(feat)), 3)
-                except Exception:  # pylint: disable=broad-exception-caught
-                    pass
-                events.append({"offset_s": float(round(seg_start_s, 0)), "low_run_s": float(round(low_run_s, 0)), "ml_end_confidence": ml_conf, "is_end": False})
+                feats.append(_features(points[:i]))
+                events.append({"offset_s": float(round(seg_start_s, 0)), "low_run_s": float(round(low_run_s, 0)), "ml_end_confidence": None, "is_end": False})
             in_low = False
             if len(events) >= max_events:
                 break
@@ -4338,18 +4479,51 @@ def _compute_cycle_events(
     if in_low:
         low_run_s = points[-1][0] - seg_start_s
         if low_run_s >= _MIN_EVENT_S:
-            ml_conf = None
-            try:
-                feat = end_feat_fn(points, expectation)
-                if feat is not None:
-                    ml_conf = round(float(end_score_fn(feat)), 3)
-            except Exception:  # pylint: disable=broad-exception-caught
-                pass
-            events.append({"offset_s": float(round(seg_start_s, 0)), "low_run_s": float(round(low_run_s, 0)), "ml_end_confidence": ml_conf, "is_end": True})
+            feats.append(_features(points))
+            events.append({"offset_s": float(round(seg_start_s, 0)), "low_run_s": float(round(low_run_s, 0)), "ml_end_confidence": None, "is_end": True})
 
     if events and not events[-1]["is_end"]:
         events[-1]["is_end"] = True
-    return events[:max_events]
+    return events[:max_events], feats[:max_events]
+
+
+def _score_feature_rows(scorer: Any, rows: list[dict[str, float] | None]) -> list[float | None]:
+    """Score the non-None feature mappings in one matrix; None stays None.
+
+    A failure (e.g. a non-numeric feature) leaves the whole batch unscored, as
+    the per-row scoring it replaces did for the affected row.
+    """
+    present = [i for i, row in enumerate(rows) if row is not None]
+    out: list[float | None] = [None] * len(rows)
+    if scorer is None or not present:
+        return out
+    try:
+        scores = scorer.score_rows([rows[i] for i in present])
+    except Exception:  # pylint: disable=broad-exception-caught
+        return out
+    for i, value in zip(present, scores):
+        out[i] = float(value)
+    return out
+
+
+def _quality_label(score: float | None) -> str:
+    if score is None:
+        return "no_data"
+    if score < 0.3:
+        return "ok"
+    if score < 0.6:
+        return "uncertain"
+    return "review"
+
+
+def _end_label(score: float | None) -> str:
+    if score is None:
+        return "no_event"
+    if score >= 0.6:
+        return "likely_end"
+    if score >= 0.35:
+        return "uncertain"
+    return "likely_pause"
 
 
 def _health_model_sig(store: Any) -> str:
@@ -4384,17 +4558,19 @@ def _compute_ml_comparison(
     """
     # Lazy imports so this module loads instantly even when ML deps are absent.
     try:
-        from .ml.engine import resolve_scorer
+        from .ml.engine import resolve_matrix_scorer
         from .ml.feature_extraction import latest_end_event_features, quality_features
         from .profile_store import decompress_power_data
     except Exception:  # pylint: disable=broad-exception-caught
         return {"enabled": False, "error": "ML models not available", "cycles": [], "settings_comparison": {}}
 
     # Prefer on-device trained models when present, else the embedded baseline.
-    quality_score_fn, quality_source = resolve_scorer("quality", store)
-    end_score_fn, end_source = resolve_scorer("end", store)
-    if quality_score_fn is None and end_score_fn is None:
+    quality_scorer = resolve_matrix_scorer("quality", store)
+    end_scorer = resolve_matrix_scorer("end", store)
+    if quality_scorer is None and end_scorer is None:
         return {"enabled": False, "error": "ML models not available", "cycles": [], "settings_comparison": {}}
+    quality_source = quality_scorer.source if quality_scorer is not None else None
+    end_source = end_scorer.source if end_scorer is not None else None
 
     model_sig = _health_model_sig(store)
     health_dirty = False
@@ -4434,6 +4610,9 @@ def _compute_ml_comparison(
     intra_pauses: list[float] = []
     evaluated: list[dict[str, Any]] = []
     recent_start_idx = max(0, len(cycles) - 200)
+    # Cycles needing fresh health collect their feature rows here; they are
+    # scored after the loop in one quality and one end-detector matrix.
+    pending: list[dict[str, Any]] = []
 
     for idx, cycle in enumerate(cycles):
         profile_name: str | None = cycle.get("profile_name")
@@ -4498,11 +4677,11 @@ def _compute_ml_comparison(
             end_label = cached.get("end_label", "no_event")
             events = cached.get("events") or []
         else:
-            ml_quality = None
-            if profile_name and profile_name in profile_medians:
+            quality_feat = None
+            if profile_name and profile_name in profile_medians and quality_scorer is not None:
                 pm = profile_medians[profile_name]
                 try:
-                    feat = quality_features(
+                    quality_feat = quality_features(
                         points=points,
                         profile_median_duration_s=pm["duration_s"],
                         profile_median_energy_wh=pm["energy_wh"],
@@ -4512,8 +4691,6 @@ def _compute_ml_comparison(
                         profile_fit_score=proxy_fit,
                         flag_count=0,
                     )
-                    if quality_score_fn is not None:
-                        ml_quality = float(quality_score_fn(feat))
                 except Exception:  # pylint: disable=broad-exception-caught
                     pass
 
@@ -4522,51 +4699,28 @@ def _compute_ml_comparison(
                 pm = profile_medians[profile_name]
                 expectation = {"duration": pm["duration_s"], "energy": pm["energy_wh"], "peak": pm["peak_w"]}
 
-            ml_end_conf = None
-            if expectation and points:
+            end_feat = None
+            events = []
+            event_feats: list[dict[str, float] | None] = []
+            if expectation and points and end_scorer is not None:
                 try:
                     end_feat = latest_end_event_features(points, expectation)
-                    if end_feat is not None and end_score_fn is not None:
-                        ml_end_conf = float(end_score_fn(end_feat))
                 except Exception:  # pylint: disable=broad-exception-caught
                     pass
-
-            # Per-cycle events timeline for the modal
-            events = []
-            if expectation and points and end_score_fn is not None:
-                events = _compute_cycle_events(points, expectation, latest_end_event_features, end_score_fn)
-
-            if ml_quality is None:
-                quality_label = "no_data"
-            elif ml_quality < 0.3:
-                quality_label = "ok"
-            elif ml_quality < 0.6:
-                quality_label = "uncertain"
-            else:
-                quality_label = "review"
-
-            if ml_end_conf is None:
-                end_label = "no_event"
-            elif ml_end_conf >= 0.6:
-                end_label = "likely_end"
-            elif ml_end_conf >= 0.35:
-                end_label = "uncertain"
-            else:
-                end_label = "likely_pause"
-
-            # Collect freshly-computed health for the event-loop to apply
-            # back to the live store dicts (avoids mutating from executor thread).
-            cycle_id_key = cycle.get("id", "")
-            if cycle_id_key:
-                health_updates[cycle_id_key] = {
-                    "score": round(ml_quality, 3) if ml_quality is not None else None,
-                    "label": quality_label,
-                    "end_score": round(ml_end_conf, 3) if ml_end_conf is not None else None,
-                    "end_label": end_label,
-                    "events": events,
-                    "model_sig": model_sig,
-                    "at": dt_util.now().isoformat(),
-                }
+                # Per-cycle events timeline for the modal
+                events, event_feats = _find_cycle_events(points, expectation, latest_end_event_features)
+
+            # Scores and labels are filled in after the loop.
+            ml_quality = ml_end_conf = None
+            quality_label = end_label = ""
+            pending.append({
+                "cycle_id": cycle.get("id", ""),
+                "quality_feat": quality_feat,
+                "end_feat": end_feat,
+                "events": events,
+                "event_feats": event_feats,
+                "row": len(evaluated),
+            })
             health_dirty = True
 
         start_raw = cycle.get("start_time", "")
@@ -4588,6 +4742,41 @@ def _compute_ml_comparison(
             "ml_review": cycle.get("ml_review") or {},
         })
 
+    if pending:
+        quality_scores = _score_feature_rows(quality_scorer, [p["quality_feat"] for p in pending])
+        end_rows: list[dict[str, float] | None] = []
+        for p in pending:
+            end_rows.append(p["end_feat"])
+            end_rows.extend(p["event_feats"])
+        end_scores = iter(_score_feature_rows(end_scorer, end_rows))
+        now_iso = dt_util.now().isoformat()
+        for p, ml_quality in zip(pending, quality_scores):
+            ml_end_conf = next(end_scores)
+            events = p["events"]
+            for event in events:
+                conf = next(end_scores)
+                event["ml_end_confidence"] = round(conf, 3) if conf is not None else None
+            quality_label = _quality_label(ml_quality)
+            end_label = _end_label(ml_end_conf)
+            evaluated[p["row"]].update({
+                "ml_quality_score": round(ml_quality, 3) if ml_quality is not None else None,
+                "ml_quality_label": quality_label,
+                "ml_end_confidence": round(ml_end_conf, 3) if ml_end_conf is not None else None,
+                "ml_end_label": end_label,
+            })
+            # Collect freshly-computed health for the event-loop to apply
+            # back to the live store dicts (avoids mutating from executor thread).
+            if p["cycle_id"]:
+                health_updates[p["cycle_id"]] = {
+                    "score": round(ml_quality, 3) if ml_quality is not None else None,
+                    "label": quality_label,
+                    "end_score": round(ml_end_conf, 3) if ml_end_conf is not None else None,
+                    "end_label": end_label,
+                    "events": events,
+                    "model_sig": model_sig,
+                    "at": now_iso,
+                }
+
     # Panel expects most-recent-first ordering; the loop appended oldest-first.
     evaluated.reverse()
 
@@ -5312,6 +5501,9 @@ _MAX_SWEEP_VALUES = 20
         vol.Optional("concurrency", default=15): vol.Coerce(int),
         vol.Optional("param_y"): str,
         vol.Optional("values_y"): vol.All([vol.Coerce(float)], vol.Length(max=_MAX_SWEEP_VALUES)),
+        # Exhaustive by default: "auto"/"halving" grids mix cells ranked on a few
+        # cycles with full-set ones, which the panel heatmap does not tell apart.
+        vol.Optional("search", default="grid"): vol.In(playground.SWEEP_SEARCH_MODES),
     }
 )
 @websocket_api.async_response
@@ -5340,8 +5532,8 @@ async def ws_run_playground_sweep(
     try:
         cycle_ids = list(msg.get("cycle_ids") or [])
         concurrency = max(1, min(playground.MAX_BATCH_CYCLES, int(msg.get("concurrency", 15))))
-        payload = await hass.async_add_executor_job(
-            playground.run_playground_sweep,
+        engine = await hass.async_add_executor_job(
+            playground.build_sweep_engine,
             store,
             cycle_ids,
             base_config,
@@ -5353,13 +5545,49 @@ async def ws_run_playground_sweep(
             concurrency,
             param_y,
             values_y,
+            None,
+            msg.get("search", "grid"),
         )
+        if isinstance(engine, dict):
+            payload = engine
+        else:
+            await _drive_playground_sweep(hass, engine)
+            payload = engine.payload()
         _send_result(connection, msg["id"], "run_playground_sweep", payload)
     except Exception as exc:  # pylint: disable=broad-exception-caught
         _LOGGER.debug("Playground sweep failed for %s: %s", entry_id, exc)
         connection.send_error(msg["id"], "unknown_error", str(exc))
 
 
+async def _drive_playground_sweep(
+    hass: HomeAssistant, engine: Any, task: Any | None = None
+) -> None:
+    """Run a :class:`playground.SweepEngine` batch by batch on the worker pool.
+
+    Each batch's cells are fanned out over the shared pool's thread lane (the
+    replays read the live ProfileStore, so they cannot be shipped to a worker
+    process) and folded back before the engine plans the next batch. With a
+    registry ``task`` the batches drive its progress and honour its cancel flag;
+    a cancelled sweep keeps whatever cells finished.
+    """
+    pool = worker_pool.get_worker_pool(hass)
+    reg = task_registry.get_registry(hass) if task is not None else None
+    while batch := engine.next_batch():
+        progress = cancelled = None
+        if reg is not None:
+            reg.update(task, total=max(engine.estimated_jobs(), engine.jobs_done + len(batch)))
+            progress, cancelled = worker_pool.task_hooks(hass, task, offset=engine.jobs_done)
+        finished: dict[int, Any] = {}
+        async for index, result in pool.async_imap(
+            engine.evaluate, batch, chunk_size=1, processes=False,
+            progress=progress, cancelled=cancelled,
+        ):
+            finished[index] = result
+        engine.record([(batch[i], finished[i]) for i in sorted(finished)])
+        if cancelled is not None and cancelled():
+            break
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "ha_washdata/get_dtw_debug",
@@ -5564,6 +5792,7 @@ async def _pg_sweep_task(
     hass: HomeAssistant, task: Any, entry_id: str,
     param: str, values: list[float], objective: str,
     param_y: str | None, values_y: list[float] | None,
+    search: str = "grid",
 ) -> None:
     reg = task_registry.get_registry(hass)
     ctx = _playground_context(hass, entry_id)
@@ -5572,54 +5801,18 @@ async def _pg_sweep_task(
         return
     _manager, store, base_config, options, price = ctx
     try:
-        past = await hass.async_add_executor_job(lambda: list(store.get_past_cycles() or []))
-        ids = [c.get("id") for c in past[-playground.DEFAULT_RECENT_CYCLES:] if isinstance(c, dict)]
-        ids = [i for i in ids[:playground.MAX_BATCH_CYCLES] if i]
-        n = max(1, len(ids))
-        # Build match snapshots once — identical for every sweep value/cell.
-        prebuilt = await hass.async_add_executor_job(playground._build_match_snapshots, store)
-        if param_y and values_y:
-            reg.update(task, total=len(values) * len(values_y))
-            grid: list[list[float | None]] = [[None] * len(values) for _ in values_y]
-            current: dict[str, Any] = {}
-            done = 0
-            cancelled = False
-            for j, vy in enumerate(values_y):
-                for i, vx in enumerate(values):
-                    if task.cancel_requested:
-                        cancelled = True
-                        break
-                    r = await hass.async_add_executor_job(
-                        playground.run_playground_sweep,
-                        store, ids, base_config, param, [vx], objective,
-                        options, price, n, param_y, [vy], prebuilt,
-                    )
-                    cell = (r.get("grid") or [[None]])[0]
-                    grid[j][i] = cell[0] if cell else None
-                    if r.get("current"):
-                        current = r["current"]
-                    done += 1
-                    reg.update(task, done=done)
-                if cancelled:
-                    break
-            payload = playground.finalize_sweep_2d(param, param_y, objective, values, values_y, grid, current)
-        else:
-            reg.update(task, total=len(values))
-            points: list[dict[str, Any]] = []
-            current_value: Any = None
-            for i, vx in enumerate(values):
-                if task.cancel_requested:
-                    break
-                r = await hass.async_add_executor_job(
-                    playground.run_playground_sweep,
-                    store, ids, base_config, param, [vx], objective, options, price, n,
-                    None, None, prebuilt,
-                )
-                points.extend(r.get("points") or [])
-                if r.get("current_value") is not None:
-                    current_value = r["current_value"]
-                reg.update(task, done=i + 1)
-            payload = playground.finalize_sweep_1d(param, objective, points, current_value)
+        # Cycle selection + match snapshots happen once for the whole sweep; the
+        # engine's cache then shares decoded traces and match results across cells.
+        engine = await hass.async_add_executor_job(
+            playground.build_sweep_engine,
+            store, None, base_config, param, values, objective, options, price,
+            playground.MAX_BATCH_CYCLES, param_y, values_y, None, search,
+        )
+        if isinstance(engine, dict):
+            reg.finish(task, state=task_registry.STATE_ERROR, error=engine.get("error"))
+            return
+        await _drive_playground_sweep(hass, engine, task)
+        payload = engine.payload()
         payload["partial"] = task.cancel_requested
         reg.finish(
             task,
@@ -5673,6 +5866,7 @@ def ws_start_playground_history(
         vol.Required("objective"): str,
         vol.Optional("param_y"): vol.Any(str, None),
         vol.Optional("values_y"): vol.Any([vol.Coerce(float)], None),
+        vol.Optional("search", default="grid"): vol.In(playground.SWEEP_SEARCH_MODES),
     }
 )
 @callback
@@ -5699,6 +5893,7 @@ def ws_start_playground_sweep(
     _raw = hass.async_create_task(_pg_sweep_task(
         hass, task, entry_id, msg["param"], list(msg.get("values") or []),
         msg["objective"], param_y, list(values_y) if values_y else None,
+        msg.get("search", "grid"),
     ))
     if _raw is not None:
         reg.link_asyncio_task(task.id, _raw)
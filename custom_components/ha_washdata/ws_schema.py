@@ -97,6 +97,7 @@ class GetDeviceCyclesResponse(TypedDict):
     reference_cycles: list[dict[str, Any]]
     total: int
     has_more: bool
+    next_cursor: str | None
 
 
 # ─── Settings ──────────────────────────────────────────────────────────────────
@@ -313,6 +314,17 @@ class GetMatchDebugResponse(TypedDict):
     candidates: list[dict[str, Any]]
 
 
+class HotPathStatsResponse(TypedDict):
+    """Per-stage timings of the power-reading path (hot_path.HotPathTimer.stats)."""
+
+    enabled: bool
+    sample_every: int
+    since: str | None
+    events: int
+    sampled_events: int
+    stages: dict[str, dict[str, Any]]
+
+
 # ─── Live power history ────────────────────────────────────────────────────────
 
 class GetPowerHistoryResponse(TypedDict, total=False):
@@ -663,6 +675,8 @@ WS_RESPONSE_TYPES: dict[str, type] = {
     "set_panel_config": SuccessResponse,
     "set_user_prefs": SuccessResponse,
     "get_match_debug": GetMatchDebugResponse,
+    "get_hot_path_stats": HotPathStatsResponse,
+    "set_hot_path_timing": HotPathStatsResponse,
     "set_program": SuccessResponse,
     "get_power_history": GetPowerHistoryResponse,
     "get_logs": GetLogsResponse,
@@ -751,6 +765,15 @@ WS_COMMANDS: dict[str, dict] = {
         _entry(),
         _p("limit", "int", False),
         _p("offset", "int", False),
+        _p("cursor", "str|null", False),
+        _p("profile_name", "str|null", False),
+        _p("status", "str", False),
+        _p("review", "str", False, enum=["golden", "reviewed", "unreviewed"]),
+        _p("since", "str", False),
+        _p("until", "str", False),
+        _p("sort", "str", False, enum=["recorded", "start_time", "duration", "energy_wh"]),
+        _p("order", "str", False, enum=["asc", "desc"]),
+        _p("fields", "list[str]", False),
     ]},
     "get_options": {"params": [_entry()]},
     "set_options": {"params": [_entry(), _p("options", "dict")]},
@@ -906,6 +929,12 @@ WS_COMMANDS: dict[str, dict] = {
     ]},
     "set_user_prefs": {"params": [_p("prefs", "dict")]},
     "get_match_debug": {"params": [_entry()]},
+    "get_hot_path_stats": {"params": [_entry(), _p("reset", "bool", False)]},
+    "set_hot_path_timing": {"params": [
+        _entry(),
+        _p("enabled", "bool"),
+        _p("sample_every", "int", False),
+    ]},
     "set_program": {"params": [_entry(), _p("program", "str|null")]},
     "get_power_history": {"params": [_entry(), _p("with_raw", "bool", False)]},
     "get_logs": {"params": [
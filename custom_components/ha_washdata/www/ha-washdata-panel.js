@@ -2474,19 +2474,24 @@ class HaWashdataPanel extends HTMLElement {
       // the paginated `cycles`/offset math so "Load more" stays correct.
       this._refCycles = res.reference_cycles || [];
       this._cycleOffset = this._cycles.length;
+      // Newer backends return `next_cursor`; continuing from it is stable even
+      // when a cycle finishes between pages (offsets would shift by one).
+      this._cycleCursor = res.next_cursor || null;
       this._cyclesTotal = (res.total != null) ? res.total : this._cycles.length;
       this._cyclesHasMore = (res.has_more != null) ? !!res.has_more : false;
-    } catch (_) { this._cyclesError = true; this._cycles = []; this._refCycles = []; this._cycleOffset = 0; this._cyclesTotal = 0; this._cyclesHasMore = false; }
+    } catch (_) { this._cyclesError = true; this._cycles = []; this._refCycles = []; this._cycleOffset = 0; this._cycleCursor = null; this._cyclesTotal = 0; this._cyclesHasMore = false; }
   }
 
   // D3: fetch the next page and append (deduping by id so optimistic removals or
   // overlaps never double up). Preserves the current client-side sort/filter.
   async _loadMoreCycles(entryId) {
-    const res = await this._ws({ type: `${_DOMAIN}/get_device_cycles`, entry_id: entryId, limit: _CYCLE_PAGE_SIZE, offset: this._cycleOffset });
+    const page = this._cycleCursor ? { cursor: this._cycleCursor } : { offset: this._cycleOffset };
+    const res = await this._ws({ type: `${_DOMAIN}/get_device_cycles`, entry_id: entryId, limit: _CYCLE_PAGE_SIZE, ...page });
     const more = res.cycles || [];
     const have = new Set(this._cycles.map(c => c.id));
     for (const c of more) if (!have.has(c.id)) this._cycles.push(c);
     this._cycleOffset += more.length;
+    this._cycleCursor = res.next_cursor || null;
     this._cyclesTotal = (res.total != null) ? res.total : this._cyclesTotal;
     this._cyclesHasMore = (res.has_more != null) ? !!res.has_more : (more.length >= _CYCLE_PAGE_SIZE);
   }
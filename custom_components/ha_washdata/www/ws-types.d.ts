@@ -122,6 +122,7 @@ export interface GetDeviceCyclesResponse {
   reference_cycles: Record<string, unknown>[];
   total: number;
   has_more: boolean;
+  next_cursor: string | null;
 }
 
 export interface GetDevicesResponse {
@@ -171,6 +172,15 @@ export interface GetMatchDebugResponse {
   candidates: Record<string, unknown>[];
 }
 
+export interface HotPathStatsResponse {
+  enabled: boolean;
+  sample_every: number;
+  since: string | null;
+  events: number;
+  sampled_events: number;
+  stages: Record<string, Record<string, unknown>>;
+}
+
 export interface GetMlComparisonResponse {
   enabled?: boolean;
   error?: string;
@@ -347,6 +357,10 @@ export interface RunPlaygroundSweepResponse {
   grid?: unknown[][];
   best?: Record<string, unknown>;
   current?: Record<string, unknown>;
+  lower_is_better?: boolean;
+  search?: "grid" | "coarse" | "halving";
+  fidelity?: (number | null)[][];
+  evaluated?: { cells: number; of: number; replays: number };
   error?: string;
 }
 
@@ -483,6 +497,15 @@ export interface GetDeviceCyclesRequest {
   entry_id: string;
   limit?: number;
   offset?: number;
+  cursor?: string | null;
+  profile_name?: string | null;
+  status?: string;
+  review?: "golden" | "reviewed" | "unreviewed";
+  since?: string;
+  until?: string;
+  sort?: "recorded" | "start_time" | "duration" | "energy_wh";
+  order?: "asc" | "desc";
+  fields?: string[];
 }
 
 export interface GetOptionsRequest {
@@ -787,6 +810,17 @@ export interface GetMatchDebugRequest {
   entry_id: string;
 }
 
+export interface GetHotPathStatsRequest {
+  entry_id: string;
+  reset?: boolean;
+}
+
+export interface SetHotPathTimingRequest {
+  entry_id: string;
+  enabled: boolean;
+  sample_every?: number;
+}
+
 export interface SetProgramRequest {
   entry_id: string;
   program: string | null;
@@ -865,6 +899,7 @@ export interface RunPlaygroundSweepRequest {
   concurrency?: number;
   param_y?: string;
   values_y?: number[];
+  search?: "auto" | "grid" | "coarse" | "halving";
 }
 
 export interface GetDtwDebugRequest {
@@ -902,6 +937,7 @@ export interface StartPlaygroundSweepRequest {
   objective: string;
   param_y?: string | null;
   values_y?: number[];
+  search?: "auto" | "grid" | "coarse" | "halving";
 }
 
 export interface StartPlaygroundCycleDetailRequest {
@@ -1079,6 +1115,8 @@ export interface WashDataWsRequests {
   "ha_washdata/set_panel_config": SetPanelConfigRequest;
   "ha_washdata/set_user_prefs": SetUserPrefsRequest;
   "ha_washdata/get_match_debug": GetMatchDebugRequest;
+  "ha_washdata/get_hot_path_stats": GetHotPathStatsRequest;
+  "ha_washdata/set_hot_path_timing": SetHotPathTimingRequest;
   "ha_washdata/set_program": SetProgramRequest;
   "ha_washdata/get_power_history": GetPowerHistoryRequest;
   "ha_washdata/get_logs": GetLogsRequest;
@@ -1184,6 +1222,8 @@ export interface WashDataWsResponses {
   "ha_washdata/set_panel_config": SuccessResponse;
   "ha_washdata/set_user_prefs": SuccessResponse;
   "ha_washdata/get_match_debug": GetMatchDebugResponse;
+  "ha_washdata/get_hot_path_stats": HotPathStatsResponse;
+  "ha_washdata/set_hot_path_timing": HotPathStatsResponse;
   "ha_washdata/set_program": SuccessResponse;
   "ha_washdata/get_power_history": GetPowerHistoryResponse;
   "ha_washdata/get_logs": GetLogsResponse;
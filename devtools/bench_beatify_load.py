@@ -0,0 +1,721 @@
+#!/usr/bin/env python3
+"""Load test of a full Beatify game session over real WebSockets.
+
+Drives ``custom_components/beatify`` (``server/websocket.py`` and
+``server/ws_handlers.py``) with N simulated phones through a whole game:
+host + players join the lobby, the host starts the game, every player
+guesses a year (some with a bet) each round, the reveal is broadcast, the
+host advances, and the last round ends the game (stats + analytics are
+recorded into a temporary config dir).
+
+Per player count, the server runs in a forked child: a bare ``HomeAssistant``
+with the Beatify objects wired as ``async_setup_entry`` wires them, a stub
+speaker (``media_player.*`` services that set a fake entity state, platform
+``sonos``) and a stub ``tts.speak``, behind an aiohttp site on 127.0.0.1. The
+simulated phones run in the parent process, so their JSON parsing does not
+load the server's event loop. The report compares the player counts on:
+
+* server handling time per message type (``_handle_message`` incl. its
+  sends and broadcasts) and client round trips for join / submit;
+* broadcast fan-out time (``BeatifyWebSocketHandler.broadcast``);
+* event-loop lag on the server (a sampler's oversleep), lobby and game;
+* propagation: host action -> every phone shows the new phase, and last
+  guess sent -> every phone shows the reveal;
+* server RSS added per joined player, frames / bytes received per phone.
+
+Client-side times (round trips, propagation) include the phones' own
+scheduling in the parent process; with many phones, read them next to the
+server-side handling times.
+
+A count "keeps up" while the game-phase loop lag p99 and the worst
+propagation stay within ``--lag-budget`` / ``--propagation-budget``.
+``MAX_PLAYERS`` (20) is lifted in the server child so larger lobbies can be
+measured at all.
+
+Usage::
+
+    python devtools/bench_beatify_load.py
+    python devtools/bench_beatify_load.py --players 5,20 --rounds 3 --think 1
+    python devtools/bench_beatify_load.py --state-sync --json load.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+from aiohttp import web
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+DEFAULT_COUNTS = (5, 20, 50, 100)
+MEDIA_PLAYER = "media_player.bench_speaker"
+TTS_ENTITY = "tts.bench"
+WS_PATH = "/beatify/ws"
+CLIENT_ID = "http://127.0.0.1/"
+
+
+# --------------------------------------------------------------------------
+# Statistics
+# --------------------------------------------------------------------------
+
+
+def _pct(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(q / 100 * (len(ordered) - 1)))]
+
+
+def summarize(values: list[float]) -> dict[str, Any]:
+    """Count and p50 / p99 / max in milliseconds of durations in seconds."""
+    if not values:
+        return {"n": 0}
+    return {
+        "n": len(values),
+        "p50_ms": round(_pct(values, 50) * 1e3, 2),
+        "p99_ms": round(_pct(values, 99) * 1e3, 2),
+        "max_ms": round(max(values) * 1e3, 2),
+    }
+
+
+def _rss_now_mb() -> float:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def synthetic_songs(count: int, seed: int) -> list[dict[str, Any]]:
+    """``count`` playable Spotify songs with distinct years."""
+    rng = random.Random(seed)
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+    return [
+        {
+            "year": 1960 + (i * 7) % 60,
+            "uri": "spotify:track:" + "".join(rng.choice(alphabet) for _ in range(22)),
+            "title": f"Bench Song {i}",
+            "artist": f"Bench Artist {i % 13}",
+        }
+        for i in range(count)
+    ]
+
+
+# --------------------------------------------------------------------------
+# Server child: Home Assistant + Beatify + stub speaker / TTS
+# --------------------------------------------------------------------------
+
+
+class StubSpeaker:
+    """``media_player`` / ``tts`` services acting on a fake speaker entity."""
+
+    def __init__(self, hass: Any, songs: list[dict[str, Any]], delay: float) -> None:
+        self._hass = hass
+        self._songs = {song["uri"]: song for song in songs}
+        self._delay = delay
+        self.calls: Counter[str] = Counter()
+        self._plays = 0
+
+    def install(self) -> None:
+        self._hass.states.async_set(
+            MEDIA_PLAYER, "idle", {"volume_level": 0.5, "friendly_name": "Bench speaker"}
+        )
+        self._hass.states.async_set(TTS_ENTITY, "unknown", {})
+        for service in (
+            "play_media", "volume_set", "media_stop", "media_play",
+            "media_pause", "media_seek",
+        ):
+            self._hass.services.async_register("media_player", service, self._handle)
+        self._hass.services.async_register("tts", "speak", self._handle)
+        self._hass.services.async_register("homeassistant", "update_entity", self._handle)
+
+    async def _handle(self, call: Any) -> None:
+        self.calls[f"{call.domain}.{call.service}"] += 1
+        if call.domain != "media_player":
+            return
+        if self._delay:
+            await asyncio.sleep(self._delay)
+        current = self._hass.states.get(MEDIA_PLAYER)
+        attrs = dict(current.attributes) if current else {}
+        if call.service == "play_media":
+            uri = call.data.get("media_content_id", "")
+            song = self._songs.get(uri, {})
+            self._plays += 1
+            attrs.update(
+                media_content_id=uri,
+                media_title=song.get("title", "Unknown Title"),
+                media_artist=song.get("artist", "Unknown Artist"),
+                entity_picture=f"/bench/art/{self._plays}.jpg",
+            )
+            self._hass.states.async_set(MEDIA_PLAYER, "playing", attrs)
+        elif call.service == "volume_set":
+            attrs["volume_level"] = call.data.get("volume_level", 0.5)
+            self._hass.states.async_set(MEDIA_PLAYER, current.state if current else "idle", attrs)
+        elif call.service in ("media_stop", "media_pause"):
+            self._hass.states.async_set(MEDIA_PLAYER, "paused", attrs)
+        elif call.service == "media_play":
+            self._hass.states.async_set(MEDIA_PLAYER, "playing", attrs)
+
+
+class ServerProbe:
+    """Timings collected inside the server process, bucketed by session phase."""
+
+    def __init__(self) -> None:
+        self.phase = "setup"
+        self.handle: dict[str, list[float]] = defaultdict(list)
+        self.fanout: dict[str, list[float]] = defaultdict(list)
+        self.fanout_sockets: dict[str, list[int]] = defaultdict(list)
+        self.lag: dict[str, list[float]] = defaultdict(list)
+        self.rss_mb: dict[str, float] = {}
+
+    def mark(self, phase: str) -> None:
+        self.rss_mb[phase] = _rss_now_mb()
+        self.phase = phase
+
+    def instrument(self, handler: Any) -> None:
+        """Time ``_handle_message`` and ``broadcast`` of one handler instance."""
+        handle_message = handler._handle_message  # pylint: disable=protected-access
+        broadcast = handler.broadcast
+
+        async def timed_handle(ws: Any, data: dict) -> None:
+            label = str(data.get("type"))
+            if label == "admin":
+                label = f"admin:{data.get('action')}"
+            started = time.perf_counter()
+            try:
+                await handle_message(ws, data)
+            finally:
+                self.handle[label].append(time.perf_counter() - started)
+
+        async def timed_broadcast(message: dict) -> None:
+            sockets = len(handler.connections)
+            started = time.perf_counter()
+            try:
+                await broadcast(message)
+            finally:
+                self.fanout[self.phase].append(time.perf_counter() - started)
+                self.fanout_sockets[self.phase].append(sockets)
+
+        handler._handle_message = timed_handle  # pylint: disable=protected-access
+        handler.broadcast = timed_broadcast
+
+    async def sample_lag(self, interval: float) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(interval)
+            self.lag[self.phase].append(max(0.0, loop.time() - started - interval))
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "handle": {label: summarize(v) for label, v in sorted(self.handle.items())},
+            "fanout": {
+                phase: {**summarize(v), "sockets_max": max(self.fanout_sockets[phase], default=0)}
+                for phase, v in self.fanout.items()
+            },
+            "loop_lag": {phase: summarize(v) for phase, v in self.lag.items()},
+            "rss_mb": {phase: round(mb, 2) for phase, mb in self.rss_mb.items()},
+        }
+
+
+async def _wire_beatify(hass: Any, tmp: Path, args: argparse.Namespace, n_players: int) -> tuple[Any, Any]:
+    """Build the Beatify objects the way ``async_setup_entry`` does."""
+    # pylint: disable=import-outside-toplevel
+    from custom_components.beatify.analytics import AnalyticsStorage
+    from custom_components.beatify.const import DOMAIN
+    from custom_components.beatify.game import player_registry
+    from custom_components.beatify.game.service import GameService
+    from custom_components.beatify.game.state import GameState
+    from custom_components.beatify.server.websocket import BeatifyWebSocketHandler
+    from custom_components.beatify.services.stats import StatsService
+
+    # The lobby cap (MAX_PLAYERS = 20) would reject the larger counts.
+    player_registry.MAX_PLAYERS = max(player_registry.MAX_PLAYERS, n_players + 1)
+
+    game_state = GameState()
+    game_state.set_hass(hass)
+    stats_service = StatsService(hass)
+    await stats_service.load()
+    analytics = AnalyticsStorage(hass)
+    await analytics.load()
+    stats_service.set_analytics(analytics)
+    game_state.set_stats_service(stats_service)
+
+    ws_handler = BeatifyWebSocketHandler(hass)
+    # Every simulated phone connects from 127.0.0.1.
+    ws_handler.RATE_LIMIT_CONNECTIONS = n_players + 10
+    game_state.set_round_end_callback(ws_handler.broadcast_state)
+    game_state.set_metadata_update_callback(ws_handler.broadcast_metadata_update)
+    ws_handler.set_analytics(analytics)
+
+    hass.data[DOMAIN] = {
+        "entry_id": "bench",
+        "version": "bench",
+        "media_players": [],
+        "playlists": [],
+        "playlist_dir": str(tmp),
+        "game": game_state,
+        "game_service": GameService(hass, game_state),
+        "ws_handler": ws_handler,
+        "stats": stats_service,
+        "analytics": analytics,
+        "companion_auth_bypass_enabled": False,
+    }
+
+    game_state.create_game(
+        playlists=["bench.json"],
+        songs=synthetic_songs(args.rounds, args.seed),
+        media_player=MEDIA_PLAYER,
+        base_url="http://127.0.0.1",
+        round_duration=args.round_duration,
+        platform="sonos",
+        provider="spotify",
+        artist_challenge_enabled=False,
+        movie_quiz_enabled=False,
+    )
+    stats_service.record_game_start()
+    await game_state.configure_tts(TTS_ENTITY)
+    return game_state, ws_handler
+
+
+async def _server_main(args: argparse.Namespace, n_players: int, conn: Any) -> None:
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.auth import auth_manager_from_config
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+    from custom_components.beatify.const import DOMAIN
+
+    tmp = Path(tempfile.mkdtemp(prefix="beatify-load-"))
+    hass = HomeAssistant(str(tmp))
+    probe = ServerProbe()
+    runner: web.AppRunner | None = None
+    lag_task: asyncio.Task | None = None
+    try:
+        # The auth store reads both registries on load (as after bootstrap).
+        await dr.async_load(hass)
+        await er.async_load(hass)
+        hass.auth = await auth_manager_from_config(hass, [], [])
+        user = await hass.auth.async_create_user("Beatify load test")
+        refresh_token = await hass.auth.async_create_refresh_token(user, CLIENT_ID)
+        ha_token = hass.auth.async_create_access_token(refresh_token)
+
+        speaker = StubSpeaker(hass, synthetic_songs(args.rounds, args.seed), args.speaker_delay)
+        speaker.install()
+        game_state, ws_handler = await _wire_beatify(hass, tmp, args, n_players)
+        probe.instrument(ws_handler)
+
+        app = web.Application()
+        app.router.add_get(WS_PATH, ws_handler.handle)
+        runner = web.AppRunner(app, handle_signals=False)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # pylint: disable=protected-access
+
+        lag_task = asyncio.create_task(probe.sample_lag(args.lag_interval))
+        conn.send(("ready", port, ha_token))
+
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                command = await loop.run_in_executor(None, conn.recv)
+            except EOFError:
+                return
+            if command[0] == "phase":
+                probe.mark(command[1])
+            elif command[0] == "stop":
+                break
+
+        probe.mark("stopped")
+        report = probe.report()
+        report["service_calls"] = dict(speaker.calls)
+        report["final_phase"] = game_state.phase.value
+        report["players_in_game"] = len(game_state.players)
+        await ws_handler.async_close_all()
+        for key in ("stats", "analytics"):
+            await hass.data[DOMAIN][key].async_shutdown()
+        conn.send(("report", report))
+    finally:
+        if lag_task is not None:
+            lag_task.cancel()
+        if runner is not None:
+            await runner.cleanup()
+        await hass.async_stop(force=True)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _serve(args: argparse.Namespace, n_players: int, conn: Any, parent_end: Any) -> None:
+    # Drop the forked copy of the parent's end, or recv() never sees EOF.
+    parent_end.close()
+    try:
+        asyncio.run(_server_main(args, n_players, conn))
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        conn.send(("error", f"{type(exc).__name__}: {exc}"))
+    finally:
+        conn.close()
+
+
+# --------------------------------------------------------------------------
+# Simulated phones (parent process)
+# --------------------------------------------------------------------------
+
+
+class SimPhone:
+    """One player's WebSocket: sends requests, tracks the phase it displays."""
+
+    def __init__(self, name: str, session: aiohttp.ClientSession, url: str) -> None:
+        self.name = name
+        self._session = session
+        self._url = url
+        self.ws: aiohttp.ClientWebSocketResponse | None = None
+        self.phase: str | None = None
+        self.round: int | None = None
+        self.rx_frames = 0
+        self.rx_bytes = 0
+        self.errors: list[str] = []
+        self._reply: asyncio.Future | None = None
+        self._seen: dict[tuple[str, int | None], float] = {}
+        self._waiters: list[tuple[str, int | None, asyncio.Future]] = []
+        self._reader: asyncio.Task | None = None
+
+    async def connect(self) -> None:
+        self.ws = await self._session.ws_connect(self._url, max_msg_size=0)
+        self._reader = asyncio.create_task(self._read())
+
+    async def close(self) -> None:
+        if self.ws is not None:
+            await self.ws.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+    async def request(self, message: dict, reply_type: str, timeout: float) -> float:
+        """Send ``message``; seconds until ``reply_type`` (or an error) arrives."""
+        assert self.ws is not None
+        self._reply = asyncio.get_running_loop().create_future()
+        started = time.perf_counter()
+        await self.ws.send_json(message)
+        kind, code = await asyncio.wait_for(self._reply, timeout)
+        if kind != reply_type:
+            raise RuntimeError(f"{self.name}: {message.get('type')} -> error {code}")
+        return time.perf_counter() - started
+
+    def reached(self, phase: str, round_: int | None = None) -> asyncio.Future:
+        """Future resolving to the time this phone first showed ``phase``."""
+        future = asyncio.get_running_loop().create_future()
+        seen = self._seen.get((phase, round_))
+        if seen is not None:
+            future.set_result(seen)
+        else:
+            self._waiters.append((phase, round_, future))
+        return future
+
+    async def _read(self) -> None:
+        assert self.ws is not None
+        async for msg in self.ws:
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                continue
+            self.rx_frames += 1
+            self.rx_bytes += len(msg.data)
+            data = json.loads(msg.data)
+            kind = data.get("type")
+            if kind == "state":
+                self._show(data.get("phase"), data.get("round"))
+            elif kind == "state_snapshot":
+                state = data.get("state") or {}
+                self._show(state.get("phase"), state.get("round"))
+            elif kind == "state_delta":
+                changes = {op["path"]: op.get("value") for op in data.get("ops", [])}
+                if "/phase" in changes or "/round" in changes:
+                    self._show(changes.get("/phase", self.phase), changes.get("/round", self.round))
+            elif kind in ("join_ack", "submit_ack", "error"):
+                if kind == "error":
+                    self.errors.append(str(data.get("code")))
+                if self._reply is not None and not self._reply.done():
+                    self._reply.set_result((kind, data.get("code")))
+
+    def _show(self, phase: str | None, round_: int | None) -> None:
+        if phase is None:
+            return
+        now = time.perf_counter()
+        self.phase, self.round = phase, round_
+        for key in ((phase, round_), (phase, None)):
+            self._seen.setdefault(key, now)
+        pending = []
+        for want_phase, want_round, future in self._waiters:
+            if want_phase == phase and want_round in (None, round_):
+                if not future.done():
+                    future.set_result(now)
+            else:
+                pending.append((want_phase, want_round, future))
+        self._waiters = pending
+
+
+async def run_session(
+    args: argparse.Namespace,
+    n_players: int,
+    port: int,
+    ha_token: str,
+    control: Callable[..., None],
+) -> dict[str, Any]:
+    """Play one game with ``n_players`` phones (the host included)."""
+    rng = random.Random(args.seed)
+    url = f"http://127.0.0.1:{port}{WS_PATH}"
+    timeout = args.round_duration + 15
+    client: dict[str, list[float]] = defaultdict(list)
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        host = SimPhone("Host", session, url)
+        phones = [host] + [SimPhone(f"Player {i}", session, url) for i in range(1, n_players)]
+
+        async def join(phone: SimPhone, delay: float) -> None:
+            await asyncio.sleep(delay)
+            await phone.connect()
+            message: dict[str, Any] = {"type": "join", "name": phone.name}
+            if phone is host:
+                message.update(is_admin=True, ha_token=ha_token)
+            client["join_rtt"].append(await phone.request(message, "join_ack", timeout))
+            if args.state_sync:
+                assert phone.ws is not None
+                await phone.ws.send_json({"type": "state_sync"})
+
+        async def reached_by_all(phase: str, round_: int | None) -> float:
+            seen = await asyncio.wait_for(
+                asyncio.gather(*(p.reached(phase, round_) for p in phones)), timeout
+            )
+            return max(seen)
+
+        async def guess(phone: SimPhone) -> float:
+            await asyncio.sleep(rng.uniform(0, args.think))
+            message = {
+                "type": "submit",
+                "year": rng.randint(1960, 2020),
+                "bet": rng.random() < args.bet_rate,
+            }
+            sent = time.perf_counter()
+            client["submit_rtt"].append(await phone.request(message, "submit_ack", timeout))
+            return sent
+
+        try:
+            control("phase", "lobby")
+            await join(host, 0)
+            await asyncio.gather(
+                *(join(p, rng.uniform(0, args.join_spread)) for p in phones[1:])
+            )
+            await asyncio.sleep(0.5)  # let the debounced lobby broadcast settle
+            control("phase", "game")
+
+            for round_ in range(1, args.rounds + 1):
+                action = "start_game" if round_ == 1 else "next_round"
+                started = time.perf_counter()
+                assert host.ws is not None
+                await host.ws.send_json({"type": "admin", "action": action})
+                client["round_start_propagation"].append(
+                    await reached_by_all("PLAYING", round_) - started
+                )
+                last_guess = max(await asyncio.gather(*(guess(p) for p in phones)))
+                client["reveal_propagation"].append(
+                    await reached_by_all("REVEAL", round_) - last_guess
+                )
+                await asyncio.sleep(args.reveal_pause)
+
+            started = time.perf_counter()
+            await host.ws.send_json({"type": "admin", "action": "next_round"})
+            client["end_propagation"].append(await reached_by_all("END", None) - started)
+            failure = None
+        except (
+            asyncio.TimeoutError,
+            RuntimeError,
+            ConnectionError,
+            aiohttp.ClientError,
+        ) as err:
+            failure = f"{type(err).__name__}: {err}" if str(err) else type(err).__name__
+        finally:
+            control("phase", "teardown")
+            await asyncio.gather(*(p.close() for p in phones), return_exceptions=True)
+
+    result: dict[str, Any] = {name: summarize(v) for name, v in client.items()}
+    result["rx_frames_per_phone"] = round(sum(p.rx_frames for p in phones) / n_players, 1)
+    result["rx_kb_per_phone"] = round(sum(p.rx_bytes for p in phones) / n_players / 1024, 1)
+    errors = Counter(code for p in phones for code in p.errors)
+    if errors:
+        result["error_codes"] = dict(errors)
+    if failure:
+        result["failure"] = failure
+    return result
+
+
+def run_count(args: argparse.Namespace, n_players: int) -> dict[str, Any]:
+    """One game with ``n_players`` against a fresh forked server."""
+    mp = multiprocessing.get_context("fork")
+    parent, child = mp.Pipe()
+    proc = mp.Process(target=_serve, args=(args, n_players, child, parent))
+    proc.start()
+    child.close()
+    try:
+        message = parent.recv()
+        if message[0] != "ready":
+            return {"error": message[1]}
+        _, port, ha_token = message
+        session = asyncio.run(
+            run_session(args, n_players, port, ha_token, lambda *cmd: parent.send(cmd))
+        )
+        parent.send(("stop",))
+        message = parent.recv()
+        if message[0] != "report":
+            return {"error": message[1], "client": session}
+        return {"client": session, "server": message[1]}
+    except EOFError:
+        return {"error": f"server exited with {proc.exitcode}"}
+    finally:
+        parent.close()
+        proc.join()
+
+
+# --------------------------------------------------------------------------
+# Report
+# --------------------------------------------------------------------------
+
+
+def verdict(res: dict[str, Any], args: argparse.Namespace) -> str:
+    """"ok", or what exceeded its budget for this player count."""
+    if "error" in res:
+        return "error"
+    if "failure" in res["client"]:
+        return "failed"
+    over = []
+    lag = res["server"]["loop_lag"].get("game", {})
+    if lag.get("p99_ms", 0) > args.lag_budget:
+        over.append("loop lag")
+    worst = max(
+        res["client"].get(key, {}).get("max_ms", 0)
+        for key in ("round_start_propagation", "reveal_propagation", "end_propagation")
+    )
+    if worst > args.propagation_budget:
+        over.append("propagation")
+    return "ok" if not over else "slow: " + ", ".join(over)
+
+
+def _cell(stats: dict[str, Any] | None, key: str = "p50_ms") -> str:
+    return f"{stats[key]:.1f}" if stats and key in stats else "-"
+
+
+def print_report(results: dict[int, dict[str, Any]], args: argparse.Namespace) -> None:
+    print(f"{'players':>7} {'join p99':>9} {'submit p99':>10} {'hdl submit':>10} "
+          f"{'fanout p50':>10} {'fanout p99':>10} {'lag p99':>8} {'lag max':>8} "
+          f"{'start max':>9} {'reveal max':>10} {'RSS':>6} {'frames':>7}  verdict")
+    print(f"{'':>7} {'ms':>9} {'ms':>10} {'p99 ms':>10} {'ms':>10} {'ms':>10} {'ms':>8} "
+          f"{'ms':>8} {'ms':>9} {'ms':>10} {'KB/pl':>6} {'/phone':>7}")
+    for n, res in results.items():
+        if "error" in res:
+            print(f"{n:>7} ERROR {res['error']}")
+            continue
+        cli, srv = res["client"], res["server"]
+        fanout = srv["fanout"].get("game")
+        lag = srv["loop_lag"].get("game")
+        rss = srv["rss_mb"]
+        per_player_kb = (rss.get("game", 0) - rss.get("lobby", 0)) * 1024 / n
+        print(f"{n:>7} {_cell(cli.get('join_rtt'), 'p99_ms'):>9} "
+              f"{_cell(cli.get('submit_rtt'), 'p99_ms'):>10} "
+              f"{_cell(srv['handle'].get('submit'), 'p99_ms'):>10} "
+              f"{_cell(fanout):>10} {_cell(fanout, 'p99_ms'):>10} "
+              f"{_cell(lag, 'p99_ms'):>8} {_cell(lag, 'max_ms'):>8} "
+              f"{_cell(cli.get('round_start_propagation'), 'max_ms'):>9} "
+              f"{_cell(cli.get('reveal_propagation'), 'max_ms'):>10} "
+              f"{per_player_kb:>6.0f} {cli['rx_frames_per_phone']:>7.0f}  {res['verdict']}")
+        if "failure" in cli:
+            print(f"{'':>7} session aborted: {cli['failure']}")
+        if cli.get("error_codes"):
+            print(f"{'':>7} errors received: {cli['error_codes']}")
+
+    slow = [n for n, res in results.items() if res.get("verdict") != "ok"]
+    print()
+    if slow:
+        print(f"lobby stops keeping up at {slow[0]} players "
+              f"(budgets: loop lag p99 {args.lag_budget:g} ms, "
+              f"propagation {args.propagation_budget:g} ms)")
+    else:
+        print(f"all counts within budget (loop lag p99 {args.lag_budget:g} ms, "
+              f"propagation {args.propagation_budget:g} ms)")
+
+
+def environment() -> dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "aiohttp": aiohttp.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "taken_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", default=",".join(map(str, DEFAULT_COUNTS)),
+                        help="comma-separated player counts, host included (default 5,20,50,100)")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds per game (default 5)")
+    parser.add_argument("--round-duration", type=int, default=30,
+                        help="round timer in seconds, 15-60 (default 30)")
+    parser.add_argument("--think", type=float, default=3.0,
+                        help="players guess after a random 0..THINK s (default 3)")
+    parser.add_argument("--bet-rate", type=float, default=0.3,
+                        help="share of guesses placed with a bet (default 0.3)")
+    parser.add_argument("--join-spread", type=float, default=2.0,
+                        help="players join within a random 0..SPREAD s (default 2)")
+    parser.add_argument("--reveal-pause", type=float, default=1.0,
+                        help="seconds the host stays on the reveal (default 1)")
+    parser.add_argument("--speaker-delay", type=float, default=0.0,
+                        help="seconds the stub speaker takes per media_player call")
+    parser.add_argument("--state-sync", action="store_true",
+                        help="phones subscribe to delta state sync instead of full states")
+    parser.add_argument("--lag-interval", type=float, default=0.01,
+                        help="event-loop lag sampling interval in seconds (default 0.01)")
+    parser.add_argument("--lag-budget", type=float, default=100.0,
+                        help="game-phase loop lag p99 budget in ms (default 100)")
+    parser.add_argument("--propagation-budget", type=float, default=1000.0,
+                        help="worst phase propagation budget in ms (default 1000)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", type=Path, help="also write the full results here")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    counts = [int(n) for n in args.players.split(",") if n.strip()]
+    results: dict[int, dict[str, Any]] = {}
+    for n in counts:
+        print(f"... {n} players", file=sys.stderr, flush=True)
+        res = run_count(args, n)
+        res["verdict"] = verdict(res, args)
+        results[n] = res
+
+    print_report(results, args)
+    if args.json:
+        report = {
+            "environment": environment(),
+            "settings": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+            "results": results,
+        }
+        args.json.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return 0 if all(res["verdict"] == "ok" for res in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,636 @@
+#!/usr/bin/env python3
+# WashData - Home Assistant integration for appliance cycle monitoring via smart plugs.
+# Copyright (C) 2026 Lukas Bandura
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Performance benchmarks for the WashData matching and detection pipeline.
+
+Covers the hot paths of ``custom_components/ha_washdata``:
+
+* ``analysis.compute_matches_worker`` in every ``dtw_mode``;
+* ``compute_dtw_lite`` / ``compute_dtw_lite_batch`` against the scalar and
+  vectorized cost-matrix fills across ``n``;
+* ``signal_processing.resample_adaptive``;
+* ``CycleDetector.process_reading`` (and the batch ``process_readings``);
+* ``analysis.compute_envelope_worker``;
+* ``ProfileStore`` save/load at 100 / 1k / 10k cycles;
+* ``ml.training_task.train_from_cycles``.
+
+Inputs are synthetic cycles (seeded, so every run sees the same data) or,
+with ``--cycles``, the cycles of an ``export_config`` JSON. Each case runs in a
+forked child so its peak RSS is its own; per case the report shows calls,
+ops/s, p50/p99 latency per call, peak RSS and the RSS the case added.
+
+``--save-baseline`` writes the results to the baseline file; a normal run
+compares against it and exits 1 when a case's p50 regressed by more than
+``--threshold`` (numbers only compare on the same machine - the baseline
+records where it was taken). The speedups quoted in docstrings are printed
+as measured ratios under "claims".
+
+Usage::
+
+    python devtools/bench_washdata.py --quick
+    python devtools/bench_washdata.py --only dtw,matches --save-baseline
+    python devtools/bench_washdata.py --cycles export.json --json out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+# pylint: disable=wrong-import-position
+from custom_components.ha_washdata import analysis  # noqa: E402
+from custom_components.ha_washdata.cycle_detector import (  # noqa: E402
+    CycleDetector,
+    CycleDetectorConfig,
+)
+from custom_components.ha_washdata.signal_processing import resample_adaptive  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).with_name("bench_washdata_baseline.json")
+DTW_MODES = ("legacy", "scaled", "ddtw", "ensemble")
+
+# (label, slower case, faster case, ratio quoted in the source)
+CLAIMS = [
+    ("dtw_lite_batch vs 10x compute_dtw_lite (analysis.py: ~3.5x)",
+     "dtw_lite_x10[n=200]", "dtw_lite_batch[k=10,n=200]", 3.5),
+    ("vectorized vs scalar matrix fill, n=800 (analysis.py: 1.6-8x)",
+     "dtw_matrix_scalar[n=800]", "dtw_matrix_vectorized[n=800]", 1.6),
+    ("scalar dtw_lite vs vectorized matrix, n=200 (analysis.py: ~2x)",
+     "dtw_matrix_vectorized[n=200]", "dtw_lite[n=200]", 2.0),
+    ("batch vs per-reading detector replay (cycle_detector.py)",
+     "detector_process_reading", "detector_process_readings", None),
+]
+
+
+@dataclasses.dataclass
+class Case:
+    """One benchmark: ``setup`` returns ``(fn, ops_per_call)``."""
+
+    name: str
+    group: str
+    setup: Callable[[Context], Awaitable[tuple[Callable[[], Any], int]]]
+    max_calls: int = 1000
+    full_only: bool = False
+
+
+@dataclasses.dataclass
+class Context:
+    """Shared inputs of one child process."""
+
+    args: argparse.Namespace
+    tmp: Path
+    hass: Any = None
+
+    async def ensure_hass(self) -> Any:
+        if self.hass is None:
+            from homeassistant.core import HomeAssistant  # pylint: disable=import-outside-toplevel
+
+            self.hass = HomeAssistant(str(self.tmp))
+        return self.hass
+
+
+# --------------------------------------------------------------------------
+# Synthetic and recorded inputs
+# --------------------------------------------------------------------------
+
+
+def program_trace(n: int, seed: int, noise_seed: int) -> np.ndarray:
+    """Piecewise-constant "program" (heat / wash / spin / idle plateaus) + noise."""
+    rng = np.random.default_rng(seed)
+    out = np.zeros(n)
+    i = 0
+    while i < n:
+        length = int(rng.integers(30, 200))
+        out[i:i + length] = rng.choice([5.0, 80.0, 200.0, 2000.0])
+        i += length
+    return np.maximum(0.0, out * (1 + 0.05 * np.random.default_rng(noise_seed).standard_normal(n)))
+
+
+def synthetic_cycles(n_cycles: int, n_profiles: int, dt: float = 5.0) -> list[dict[str, Any]]:
+    """``n_cycles`` completed cycles spread over ``n_profiles`` programs."""
+    t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    cycles = []
+    for k in range(n_cycles):
+        prof = k % n_profiles
+        power = program_trace(240 + 40 * (prof % 8), prof, 1000 + k)
+        pdata = [[round(i * dt, 1), round(float(w), 1)] for i, w in enumerate(power)]
+        cycles.append({
+            "start_time": (t0 + timedelta(hours=6 * k)).isoformat(),
+            "end_time": (t0 + timedelta(hours=6 * k, seconds=pdata[-1][0])).isoformat(),
+            "duration": pdata[-1][0],
+            "status": "completed",
+            "profile_name": f"Program {prof}",
+            "power_data": pdata,
+        })
+    return cycles
+
+
+def recorded_cycles(path: str) -> list[dict[str, Any]]:
+    """Labeled completed cycles of an ``export_config`` JSON (or a .storage file)."""
+    with open(path, encoding="utf-8") as fh:
+        payload = json.load(fh)
+    data = payload.get("data", payload)
+    cycles = list(data.get("past_cycles") or []) + list(data.get("reference_cycles") or [])
+    return [
+        {k: v for k, v in c.items() if k != "id"}
+        for c in cycles
+        if isinstance(c, dict) and c.get("power_data") and c.get("status") == "completed"
+    ]
+
+
+def bench_cycles(ctx: Context, n_cycles: int, n_profiles: int = 8) -> list[dict[str, Any]]:
+    """Recorded cycles (repeated to ``n_cycles``) when given, else synthetic ones."""
+    if ctx.args.cycles:
+        base = recorded_cycles(ctx.args.cycles)
+        if base:
+            return [json.loads(json.dumps(base[i % len(base)])) for i in range(n_cycles)]
+    return synthetic_cycles(n_cycles, n_profiles)
+
+
+async def build_store(
+    ctx: Context, cycles: list[dict[str, Any]], entry: str, envelopes: bool = True
+) -> Any:
+    """A ProfileStore holding ``cycles`` with profiles (and envelopes) built."""
+    from custom_components.ha_washdata.profile_store import ProfileStore  # pylint: disable=import-outside-toplevel
+
+    hass = await ctx.ensure_hass()
+    store = ProfileStore(hass, entry)
+    await store.async_load()
+    store.set_retention_limits(
+        max_past_cycles=len(cycles) + 1,
+        max_full_traces_per_profile=len(cycles) + 1,
+        max_full_traces_unlabeled=len(cycles) + 1,
+    )
+    ids: set[Any] = set()
+    for cycle in cycles:
+        store._add_cycle_data(dict(cycle), id_pool=ids)  # pylint: disable=protected-access
+    profiles = store._data["profiles"]  # pylint: disable=protected-access
+    for cycle in store.get_past_cycles():
+        name = cycle.get("profile_name")
+        if name and name not in profiles:
+            profiles[name] = {"sample_cycle_id": cycle["id"], "avg_duration": cycle["duration"]}
+    if envelopes:
+        await store.async_rebuild_all_envelopes()
+    return store
+
+
+def live_prefix(cycle: dict[str, Any], fraction: float = 0.6) -> tuple[list[float], float]:
+    """Resampled matching trace of the first ``fraction`` of a cycle."""
+    from custom_components.ha_washdata.profile_store import _match_trace, decompress_power_data  # pylint: disable=import-outside-toplevel
+
+    pts = decompress_power_data(cycle)
+    pts = pts[: max(8, int(len(pts) * fraction))]
+    trace = _match_trace(np.array([p[0] for p in pts]), np.array([p[1] for p in pts]))
+    if trace is None:
+        raise RuntimeError("cycle too short to match")
+    return trace
+
+
+# --------------------------------------------------------------------------
+# Cases
+# --------------------------------------------------------------------------
+
+
+def _pair(n: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    x = program_trace(n, seed, 1)
+    y = program_trace(n, seed, 2)
+    return x, y
+
+
+def _dtw_cases() -> list[Case]:
+    cases = []
+    for n in (50, 200, 800, 2000):
+        full = n >= 2000
+
+        async def lite(_ctx: Context, n: int = n):
+            x, y = _pair(n)
+            return (lambda: analysis.compute_dtw_lite(x, y, 0.1)), 1
+
+        async def scalar(_ctx: Context, n: int = n):
+            x, y = _pair(n)
+            w = max(1, int(n * 0.1))
+            return (lambda: analysis._dtw_cost_matrix_scalar(x, y, n, n, w)), 1  # pylint: disable=protected-access
+
+        async def vector(_ctx: Context, n: int = n):
+            x, y = _pair(n)
+            w = max(1, int(n * 0.1))
+            return (lambda: analysis._dtw_cost_matrix_vectorized(x, y, n, n, w)), 1  # pylint: disable=protected-access
+
+        cases += [
+            Case(f"dtw_lite[n={n}]", "dtw", lite, full_only=full),
+            Case(f"dtw_matrix_scalar[n={n}]", "dtw", scalar, max_calls=200, full_only=full),
+            Case(f"dtw_matrix_vectorized[n={n}]", "dtw", vector, max_calls=200, full_only=full),
+        ]
+
+    async def singles(_ctx: Context):
+        x = program_trace(200, 0, 1)
+        ys = [program_trace(200, s, 2) for s in range(10)]
+        return (lambda: [analysis.compute_dtw_lite(x, y, 0.1) for y in ys]), 10
+
+    async def batch(_ctx: Context):
+        x = program_trace(200, 0, 1)
+        ys = np.stack([program_trace(200, s, 2) for s in range(10)])
+        return (lambda: analysis.compute_dtw_lite_batch(x, ys, 0.1)), 10
+
+    cases += [
+        Case("dtw_lite_x10[n=200]", "dtw", singles),
+        Case("dtw_lite_batch[k=10,n=200]", "dtw", batch),
+    ]
+    return cases
+
+
+def _resample_cases() -> list[Case]:
+    cases = []
+    for cadence, hours in ((1.0, 3), (5.0, 3), (30.0, 3)):
+        async def setup(_ctx: Context, cadence: float = cadence, hours: int = hours):
+            n = int(hours * 3600 / cadence)
+            rng = np.random.default_rng(3)
+            ts = np.cumsum(np.full(n, cadence) + rng.normal(0, cadence * 0.05, n))
+            # A few sensor dropouts so the gap splitting is exercised too.
+            ts[n // 3:] += 900.0
+            power = program_trace(n, 4, 5)
+            return (lambda: resample_adaptive(ts, power, min_dt=5.0, gap_s=300.0)), n
+
+        cases.append(Case(f"resample_adaptive[{cadence:g}s x {hours}h]", "resample", setup))
+    return cases
+
+
+def _detector_stream(days: int) -> tuple[list[datetime], np.ndarray]:
+    rng = np.random.default_rng(1)
+    t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    per_day = 86400 // 5
+    ts: list[datetime] = []
+    chunks = []
+    for day in range(days):
+        power = np.full(per_day, 0.4) + rng.random(per_day) * 0.2
+        start = int(rng.integers(2000, 12000))
+        length = int(rng.integers(600, 1500))
+        power[start:start + length] = program_trace(length, day, day + 50)
+        chunks.append(power)
+        ts += [t0 + timedelta(seconds=day * 86400 + 5 * k) for k in range(per_day)]
+    return ts, np.concatenate(chunks)
+
+
+def _new_detector() -> CycleDetector:
+    cfg = CycleDetectorConfig(
+        min_power=10.0, off_delay=300, start_threshold_w=11, stop_threshold_w=6,
+        device_type="washing_machine",
+    )
+    return CycleDetector(
+        cfg, lambda _a, _b: None, lambda _d: None,
+        profile_matcher=lambda _r: ("Program 0", 0.8, 3000.0, None, False, False),
+    )
+
+
+def _detector_cases() -> list[Case]:
+    async def per_reading(ctx: Context):
+        ts, power = _detector_stream(1 if ctx.args.quick else 3)
+        values = power.tolist()
+
+        def run() -> None:
+            det = _new_detector()
+            for stamp, watts in zip(ts, values):
+                det.process_reading(watts, stamp)
+
+        return run, len(ts)
+
+    async def batch(ctx: Context):
+        ts, power = _detector_stream(1 if ctx.args.quick else 3)
+        return (lambda: _new_detector().process_readings(ts, power)), len(ts)
+
+    return [
+        Case("detector_process_reading", "detector", per_reading, max_calls=5),
+        Case("detector_process_readings", "detector", batch, max_calls=20),
+    ]
+
+
+def _matches_cases() -> list[Case]:
+    cases = []
+    for mode in DTW_MODES:
+        async def setup(ctx: Context, mode: str = mode):
+            store = await build_store(ctx, bench_cycles(ctx, 48, 12), f"matches_{mode}")
+            power, used_dt = live_prefix(store.get_past_cycles()[5])
+            snapshots, _groups, _members, config = store._match_inputs(used_dt)  # pylint: disable=protected-access
+            config = {**config, "dtw_mode": mode}
+            duration = len(power) * used_dt
+            return (lambda: analysis.compute_matches_worker(power, duration, snapshots, config)), 1
+
+        cases.append(Case(f"matches_worker[{mode}]", "matches", setup, max_calls=300))
+    return cases
+
+
+def _envelope_cases() -> list[Case]:
+    cases = []
+    for n_cycles in (5, 20):
+        async def setup(ctx: Context, n_cycles: int = n_cycles):
+            from custom_components.ha_washdata.profile_store import decompress_power_data  # pylint: disable=import-outside-toplevel
+
+            cycles = [c for c in bench_cycles(ctx, 8 * n_cycles) if c.get("profile_name")]
+            name = cycles[0]["profile_name"]
+            raw = []
+            for cycle in [c for c in cycles if c["profile_name"] == name][:n_cycles]:
+                pts = decompress_power_data(cycle)
+                raw.append(([p[0] for p in pts], [p[1] for p in pts], float(cycle["duration"])))
+            return (lambda: analysis.compute_envelope_worker(raw, 0.1)), 1
+
+        cases.append(Case(f"envelope_worker[cycles={n_cycles}]", "envelope", setup, max_calls=100))
+    return cases
+
+
+def _store_cases() -> list[Case]:
+    cases = []
+    for size in (100, 1000, 10000):
+        full = size >= 10000
+
+        async def save(ctx: Context, size: int = size):
+            store = await build_store(ctx, bench_cycles(ctx, size), f"save_{size}", envelopes=False)
+            return store.async_save, 1
+
+        async def load(ctx: Context, size: int = size):
+            from custom_components.ha_washdata.profile_store import ProfileStore  # pylint: disable=import-outside-toplevel
+
+            store = await build_store(ctx, bench_cycles(ctx, size), f"load_{size}", envelopes=False)
+            await store.async_save()
+
+            async def run() -> None:
+                await ProfileStore(ctx.hass, f"load_{size}").async_load()
+
+            return run, 1
+
+        cases += [
+            Case(f"store_save[{size}]", "store", save, max_calls=20, full_only=full),
+            Case(f"store_load[{size}]", "store", load, max_calls=20, full_only=full),
+        ]
+    return cases
+
+
+def _train_cases() -> list[Case]:
+    async def setup(ctx: Context):
+        from custom_components.ha_washdata.ml.training_task import train_from_cycles  # pylint: disable=import-outside-toplevel
+
+        store = await build_store(ctx, bench_cycles(ctx, 64), "train")
+        cycles = store.get_past_cycles()
+        return (lambda: train_from_cycles(cycles, "washing_machine")), 1
+
+    return [Case("train_from_cycles[64]", "train", setup, max_calls=10)]
+
+
+def all_cases() -> list[Case]:
+    return [
+        *_matches_cases(),
+        *_dtw_cases(),
+        *_resample_cases(),
+        *_detector_cases(),
+        *_envelope_cases(),
+        *_store_cases(),
+        *_train_cases(),
+    ]
+
+
+# --------------------------------------------------------------------------
+# Runner
+# --------------------------------------------------------------------------
+
+
+def _rss_now_mb() -> float:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+async def _measure(case: Case, ctx: Context) -> dict[str, Any]:
+    rss_before = _rss_now_mb()
+    fn, ops = await case.setup(ctx)
+    is_async = asyncio.iscoroutinefunction(fn)
+
+    async def call() -> None:
+        if is_async:
+            await fn()
+        else:
+            fn()
+
+    await call()  # warm-up (lazy imports, caches, JIT-free but first-touch pages)
+    budget = ctx.args.min_time
+    times: list[float] = []
+    started = time.perf_counter()
+    while len(times) < case.max_calls and (time.perf_counter() - started < budget or len(times) < 3):
+        t = time.perf_counter()
+        await call()
+        times.append(time.perf_counter() - t)
+    arr = np.asarray(times)
+    return {
+        "calls": len(times),
+        "ops_per_call": ops,
+        "ops_s": round(ops * len(times) / float(arr.sum()), 2),
+        "p50_ms": round(float(np.percentile(arr, 50)) * 1e3, 4),
+        "p99_ms": round(float(np.percentile(arr, 99)) * 1e3, 4),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "rss_delta_mb": round(max(0.0, _peak_rss_mb() - rss_before), 1),
+    }
+
+
+def _run_case(case: Case, args: argparse.Namespace) -> dict[str, Any]:
+    async def main() -> dict[str, Any]:
+        tmp = Path(tempfile.mkdtemp(prefix="washdata-bench-"))
+        ctx = Context(args, tmp)
+        try:
+            return await _measure(case, ctx)
+        finally:
+            if ctx.hass is not None:
+                await ctx.hass.async_stop(force=True)
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    return asyncio.run(main())
+
+
+def _child(case: Case, args: argparse.Namespace, conn: Any) -> None:
+    try:
+        conn.send(_run_case(case, args))
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        conn.send({"error": f"{type(exc).__name__}: {exc}"})
+    finally:
+        conn.close()
+
+
+def run_case(case: Case, args: argparse.Namespace) -> dict[str, Any]:
+    """Run one case, in a forked child where available (isolated peak RSS)."""
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return _run_case(case, args)
+    mp = multiprocessing.get_context("fork")
+    parent, child = mp.Pipe(duplex=False)
+    proc = mp.Process(target=_child, args=(case, args, child))
+    proc.start()
+    child.close()
+    try:
+        result = parent.recv()
+    except EOFError:
+        result = {"error": f"child exited with {proc.exitcode}"}
+    proc.join()
+    return result
+
+
+def environment() -> dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "taken_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def compare(results: dict[str, dict[str, Any]], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Cases whose p50 regressed by more than ``threshold`` against ``baseline``."""
+    regressions = []
+    base_cases = baseline.get("results", {})
+    for name, res in results.items():
+        base = base_cases.get(name)
+        if "error" in res or not base or "error" in base or not base.get("p50_ms"):
+            continue
+        ratio = res["p50_ms"] / base["p50_ms"]
+        res["vs_baseline"] = round(ratio, 3)
+        if ratio > 1.0 + threshold:
+            regressions.append(f"{name}: p50 {base['p50_ms']:.3f} -> {res['p50_ms']:.3f} ms (x{ratio:.2f})")
+    return regressions
+
+
+def claims(results: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
+    """Measured ratio (per op) for each speedup quoted in the source."""
+    out = []
+    for label, slow, fast, quoted in CLAIMS:
+        a, b = results.get(slow), results.get(fast)
+        if not a or not b or "error" in a or "error" in b:
+            continue
+        out.append({
+            "claim": label,
+            "measured": round(b["ops_s"] / a["ops_s"], 2),
+            "quoted": quoted,
+        })
+    return out
+
+
+def print_table(results: dict[str, dict[str, Any]]) -> None:
+    print(f"{'case':44} {'calls':>6} {'ops/s':>12} {'p50 ms':>10} {'p99 ms':>10} "
+          f"{'peakMB':>7} {'+MB':>6} {'vs base':>8}")
+    for name, res in results.items():
+        if "error" in res:
+            print(f"{name:44} ERROR {res['error']}")
+            continue
+        vs = f"x{res['vs_baseline']:.2f}" if "vs_baseline" in res else "-"
+        print(f"{name:44} {res['calls']:>6} {res['ops_s']:>12.1f} {res['p50_ms']:>10.3f} "
+              f"{res['p99_ms']:>10.3f} {res['peak_rss_mb']:>7.1f} {res['rss_delta_mb']:>6.1f} {vs:>8}")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true",
+                        help="skip the largest sizes and shorten each case")
+    parser.add_argument("--only", default="",
+                        help="comma-separated groups or case-name prefixes "
+                             "(matches, dtw, resample, detector, envelope, store, train)")
+    parser.add_argument("--cycles", help="export_config JSON to take cycles from instead of synthetic ones")
+    parser.add_argument("--min-time", type=float, default=None,
+                        help="seconds to spend per case (default 2, 0.5 with --quick)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed p50 slowdown vs baseline before failing (default 0.25)")
+    parser.add_argument("--json", type=Path, help="also write the results here")
+    args = parser.parse_args(argv)
+    if args.min_time is None:
+        args.min_time = 0.5 if args.quick else 2.0
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    wanted = [w.strip() for w in args.only.split(",") if w.strip()]
+    cases = [
+        c for c in all_cases()
+        if not (args.quick and c.full_only)
+        and (not wanted or any(c.group == w or c.name.startswith(w) for w in wanted))
+    ]
+    results: dict[str, dict[str, Any]] = {}
+    for case in cases:
+        print(f"... {case.name}", file=sys.stderr, flush=True)
+        results[case.name] = run_case(case, args)
+
+    baseline: dict[str, Any] = {}
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare(results, baseline, args.threshold) if baseline else []
+
+    print_table(results)
+    measured = claims(results)
+    if measured:
+        print("\nclaims (measured ratio, per op):")
+        for item in measured:
+            quoted = f" (quoted {item['quoted']}x)" if item["quoted"] else ""
+            print(f"  {item['claim']}: x{item['measured']}{quoted}")
+    if baseline and baseline.get("environment", {}).get("platform") != platform.platform():
+        print("\nnote: baseline was taken on a different machine:",
+              baseline.get("environment"))
+
+    report = {"environment": environment(), "quick": args.quick, "results": results, "claims": measured}
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if args.save_baseline:
+        if args.baseline.exists():
+            # Keep cases this run skipped (--only / --quick).
+            old = json.loads(args.baseline.read_text(encoding="utf-8")).get("results", {})
+            report["results"] = {**old, **results}
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"\nbaseline written to {args.baseline}")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+        for line in regressions:
+            print("  " + line)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())